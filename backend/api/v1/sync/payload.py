@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Request, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Request, HTTPException
 import logging
 from pydantic import ValidationError
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, Any, List, Union
 import os
 import json
@@ -10,6 +10,7 @@ from backend.data_models import PayloadWebhookDoc
 from backend.data_ingestion.embedding_processor import process_payload_documents, process_payload_documents_with_faq
 from backend.data_ingestion.vector_store_manager import VectorStoreManager
 from backend.rag_pipeline import RAGPipeline
+from backend.services.ingestion_queue import IngestionJob, IngestionQueue
 from backend.utils.webhook_auth import verify_webhook_request
 import asyncio
 
@@ -31,6 +32,7 @@ try:
     from backend.monitoring.metrics import (
         webhook_processing_total,
         webhook_processing_duration_seconds,
+        webhook_chunk_changes_total,
     )
     MONITORING_ENABLED = True
 except ImportError:
@@ -79,9 +81,12 @@ def normalize_relationship_fields(doc_data: Dict[str, Any]) -> Dict[str, Any]:
 
     return normalized
 
-def delete_and_refresh_vector_store(payload_id, operation="delete"):
+async def delete_and_refresh_vector_store(payload_id, operation="delete"):
     """
-    Background task to delete documents by payload_id and refresh the RAG pipeline.
+    Ingestion job to delete documents by payload_id and refresh the RAG pipeline.
+
+    Blocking vector store and refresh work runs in worker threads. Raises on
+    failure so the ingestion queue can retry.
     
     Args:
         payload_id: The Payload CMS document ID
@@ -99,23 +104,27 @@ def delete_and_refresh_vector_store(payload_id, operation="delete"):
             logger.debug(f"🗑️ [Delete Task: {payload_id}] Using global VectorStoreManager instance")
         else:
             # Fallback: create new instance only if global not available
-            vector_store_manager = VectorStoreManager()
+            vector_store_manager = await asyncio.to_thread(VectorStoreManager)
             logger.warning(f"🗑️ [Delete Task: {payload_id}] Created new VectorStoreManager (global instance unavailable)")
 
-        # Delete documents AND rebuild FAISS (since we're not adding new content)
-        # For unpublish/delete, we need to rebuild to remove the deleted vectors
-        deleted_count = vector_store_manager.delete_documents_by_metadata_field('payload_id', payload_id, rebuild_faiss=True)
-        logger.info(f"🗑️ [Delete Task: {payload_id}] Deleted {deleted_count} document(s) and rebuilt FAISS index.")
+        # Delete documents; their vectors are removed from FAISS by payload_id (no rebuild).
+        # VectorStoreManager serializes this with other writers, snapshots and reloads.
+        deleted_count = await asyncio.to_thread(
+            vector_store_manager.delete_documents_by_metadata_field, 'payload_id', payload_id
+        )
+        logger.info(f"🗑️ [Delete Task: {payload_id}] Deleted {deleted_count} document(s) and their FAISS vectors.")
 
-        # Refresh the RAG pipeline to reload retrievers (this just reloads from disk now)
+        # Refresh the RAG pipeline to swap in a retriever bundle without the removed vectors
         try:
             if _global_rag_pipeline:
-                _global_rag_pipeline.refresh_vector_store()
+                # Drop this document from the in-process indexes instead of rebuilding them
+                await asyncio.to_thread(_global_rag_pipeline.apply_payload_removal, payload_id)
+                await asyncio.to_thread(_global_rag_pipeline.refresh_vector_store, incremental=True)
                 logger.info(f"✅ [Delete Task: {payload_id}] RAG pipeline refreshed successfully")
             else:
                 # Fallback: create new RAG pipeline instance
-                rag_pipeline = RAGPipeline()
-                rag_pipeline.refresh_vector_store()
+                rag_pipeline = await asyncio.to_thread(RAGPipeline)
+                await asyncio.to_thread(rag_pipeline.refresh_vector_store)
                 logger.info(f"✅ [Delete Task: {payload_id}] RAG pipeline refreshed successfully (new instance)")
         except Exception as refresh_error:
             logger.warning(f"⚠️ [Delete Task: {payload_id}] Failed to refresh RAG pipeline: {refresh_error}")
@@ -150,10 +159,11 @@ def delete_and_refresh_vector_store(payload_id, operation="delete"):
                 operation=operation,
                 status="error"
             ).inc()
+        raise
 
-def process_and_embed_document(payload_doc, operation="create"):
+async def process_and_embed_document(payload_doc, operation="create"):
     """
-    Background task to process and embed a single document from Payload.
+    Ingestion job to process and embed a single document from Payload.
     
     Supports FAQ indexing (Parent Document Pattern) when USE_FAQ_INDEXING=true.
     Synthetic questions are generated and indexed alongside the original chunks.
@@ -161,6 +171,13 @@ def process_and_embed_document(payload_doc, operation="create"):
     CRUD Lifecycle: Synthetic questions inherit payload_id from parent chunk,
     so deletion by payload_id automatically removes both parent AND synthetic.
     
+    Updates are diff-based: the new chunks are compared with the stored ones by
+    content fingerprint, and only added chunks are embedded; unchanged chunks
+    keep their vectors and removed ones are deleted.
+
+    FAQ generation runs on the event loop; chunking, embedding and the refresh
+    run in worker threads. Raises on failure so the ingestion queue can retry.
+    
     Args:
         payload_doc: The Payload CMS document
         operation: The operation type ("create" or "update")
@@ -179,63 +196,60 @@ def process_and_embed_document(payload_doc, operation="create"):
             logger.debug(f"✅ [Task ID: {payload_id}] Using global VectorStoreManager instance (shared connection pool)")
         else:
             # Fallback: create new instance only if global not available
-            vector_store_manager = VectorStoreManager()
+            vector_store_manager = await asyncio.to_thread(VectorStoreManager)
             logger.warning(f"⚠️ [Task ID: {payload_id}] Created new VectorStoreManager (global instance unavailable)")
         logger.info(f"✅ [Task ID: {payload_id}] Vector store connected successfully")
 
-        # 1. Delete existing documents for this payload_id to handle updates cleanly.
-        # This removes BOTH original chunks AND synthetic questions (they share payload_id)
-        logger.info(f"🗑️ [Task ID: {payload_id}] Deleting existing chunks from vector store...")
-        deleted_count = vector_store_manager.delete_documents_by_metadata_field('payload_id', payload_id)
-        logger.info(f"🗑️ [Task ID: {payload_id}] Deleted {deleted_count} existing chunk(s) (includes synthetic questions).")
-
-        # 2. Process the new document into chunks with optional FAQ generation.
+        # 1. Process the new document into chunks with optional FAQ generation.
         # Check if FAQ indexing is enabled
         USE_FAQ_INDEXING = os.getenv("USE_FAQ_INDEXING", "true").lower() == "true"
         
         if USE_FAQ_INDEXING:
             logger.info(f"📝 [Task ID: {payload_id}] Processing document with FAQ generation (Parent Document Pattern)...")
-            try:
-                # Use asyncio.run to call the async FAQ processing function
-                processed_chunks = asyncio.run(process_payload_documents_with_faq([payload_doc], generate_faq=True))
-            except RuntimeError as e:
-                # Handle case where event loop is already running (shouldn't happen in background task)
-                if "already running" in str(e):
-                    logger.warning(f"⚠️ [Task ID: {payload_id}] Event loop already running, falling back to sync processing")
-                    processed_chunks = process_payload_documents([payload_doc])
-                else:
-                    raise
+            processed_chunks = await process_payload_documents_with_faq([payload_doc], generate_faq=True)
         else:
             logger.info(f"📝 [Task ID: {payload_id}] Processing document into hierarchical chunks (FAQ generation disabled)...")
-            processed_chunks = process_payload_documents([payload_doc])
+            processed_chunks = await asyncio.to_thread(process_payload_documents, [payload_doc])
 
         if processed_chunks is None:
-            logger.error(f"❌ [Task ID: {payload_id}] process_payload_documents returned None")
-            return
+            # Chunking/embedding failed: raise so the ingestion queue records it and retries
+            raise RuntimeError(f"Processing payload document {payload_id} returned no chunks")
 
         # Count synthetic questions vs original chunks
         synthetic_count = sum(1 for c in processed_chunks if c.metadata.get("is_synthetic", False))
         original_count = len(processed_chunks) - synthetic_count
         logger.info(f"📦 [Task ID: {payload_id}] Generated {original_count} chunks + {synthetic_count} synthetic questions")
 
-        # 3. Add the new chunks to the vector store.
-        if processed_chunks:
-            logger.info(f"💾 [Task ID: {payload_id}] Adding {len(processed_chunks)} documents to the vector store...")
-            vector_store_manager.add_documents(processed_chunks)
-            logger.info(f"✅ [Task ID: {payload_id}] Successfully added {len(processed_chunks)} documents to the vector store.")
-        else:
+        # 2. Diff against the stored chunks (original + synthetic questions share payload_id):
+        # embed and add new chunks, delete removed ones, keep unchanged (or only moved) ones in place.
+        if not processed_chunks:
             logger.warning(f"⚠️ [Task ID: {payload_id}] No chunks were generated from the document.")
+        logger.info(f"💾 [Task ID: {payload_id}] Upserting {len(processed_chunks)} documents into the vector store...")
+        # VectorStoreManager serializes writers, snapshots and reloads (FAISS and the sparse
+        # index are not safe for concurrent mutation)
+        changes = await asyncio.to_thread(
+            vector_store_manager.upsert_payload_documents, payload_id, processed_chunks
+        )
+        logger.info(
+            f"✅ [Task ID: {payload_id}] Vector store upserted: kept {changes['kept']}, "
+            f"patched {changes['patched']}, added {changes['added']}, removed {changes['removed']} chunk(s)."
+        )
+        if MONITORING_ENABLED:
+            for change, count in changes.items():
+                webhook_chunk_changes_total.labels(source="payload_cms", change=change).inc(count)
 
-        # 4. Refresh the RAG pipeline to include the new documents
+        # 3. Refresh the RAG pipeline to include the new documents
         logger.info(f"🔄 [Task ID: {payload_id}] Refreshing RAG pipeline with new documents...")
         try:
             if _global_rag_pipeline:
-                _global_rag_pipeline.refresh_vector_store()
+                # Swap this document's chunks in the in-process indexes instead of rebuilding them
+                await asyncio.to_thread(_global_rag_pipeline.apply_payload_update, payload_id, processed_chunks)
+                await asyncio.to_thread(_global_rag_pipeline.refresh_vector_store, incremental=True)
                 logger.info(f"✅ [Task ID: {payload_id}] RAG pipeline refreshed successfully")
             else:
                 # Fallback: create new RAG pipeline instance
-                rag_pipeline = RAGPipeline()
-                rag_pipeline.refresh_vector_store()
+                rag_pipeline = await asyncio.to_thread(RAGPipeline)
+                await asyncio.to_thread(rag_pipeline.refresh_vector_store)
                 logger.info(f"✅ [Task ID: {payload_id}] RAG pipeline refreshed successfully (new instance)")
         except Exception as refresh_error:
             logger.warning(f"⚠️ [Task ID: {payload_id}] Failed to refresh RAG pipeline: {refresh_error}")
@@ -270,13 +284,70 @@ def process_and_embed_document(payload_doc, operation="create"):
                 operation=operation,
                 status="error"
             ).inc()
+        raise
+
+
+async def invalidate_cached_answers(payload_id, operation):
+    """
+    Drop cached answers made stale by a Payload change.
+
+    Runs after the job's refresh, so answers cached from here on reflect the
+    updated vector store.
+
+    - Exact-match query cache: cleared on every backend worker
+    - Redis vector cache: only the answers that cited this document
+
+    Args:
+        payload_id: The Payload CMS document ID
+        operation: The webhook operation that changed the document
+    """
+    if _global_rag_pipeline is None:
+        return
+
+    query_cache = getattr(_global_rag_pipeline, "query_cache", None)
+    if query_cache is not None and hasattr(query_cache, "invalidate_all"):
+        try:
+            generation = await query_cache.invalidate_all()
+            logger.info(f"🧹 [Cache: {payload_id}] Query cache invalidated after {operation} (generation {generation})")
+        except Exception as e:
+            logger.warning(f"⚠️ [Cache: {payload_id}] Failed to invalidate query cache: {e}")
+
+    if getattr(_global_rag_pipeline, "use_redis_cache", False):
+        try:
+            redis_cache = _global_rag_pipeline.get_redis_vector_cache()
+            if redis_cache:
+                removed = await redis_cache.invalidate_payload(str(payload_id))
+                logger.info(f"🧹 [Cache: {payload_id}] Removed {removed} Redis vector cache entries citing this document")
+        except Exception as e:
+            logger.warning(f"⚠️ [Cache: {payload_id}] Failed to invalidate Redis vector cache: {e}")
+
+
+async def run_ingestion_job(job: IngestionJob):
+    """Ingestion queue handler: apply one Payload change, then drop the answers it made stale."""
+    if job.operation in ("delete", "unpublish"):
+        await delete_and_refresh_vector_store(job.payload_id, job.operation)
+    else:
+        await process_and_embed_document(PayloadWebhookDoc(**job.doc), job.operation)
+    await invalidate_cached_answers(job.payload_id, job.operation)
+
+
+_ingestion_queue = None
+
+def get_ingestion_queue() -> IngestionQueue:
+    """Process-wide ingestion queue for webhook jobs (started by main.py's lifespan)."""
+    global _ingestion_queue
+    if _ingestion_queue is None:
+        _ingestion_queue = IngestionQueue(run_ingestion_job)
+    return _ingestion_queue
 
 
 @router.post("/payload")
-async def receive_payload_webhook(request: Request, background_tasks: BackgroundTasks):
+async def receive_payload_webhook(request: Request):
     """
     Receives a webhook from Payload CMS after a document is changed.
-    Validates the payload and triggers a background task for processing if the document is published.
+    Validates the payload and queues an ingestion job for it (processing for
+    published documents, removal otherwise). Queued jobs for the same document
+    are coalesced, so only its latest revision is processed.
     
     Requires HMAC-SHA256 signature verification via X-Webhook-Signature header
     and timestamp validation via X-Webhook-Timestamp header.
@@ -337,26 +408,51 @@ async def receive_payload_webhook(request: Request, background_tasks: Background
         logger.info(f"📝 Processing doc ID '{payload_doc.id}' with status '{payload_doc.status}' and operation '{operation}'")
         logger.info(f"📖 Document title: '{payload_doc.title}'" if hasattr(payload_doc, 'title') and payload_doc.title else "📖 No title found")
 
+        # CMS change time, for publish-to-searchable latency
+        updated_at = payload_doc.updatedAt
+        if updated_at.tzinfo is None:
+            updated_at = updated_at.replace(tzinfo=timezone.utc)
+        ingestion_queue = get_ingestion_queue()
+
         # Handle delete operations or non-published documents
         if operation == 'delete' or payload_doc.status != 'published':
             # Delete any existing chunks for this document and refresh RAG pipeline
             webhook_operation = 'delete' if operation == 'delete' else 'unpublish'
-            background_tasks.add_task(delete_and_refresh_vector_store, payload_doc.id, webhook_operation)
+            job = await ingestion_queue.enqueue(
+                payload_doc.id, webhook_operation, published_at=updated_at.timestamp()
+            )
             if operation == 'delete':
                 msg = f"🗑️ DELETE operation: Document ID '{payload_doc.id}' deleted from CMS. Removing embeddings from FAISS and refreshing RAG pipeline."
                 logger.info(msg)
             else:
                 msg = f"🚫 Document ID '{payload_doc.id}' status changed to '{payload_doc.status}' (not published). Removing embeddings from FAISS and refreshing RAG pipeline."
                 logger.info(msg)
-            return {"status": "not_published_or_deleted", "message": msg, "document_id": payload_doc.id, "operation": operation}
+            return {
+                "status": "not_published_or_deleted",
+                "message": msg,
+                "document_id": payload_doc.id,
+                "operation": operation,
+                "revision": job["revision"],
+            }
         else:
             # Document is published and not deleted, process it
-            # Run the processing in the background to avoid blocking the webhook response.
+            # Queue the processing to avoid blocking the webhook response.
             webhook_operation = 'create' if operation == 'create' else 'update'
-            background_tasks.add_task(process_and_embed_document, payload_doc, webhook_operation)
-            msg = f"✅ Processing triggered for published document ID: {payload_doc.id}"
+            job = await ingestion_queue.enqueue(
+                payload_doc.id,
+                webhook_operation,
+                doc=payload_doc.model_dump(mode="json"),
+                published_at=updated_at.timestamp(),
+            )
+            msg = f"✅ Processing queued for published document ID: {payload_doc.id} (revision {job['revision']})"
             logger.info(msg)
-            return {"status": "processing_triggered", "message": msg, "document_id": payload_doc.id}
+            return {
+                "status": "processing_triggered",
+                "message": msg,
+                "document_id": payload_doc.id,
+                "revision": job["revision"],
+                "coalesced": job["coalesced"],
+            }
     except ValidationError as e:
         logger.error(f"❌ Payload webhook validation error: {e.errors()}", exc_info=True)
         raise HTTPException(
@@ -406,6 +502,10 @@ async def webhook_health_check():
                 "total": total_count,
                 "from_payload_cms": payload_count
             },
+            "ingestion_queue": {
+                "queued": get_ingestion_queue().depth,
+                "processing": get_ingestion_queue().active
+            },
             "message": "Webhook service is operational"
         }
     except Exception as e:
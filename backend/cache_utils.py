@@ -2,30 +2,114 @@
 Caching utilities for RAG pipeline performance optimization.
 """
 
+import asyncio
+import base64
 import hashlib
+import heapq
 import json
+import os
 import time
 import logging
 import re
+import zlib
 from typing import Dict, Any, Optional, Tuple, List
 from functools import lru_cache
 import threading
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from langchain_core.documents import Document
+from backend.utils.sse_encoder import EncodedSources, encode_published_sources
 
 logger = logging.getLogger(__name__)
 
+# Import metrics if available
+try:
+    from backend.monitoring.metrics import (
+        rag_cache_hits_total,
+        rag_cache_misses_total,
+        query_cache_evictions_total,
+        query_cache_invalidations_total,
+        query_cache_l2_lookup_seconds,
+        suggested_question_cache_stale_hits_total,
+        suggested_question_cache_background_refreshes_total,
+    )
+    METRICS_ENABLED = True
+except ImportError:
+    METRICS_ENABLED = False
+
+# Redis L2 for the exact-match query cache (shared by all backend workers)
+QUERY_CACHE_L2_ENABLED = os.getenv("QUERY_CACHE_L2_ENABLED", "true").lower() == "true"
+QUERY_CACHE_L2_TTL_SECONDS = int(os.getenv("QUERY_CACHE_L2_TTL_SECONDS", "3600"))
+QUERY_CACHE_INVALIDATION_CHANNEL = os.getenv("QUERY_CACHE_INVALIDATION_CHANNEL", "query_cache:invalidate")
+# How often a worker re-reads the L2 generation when it may have missed a pub/sub message
+QUERY_CACHE_VERSION_CHECK_SECONDS = 5.0
+
+# Content-hash embedding cache; EMBEDDING_CACHE_DIR persists it across ingest runs
+EMBEDDING_CACHE_MAX_SIZE = int(os.getenv("EMBEDDING_CACHE_MAX_SIZE", "2000"))
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR") or None
+
+# Suggested question cache: entries older than the soft TTL are served but regenerated
+# in the background; the hard TTL is the Redis expiry
+SUGGESTED_QUESTION_CACHE_TTL = int(os.getenv("SUGGESTED_QUESTION_CACHE_TTL", "86400"))
+SUGGESTED_QUESTION_CACHE_HARD_TTL = int(os.getenv("SUGGESTED_QUESTION_CACHE_HARD_TTL", "259200"))
+SUGGESTED_QUESTION_REFRESH_CONCURRENCY = int(os.getenv("SUGGESTED_QUESTION_REFRESH_CONCURRENCY", "4"))
+# One worker regenerates a stale entry; the lock also spaces out retries after a failed refresh
+SUGGESTED_QUESTION_REFRESH_LOCK_SECONDS = 300
+
+
+class _QueryCacheShard:
+    """One lock's worth of QueryCache entries: LRU order + expiry heap + counters."""
+
+    __slots__ = ("lock", "entries", "expiry_heap", "hits", "misses", "evictions", "expirations")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # key -> entry, least recently used first
+        self.entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # (expires_at, key); stale items (re-set or evicted keys) are skipped lazily
+        self.expiry_heap: List[Tuple[float, str]] = []
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+
 class QueryCache:
     """
     In-memory cache for query responses with TTL and size limits.
+
+    Keys are spread over independently locked shards so concurrent requests do
+    not serialize on one lock. Each shard is an OrderedDict LRU (O(1) get/set,
+    least recently used entry evicted first) with a min-heap of expiry times,
+    so expired entries are dropped in O(log n) without scanning.
     """
 
-    def __init__(self, max_size: int = 1000, ttl_seconds: int = 3600):  # 1 hour TTL
-        self.cache: Dict[str, Dict[str, Any]] = {}
+    def __init__(self, max_size: int = 1000, ttl_seconds: int = 3600, shards: int = 16):  # 1 hour TTL
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
-        self._lock = threading.Lock()
+        shards = max(1, min(shards, max_size))
+        self._shards = [_QueryCacheShard() for _ in range(shards)]
+        # Per-shard capacity; the total never exceeds max_size
+        self._shard_capacity = [max_size // shards + (1 if i < max_size % shards else 0) for i in range(shards)]
+
+    def _shard_index(self, key: str) -> int:
+        # Keys are md5 hex digests, so their prefix is uniformly distributed
+        return int(key[:8], 16) % len(self._shards)
+
+    @staticmethod
+    def _purge_expired(shard: _QueryCacheShard, now: float) -> int:
+        """Drop entries whose expiry has passed. Caller must hold the shard lock."""
+        heap = shard.expiry_heap
+        expired = 0
+        while heap and heap[0][0] <= now:
+            expires_at, key = heapq.heappop(heap)
+            entry = shard.entries.get(key)
+            if entry is not None and entry["expires_at"] == expires_at:
+                del shard.entries[key]
+                expired += 1
+        shard.expirations += expired
+        return expired
 
     def _generate_key(self, query: str, chat_history: List[Tuple[str, str]]) -> str:
         """Generate a unique cache key for the query and conversation context."""
@@ -65,122 +149,758 @@ class QueryCache:
     def get(self, query: str, chat_history: List[Tuple[str, str]]) -> Optional[Tuple[str, List]]:
         """Get cached response if available and not expired."""
         key = self._generate_key(query, chat_history)
+        shard = self._shards[self._shard_index(key)]
+        result = None
+        expired = False
 
-        with self._lock:
-            if key in self.cache:
-                entry = self.cache[key]
-                if time.time() - entry['timestamp'] < self.ttl_seconds:
-                    return entry['answer'], entry['sources']
+        with shard.lock:
+            entry = shard.entries.get(key)
+            if entry is not None:
+                if time.time() < entry["expires_at"]:
+                    shard.entries.move_to_end(key)
+                    shard.hits += 1
+                    result = entry["answer"], entry["sources"]
                 else:
-                    # Expired, remove it
-                    del self.cache[key]
+                    # Expired, remove it (its heap item is skipped later)
+                    del shard.entries[key]
+                    shard.expirations += 1
+                    expired = True
+            if result is None:
+                shard.misses += 1
 
-        return None
+        if METRICS_ENABLED:
+            if result is not None:
+                rag_cache_hits_total.labels(cache_type="exact").inc()
+            else:
+                rag_cache_misses_total.labels(cache_type="exact").inc()
+                if expired:
+                    query_cache_evictions_total.labels(reason="expired").inc()
+        return result
 
     def set(self, query: str, chat_history: List[Tuple[str, str]], answer: str, sources: List) -> None:
         """Cache a query response."""
         key = self._generate_key(query, chat_history)
+        index = self._shard_index(key)
+        shard = self._shards[index]
+        capacity = self._shard_capacity[index]
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        evicted = 0
 
-        with self._lock:
-            # Remove oldest entries if cache is full
-            if len(self.cache) >= self.max_size:
-                oldest_key = min(self.cache.keys(), key=lambda k: self.cache[k]['timestamp'])
-                del self.cache[oldest_key]
+        with shard.lock:
+            expired = self._purge_expired(shard, now)
 
-            self.cache[key] = {
+            shard.entries[key] = {
                 'answer': answer,
-                'sources': sources,
-                'timestamp': time.time(),
+                # EncodedSources memoises the SSE encoding so repeated hits reuse it
+                'sources': EncodedSources(sources),
+                'timestamp': now,
+                'expires_at': expires_at,
                 'query': query
             }
+            shard.entries.move_to_end(key)
+            heapq.heappush(shard.expiry_heap, (expires_at, key))
+
+            # LRU eviction when the shard is full
+            while len(shard.entries) > capacity:
+                shard.entries.popitem(last=False)
+                evicted += 1
+            shard.evictions += evicted
+
+            # Re-set and evicted keys leave stale heap items; rebuild once they dominate
+            if len(shard.expiry_heap) > 2 * len(shard.entries) + 64:
+                shard.expiry_heap = [(e["expires_at"], k) for k, e in shard.entries.items()]
+                heapq.heapify(shard.expiry_heap)
+
+        if METRICS_ENABLED:
+            if evicted:
+                query_cache_evictions_total.labels(reason="capacity").inc(evicted)
+            if expired:
+                query_cache_evictions_total.labels(reason="expired").inc(expired)
 
     def clear(self) -> None:
         """Clear all cached entries."""
-        with self._lock:
-            self.cache.clear()
+        for shard in self._shards:
+            with shard.lock:
+                shard.entries.clear()
+                shard.expiry_heap.clear()
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) for shard in self._shards)
 
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        with self._lock:
-            return {
-                'size': len(self.cache),
-                'max_size': self.max_size,
-                'hit_rate': 0  # Would need to track hits/misses for this
-            }
+        size = hits = misses = evictions = expirations = 0
+        for shard in self._shards:
+            with shard.lock:
+                size += len(shard.entries)
+                hits += shard.hits
+                misses += shard.misses
+                evictions += shard.evictions
+                expirations += shard.expirations
+        lookups = hits + misses
+        return {
+            'size': size,
+            'max_size': self.max_size,
+            'shards': len(self._shards),
+            'hits': hits,
+            'misses': misses,
+            'evictions': evictions,
+            'expirations': expirations,
+            'hit_rate': hits / lookups if lookups else 0.0
+        }
+
+
+class SharedQueryCache:
+    """
+    Two-tier exact-match cache: this worker's QueryCache (L1) in front of a
+    Redis L2 shared by all backend workers.
+
+    L2 entries are keyed by the same QueryCache._generate_key hash under a
+    generation number, and hold zlib-compressed JSON (base64-encoded, since
+    the shared Redis client decodes responses). invalidate_all() bumps the
+    generation with INCR, which orphans every L2 entry at once (they expire by
+    TTL), and publishes the new generation so each worker clears its L1.
+    Workers that miss a message notice the new generation within
+    QUERY_CACHE_VERSION_CHECK_SECONDS.
+
+    get/set only touch L1; aget/aset go through both tiers. Redis errors
+    degrade to L1-only behaviour.
+    """
+
+    VERSION_KEY = "query_cache:version"
+    KEY_PREFIX = "query_cache:entry"
+
+    def __init__(
+        self,
+        l1: QueryCache,
+        ttl_seconds: Optional[int] = None,
+        enabled: Optional[bool] = None,
+        channel: Optional[str] = None,
+    ):
+        self.l1 = l1
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else QUERY_CACHE_L2_TTL_SECONDS
+        self.enabled = QUERY_CACHE_L2_ENABLED if enabled is None else enabled
+        self.channel = channel or QUERY_CACHE_INVALIDATION_CHANNEL
+        self._redis_client = None
+        self._version: Optional[int] = None
+        self._version_checked_at = 0.0
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.l2_errors = 0
+        self.invalidations = 0
+
+    async def _get_redis_client(self):
+        """Get Redis client instance (None when L2 is disabled or unavailable)."""
+        if not self.enabled:
+            return None
+        if self._redis_client is None:
+            try:
+                from backend.redis_client import get_redis_client
+                self._redis_client = await get_redis_client()
+            except Exception as e:
+                logger.warning(f"Failed to get Redis client for query cache L2: {e}")
+                return None
+        return self._redis_client
+
+    def _entry_key(self, version: int, key: str) -> str:
+        return f"{self.KEY_PREFIX}:{version}:{key}"
+
+    @staticmethod
+    def _encode(answer: str, sources: List) -> str:
+        payload = {
+            "answer": answer,
+            "sources": [
+                {"page_content": doc.page_content, "metadata": doc.metadata}
+                if isinstance(doc, Document) else doc
+                for doc in sources
+            ],
+        }
+        raw = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+        return base64.b64encode(zlib.compress(raw)).decode("ascii")
+
+    @staticmethod
+    def _decode(value: Any) -> Tuple[str, List[Document]]:
+        if isinstance(value, str):
+            value = value.encode("ascii")
+        payload = json.loads(zlib.decompress(base64.b64decode(value)))
+        sources = [
+            Document(page_content=doc.get("page_content", ""), metadata=doc.get("metadata", {}))
+            for doc in payload.get("sources", [])
+        ]
+        return payload.get("answer", ""), sources
+
+    def _apply_version(self, version: int, source: str = "remote") -> bool:
+        """Adopt an L2 generation; a new one clears L1. Returns True if it changed."""
+        self._version_checked_at = time.monotonic()
+        if version == self._version:
+            return False
+        first_seen = self._version is None
+        self._version = version
+        if first_seen:
+            return False
+        self.l1.clear()
+        self.invalidations += 1
+        if METRICS_ENABLED:
+            query_cache_invalidations_total.labels(source=source).inc()
+        return True
+
+    async def _current_version(self, redis_client) -> int:
+        if self._version is None or time.monotonic() - self._version_checked_at > QUERY_CACHE_VERSION_CHECK_SECONDS:
+            self._apply_version(int(await redis_client.get(self.VERSION_KEY) or 0))
+        return self._version
+
+    def get(self, query: str, chat_history: List[Tuple[str, str]]) -> Optional[Tuple[str, List]]:
+        """L1-only lookup."""
+        return self.l1.get(query, chat_history)
+
+    def set(self, query: str, chat_history: List[Tuple[str, str]], answer: str, sources: List) -> None:
+        """L1-only store."""
+        self.l1.set(query, chat_history, answer, sources)
+
+    async def aget(self, query: str, chat_history: List[Tuple[str, str]]) -> Optional[Tuple[str, List]]:
+        """Look up L1, then L2; an L2 hit is copied into L1."""
+        cached = self.l1.get(query, chat_history)
+        if cached is not None:
+            return cached
+        redis_client = await self._get_redis_client()
+        if redis_client is None:
+            return None
+
+        key = self.l1._generate_key(query, chat_history)
+        start = time.perf_counter()
+        try:
+            version = await self._current_version(redis_client)
+            value = await redis_client.get(self._entry_key(version, key))
+            result = self._decode(value) if value is not None else None
+        except Exception as e:
+            self.l2_errors += 1
+            logger.warning(f"Error getting from query cache L2: {e}")
+            return None
+
+        if METRICS_ENABLED:
+            query_cache_l2_lookup_seconds.observe(time.perf_counter() - start)
+        if result is None:
+            self.l2_misses += 1
+            if METRICS_ENABLED:
+                rag_cache_misses_total.labels(cache_type="exact_l2").inc()
+            return None
+
+        self.l2_hits += 1
+        if METRICS_ENABLED:
+            rag_cache_hits_total.labels(cache_type="exact_l2").inc()
+        answer, sources = result
+        # Skip the L1 copy if an invalidation arrived while Redis was being read
+        if version == self._version:
+            self.l1.set(query, chat_history, answer, sources)
+        return answer, EncodedSources(sources)
+
+    async def aset(self, query: str, chat_history: List[Tuple[str, str]], answer: str, sources: List) -> None:
+        """Write through to L1 and L2."""
+        self.l1.set(query, chat_history, answer, sources)
+        redis_client = await self._get_redis_client()
+        if redis_client is None:
+            return
+
+        key = self.l1._generate_key(query, chat_history)
+        try:
+            value = self._encode(answer, sources)
+            version = await self._current_version(redis_client)
+            await redis_client.setex(self._entry_key(version, key), self.ttl_seconds, value)
+        except Exception as e:
+            self.l2_errors += 1
+            logger.warning(f"Error setting query cache L2: {e}")
+
+    async def invalidate_all(self) -> Optional[int]:
+        """
+        Drop cached answers on every worker.
+
+        Returns:
+            The new L2 generation, or None if Redis is unavailable (L1 is still cleared)
+        """
+        self.l1.clear()
+        redis_client = await self._get_redis_client()
+        if redis_client is None:
+            return None
+        try:
+            version = int(await redis_client.incr(self.VERSION_KEY))
+            await redis_client.publish(self.channel, str(version))
+        except Exception as e:
+            self.l2_errors += 1
+            logger.warning(f"Error invalidating query cache L2: {e}")
+            return None
+        self._version = version
+        self._version_checked_at = time.monotonic()
+        self.invalidations += 1
+        if METRICS_ENABLED:
+            query_cache_invalidations_total.labels(source="local").inc()
+        return version
+
+    def _on_invalidation_message(self, data: Any) -> None:
+        try:
+            version = int(data)
+        except (TypeError, ValueError):
+            logger.warning(f"Ignoring malformed query cache invalidation message: {data!r}")
+            return
+        if self._apply_version(version):
+            logger.info(f"Query cache invalidated by another worker (generation {version})")
+
+    async def listen_for_invalidations(self, poll_seconds: float = 1.0) -> None:
+        """Clear L1 when another worker publishes an invalidation; runs until cancelled."""
+        while True:
+            pubsub = None
+            try:
+                redis_client = await self._get_redis_client()
+                if redis_client is None:
+                    return
+                pubsub = redis_client.pubsub()
+                await pubsub.subscribe(self.channel)
+                # Catch up on invalidations published while not subscribed
+                self._apply_version(int(await redis_client.get(self.VERSION_KEY) or 0))
+                logger.info(f"Listening for query cache invalidations on '{self.channel}'")
+                while True:
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=poll_seconds)
+                    if message and message.get("type") == "message":
+                        self._on_invalidation_message(message.get("data"))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Query cache invalidation listener error, retrying in 5s: {e}")
+                await asyncio.sleep(5)
+            finally:
+                if pubsub is not None:
+                    try:
+                        await pubsub.aclose()
+                    except Exception:
+                        pass
+
+    def clear(self) -> None:
+        """Clear this worker's L1 (use invalidate_all() to drop answers everywhere)."""
+        self.l1.clear()
+
+    def __len__(self) -> int:
+        return len(self.l1)
+
+    def stats(self) -> Dict[str, Any]:
+        """L1 statistics plus L2 counters."""
+        stats = self.l1.stats()
+        l2_lookups = self.l2_hits + self.l2_misses
+        stats.update({
+            'l2_enabled': self.enabled,
+            'l2_hits': self.l2_hits,
+            'l2_misses': self.l2_misses,
+            'l2_errors': self.l2_errors,
+            'l2_hit_rate': self.l2_hits / l2_lookups if l2_lookups else 0.0,
+            'invalidations': self.invalidations,
+            'generation': self._version,
+        })
+        return stats
 
 
 class EmbeddingCache:
     """
-    Cache for query embeddings to reduce API calls for similar queries.
+    Content-hash keyed embedding store: text -> vector without re-embedding.
+
+    - Memory tier: a true LRU (OrderedDict of key -> row) over a preallocated
+      (max_size x dim) float32 matrix; an eviction hands its row to the new
+      entry, so get/set are O(1) and nothing is rebuilt.
+    - Disk tier (optional, persist_dir): append-only segments, each a .npy
+      matrix plus a JSON list of its keys, memory-mapped on load. Ingest reruns
+      find unchanged chunks there instead of re-embedding them.
+    - get_many() returns per-text vectors plus a hit mask, so the misses can be
+      embedded in one batch and stored back with set_many().
+    - get_similar() keeps the query-side fuzzy fallback: Jaccard word overlap,
+      computed for every entry at once over hashed word bitsets.
+    - Entries may carry a JSON-serializable extra (e.g. the sparse half of a
+      hybrid embedding), set with set_many(extras=...) and read back with
+      get_many_with_extras(); extras are persisted in the segment's keys file.
+
+    Keys are blake2b(namespace + text); pass the embedding model as namespace so
+    a model change never serves vectors from another model.
     """
 
-    def __init__(self, max_size: int = 500, similarity_threshold: float = 0.95):
-        self.cache: Dict[str, np.ndarray] = {}
-        self.query_map: Dict[str, str] = {}  # query -> cache_key
+    BITSET_BITS = 256
+    SEGMENT_PREFIX = "embeddings-"
+
+    def __init__(
+        self,
+        max_size: int = 500,
+        similarity_threshold: float = 0.7,
+        persist_dir: Optional[str] = None,
+        flush_every: int = 512,
+        max_segments: int = 16,
+    ):
         self.max_size = max_size
+        # Minimum word-overlap (Jaccard) for get_similar()
         self.similarity_threshold = similarity_threshold
+        self.persist_dir = persist_dir
+        self.flush_every = flush_every
+        self.max_segments = max_segments
         self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
 
-    def _normalize_query(self, query: str) -> str:
-        """Normalize query for better caching."""
-        return query.strip().lower()
+        # Memory tier; the matrix is allocated on first set(), once the dimension is known
+        self._rows: "OrderedDict[str, int]" = OrderedDict()
+        self._vectors: Optional[np.ndarray] = None
+        self._bitsets = np.zeros((max_size, self.BITSET_BITS // 8), dtype=np.uint8)
+        self._used = np.zeros(max_size, dtype=bool)
+        self._free_rows: List[int] = list(range(max_size - 1, -1, -1))
+
+        # Disk tier: key -> (segment, row); vectors set since the last flush
+        self._segments: List[Tuple[str, np.ndarray]] = []
+        self._disk: Dict[str, Tuple[int, int]] = {}
+        self._pending: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        # Extras of entries in the memory tier / pending writes / disk segments
+        self._extras: Dict[str, Any] = {}
+        self._pending_extras: Dict[str, Any] = {}
+        self._disk_extras: Dict[str, Any] = {}
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if persist_dir:
+            self.load()
 
-    def _cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
-        """Calculate cosine similarity between two vectors."""
-        return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b))
+    @staticmethod
+    def key(text: str, namespace: str = "") -> str:
+        """Content hash of a text (under an embedding-model namespace)."""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(namespace.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.hexdigest()
 
-    def get_similar(self, query: str) -> Optional[np.ndarray]:
-        """Get cached embedding for a similar query if available."""
-        normalized_query = self._normalize_query(query)
+    @classmethod
+    def _word_bitset(cls, text: str) -> np.ndarray:
+        """Lowercased word set hashed into a fixed-size bitset (Jaccard via popcounts)."""
+        bits = np.zeros(cls.BITSET_BITS, dtype=bool)
+        for word in text.strip().lower().split():
+            bits[zlib.crc32(word.encode("utf-8")) % cls.BITSET_BITS] = True
+        return np.packbits(bits)
+
+    def _lookup(self, key: str) -> Optional[np.ndarray]:
+        """Memory tier, then pending writes, then disk (promoted into memory). Caller holds the lock."""
+        row = self._rows.get(key)
+        if row is not None:
+            self._rows.move_to_end(key)
+            self.hits += 1
+            return self._vectors[row].copy()
+
+        vector = self._pending.get(key)
+        if vector is None:
+            location = self._disk.get(key)
+            if location is None:
+                self.misses += 1
+                return None
+            segment, row = location
+            vector = np.array(self._segments[segment][1][row], dtype=np.float32)
+            self.disk_hits += 1
+        else:
+            self.hits += 1
+        self._store(key, vector, None)
+        return vector.copy()
+
+    def _store(self, key: str, vector: np.ndarray, text: Optional[str]) -> None:
+        """Put a vector into the memory tier (evicting the LRU entry when full). Caller holds the lock."""
+        if self.max_size <= 0:
+            return
+        if self._vectors is None or self._vectors.shape[1] != vector.shape[0]:
+            if self._vectors is not None:
+                logger.warning(
+                    "Embedding dimension changed (%s -> %s); clearing the in-memory embedding cache",
+                    self._vectors.shape[1], vector.shape[0],
+                )
+                self._reset_memory()
+            self._vectors = np.zeros((self.max_size, vector.shape[0]), dtype=np.float32)
 
+        row = self._rows.get(key)
+        if row is None:
+            if not self._free_rows:
+                evicted, freed = self._rows.popitem(last=False)
+                self._extras.pop(evicted, None)
+                self._free_rows.append(freed)
+            row = self._free_rows.pop()
+            self._rows[key] = row
+            self._bitsets[row] = 0
+        else:
+            self._rows.move_to_end(key)
+        self._vectors[row] = vector
+        self._used[row] = True
+        if text is not None:
+            self._bitsets[row] = self._word_bitset(text)
+
+    def _reset_memory(self) -> None:
+        self._rows.clear()
+        self._extras.clear()
+        self._vectors = None
+        self._bitsets[:] = 0
+        self._used[:] = False
+        self._free_rows = list(range(self.max_size - 1, -1, -1))
+
+    def get(self, text: str, namespace: str = "") -> Optional[np.ndarray]:
+        """Exact (content-hash) lookup."""
+        with self._lock:
+            return self._lookup(self.key(text, namespace))
+
+    def get_many(self, texts: List[str], namespace: str = "") -> Tuple[List[Optional[np.ndarray]], np.ndarray]:
+        """
+        Exact lookup for a batch of texts.
+
+        Returns:
+            (vectors, hits): one vector or None per text, and a boolean hit mask
+            (embed texts[~hits] in one batch, then set_many() them)
+        """
+        keys = [self.key(text, namespace) for text in texts]
+        with self._lock:
+            vectors = [self._lookup(key) for key in keys]
+        return vectors, np.array([vector is not None for vector in vectors], dtype=bool)
+
+    _NO_EXTRA = object()
+
+    def _lookup_extra(self, key: str) -> Any:
+        """Extra stored for a key, or _NO_EXTRA. Caller holds the lock."""
+        for store in (self._extras, self._pending_extras, self._disk_extras):
+            if key in store:
+                return store[key]
+        return self._NO_EXTRA
+
+    def get_many_with_extras(
+        self, texts: List[str], namespace: str = ""
+    ) -> Tuple[List[Optional[np.ndarray]], List[Any], np.ndarray]:
+        """
+        Exact lookup for entries stored with extras; an entry without one is a miss.
+
+        Returns:
+            (vectors, extras, hits), one element per text
+        """
+        keys = [self.key(text, namespace) for text in texts]
+        vectors: List[Optional[np.ndarray]] = []
+        extras: List[Any] = []
+        with self._lock:
+            for key in keys:
+                extra = self._lookup_extra(key)
+                if extra is self._NO_EXTRA:
+                    self.misses += 1
+                    vectors.append(None)
+                    extras.append(None)
+                    continue
+                vector = self._lookup(key)
+                vectors.append(vector)
+                extras.append(extra if vector is not None else None)
+        return vectors, extras, np.array([vector is not None for vector in vectors], dtype=bool)
+
+    def set(self, text: str, embedding: Any, namespace: str = "") -> None:
+        """Cache an embedding for a text."""
+        self.set_many([text], [embedding], namespace)
+
+    def set_many(
+        self, texts: List[str], embeddings: List[Any], namespace: str = "", extras: Optional[List[Any]] = None
+    ) -> None:
+        """
+        Cache embeddings for a batch of texts (queued for the next disk flush when persisting).
+
+        Args:
+            extras: Optional JSON-serializable value per text, stored with the vector
+        """
+        flush = False
         with self._lock:
-            # Check for exact match first
-            if normalized_query in self.query_map:
-                cache_key = self.query_map[normalized_query]
-                if cache_key in self.cache:
-                    return self.cache[cache_key]
-
-            # Check for similar queries
-            for cached_query, cache_key in self.query_map.items():
-                if cache_key in self.cache:
-                    # Simple heuristic: if queries share many words, check similarity
-                    query_words = set(normalized_query.split())
-                    cached_words = set(cached_query.split())
-                    overlap = len(query_words & cached_words) / len(query_words | cached_words)
-
-                    if overlap > 0.7:  # 70% word overlap
-                        return self.cache[cache_key]
+            for i, (text, embedding) in enumerate(zip(texts, embeddings)):
+                key = self.key(text, namespace)
+                vector = np.asarray(embedding, dtype=np.float32).ravel()
+                self._store(key, vector, text)
+                if extras is not None and key in self._rows:
+                    self._extras[key] = extras[i]
+                if self.persist_dir and (key not in self._disk or (extras is not None and key not in self._disk_extras)):
+                    self._pending[key] = vector
+                    if extras is not None:
+                        self._pending_extras[key] = extras[i]
+            flush = bool(self.persist_dir) and len(self._pending) >= self.flush_every
+        if flush:
+            try:
+                self.flush()
+            except OSError as e:
+                logger.warning("Failed to persist embedding cache: %s", e)
 
+    def get_similar(self, query: str, namespace: str = "") -> Optional[np.ndarray]:
+        """Exact hit, else the in-memory entry with the highest word overlap above the threshold."""
+        with self._lock:
+            vector = self._lookup(self.key(query, namespace))
+            if vector is not None or not self._rows:
+                return vector
+
+            query_bits = self._word_bitset(query)
+            # Jaccard over every row at once: |A & B| / |A | B| via popcounts
+            inter = np.unpackbits(self._bitsets & query_bits, axis=1).sum(axis=1)
+            union = np.unpackbits(self._bitsets | query_bits, axis=1).sum(axis=1)
+            overlap = np.where(self._used & (union > 0), inter / np.maximum(union, 1), 0.0)
+            best = int(overlap.argmax())
+            if overlap[best] > self.similarity_threshold:
+                return self._vectors[best].copy()
         return None
 
-    def set(self, query: str, embedding: np.ndarray) -> None:
-        """Cache an embedding for a query."""
-        normalized_query = self._normalize_query(query)
-        cache_key = hashlib.md5(normalized_query.encode()).hexdigest()
+    def _segment_paths(self) -> List[Tuple[str, str]]:
+        names = sorted(
+            name for name in os.listdir(self.persist_dir)
+            if name.startswith(self.SEGMENT_PREFIX) and name.endswith(".json")
+        )
+        return [
+            (os.path.join(self.persist_dir, name), os.path.join(self.persist_dir, name[: -len(".json")] + ".npy"))
+            for name in names
+        ]
 
+    def load(self) -> int:
+        """Memory-map the persisted segments (later segments win). Returns the vectors available on disk."""
+        if not self.persist_dir:
+            return 0
+        os.makedirs(self.persist_dir, exist_ok=True)
+        segments, disk, disk_extras = [], {}, {}
+        for keys_path, vectors_path in self._segment_paths():
+            try:
+                with open(keys_path) as f:
+                    meta = json.load(f)
+                keys = meta["keys"]
+                vectors = np.load(vectors_path, mmap_mode="r")
+                if len(vectors) != len(keys):
+                    raise ValueError(f"{len(vectors)} vectors for {len(keys)} keys")
+            except Exception as e:
+                logger.warning("Skipping unreadable embedding cache segment %s: %s", keys_path, e)
+                continue
+            segment = len(segments)
+            segments.append((keys_path, vectors))
+            disk.update((key, (segment, row)) for row, key in enumerate(keys))
+            # A later segment without an extra for a key supersedes the earlier extra
+            for key in keys:
+                disk_extras.pop(key, None)
+            disk_extras.update(meta.get("extras") or {})
+        with self._lock:
+            self._segments, self._disk, self._disk_extras = segments, disk, disk_extras
+        logger.info("Embedding cache: %s vectors in %s segment(s) at %s", len(disk), len(segments), self.persist_dir)
+        return len(disk)
+
+    def _write_segment(self, keys: List[str], vectors: np.ndarray, extras: Optional[Dict[str, Any]] = None) -> str:
+        """Write a segment; its keys file is written last, so a partial segment is never loaded."""
+        stamp = time.time_ns()
+        while os.path.exists(os.path.join(self.persist_dir, f"{self.SEGMENT_PREFIX}{stamp:020d}.npy")):
+            stamp += 1
+        name = f"{self.SEGMENT_PREFIX}{stamp:020d}"
+        vectors_path = os.path.join(self.persist_dir, name + ".npy")
+        keys_path = os.path.join(self.persist_dir, name + ".json")
+        with open(vectors_path + ".tmp", "wb") as f:
+            np.save(f, vectors)
+        os.replace(vectors_path + ".tmp", vectors_path)
+        with open(keys_path + ".tmp", "w") as f:
+            meta = {"dim": int(vectors.shape[1]), "keys": keys}
+            if extras:
+                meta["extras"] = extras
+            json.dump(meta, f)
+        os.replace(keys_path + ".tmp", keys_path)
+        return keys_path
+
+    def flush(self) -> int:
+        """Persist vectors set since the last flush as a new segment. Returns vectors written."""
+        if not self.persist_dir:
+            return 0
+        with self._flush_lock:
+            return self._flush()
+
+    def _flush(self) -> int:
+        with self._lock:
+            pending = list(self._pending.items())
+            pending_extras = dict(self._pending_extras)
+        if not pending:
+            return 0
+
+        os.makedirs(self.persist_dir, exist_ok=True)
+        # One segment per dimension (a model change mid-run)
+        by_dim: Dict[int, List[Tuple[str, np.ndarray]]] = {}
+        for key, vector in pending:
+            by_dim.setdefault(vector.shape[0], []).append((key, vector))
+        for items in by_dim.values():
+            keys = [key for key, _ in items]
+            self._write_segment(
+                keys,
+                np.stack([vector for _, vector in items]),
+                {key: pending_extras[key] for key in keys if key in pending_extras},
+            )
+
+        if len(self._segment_paths()) > self.max_segments:
+            self._compact()
+        self.load()
+        # Written keys now resolve from disk; drop them only after load() so lookups never miss them
         with self._lock:
-            # Remove oldest entries if cache is full
-            if len(self.cache) >= self.max_size:
-                # Remove a random entry (simple LRU approximation)
-                oldest_key = next(iter(self.cache))
-                del self.cache[oldest_key]
-                # Clean up query_map
-                self.query_map = {q: k for q, k in self.query_map.items() if k != oldest_key}
+            for key, vector in pending:
+                if self._pending.get(key) is vector:
+                    del self._pending[key]
+                    self._pending_extras.pop(key, None)
+        return len(pending)
 
-            self.cache[cache_key] = embedding
-            self.query_map[normalized_query] = cache_key
+    def _compact(self) -> None:
+        """Merge all segments (per dimension) into one, dropping keys superseded by later segments."""
+        latest: Dict[str, Tuple[np.ndarray, int]] = {}
+        extras: Dict[str, Any] = {}
+        paths = self._segment_paths()
+        for keys_path, vectors_path in paths:
+            with open(keys_path) as f:
+                meta = json.load(f)
+            vectors = np.load(vectors_path, mmap_mode="r")
+            segment_extras = meta.get("extras") or {}
+            for row, key in enumerate(meta["keys"]):
+                latest[key] = (vectors, row)
+                extras.pop(key, None)
+            extras.update(segment_extras)
+
+        by_dim: Dict[int, List[str]] = {}
+        for key, (vectors, _row) in latest.items():
+            by_dim.setdefault(vectors.shape[1], []).append(key)
+        for keys in by_dim.values():
+            self._write_segment(
+                keys,
+                np.stack([latest[key][0][latest[key][1]] for key in keys]),
+                {key: extras[key] for key in keys if key in extras},
+            )
+
+        for keys_path, vectors_path in paths:
+            # Keys first: a crash in between leaves an orphan .npy, never a dangling keys file
+            os.remove(keys_path)
+            os.remove(vectors_path)
+        logger.info("Compacted %s embedding cache segments into %s", len(paths), len(by_dim))
 
     def clear(self) -> None:
-        """Clear all cached embeddings."""
+        """Clear all cached embeddings (in memory; persisted segments are kept)."""
         with self._lock:
-            self.cache.clear()
-            self.query_map.clear()
+            self._reset_memory()
+            self._pending.clear()
+            self._pending_extras.clear()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "size": len(self._rows),
+                "max_size": self.max_size,
+                "disk_entries": len(self._disk),
+                "disk_segments": len(self._segments),
+                "pending": len(self._pending),
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
 
 
 class SemanticCache:
     """
     Semantic cache that stores (query → answer + sources) using embedding similarity.
     Reuses the embedding model from VectorStoreManager for consistency with the vector store.
+
+    Entries live in a preallocated (max_size x dim) float32 matrix of L2-normalized
+    query vectors, filled as a ring buffer (the next write overwrites the oldest
+    entry). A lookup is one mat-vec + argmax; expiry is a mask over a parallel
+    timestamp array, so nothing is rebuilt per get/set.
     """
     
     def __init__(self, 
@@ -193,17 +913,24 @@ class SemanticCache:
         self.max_size = max_size
         self.ttl_seconds = ttl_seconds
         
-        # Cache structure: list of dicts (we'll use LRU manually)
-        self.entries: List[Dict[str, Any]] = []
+        # Ring buffer: slot i holds _vectors[i] / _timestamps[i] / _payloads[i].
+        # The matrix is allocated on first set(), once the embedding dimension is known.
+        self._vectors: Optional[np.ndarray] = None
+        self._timestamps = np.full(max_size, -np.inf, dtype=np.float64)
+        self._payloads: List[Optional[Dict[str, Any]]] = [None] * max_size
+        self._next_slot = 0
+        self._filled = 0
         self._lock = threading.Lock()
         
         # In-memory cache for embeddings (avoid recomputing for same queries)
         self._embedding_cache: Dict[str, np.ndarray] = {}
         self._embedding_cache_max_size = 500
 
-    def _cosine_similarity(self, a: np.ndarray, b: np.ndarray) -> float:
-        """Calculate cosine similarity between two vectors using numpy."""
-        return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b) + 1e-10)
+    @staticmethod
+    def _unit(vec: np.ndarray) -> np.ndarray:
+        """L2-normalize so cosine similarity is a plain dot product."""
+        vec = np.asarray(vec, dtype=np.float32).ravel()
+        return vec / (np.linalg.norm(vec) + 1e-10)
 
     def _embed(self, text: str) -> np.ndarray:
         """Embed a single text with in-memory caching."""
@@ -265,23 +992,21 @@ class SemanticCache:
         normalized = self._normalize(query)
         search_text = self._build_search_text(normalized, chat_history or [])
         
-        query_vec = self._embed(search_text)
+        query_vec = self._unit(self._embed(search_text))
 
         with self._lock:
-            now = time.time()
             best_match = None
             best_score = 0.0
 
-            # Clean expired entries first
-            self.entries = [e for e in self.entries if now - e["timestamp"] < self.ttl_seconds]
-
-            for entry in self.entries:
-                entry_vec = entry["query_vec"]
-                sim = self._cosine_similarity(query_vec, entry_vec)
-                
-                if sim > best_score and sim >= self.threshold:
-                    best_score = sim
-                    best_match = entry
+            filled = self._filled
+            if filled and self._vectors is not None and self._vectors.shape[1] == query_vec.shape[0]:
+                # Top-1 over all live slots with a single mat-vec; expired slots are masked out
+                sims = self._vectors[:filled] @ query_vec
+                sims[self._timestamps[:filled] <= time.time() - self.ttl_seconds] = -np.inf
+                best = int(np.argmax(sims))
+                if sims[best] >= self.threshold:
+                    best_score = float(sims[best])
+                    best_match = self._payloads[best]
 
             if best_match:
                 logger.debug(f"Semantic cache HIT: similarity={best_score:.3f} for query: {query[:50]}...")
@@ -303,27 +1028,33 @@ class SemanticCache:
         """Cache the result with embedding."""
         normalized = self._normalize(query)
         search_text = self._build_search_text(normalized, chat_history or [])
-        query_vec = self._embed(search_text)
+        query_vec = self._unit(self._embed(search_text))
 
         with self._lock:
-            # Clean expired entries before adding
-            now = time.time()
-            self.entries = [e for e in self.entries if now - e["timestamp"] < self.ttl_seconds]
-            
-            # LRU eviction: remove oldest entries if cache is full
-            if len(self.entries) >= self.max_size:
-                # Sort by timestamp and keep newest half
-                self.entries.sort(key=lambda x: x["timestamp"])
-                self.entries = self.entries[-self.max_size//2:]
+            if self._vectors is None or self._vectors.shape[1] != query_vec.shape[0]:
+                # First entry (or embedding model changed): (re)allocate the matrix
+                self._vectors = np.zeros((self.max_size, query_vec.shape[0]), dtype=np.float32)
+                self._reset_slots()
 
-            self.entries.append({
+            # Ring buffer: overwrite the oldest slot (TTL is uniform, so it also expires first)
+            slot = self._next_slot
+            self._vectors[slot] = query_vec
+            self._timestamps[slot] = time.time()
+            self._payloads[slot] = {
                 "query": normalized,
-                "query_vec": query_vec,
                 "answer": answer,
-                "sources": sources,
-                "timestamp": time.time(),
+                "sources": EncodedSources(sources),
                 "search_text": search_text
-            })
+            }
+            self._next_slot = (slot + 1) % self.max_size
+            self._filled = max(self._filled, slot + 1)
+
+    def _reset_slots(self) -> None:
+        """Mark every slot empty. Caller must hold the lock."""
+        self._timestamps.fill(-np.inf)
+        self._payloads = [None] * self.max_size
+        self._next_slot = 0
+        self._filled = 0
 
     def _build_search_text(self, query: str, chat_history: List[Tuple[str, str]]) -> str:
         """
@@ -342,17 +1073,16 @@ class SemanticCache:
     def clear(self):
         """Clear all cached entries."""
         with self._lock:
-            self.entries.clear()
+            self._reset_slots()
             self._embedding_cache.clear()
 
     def stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
         with self._lock:
-            now = time.time()
-            valid = [e for e in self.entries if now - e["timestamp"] < self.ttl_seconds]
+            timestamps = self._timestamps[:self._filled]
             return {
-                "size": len(valid),
-                "total": len(self.entries),
+                "size": int(np.count_nonzero(timestamps > time.time() - self.ttl_seconds)),
+                "total": self._filled,
                 "threshold": self.threshold,
                 "ttl_seconds": self.ttl_seconds,
                 "max_size": self.max_size
@@ -361,19 +1091,46 @@ class SemanticCache:
 
 class SuggestedQuestionCache:
     """
-    Redis-based cache for suggested question responses with 24-hour TTL.
+    Redis-based cache for suggested question responses (stale-while-revalidate).
     This is an ADDITIONAL cache layer on top of the existing QueryCache.
+
+    Entries hold the answer and the content-addressed ids of its sources; the
+    chunks themselves live once in the shared chunk store (services.chunk_store).
+    Entries written before that (inline "sources") are still readable.
+
+    Each entry has two lifetimes:
+    - soft TTL (ttl_seconds): after it the entry is stale. get() still returns
+      it immediately and schedules a background regeneration via the refresher
+      registered with set_refresher().
+    - hard TTL (hard_ttl_seconds): the Redis expiry; past it the entry is a miss.
+    Regenerations (background and refresh()) share one semaphore of
+    refresh_concurrency slots, and a short Redis lock keeps workers from
+    regenerating the same stale entry at once.
     """
     
-    def __init__(self, ttl_seconds: int = 86400):
+    def __init__(
+        self,
+        ttl_seconds: Optional[int] = None,
+        hard_ttl_seconds: Optional[int] = None,
+        refresh_concurrency: Optional[int] = None,
+    ):
         """
         Initialize the Suggested Question Cache.
         
         Args:
-            ttl_seconds: Time-to-live in seconds (default: 86400 = 24 hours)
+            ttl_seconds: Soft TTL in seconds (default: SUGGESTED_QUESTION_CACHE_TTL = 24 hours)
+            hard_ttl_seconds: Redis expiry in seconds (default: SUGGESTED_QUESTION_CACHE_HARD_TTL = 72 hours)
+            refresh_concurrency: Concurrent regenerations (default: SUGGESTED_QUESTION_REFRESH_CONCURRENCY)
         """
-        self.ttl_seconds = ttl_seconds
+        self.ttl_seconds = ttl_seconds or SUGGESTED_QUESTION_CACHE_TTL
+        self.hard_ttl_seconds = max(hard_ttl_seconds or SUGGESTED_QUESTION_CACHE_HARD_TTL, self.ttl_seconds)
+        self.refresh_concurrency = max(1, refresh_concurrency or SUGGESTED_QUESTION_REFRESH_CONCURRENCY)
         self._redis_client = None
+        self._chunk_client = None
+        self._refresher = None
+        self._refresh_semaphore = asyncio.Semaphore(self.refresh_concurrency)
+        self._refreshing: set = set()  # cache keys with a background refresh in this process
+        self._refresh_tasks: set = set()  # keeps background tasks referenced until they finish
     
     async def _get_redis_client(self):
         """Get Redis client instance."""
@@ -386,6 +1143,17 @@ class SuggestedQuestionCache:
                 return None
         return self._redis_client
     
+    async def _get_chunk_client(self):
+        """Get the binary Redis client used for chunk store payloads."""
+        if self._chunk_client is None:
+            try:
+                from backend.redis_client import get_binary_redis_client
+                self._chunk_client = await get_binary_redis_client()
+            except Exception as e:
+                logger.warning(f"Failed to get binary Redis client: {e}")
+                return None
+        return self._chunk_client
+    
     def _normalize_question(self, question: str) -> str:
         """
         Normalize question text for consistent cache keys.
@@ -492,6 +1260,9 @@ class SuggestedQuestionCache:
         """
         Get cached response for a question.
         
+        A stale entry (older than the soft TTL) is still returned; a background
+        refresh is scheduled for it when a refresher is registered.
+        
         Args:
             question: The question text
             
@@ -512,10 +1283,34 @@ class SuggestedQuestionCache:
             # Parse JSON data
             data = json.loads(cached_data)
             answer = data.get("answer", "")
+            
+            if self._is_stale(data):
+                if METRICS_ENABLED:
+                    suggested_question_cache_stale_hits_total.inc()
+                self._schedule_refresh(question)
+            
+            if "source_ids" in data:
+                chunk_client = await self._get_chunk_client()
+                if chunk_client is None:
+                    return None
+                from backend.services.chunk_store import chunk_store
+                docs = await chunk_store.get_many(chunk_client, data["source_ids"])
+                if any(doc is None for doc in docs):
+                    # A source chunk expired; treat as a miss so the answer is regenerated
+                    return None
+                return answer, EncodedSources(docs)
+            
             sources_data = data.get("sources", [])
             
-            # Deserialize sources back to Document objects
-            sources = [self._deserialize_document(doc_dict) for doc_dict in sources_data]
+            # Deserialize sources back to Document objects, attaching the
+            # pre-encoded SSE payload when the entry carries one
+            encoded = None
+            if data.get("sources_json") is not None:
+                encoded = (data["sources_json"].encode("utf-8"), int(data.get("sources_count", 0)))
+            sources = EncodedSources(
+                (self._deserialize_document(doc_dict) for doc_dict in sources_data),
+                encoded=encoded,
+            )
             
             return answer, sources
         except Exception as e:
@@ -542,18 +1337,31 @@ class SuggestedQuestionCache:
             # Serialize sources to dictionaries
             sources_data = [self._serialize_document(doc) for doc in sources]
             
-            # Create cache entry
             cache_entry = {
                 "answer": answer,
-                "sources": sources_data,
                 "question": question,
                 "cached_at": time.time()
             }
+            chunk_client = await self._get_chunk_client()
+            if chunk_client is not None:
+                # Sources are stored once in the chunk store; the entry only references them
+                from backend.services.chunk_store import chunk_store
+                cache_entry["source_ids"] = await chunk_store.put_many(chunk_client, sources_data)
+            else:
+                # Inline fallback; published sources pre-encoded once for the SSE sources event
+                sources_json, sources_count = encode_published_sources(
+                    self._deserialize_document(doc_dict) for doc_dict in sources_data
+                )
+                cache_entry.update({
+                    "sources": sources_data,
+                    "sources_json": sources_json.decode("utf-8"),
+                    "sources_count": sources_count,
+                })
             
-            # Store in Redis with TTL
+            # Store in Redis with the hard TTL; staleness is judged from cached_at
             await redis_client.setex(
                 key,
-                self.ttl_seconds,
+                self.hard_ttl_seconds,
                 json.dumps(cache_entry)
             )
         except Exception as e:
@@ -581,6 +1389,98 @@ class SuggestedQuestionCache:
             logger.warning(f"Error checking Suggested Question Cache: {e}")
             return False
     
+    async def is_fresh(self, question: str) -> bool:
+        """
+        Check if a question is cached and within its soft TTL.
+        
+        Args:
+            question: The question text
+            
+        Returns:
+            True if cached and not stale, False otherwise
+        """
+        redis_client = await self._get_redis_client()
+        if redis_client is None:
+            return False
+        
+        try:
+            key = f"suggested_question:{self._generate_key(question)}"
+            cached_data = await redis_client.get(key)
+            return cached_data is not None and not self._is_stale(json.loads(cached_data))
+        except Exception as e:
+            logger.warning(f"Error checking Suggested Question Cache: {e}")
+            return False
+    
+    def _is_stale(self, data: Dict[str, Any]) -> bool:
+        """Whether a parsed entry is past its soft TTL (entries without cached_at count as stale)."""
+        return time.time() - float(data.get("cached_at", 0)) >= self.ttl_seconds
+    
+    def set_refresher(self, refresher) -> None:
+        """
+        Register the coroutine function that regenerates an answer.
+        
+        Args:
+            refresher: async callable(question) -> (answer, sources), or None to skip caching
+        """
+        self._refresher = refresher
+    
+    async def refresh(self, question: str) -> bool:
+        """
+        Regenerate and store the answer for a question, waiting for a refresh slot.
+        
+        Args:
+            question: The question text
+            
+        Returns:
+            True if a new answer was cached, False if the refresher declined
+            
+        Raises:
+            RuntimeError: If no refresher is registered; refresher errors propagate
+        """
+        if self._refresher is None:
+            raise RuntimeError("SuggestedQuestionCache has no refresher registered")
+        async with self._refresh_semaphore:
+            result = await self._refresher(question)
+        if result is None:
+            return False
+        answer, sources = result
+        await self.set(question, answer, sources)
+        return True
+    
+    def _schedule_refresh(self, question: str) -> None:
+        """Start a background refresh unless one is already running for this question."""
+        if self._refresher is None:
+            return
+        cache_key = self._generate_key(question)
+        if cache_key in self._refreshing:
+            return
+        self._refreshing.add(cache_key)
+        task = asyncio.ensure_future(self._background_refresh(question, cache_key))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+    
+    async def _background_refresh(self, question: str, cache_key: str) -> None:
+        result = "error"
+        try:
+            redis_client = await self._get_redis_client()
+            if redis_client is not None:
+                # Cross-worker dedupe; left to expire so a failing question is retried at most once per lock period
+                acquired = await redis_client.set(
+                    f"suggested_question_refresh:{cache_key}", "1",
+                    nx=True, ex=SUGGESTED_QUESTION_REFRESH_LOCK_SECONDS,
+                )
+                if not acquired:
+                    result = "deduplicated"
+                    return
+            result = "refreshed" if await self.refresh(question) else "declined"
+            logger.info(f"Background refresh of stale suggested question ({result}): {question[:50]}...")
+        except Exception as e:
+            logger.warning(f"Background refresh of suggested question failed: {e}")
+        finally:
+            self._refreshing.discard(cache_key)
+            if METRICS_ENABLED:
+                suggested_question_cache_background_refreshes_total.labels(result=result).inc()
+    
     async def clear(self) -> None:
         """
         Clear all cached entries.
@@ -628,7 +1528,8 @@ class SuggestedQuestionCache:
 
 # Global cache instances
 query_cache = QueryCache()
-embedding_cache = EmbeddingCache()
+shared_query_cache = SharedQueryCache(query_cache)
+embedding_cache = EmbeddingCache(max_size=EMBEDDING_CACHE_MAX_SIZE, persist_dir=EMBEDDING_CACHE_DIR)
 suggested_question_cache = SuggestedQuestionCache()
 
 # Thread pool for async operations
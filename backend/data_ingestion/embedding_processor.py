@@ -423,16 +423,20 @@ async def process_payload_documents_with_faq(
     # Generate synthetic questions
     try:
         from backend.services.faq_generator import FAQGenerator
+        from backend.services.faq_question_cache import get_faq_question_cache
         
-        faq_generator = FAQGenerator()
+        # Unchanged chunks reuse their stored questions; only new or edited chunks reach the LLM
+        faq_generator = FAQGenerator(question_cache=get_faq_question_cache())
         all_docs, parent_chunks_map = await faq_generator.process_chunks_with_questions(base_chunks)
         
         # Note: parent_chunks_map is not returned here but is built from MongoDB at retrieval time
         # The synthetic questions include parent_chunk_id in metadata for resolution
         
+        stats = faq_generator.last_run_stats
         logger.info(
             f"FAQ generation complete: {len(base_chunks)} base chunks → "
-            f"{len(all_docs)} total docs ({len(all_docs) - len(base_chunks)} synthetic questions)"
+            f"{len(all_docs)} total docs ({len(all_docs) - len(base_chunks)} synthetic questions, "
+            f"question cache hit ratio {stats.get('cache_hit_ratio', 0.0):.0%})"
         )
         return all_docs
         
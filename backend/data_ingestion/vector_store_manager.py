@@ -1,7 +1,13 @@
 import os
+import sys
+import threading
+import time
 import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from typing import List, Dict, Any, Optional
-from pymongo import MongoClient, UpdateOne
+from pymongo import MongoClient, UpdateOne, InsertOne, DeleteMany
 import torch
 from langchain_core.documents import Document
 from langchain_community.vectorstores import FAISS
@@ -11,6 +17,9 @@ except ImportError:
     # Fallback to deprecated import for backward compatibility
     from langchain_community.embeddings import HuggingFaceEmbeddings
 from cache_utils import embedding_cache
+from backend.services.sparse_index import SparseVectorIndex, encode_sparse_for_mongo
+from backend.services.payload_vector_ids import PayloadVectorIds
+from backend.services.payload_upsert import patched_metadata, plan_payload_upsert
 import numpy as np
 
 logger = logging.getLogger(__name__)
@@ -106,6 +115,16 @@ def _set_faiss_rebuild_in_progress(value: bool):
     global _faiss_rebuild_in_progress
     _faiss_rebuild_in_progress = value
 
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes on Linux
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
 # Auto-detect Apple M1/M2/M3 GPU (Metal Performance Shaders)
 if torch.backends.mps.is_available():
     device = "mps"
@@ -250,6 +269,23 @@ class VectorStoreManager:
 
         # Check if we should use Infinity embeddings with 1024-dim index
         self.use_infinity = os.getenv("USE_INFINITY_EMBEDDINGS", "false").lower() == "true"
+
+        # Precomputed document sparse vectors for the sparse re-rank stage (Infinity mode).
+        # Loaded lazily from MongoDB via get_sparse_index() and maintained by add/delete.
+        self.sparse_vectors = SparseVectorIndex()
+
+        # Counters, docs/sec and peak RSS of the last _create_faiss_from_mongodb() rebuild
+        self.last_rebuild_stats: Dict[str, Any] = {}
+
+        # payload_id -> FAISS docstore ids, so webhook updates/deletes remove only the
+        # affected vectors instead of rebuilding FAISS (bound lazily to the current store)
+        self.payload_vector_ids = PayloadVectorIds()
+
+        # Held by every change to the writer store (FAISS index, docstore, payload_id table,
+        # sparse index, MongoDB chunks), by read snapshots and by reloads, so ingestion jobs
+        # in different threads never see each other's half-applied changes. Reentrant:
+        # writers call each other (e.g. delete -> remove_payload_vectors -> save).
+        self._write_lock = threading.RLock()
         
         if self.use_infinity:
             # Use 1024-dim index with placeholder embeddings
@@ -363,6 +399,9 @@ class VectorStoreManager:
     def _create_faiss_from_mongodb(self):
         """
         Creates FAISS vector store from existing MongoDB documents.
+
+        Streams MongoDB page by page (see _rebuild_faiss_from_mongodb_pages), so
+        memory stays bounded by the page size rather than the collection size.
         
         Uses a global lock to prevent thundering herd when multiple webhooks
         trigger simultaneously (e.g., bulk status changes in CMS).
@@ -395,179 +434,247 @@ class VectorStoreManager:
         logger.info("Acquired FAISS rebuild lock, starting index rebuild...")
         
         try:
-            # Load all documents from MongoDB.
-            # If embeddings are present, rebuild FAISS from stored embeddings (no re-embed).
-            # If embeddings are missing, optionally backfill them (guarded by env var).
-            mongo_docs = list(self.collection.find({}))
-
-            texts: List[str] = []
-            metadatas: List[Dict[str, Any]] = []
-            embeddings: List[List[float]] = []
-            missing_for_backfill: List[Dict[str, Any]] = []
-
-            for doc in mongo_docs:
-                text = doc.get("text", "") or ""
-                if not text:
-                    continue
-                metadata = doc.get("metadata", {}) or {}
-                emb = doc.get("embedding")
-                if isinstance(emb, list) and emb:
-                    texts.append(text)
-                    metadatas.append(metadata)
-                    embeddings.append(emb)
-                else:
-                    missing_for_backfill.append(
-                        {
-                            "_id": doc.get("_id"),
-                            "text": text,
-                            "metadata": metadata,
-                        }
-                    )
+            return self._rebuild_faiss_from_mongodb_pages()
+        finally:
+            # Always release the lock
+            _set_faiss_rebuild_in_progress(False)
+            rebuild_lock.release()
+            logger.info("Released FAISS rebuild lock")
 
-            if not texts and not missing_for_backfill:
-                logger.info("No documents in MongoDB, creating empty FAISS index")
-                return self._create_empty_faiss_index()
-
-            # Backfill missing embeddings if needed.
-            # If allow_backfill is false, we will still embed missing docs for this rebuild,
-            # but we won't persist them to MongoDB (so operators can choose to run backfill explicitly).
-            if missing_for_backfill:
-                allow_backfill = os.getenv("ALLOW_EMBEDDING_BACKFILL_ON_REBUILD", "false").lower() == "true"
-                backfill_batch_size = int(os.getenv("EMBEDDING_BACKFILL_BATCH_SIZE", "10"))
-
-                if allow_backfill:
-                    logger.info(
-                        "Backfilling %s MongoDB docs missing embeddings during rebuild (ALLOW_EMBEDDING_BACKFILL_ON_REBUILD=true)",
-                        len(missing_for_backfill),
-                    )
-                else:
-                    logger.warning(
-                        "Found %s MongoDB docs missing embeddings. "
-                        "Rebuild will embed them now, but will NOT persist. "
-                        "Set ALLOW_EMBEDDING_BACKFILL_ON_REBUILD=true or run a dedicated backfill script.",
-                        len(missing_for_backfill),
-                    )
+    def _iter_mongo_pages(self, page_size: int):
+        """
+        Yield MongoDB documents in pages of up to `page_size`, in _id order.
 
-                updates: List[UpdateOne] = []
+        Keyset pagination (_id > last seen) with a projection, so neither the
+        whole collection nor unused fields (sparse_embedding, ...) are held in memory.
+        """
+        projection = {"text": 1, "metadata": 1, "embedding": 1}
+        last_id = None
+        while True:
+            query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+            page = list(self.collection.find(query, projection).sort("_id", 1).limit(page_size))
+            if not page:
+                return
+            last_id = page[-1]["_id"]
+            yield page
+            if len(page) < page_size:
+                return
+
+    def _embed_backfill_batch(self, client, texts: List[str]):
+        """
+        Embed one batch of documents missing stored embeddings (runs on a worker thread).
 
-                if self.use_infinity:
-                    import httpx
+        Returns:
+            (dense embeddings, sparse embeddings or None per text, embedding model name)
+        """
+        if self.use_infinity:
+            dense, sparse = self._embed_with_infinity(client, texts)
+            return dense, sparse, os.getenv("EMBEDDING_MODEL_ID", "BAAI/bge-m3")
+        dense = self.get_cached_embeddings(texts)
+        return dense, [None] * len(dense), DEFAULT_EMBEDDING_MODEL
 
-                    infinity_url = os.getenv("INFINITY_URL", "http://localhost:7997")
-                    model_id = os.getenv("EMBEDDING_MODEL_ID", "BAAI/bge-m3")
+    def _rebuild_faiss_from_mongodb_pages(self):
+        """
+        Stream MongoDB into a new FAISS index (call with the rebuild lock held).
+
+        Documents with stored embeddings are added as their page arrives. Missing
+        embeddings are computed in batches of EMBEDDING_BACKFILL_BATCH_SIZE, with up
+        to EMBEDDING_BACKFILL_CONCURRENCY batches in flight on worker threads while
+        the next pages are read; finished batches are added in order (and persisted
+        to MongoDB when ALLOW_EMBEDDING_BACKFILL_ON_REBUILD=true). Throughput and
+        peak RSS are logged and kept in self.last_rebuild_stats.
+        """
+        allow_backfill = os.getenv("ALLOW_EMBEDDING_BACKFILL_ON_REBUILD", "false").lower() == "true"
+        backfill_batch_size = max(1, int(os.getenv("EMBEDDING_BACKFILL_BATCH_SIZE", "10")))
+        backfill_concurrency = max(1, int(os.getenv("EMBEDDING_BACKFILL_CONCURRENCY", "4")))
+        page_size = max(1, int(os.getenv("FAISS_REBUILD_PAGE_SIZE", "500")))
 
-                    with httpx.Client(timeout=120.0) as client:
-                        for i in range(0, len(missing_for_backfill), backfill_batch_size):
-                            batch_missing = missing_for_backfill[i : i + backfill_batch_size]
-                            batch_texts = [d["text"] for d in batch_missing]
+        started = time.perf_counter()
+        stats = {"documents": 0, "stored": 0, "embedded": 0, "persisted": 0, "pages": 0}
+        vector_store = None
 
-                            batch_num = i // backfill_batch_size + 1
-                            total_batches = (len(missing_for_backfill) + backfill_batch_size - 1) // backfill_batch_size
-                            logger.info(f"Embedding backfill batch {batch_num}/{total_batches} from MongoDB...")
+        def add_to_index(texts, embeddings, metadatas):
+            nonlocal vector_store
+            text_embeddings = list(zip(texts, embeddings))
+            if vector_store is None:
+                vector_store = FAISS.from_embeddings(
+                    text_embeddings=text_embeddings,
+                    embedding=self.embeddings,
+                    metadatas=metadatas,
+                )
+            else:
+                vector_store.add_embeddings(text_embeddings, metadatas=metadatas)
+            stats["documents"] += len(texts)
+
+        def finish_backfill_batch(future, rows):
+            dense, sparse, model = future.result()
+            embedding_dim = len(dense[0]) if dense else 0
+            metadatas = []
+            updates: List[UpdateOne] = []
+            for row, emb, sparse_emb in zip(rows, dense, sparse):
+                md = dict(row.get("metadata") or {})
+                md.setdefault("embedding_model", model)
+                if embedding_dim:
+                    md.setdefault("embedding_dim", embedding_dim)
+                metadatas.append(md)
+                if allow_backfill and row.get("_id") is not None:
+                    fields = {"embedding": emb, "metadata": md}
+                    stored_sparse = encode_sparse_for_mongo(sparse_emb)
+                    if stored_sparse:
+                        fields["sparse_embedding"] = stored_sparse
+                    updates.append(UpdateOne({"_id": row["_id"]}, {"$set": fields}))
+            add_to_index([row["text"] for row in rows], dense, metadatas)
+            stats["embedded"] += len(rows)
+            if updates:
+                try:
+                    self.collection.bulk_write(updates, ordered=False)
+                    stats["persisted"] += len(updates)
+                except Exception as e:
+                    logger.warning("Failed to persist backfilled embeddings to MongoDB: %s", e, exc_info=True)
+
+        with ExitStack() as stack:
+            client = None
+            if self.use_infinity:
+                import httpx
+                client = stack.enter_context(httpx.Client(timeout=120.0))
+            executor = stack.enter_context(ThreadPoolExecutor(max_workers=backfill_concurrency))
+            in_flight: deque = deque()  # (future, rows), oldest first
+            missing: List[Dict[str, Any]] = []
+            warned_missing = False
+
+            def submit_missing(force: bool = False):
+                nonlocal missing
+                while missing and (force or len(missing) >= backfill_batch_size):
+                    rows, missing = missing[:backfill_batch_size], missing[backfill_batch_size:]
+                    future = executor.submit(self._embed_backfill_batch, client, [row["text"] for row in rows])
+                    in_flight.append((future, rows))
+                    # Bound memory: wait for the oldest batch once the pipeline is full
+                    while len(in_flight) > backfill_concurrency:
+                        finish_backfill_batch(*in_flight.popleft())
+
+            for page in self._iter_mongo_pages(page_size):
+                stats["pages"] += 1
+                texts, embeddings, metadatas = [], [], []
+                for doc in page:
+                    text = doc.get("text", "") or ""
+                    if not text:
+                        continue
+                    metadata = doc.get("metadata", {}) or {}
+                    emb = doc.get("embedding")
+                    if isinstance(emb, list) and emb:
+                        texts.append(text)
+                        metadatas.append(metadata)
+                        embeddings.append(emb)
+                    else:
+                        missing.append({"_id": doc.get("_id"), "text": text, "metadata": metadata})
+                if texts:
+                    add_to_index(texts, embeddings, metadatas)
+                    stats["stored"] += len(texts)
+                if missing and not warned_missing:
+                    warned_missing = True
+                    if allow_backfill:
+                        logger.info(
+                            "Backfilling MongoDB docs missing embeddings during rebuild (ALLOW_EMBEDDING_BACKFILL_ON_REBUILD=true)"
+                        )
+                    else:
+                        logger.warning(
+                            "Found MongoDB docs missing embeddings. "
+                            "Rebuild will embed them now, but will NOT persist. "
+                            "Set ALLOW_EMBEDDING_BACKFILL_ON_REBUILD=true or run a dedicated backfill script."
+                        )
+                submit_missing()
+                logger.info(
+                    f"FAISS rebuild: page {stats['pages']} read, {stats['documents']} documents indexed, "
+                    f"{len(in_flight)} embedding batch(es) in flight"
+                )
 
-                            response = client.post(
-                                f"{infinity_url}/embeddings",
-                                json={
-                                    "input": batch_texts,
-                                    "model": model_id,
-                                    "encoding_format": "float",
-                                },
-                            )
-                            response.raise_for_status()
-                            result = response.json()
-                            batch_embeddings = [item["embedding"] for item in result.get("data", [])]
-
-                            if len(batch_embeddings) != len(batch_texts):
-                                raise ValueError(
-                                    f"Backfill embedding count mismatch: got {len(batch_embeddings)}, expected {len(batch_texts)}"
-                                )
-
-                            embedding_dim = len(batch_embeddings[0]) if batch_embeddings else 0
-                            for doc_row, emb in zip(batch_missing, batch_embeddings):
-                                md = dict(doc_row.get("metadata") or {})
-                                md.setdefault("embedding_model", model_id)
-                                if embedding_dim:
-                                    md.setdefault("embedding_dim", embedding_dim)
+            submit_missing(force=True)
+            while in_flight:
+                finish_backfill_batch(*in_flight.popleft())
 
-                                texts.append(doc_row["text"])
-                                metadatas.append(md)
-                                embeddings.append(emb)
-
-                                if allow_backfill and doc_row.get("_id") is not None:
-                                    updates.append(
-                                        UpdateOne(
-                                            {"_id": doc_row["_id"]},
-                                            {"$set": {"embedding": emb, "metadata": md}},
-                                        )
-                                    )
-                else:
-                    embedding_model = DEFAULT_EMBEDDING_MODEL
-
-                    for i in range(0, len(missing_for_backfill), backfill_batch_size):
-                        batch_missing = missing_for_backfill[i : i + backfill_batch_size]
-                        batch_texts = [d["text"] for d in batch_missing]
-
-                        batch_num = i // backfill_batch_size + 1
-                        total_batches = (len(missing_for_backfill) + backfill_batch_size - 1) // backfill_batch_size
-                        logger.info(f"Embedding backfill batch {batch_num}/{total_batches} from MongoDB...")
-
-                        batch_embeddings = self.get_cached_embeddings(batch_texts)
-                        embedding_dim = len(batch_embeddings[0]) if batch_embeddings else 0
-
-                        for doc_row, emb in zip(batch_missing, batch_embeddings):
-                            md = dict(doc_row.get("metadata") or {})
-                            md.setdefault("embedding_model", embedding_model)
-                            if embedding_dim:
-                                md.setdefault("embedding_dim", embedding_dim)
-
-                            texts.append(doc_row["text"])
-                            metadatas.append(md)
-                            embeddings.append(emb)
-
-                            if allow_backfill and doc_row.get("_id") is not None:
-                                updates.append(
-                                    UpdateOne(
-                                        {"_id": doc_row["_id"]},
-                                        {"$set": {"embedding": emb, "metadata": md}},
-                                    )
-                                )
-
-                if allow_backfill and updates:
-                    try:
-                        self.collection.bulk_write(updates, ordered=False)
-                        logger.info("Backfill persisted %s embeddings to MongoDB", len(updates))
-                    except Exception as e:
-                        logger.warning("Failed to persist backfilled embeddings to MongoDB: %s", e, exc_info=True)
-
-            if not texts:
-                logger.info("No documents available for FAISS rebuild after filtering; creating empty FAISS index")
-                return self._create_empty_faiss_index()
-
-            logger.info(f"Creating FAISS index from {len(texts)} documents in MongoDB (stored embeddings)")
-
-            # Create FAISS from stored embeddings (works for both Infinity + legacy)
-            text_embeddings = list(zip(texts, embeddings))
-            vector_store = FAISS.from_embeddings(
-                text_embeddings=text_embeddings,
-                embedding=self.embeddings,
-                metadatas=metadatas,
-            )
-            vector_store.save_local(self.faiss_index_path)
-            logger.info(f"FAISS index created from stored embeddings and saved to {self.faiss_index_path}")
-            return vector_store
-        finally:
-            # Always release the lock
-            _set_faiss_rebuild_in_progress(False)
-            rebuild_lock.release()
-            logger.info("Released FAISS rebuild lock")
+        elapsed = time.perf_counter() - started
+        stats["seconds"] = round(elapsed, 3)
+        stats["docs_per_second"] = round(stats["documents"] / elapsed, 1) if elapsed > 0 else 0.0
+        stats["peak_rss_mb"] = _peak_rss_mb()
+        self.last_rebuild_stats = stats
+
+        if vector_store is None:
+            logger.info("No documents in MongoDB, creating empty FAISS index")
+            return self._create_empty_faiss_index()
+
+        vector_store.save_local(self.faiss_index_path)
+        logger.info(
+            f"FAISS index rebuilt from MongoDB and saved to {self.faiss_index_path}: "
+            f"{stats['documents']} documents ({stats['stored']} stored embeddings, {stats['embedded']} embedded, "
+            f"{stats['persisted']} persisted) in {elapsed:.1f}s ({stats['docs_per_second']} docs/s, "
+            f"peak RSS {stats['peak_rss_mb']} MB)"
+        )
+        return vector_store
 
     def _save_faiss_index(self):
-        """Saves the current FAISS index to disk."""
-        try:
-            self.vector_store.save_local(self.faiss_index_path)
-            logger.info(f"FAISS index saved to {self.faiss_index_path}")
-        except Exception as e:
-            logger.error(f"Error saving FAISS index: {e}")
+        """Saves the current FAISS index (and its payload_id table) to disk."""
+        with self._write_lock:
+            try:
+                self.vector_store.save_local(self.faiss_index_path)
+                self.payload_vector_ids.save(self.faiss_index_path, self.vector_store)
+                logger.info(f"FAISS index saved to {self.faiss_index_path}")
+            except Exception as e:
+                logger.error(f"Error saving FAISS index: {e}")
+
+    def _get_payload_vector_ids(self) -> PayloadVectorIds:
+        """payload_id table bound to the current FAISS store (loaded or reconstructed on first use)."""
+        return self.payload_vector_ids.bind(self.vector_store, self.faiss_index_path)
+
+    def remove_payload_vectors(self, payload_id: str) -> int:
+        """
+        Remove a Payload document's chunks from FAISS in place and persist the index.
+
+        O(chunks) id lookups plus one FAISS remove_ids pass; no MongoDB read and
+        no re-embedding, unlike _create_faiss_from_mongodb().
+
+        Returns:
+            Number of vectors removed
+        """
+        with self._write_lock:
+            try:
+                removed = self._get_payload_vector_ids().remove(self.vector_store, payload_id)
+            except Exception as e:
+                logger.error(f"Failed to remove vectors for payload_id={payload_id} from FAISS: {e}", exc_info=True)
+                return 0
+            if removed:
+                self._save_faiss_index()
+                logger.info(f"Removed {removed} vectors for payload_id={payload_id} from FAISS")
+            return removed
+
+    def snapshot_vector_store(self):
+        """
+        Return an independent read-only copy of the current FAISS store.
+
+        The FAISS index is cloned and the docstore / id mapping copied, so
+        ingestion can keep mutating self.vector_store (the writer) without
+        racing searches running against the snapshot. Documents themselves are
+        shared, not copied.
+
+        Returns:
+            A FAISS store; the writer store itself if it cannot be cloned
+        """
+        with self._write_lock:
+            store = self.vector_store
+            if not isinstance(store, FAISS):
+                return store
+            try:
+                import copy
+                import faiss
+                from langchain_community.docstore.in_memory import InMemoryDocstore
+
+                snapshot = copy.copy(store)
+                snapshot.index = faiss.clone_index(store.index)
+                snapshot.docstore = InMemoryDocstore(dict(store.docstore._dict))
+                snapshot.index_to_docstore_id = dict(store.index_to_docstore_id)
+                return snapshot
+            except Exception as e:
+                logger.warning(f"Could not clone FAISS store for a read snapshot, sharing the writer store: {e}")
+                return store
 
     def reload_from_disk(self):
         """
@@ -579,23 +686,24 @@ class VectorStoreManager:
         Returns:
             True if reload succeeded, False otherwise
         """
-        index_file = os.path.join(self.faiss_index_path, "index.faiss")
-        if not os.path.exists(index_file):
-            logger.warning(f"FAISS index file not found at {index_file}, cannot reload")
-            return False
+        with self._write_lock:
+            index_file = os.path.join(self.faiss_index_path, "index.faiss")
+            if not os.path.exists(index_file):
+                logger.warning(f"FAISS index file not found at {index_file}, cannot reload")
+                return False
         
-        try:
-            self.vector_store = FAISS.load_local(
-                self.faiss_index_path, 
-                self.embeddings, 
-                allow_dangerous_deserialization=True
-            )
-            faiss_count = self.vector_store.index.ntotal if hasattr(self.vector_store, 'index') and hasattr(self.vector_store.index, 'ntotal') else 0
-            logger.info(f"FAISS index reloaded from disk ({faiss_count} vectors)")
-            return True
-        except Exception as e:
-            logger.error(f"Error reloading FAISS index from disk: {e}")
-            return False
+            try:
+                self.vector_store = FAISS.load_local(
+                    self.faiss_index_path, 
+                    self.embeddings, 
+                    allow_dangerous_deserialization=True
+                )
+                faiss_count = self.vector_store.index.ntotal if hasattr(self.vector_store, 'index') and hasattr(self.vector_store.index, 'ntotal') else 0
+                logger.info(f"FAISS index reloaded from disk ({faiss_count} vectors)")
+                return True
+            except Exception as e:
+                logger.error(f"Error reloading FAISS index from disk: {e}")
+                return False
 
     def add_documents(self, documents: List[Document], batch_size: int = 10):
         """
@@ -636,23 +744,26 @@ class VectorStoreManager:
                     if embedding_dim:
                         md.setdefault("embedding_dim", embedding_dim)
 
-                # Add to FAISS using precomputed vectors
-                text_embeddings = list(zip(texts, embeddings))
-                self.vector_store.add_embeddings(text_embeddings, metadatas=metadatas)
+                with self._write_lock:
+                    # Add to FAISS using precomputed vectors
+                    text_embeddings = list(zip(texts, embeddings))
+                    payload_vector_ids = self._get_payload_vector_ids()
+                    vector_ids = self.vector_store.add_embeddings(text_embeddings, metadatas=metadatas)
+                    payload_vector_ids.record(vector_ids, metadatas)
 
-                # Store in MongoDB if available (persist embeddings for cheap rebuilds)
-                if self.mongodb_available:
-                    mongo_docs = []
-                    for text, metadata, emb in zip(texts, metadatas, embeddings):
-                        mongo_docs.append(
-                            {
-                                "text": text,
-                                "metadata": metadata,
-                                "embedding": emb,
-                            }
-                        )
-                    if mongo_docs:
-                        self.collection.insert_many(mongo_docs, ordered=False)
+                    # Store in MongoDB if available (persist embeddings for cheap rebuilds)
+                    if self.mongodb_available:
+                        mongo_docs = []
+                        for text, metadata, emb in zip(texts, metadatas, embeddings):
+                            mongo_docs.append(
+                                {
+                                    "text": text,
+                                    "metadata": metadata,
+                                    "embedding": emb,
+                                }
+                            )
+                        if mongo_docs:
+                            self.collection.insert_many(mongo_docs, ordered=False)
 
                 success_count += len(batch)
                 logger.info(f"Successfully added batch of {len(batch)} documents.")
@@ -660,6 +771,12 @@ class VectorStoreManager:
                 logger.error(f"Error adding batch {i//batch_size + 1}: {e}", exc_info=True)
                 raise e
 
+        # Persist newly computed embeddings (no-op unless EMBEDDING_CACHE_DIR is set)
+        try:
+            embedding_cache.flush()
+        except Exception as e:
+            logger.warning(f"Failed to persist embedding cache: {e}")
+
         # Save FAISS index after all additions
         self._save_faiss_index()
         if self.mongodb_available:
@@ -667,6 +784,82 @@ class VectorStoreManager:
         else:
             logger.info(f"Finished adding {success_count} of {total_docs} documents to FAISS (MongoDB not available).")
     
+    def _embed_with_infinity(self, client, texts: List[str]):
+        """
+        Embed texts with the Infinity service (sync request) with retry.
+
+        Returns:
+            (dense embeddings, sparse embeddings or None per text)
+        """
+        infinity_url = os.getenv("INFINITY_URL", "http://localhost:7997")
+        model_id = os.getenv("EMBEDDING_MODEL_ID", "BAAI/bge-m3")
+
+        max_retries = 3
+        retry_delay = 2.0  # seconds
+        result = None
+        
+        for attempt in range(max_retries):
+            try:
+                response = client.post(
+                    f"{infinity_url}/embeddings",
+                    json={
+                        "input": texts,
+                        "model": model_id,
+                        "encoding_format": "float"
+                    }
+                )
+                response.raise_for_status()
+                result = response.json()
+                break  # Success, exit retry loop
+            except Exception as retry_error:
+                if attempt < max_retries - 1:
+                    logger.warning(f"Embedding request failed (attempt {attempt + 1}/{max_retries}): {retry_error}")
+                    time.sleep(retry_delay * (attempt + 1))  # Exponential backoff
+                else:
+                    raise  # Re-raise on final attempt
+        
+        if result is None:
+            raise ValueError("Failed to get embeddings after retries")
+        
+        # Extract dense + sparse embeddings (sparse is precomputed here so the
+        # sparse re-rank stage never has to re-embed documents at query time)
+        result_data = result.get("data", [])
+        dense_embeddings = [item["embedding"] for item in result_data]
+        sparse_embeddings = [item.get("sparse_embedding") for item in result_data]
+        
+        if len(dense_embeddings) != len(texts):
+            raise ValueError(f"Embedding count mismatch: got {len(dense_embeddings)}, expected {len(texts)}")
+        return dense_embeddings, sparse_embeddings
+
+    def _embed_with_infinity_cached(self, client, texts: List[str]):
+        """
+        Embed texts with Infinity, serving unchanged texts from the content-hash EmbeddingCache.
+
+        Dense vectors are cached under the EMBEDDING_MODEL_ID namespace with the
+        sparse vector stored alongside, so a hit needs no request at all; only
+        the misses are sent to Infinity (in one request).
+
+        Returns:
+            (dense embeddings, sparse embeddings or None per text)
+        """
+        namespace = os.getenv("EMBEDDING_MODEL_ID", "BAAI/bge-m3")
+        vectors, sparse, hits = embedding_cache.get_many_with_extras(texts, namespace=namespace)
+        dense: List[Optional[List[float]]] = [v.tolist() if v is not None else None for v in vectors]
+
+        miss_indices = np.flatnonzero(~hits).tolist()
+        if miss_indices:
+            uncached_texts = [texts[i] for i in miss_indices]
+            logger.debug(
+                f"Embedding {len(uncached_texts)} uncached texts with Infinity "
+                f"({len(texts) - len(uncached_texts)} cached)"
+            )
+            new_dense, new_sparse = self._embed_with_infinity(client, uncached_texts)
+            embedding_cache.set_many(uncached_texts, new_dense, namespace=namespace, extras=new_sparse)
+            for i, embedding, sparse_embedding in zip(miss_indices, new_dense, new_sparse):
+                dense[i] = embedding
+                sparse[i] = sparse_embedding
+        return dense, sparse
+
     def _add_documents_with_infinity_sync(self, documents: List[Document], batch_size: int = 10):
         """
         Synchronous wrapper for adding documents with Infinity embeddings.
@@ -675,7 +868,6 @@ class VectorStoreManager:
         """
         import httpx
         
-        infinity_url = os.getenv("INFINITY_URL", "http://localhost:7997")
         model_id = os.getenv("EMBEDDING_MODEL_ID", "BAAI/bge-m3")
         
         total_docs = len(documents)
@@ -693,66 +885,48 @@ class VectorStoreManager:
                     texts = [doc.page_content for doc in batch]
                     metadatas = [doc.metadata for doc in batch]
                     
-                    # Compute embeddings via Infinity service (sync request) with retry
-                    max_retries = 3
-                    retry_delay = 2.0  # seconds
-                    result = None
-                    
-                    for attempt in range(max_retries):
-                        try:
-                            response = client.post(
-                                f"{infinity_url}/embeddings",
-                                json={
-                                    "input": texts,
-                                    "model": model_id,
-                                    "encoding_format": "float"
-                                }
-                            )
-                            response.raise_for_status()
-                            result = response.json()
-                            break  # Success, exit retry loop
-                        except Exception as retry_error:
-                            if attempt < max_retries - 1:
-                                logger.warning(f"Embedding request failed (attempt {attempt + 1}/{max_retries}): {retry_error}")
-                                import time
-                                time.sleep(retry_delay * (attempt + 1))  # Exponential backoff
-                            else:
-                                raise  # Re-raise on final attempt
-                    
-                    if result is None:
-                        raise ValueError("Failed to get embeddings after retries")
-                    
-                    # Extract dense embeddings
-                    dense_embeddings = [item["embedding"] for item in result.get("data", [])]
+                    # Compute dense + sparse embeddings via Infinity service (sync request);
+                    # texts embedded before are served from the embedding cache
+                    dense_embeddings, sparse_embeddings = self._embed_with_infinity_cached(client, texts)
                     
-                    if len(dense_embeddings) != len(texts):
-                        raise ValueError(f"Embedding count mismatch: got {len(dense_embeddings)}, expected {len(texts)}")
+                    with self._write_lock:
+                        # Create text-embedding pairs for FAISS
+                        text_embeddings = list(zip(texts, dense_embeddings))
                     
-                    # Create text-embedding pairs for FAISS
-                    text_embeddings = list(zip(texts, dense_embeddings))
+                        # Add to FAISS using add_embeddings (works with pre-computed vectors)
+                        payload_vector_ids = self._get_payload_vector_ids()
+                        vector_ids = self.vector_store.add_embeddings(text_embeddings, metadatas=metadatas)
+                        payload_vector_ids.record(vector_ids, metadatas)
                     
-                    # Add to FAISS using add_embeddings (works with pre-computed vectors)
-                    self.vector_store.add_embeddings(text_embeddings, metadatas=metadatas)
-                    
-                    # Store in MongoDB if available
-                    if self.mongodb_available:
-                        embedding_dim = len(dense_embeddings[0]) if dense_embeddings else 0
+                        # Store in MongoDB if available
+                        if self.mongodb_available:
+                            embedding_dim = len(dense_embeddings[0]) if dense_embeddings else 0
 
-                        mongo_docs = []
-                        for text, metadata, emb in zip(texts, metadatas, dense_embeddings):
-                            md = dict(metadata or {})
-                            md.setdefault("embedding_model", model_id)
-                            if embedding_dim:
-                                md.setdefault("embedding_dim", embedding_dim)
-                            mongo_docs.append(
-                                {
+                            mongo_docs = []
+                            for text, metadata, emb, sparse in zip(texts, metadatas, dense_embeddings, sparse_embeddings):
+                                md = dict(metadata or {})
+                                md.setdefault("embedding_model", model_id)
+                                if embedding_dim:
+                                    md.setdefault("embedding_dim", embedding_dim)
+                                mongo_doc = {
                                     "text": text,
                                     "metadata": md,
                                     "embedding": emb,
                                 }
+                                stored_sparse = encode_sparse_for_mongo(sparse)
+                                if stored_sparse:
+                                    mongo_doc["sparse_embedding"] = stored_sparse
+                                mongo_docs.append(mongo_doc)
+                            if mongo_docs:
+                                self.collection.insert_many(mongo_docs, ordered=False)
+                    
+                        # Keep the in-memory sparse index current (once loaded, MongoDB is not re-read)
+                        if self.sparse_vectors.is_loaded or not self.mongodb_available:
+                            self.sparse_vectors.add(
+                                texts,
+                                sparse_embeddings,
+                                [(md or {}).get("payload_id") for md in metadatas],
                             )
-                        if mongo_docs:
-                            self.collection.insert_many(mongo_docs, ordered=False)
                     
                     success_count += len(batch)
                     logger.info(f"Successfully added batch of {len(batch)} documents with Infinity embeddings.")
@@ -763,6 +937,11 @@ class VectorStoreManager:
         
         # Save FAISS index after all additions
         self._save_faiss_index()
+        # Persist newly computed embeddings (no-op unless EMBEDDING_CACHE_DIR is set)
+        try:
+            embedding_cache.flush()
+        except Exception as e:
+            logger.warning(f"Failed to persist embedding cache: {e}")
         if self.mongodb_available:
             logger.info(f"Finished adding {success_count} of {total_docs} documents to FAISS and MongoDB (Infinity mode).")
         else:
@@ -772,39 +951,44 @@ class VectorStoreManager:
         """
         Get embeddings for texts with caching to reduce computation.
 
+        Texts are looked up by content hash in one batch; only the misses are
+        embedded (in a single embed_documents call) and stored back.
+
         Args:
             texts: List of text strings to embed
 
         Returns:
             List of embedding vectors
         """
-        cached_embeddings = []
-        uncached_texts = []
-        uncached_indices = []
-
-        # Check cache for each text
-        for i, text in enumerate(texts):
-            cached = embedding_cache.get_similar(text)
-            if cached is not None:
-                cached_embeddings.append(cached.tolist())
-            else:
-                uncached_texts.append(text)
-                uncached_indices.append(i)
+        vectors, hits = embedding_cache.get_many(texts, namespace=DEFAULT_EMBEDDING_MODEL)
+        results: List[Optional[List[float]]] = [v.tolist() if v is not None else None for v in vectors]
 
         # Generate embeddings for uncached texts using local model
-        if uncached_texts:
-            logger.info(f"Generating embeddings for {len(uncached_texts)} uncached texts using local model")
+        miss_indices = np.flatnonzero(~hits).tolist()
+        if miss_indices:
+            uncached_texts = [texts[i] for i in miss_indices]
+            logger.info(
+                f"Generating embeddings for {len(uncached_texts)} uncached texts using local model "
+                f"({len(texts) - len(uncached_texts)} cached)"
+            )
             new_embeddings = self.embeddings.embed_documents(uncached_texts)
+            embedding_cache.set_many(uncached_texts, new_embeddings, namespace=DEFAULT_EMBEDDING_MODEL)
+            for i, embedding in zip(miss_indices, new_embeddings):
+                results[i] = list(embedding)
 
-            # Cache the new embeddings
-            for text, embedding in zip(uncached_texts, new_embeddings):
-                embedding_cache.set(text, np.array(embedding))
+        return results
 
-            # Insert new embeddings into results
-            for i, (idx, embedding) in enumerate(zip(uncached_indices, new_embeddings)):
-                cached_embeddings.insert(idx, embedding)
-
-        return cached_embeddings
+    def get_sparse_index(self) -> SparseVectorIndex:
+        """
+        Returns the precomputed document sparse vector index, loading it from
+        MongoDB on first use. Blocking - call from a worker thread in async code.
+        """
+        if not self.sparse_vectors.is_loaded and self.mongodb_available:
+            try:
+                self.sparse_vectors.load(self.collection)
+            except Exception as e:
+                logger.warning(f"Failed to load sparse vectors from MongoDB: {e}")
+        return self.sparse_vectors
 
     def get_retriever(self, search_type="similarity", search_kwargs=None):
         """
@@ -821,47 +1005,206 @@ class VectorStoreManager:
             search_kwargs=search_kwargs
         )
 
+    def _embed_texts(self, texts: List[str], batch_size: int = 10):
+        """
+        Embed texts with the configured backend (Infinity, or the cached local model).
+
+        Returns:
+            (dense embeddings, sparse embeddings or None per text, embedding model name)
+        """
+        if not texts:
+            return [], [], None
+        dense: List[List[float]] = []
+        sparse: List[Any] = []
+        if self.use_infinity:
+            import httpx
+            with httpx.Client(timeout=120.0) as client:
+                for i in range(0, len(texts), batch_size):
+                    batch_dense, batch_sparse = self._embed_with_infinity_cached(client, texts[i:i + batch_size])
+                    dense.extend(batch_dense)
+                    sparse.extend(batch_sparse)
+            model_name = os.getenv("EMBEDDING_MODEL_ID", "BAAI/bge-m3")
+        else:
+            for i in range(0, len(texts), batch_size):
+                dense.extend(self.get_cached_embeddings(texts[i:i + batch_size]))
+            sparse = [None] * len(dense)
+            model_name = DEFAULT_EMBEDDING_MODEL
+        # Persist newly computed embeddings (no-op unless EMBEDDING_CACHE_DIR is set)
+        try:
+            embedding_cache.flush()
+        except Exception as e:
+            logger.warning(f"Failed to persist embedding cache: {e}")
+        return dense, sparse, model_name
+
+    def upsert_payload_documents(self, payload_id: str, documents: List[Document], batch_size: int = 10) -> Dict[str, int]:
+        """
+        Replace a Payload document's chunks with `documents`, touching only what changed.
+
+        Stored chunks are matched to the new ones by fingerprint (text + indexed
+        metadata, see services.payload_upsert): unchanged chunks stay in place with
+        their vectors, chunks that only moved (chunk_index / chunk_id shifted by an
+        inserted paragraph) keep their vectors and get their metadata patched, only
+        added chunks are embedded, and removed chunks are deleted. MongoDB and FAISS
+        are diffed separately, so a store that drifted from the other is repaired by
+        the same call.
+
+        Every embedding is computed before anything is modified, so a failure
+        leaves the previous version fully indexed. MongoDB (the source of truth)
+        is then updated in one ordered bulk write - inserts before deletes, so the
+        article never disappears - followed by the FAISS writer store, which
+        queries only see after the next retriever bundle swap. The whole upsert
+        holds the write lock, so snapshots and reloads see it all or not at all.
+
+        Args:
+            documents: All chunks of the payload after re-ingestion (incl. synthetic questions)
+            batch_size: Texts per embedding request
+
+        Returns:
+            {"kept", "patched", "added", "removed"} chunk counts (MongoDB's when available, else FAISS's)
+        """
+        with self._write_lock:
+            # 1. Plan against what each store holds for this payload
+            payload_vector_ids = self._get_payload_vector_ids()
+            docstore = getattr(getattr(self.vector_store, "docstore", None), "_dict", None) or {}
+            faiss_existing = []
+            for vector_id in payload_vector_ids.get(payload_id):
+                doc = docstore.get(vector_id)
+                if doc is not None:
+                    faiss_existing.append((vector_id, doc.page_content, doc.metadata))
+            faiss_plan = plan_payload_upsert(faiss_existing, documents)
+            removed_texts = [docstore[vector_id].page_content for vector_id in faiss_plan.remove_ids]
+
+            mongo_plan = None
+            if self.mongodb_available:
+                rows = list(self.collection.find({"metadata.payload_id": payload_id}, {"text": 1, "metadata": 1}))
+                mongo_plan = plan_payload_upsert(
+                    [(row["_id"], row.get("text", ""), row.get("metadata") or {}) for row in rows],
+                    documents,
+                )
+                texts_by_id = {row["_id"]: row.get("text", "") for row in rows}
+                metadata_by_id = {row["_id"]: row.get("metadata") or {} for row in rows}
+                removed_texts = [texts_by_id[row_id] for row_id in mongo_plan.remove_ids]
+            plan = mongo_plan or faiss_plan
+
+            # 2. Embed what either store is missing (nothing has been modified yet)
+            needed = sorted(set(faiss_plan.add_indexes) | set(mongo_plan.add_indexes if mongo_plan else []))
+            dense, sparse, embedding_model = self._embed_texts([documents[i].page_content for i in needed], batch_size)
+            embedded = {i: (vector, sparse_vector) for i, vector, sparse_vector in zip(needed, dense, sparse)}
+            embedding_dim = len(dense[0]) if dense else 0
+
+            def stamped(metadata: Dict[str, Any]) -> Dict[str, Any]:
+                # Stamp embedding identity into metadata (helps detect model/dim drift later)
+                md = dict(metadata or {})
+                md.setdefault("embedding_model", embedding_model)
+                if embedding_dim:
+                    md.setdefault("embedding_dim", embedding_dim)
+                return md
+
+            # 3. MongoDB: one ordered bulk write, inserts and metadata patches before deletes
+            if mongo_plan and (mongo_plan.add_indexes or mongo_plan.patches or mongo_plan.remove_ids):
+                operations = []
+                for i in mongo_plan.add_indexes:
+                    mongo_doc = {
+                        "text": documents[i].page_content,
+                        "metadata": stamped(documents[i].metadata),
+                        "embedding": embedded[i][0],
+                    }
+                    stored_sparse = encode_sparse_for_mongo(embedded[i][1])
+                    if stored_sparse:
+                        mongo_doc["sparse_embedding"] = stored_sparse
+                    operations.append(InsertOne(mongo_doc))
+                for row_id, i in mongo_plan.patches:
+                    metadata = patched_metadata(metadata_by_id[row_id], documents[i].metadata)
+                    operations.append(UpdateOne({"_id": row_id}, {"$set": {"metadata": metadata}}))
+                if mongo_plan.remove_ids:
+                    operations.append(DeleteMany({"_id": {"$in": mongo_plan.remove_ids}}))
+                self.collection.bulk_write(operations, ordered=True)
+
+            # 4. FAISS writer store (patched documents are replaced, not mutated: snapshots share them)
+            for vector_id, i in faiss_plan.patches:
+                docstore[vector_id] = Document(
+                    page_content=docstore[vector_id].page_content,
+                    metadata=patched_metadata(docstore[vector_id].metadata, documents[i].metadata),
+                )
+            if faiss_plan.remove_ids:
+                payload_vector_ids.remove_ids(self.vector_store, payload_id, faiss_plan.remove_ids)
+            if faiss_plan.add_indexes:
+                metadatas = [stamped(documents[i].metadata) for i in faiss_plan.add_indexes]
+                vector_ids = self.vector_store.add_embeddings(
+                    [(documents[i].page_content, embedded[i][0]) for i in faiss_plan.add_indexes],
+                    metadatas=metadatas,
+                )
+                payload_vector_ids.record(vector_ids, metadatas)
+            if faiss_plan.remove_ids or faiss_plan.add_indexes or faiss_plan.patches:
+                self._save_faiss_index()
+
+            # 5. In-memory sparse index (once loaded, MongoDB is not re-read)
+            if self.sparse_vectors.is_loaded or not self.mongodb_available:
+                self.sparse_vectors.remove_texts(payload_id, removed_texts)
+                self.sparse_vectors.add(
+                    [documents[i].page_content for i in plan.add_indexes],
+                    [embedded[i][1] for i in plan.add_indexes],
+                    [payload_id] * len(plan.add_indexes),
+                )
+
+            counts = plan.counts()
+            logger.info(
+                f"Upserted payload_id={payload_id}: kept {counts['kept']}, patched {counts['patched']}, added {counts['added']}, "
+                f"removed {counts['removed']} chunks ({len(needed)} embedded)"
+            )
+            return counts
+
     def delete_documents_by_metadata_field(self, field_name: str, field_value: Any, rebuild_faiss: bool = False):
         """
-        Deletes documents from MongoDB. Optionally rebuilds FAISS index.
+        Deletes documents from MongoDB and keeps FAISS in sync.
         
-        By default, this does NOT rebuild FAISS - the caller should handle FAISS updates
-        (e.g., by calling add_documents which saves incrementally, then refresh_vector_store
-        which reloads from disk).
+        Deletes by payload_id remove the matching vectors from FAISS incrementally
+        (see remove_payload_vectors), so updates no longer leave stale vectors
+        behind and deletes no longer need a rebuild. For other fields FAISS cannot
+        be filtered by metadata, so it is only rebuilt when rebuild_faiss=True.
         
         This is the generic method for deleting documents based on a metadata key-value pair.
 
         Args:
             field_name: The name of the metadata field to filter on (e.g., "payload_id", "source").
             field_value: The value of the metadata field to match.
-            rebuild_faiss: If True, rebuild FAISS index after deletion. Default False for performance.
+            rebuild_faiss: If True, rebuild FAISS index after a non-payload_id deletion. Default False for performance.
         """
-        if not field_name or field_value is None:
-            logger.warning("Field name and value must be provided for deletion.")
-            return 0
+        with self._write_lock:
+            if not field_name or field_value is None:
+                logger.warning("Field name and value must be provided for deletion.")
+                return 0
 
-        if not self.mongodb_available:
-            logger.warning("MongoDB not available. Cannot perform selective deletion. Use clear_all_documents to reset FAISS index.")
-            return 0
+            if field_name == "payload_id":
+                self.remove_payload_vectors(field_value)
 
-        mongo_filter = {f"metadata.{field_name}": field_value}
+            if not self.mongodb_available:
+                logger.warning("MongoDB not available. Cannot perform selective deletion. Use clear_all_documents to reset FAISS index.")
+                return 0
 
-        logger.info(f"Attempting to delete documents with filter: {mongo_filter}")
-        try:
-            result = self.collection.delete_many(mongo_filter)
-            logger.info(f"Deleted {result.deleted_count} documents matching filter: {mongo_filter}")
+            mongo_filter = {f"metadata.{field_name}": field_value}
 
-            # Only rebuild FAISS if explicitly requested (expensive operation!)
-            if rebuild_faiss:
-                logger.info("Rebuilding FAISS index after deletion (rebuild_faiss=True)...")
-                self.vector_store = self._create_faiss_from_mongodb()
-            else:
-                logger.info("Skipping FAISS rebuild (will be updated on next add/refresh)")
+            logger.info(f"Attempting to delete documents with filter: {mongo_filter}")
+            try:
+                result = self.collection.delete_many(mongo_filter)
+                logger.info(f"Deleted {result.deleted_count} documents matching filter: {mongo_filter}")
 
-            return result.deleted_count
-        except Exception as e:
-            logger.error(f"An error occurred during deletion with filter {mongo_filter}: {e}", exc_info=True)
-            return 0
+                if field_name == "payload_id":
+                    self.sparse_vectors.remove_payload(field_value)
+                else:
+                    self.sparse_vectors.clear()
+
+                # Only rebuild FAISS if explicitly requested (expensive operation!)
+                if rebuild_faiss and field_name != "payload_id":
+                    logger.info("Rebuilding FAISS index after deletion (rebuild_faiss=True)...")
+                    self.vector_store = self._create_faiss_from_mongodb()
+                elif field_name != "payload_id":
+                    logger.info("Skipping FAISS rebuild (will be updated on next add/refresh)")
+
+                return result.deleted_count
+            except Exception as e:
+                logger.error(f"An error occurred during deletion with filter {mongo_filter}: {e}", exc_info=True)
+                return 0
 
     def clean_draft_documents(self, rebuild_faiss: bool = True):
         """
@@ -871,71 +1214,76 @@ class VectorStoreManager:
         Args:
             rebuild_faiss: If True (default), rebuild FAISS index after cleanup.
         """
-        if not self.mongodb_available:
-            logger.warning("MongoDB not available. Cannot clean draft documents.")
-            return 0
+        with self._write_lock:
+            if not self.mongodb_available:
+                logger.warning("MongoDB not available. Cannot clean draft documents.")
+                return 0
 
-        try:
-            logger.info("🧹 Starting cleanup of draft/unpublished documents...")
-
-            # Find documents that are not published (draft, etc.)
-            draft_filter = {"metadata.status": {"$ne": "published"}}
-            draft_docs_cursor = self.collection.find(draft_filter)
-            draft_payload_ids = []
-
-            # Collect payload IDs to delete from FAISS (FAISS doesn't support metadata queries)
-            for doc in draft_docs_cursor:
-                payload_id = doc.get("metadata", {}).get("payload_id")
-                if payload_id:
-                    draft_payload_ids.append(payload_id)
-
-            # Delete draft documents from MongoDB
-            result = self.collection.delete_many(draft_filter)
-            logger.info(f"🗑️ Deleted {result.deleted_count} draft documents from MongoDB")
-
-            # If we have payload IDs, also clean any chunks that might use different status values
-            additional_deleted = 0
-            if draft_payload_ids:
-                additional_filter = {"metadata.payload_id": {"$in": draft_payload_ids}}
-                additional_result = self.collection.delete_many(additional_filter)
-                additional_deleted = additional_result.deleted_count
-                if additional_deleted > 0:
-                    logger.info(f"🗑️ Deleted {additional_deleted} additional chunks by payload_id")
-
-            # Only rebuild FAISS if requested
-            if rebuild_faiss:
-                self.vector_store = self._create_faiss_from_mongodb()
-                logger.info("✅ FAISS index rebuilt after draft cleanup")
-            else:
-                logger.info("✅ Draft cleanup complete (FAISS rebuild skipped)")
+            try:
+                logger.info("🧹 Starting cleanup of draft/unpublished documents...")
+
+                # Find documents that are not published (draft, etc.)
+                draft_filter = {"metadata.status": {"$ne": "published"}}
+                draft_docs_cursor = self.collection.find(draft_filter)
+                draft_payload_ids = []
+
+                # Collect payload IDs to delete from FAISS (FAISS doesn't support metadata queries)
+                for doc in draft_docs_cursor:
+                    payload_id = doc.get("metadata", {}).get("payload_id")
+                    if payload_id:
+                        draft_payload_ids.append(payload_id)
+
+                # Delete draft documents from MongoDB
+                result = self.collection.delete_many(draft_filter)
+                logger.info(f"🗑️ Deleted {result.deleted_count} draft documents from MongoDB")
+
+                # If we have payload IDs, also clean any chunks that might use different status values
+                additional_deleted = 0
+                if draft_payload_ids:
+                    additional_filter = {"metadata.payload_id": {"$in": draft_payload_ids}}
+                    additional_result = self.collection.delete_many(additional_filter)
+                    additional_deleted = additional_result.deleted_count
+                    if additional_deleted > 0:
+                        logger.info(f"🗑️ Deleted {additional_deleted} additional chunks by payload_id")
+
+                # Only rebuild FAISS if requested
+                if rebuild_faiss:
+                    self.vector_store = self._create_faiss_from_mongodb()
+                    logger.info("✅ FAISS index rebuilt after draft cleanup")
+                else:
+                    logger.info("✅ Draft cleanup complete (FAISS rebuild skipped)")
 
-            total_deleted = result.deleted_count + additional_deleted
-            return total_deleted
+                self.sparse_vectors.clear()
 
-        except Exception as e:
-            logger.error(f"An error occurred during draft document cleanup: {e}", exc_info=True)
-            return 0
+                total_deleted = result.deleted_count + additional_deleted
+                return total_deleted
+
+            except Exception as e:
+                logger.error(f"An error occurred during draft document cleanup: {e}", exc_info=True)
+                return 0
 
     def clear_all_documents(self):
         """
         Deletes all documents from MongoDB and creates empty FAISS index. Use with caution.
         """
-        if self.mongodb_available:
-            logger.warning(f"Attempting to delete ALL documents from collection: '{self.collection_name}' in db: '{self.db_name}'")
-            try:
-                result = self.collection.delete_many({})
-                logger.info(f"Deleted {result.deleted_count} documents. Collection should now be empty.")
-            except Exception as e:
-                logger.error(f"An error occurred during clearing all documents: {e}", exc_info=True)
-                return 0
-        else:
-            logger.warning("MongoDB not available. Clearing FAISS index only.")
+        with self._write_lock:
+            if self.mongodb_available:
+                logger.warning(f"Attempting to delete ALL documents from collection: '{self.collection_name}' in db: '{self.db_name}'")
+                try:
+                    result = self.collection.delete_many({})
+                    logger.info(f"Deleted {result.deleted_count} documents. Collection should now be empty.")
+                except Exception as e:
+                    logger.error(f"An error occurred during clearing all documents: {e}", exc_info=True)
+                    return 0
+            else:
+                logger.warning("MongoDB not available. Clearing FAISS index only.")
 
-        # Create empty FAISS index
-        self.vector_store = self._create_empty_faiss_index()
-        logger.info("FAISS index cleared and saved.")
+            # Create empty FAISS index
+            self.vector_store = self._create_empty_faiss_index()
+            self.sparse_vectors.clear(loaded=self.mongodb_available)
+            logger.info("FAISS index cleared and saved.")
 
-        return 0 if not self.mongodb_available else result.deleted_count
+            return 0 if not self.mongodb_available else result.deleted_count
 
     def close(self):
         """
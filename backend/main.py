@@ -35,8 +35,6 @@ from backend.api.v1.admin.cache import router as admin_cache_router
 from backend.api.v1.admin.users import router as admin_users_router
 from backend.dependencies import get_user_questions_collection, get_llm_request_logs_collection
 from bson import ObjectId
-from fastapi.encoders import jsonable_encoder # Import jsonable_encoder
-import json
 import logging
 
 from fastapi.middleware.cors import CORSMiddleware
@@ -60,6 +58,8 @@ from backend.rate_limiter import RateLimitConfig, check_rate_limit
 from backend.utils.challenge import generate_challenge, validate_and_consume_challenge
 from backend.utils.turnstile import verify_turnstile_token, is_turnstile_enabled
 from backend.utils.cost_throttling import check_cost_based_throttling
+from backend.utils.stream_replay import replay_text
+from backend.utils.sse_encoder import StreamFrameEncoder
 
 # Challenge endpoint rate limits (prevent challenge exhaustion attacks)
 # In development mode, allow much higher limits to avoid 429 errors during rapid page loads
@@ -361,7 +361,7 @@ async def lifespan(app: FastAPI):
                                 
                                 # Refresh the RAG pipeline to load new documents
                                 logger.info("Refreshing RAG pipeline to load newly synced documents...")
-                                rag_pipeline_instance.refresh_vector_store()
+                                await asyncio.to_thread(rag_pipeline_instance.refresh_vector_store)
                                 logger.info("✅ RAG pipeline refreshed successfully")
                             else:
                                 logger.warning("No chunks were generated from any articles.")
@@ -409,6 +409,22 @@ async def lifespan(app: FastAPI):
     
     cache_refresh_task = asyncio.create_task(refresh_cache_background())
     logger.info("Started background suggested question cache refresh task")
+
+    # Startup: Clear this worker's exact-match L1 when another worker invalidates the shared cache
+    query_cache_listener_task = None
+    if hasattr(rag_pipeline_instance.query_cache, "listen_for_invalidations"):
+        query_cache_listener_task = asyncio.create_task(
+            rag_pipeline_instance.query_cache.listen_for_invalidations()
+        )
+        logger.info("Started query cache invalidation listener")
+
+    # Startup: Start the webhook ingestion workers (re-queues jobs a previous run left unfinished)
+    from backend.api.v1.sync.payload import get_ingestion_queue
+    ingestion_queue = get_ingestion_queue()
+    try:
+        await ingestion_queue.start()
+    except Exception as e:
+        logger.error(f"Error starting ingestion queue: {e}", exc_info=True)
     
     yield
     # Shutdown: Cancel the background task
@@ -417,6 +433,17 @@ async def lifespan(app: FastAPI):
         await metrics_task
     except asyncio.CancelledError:
         logger.info("Stopped background metrics update task")
+
+    if query_cache_listener_task is not None:
+        query_cache_listener_task.cancel()
+        try:
+            await query_cache_listener_task
+        except asyncio.CancelledError:
+            logger.info("Stopped query cache invalidation listener")
+
+    # Shutdown: Stop ingestion workers; unfinished jobs stay in Redis for the next start
+    await ingestion_queue.stop()
+    logger.info("Stopped ingestion queue workers")
     
     # Shutdown: Close all MongoDB connections to prevent connection leaks
     logger.info("Closing MongoDB connections...")
@@ -440,7 +467,16 @@ async def lifespan(app: FastAPI):
         await close_redis_client()
     except Exception as e:
         logger.error(f"Error closing Redis client: {e}", exc_info=True)
-    
+
+    # Shutdown: Close pooled Infinity HTTP client
+    try:
+        if rag_pipeline_instance.use_infinity_embeddings:
+            infinity = rag_pipeline_instance.get_infinity_embeddings()
+            if infinity:
+                await infinity.aclose()
+    except Exception as e:
+        logger.error(f"Error closing Infinity HTTP client: {e}", exc_info=True)
+
     logger.info("MongoDB connection cleanup completed")
 
 app = FastAPI(
@@ -606,10 +642,34 @@ from backend.monitoring.metrics import (
     suggested_question_cache_lookup_duration_seconds,
 )
 
+async def generate_suggested_answer(question_text: str):
+    """
+    Regenerate a suggested question's answer via the RAG pipeline (empty chat history).
+    The pipeline's caches are bypassed: they would return the stale answer being replaced.
+    Returns (answer, sources), or None when the pipeline returned the generic error message,
+    which must not be cached.
+    """
+    logger.info(f"Generating response for question: {question_text[:50]}...")
+    answer, sources, metadata = await rag_pipeline_instance.aquery(question_text, [], bypass_cache=True)
+    if answer.strip() == GENERIC_USER_ERROR_MESSAGE:
+        logger.warning(
+            "RAG pipeline returned generic error message during suggested-question refresh; "
+            f"skipping cache for question: {question_text[:50]}..."
+        )
+        return None
+    return answer, sources
+
+
+# Stale entries served by the cache are regenerated in the background through the pipeline
+suggested_question_cache.set_refresher(generate_suggested_answer)
+
+
 async def refresh_suggested_question_cache():
     """
     Refresh the suggested question cache by pre-generating responses for all active questions.
     This function fetches active questions from Payload CMS and generates responses via RAG pipeline.
+    Questions are regenerated concurrently, bounded by SUGGESTED_QUESTION_REFRESH_CONCURRENCY;
+    entries still within their soft TTL are skipped.
     """
     start_time = time.time()
     cached_count = 0
@@ -634,48 +694,39 @@ async def refresh_suggested_question_cache():
                 "duration_seconds": time.time() - start_time
             }
         
-        logger.info(f"Fetched {total_questions} active suggested questions from Payload CMS")
+        logger.info(
+            f"Fetched {total_questions} active suggested questions from Payload CMS "
+            f"(refresh concurrency: {suggested_question_cache.refresh_concurrency})"
+        )
         
-        # Process each question
-        for question_data in questions:
+        async def process_question(question_data) -> str:
             question_text = question_data.get("question", "").strip()
             if not question_text:
                 logger.warning(f"Skipping question with empty text (ID: {question_data.get('id', 'unknown')})")
-                skipped_count += 1
-                continue
+                return "skipped"
             
             try:
-                # Check if already cached
-                is_cached = await suggested_question_cache.is_cached(question_text)
-                if is_cached:
+                # Skip entries that are cached and not yet stale
+                if await suggested_question_cache.is_fresh(question_text):
                     logger.debug(f"Question already cached, skipping: {question_text[:50]}...")
-                    skipped_count += 1
-                    continue
+                    return "skipped"
                 
-                # Generate response via RAG pipeline (empty chat history for suggested questions)
-                logger.info(f"Generating response for question: {question_text[:50]}...")
-                answer, sources, metadata = await rag_pipeline_instance.aquery(question_text, [])
-
-                # If the pipeline returned the generic user-facing error message,
-                # treat this as a refresh error and DO NOT cache the response.
-                if answer.strip() == GENERIC_USER_ERROR_MESSAGE:
-                    error_count += 1
-                    logger.warning(
-                        "RAG pipeline returned generic error message during suggested-question refresh; "
-                        f"skipping cache for question: {question_text[:50]}..."
-                    )
+                # Generate and store (waits for one of the cache's refresh slots)
+                if not await suggested_question_cache.refresh(question_text):
                     suggested_question_cache_refresh_errors_total.inc()
-                    continue
-                
-                # Store in Suggested Question Cache
-                await suggested_question_cache.set(question_text, answer, sources)
-                cached_count += 1
+                    return "error"
                 logger.debug(f"Cached response for question: {question_text[:50]}...")
+                return "cached"
                 
             except Exception as e:
-                error_count += 1
                 logger.error(f"Error processing question '{question_text[:50]}...': {e}", exc_info=True)
                 suggested_question_cache_refresh_errors_total.inc()
+                return "error"
+        
+        outcomes = await asyncio.gather(*(process_question(question_data) for question_data in questions))
+        cached_count = outcomes.count("cached")
+        skipped_count = outcomes.count("skipped")
+        error_count = outcomes.count("error")
         
         # Update cache size metric
         cache_size = await suggested_question_cache.get_cache_size()
@@ -1145,6 +1196,7 @@ async def chat_stream_endpoint(request: ChatRequest, background_tasks: Backgroun
         cache_type = None
         status = "success"
         error_message = None
+        sse = StreamFrameEncoder()
         
         try:
             # Check usage status and include in stream if not ok
@@ -1172,7 +1224,7 @@ async def chat_stream_endpoint(request: ChatRequest, background_tasks: Backgroun
                     },
                     "isComplete": False
                 }
-                yield f"data: {json.dumps(payload)}\n\n"
+                yield sse.event(payload)
             
             # Send initial status
             payload = {
@@ -1180,7 +1232,7 @@ async def chat_stream_endpoint(request: ChatRequest, background_tasks: Backgroun
                 "chunk": "",
                 "isComplete": False
             }
-            yield f"data: {json.dumps(payload)}\n\n"
+            yield sse.event(payload)
 
             # Check Suggested Question Cache FIRST (for empty chat history)
             from_cache = False
@@ -1208,38 +1260,16 @@ async def chat_stream_endpoint(request: ChatRequest, background_tasks: Backgroun
                         suggested_question_cache_hits_total.labels(cache_type="suggested_question").inc()
                         full_answer = answer
                         
-                        # Filter published sources
-                        published_sources = [
-                            doc for doc in sources
-                            if doc.metadata.get('status') == 'published'
-                        ]
-                        sources_count = len(published_sources)
                         cache_hit = True
                         cache_type = "suggested_question"
                         
-                        # Send sources first
-                        sources_json = jsonable_encoder([
-                            SourceDocument(page_content=doc.page_content, metadata=doc.metadata)
-                            for doc in published_sources
-                        ])
-                        payload = {
-                            "status": "sources",
-                            "sources": sources_json,
-                            "isComplete": False
-                        }
-                        yield f"data: {json.dumps(payload)}\n\n"
+                        # Send sources first (pre-encoded on the cache entry)
+                        frame, sources_count = sse.sources(sources)
+                        yield frame
                         
-                        # Stream cached response character by character for consistent UX
-                        for i, char in enumerate(answer):
-                            payload = {
-                                "status": "streaming",
-                                "chunk": char,
-                                "isComplete": False
-                            }
-                            yield f"data: {json.dumps(payload)}\n\n"
-                            # Small delay to control streaming speed
-                            if i % 10 == 0:  # Yield control every 10 characters
-                                await asyncio.sleep(0.001)
+                        # Replay cached response in word/sentence blocks (CACHED_REPLAY_MODE)
+                        async for block in replay_text(answer):
+                            yield sse.chunk(block)
                         
                         # Signal completion with cache flag
                         payload = {
@@ -1248,7 +1278,7 @@ async def chat_stream_endpoint(request: ChatRequest, background_tasks: Backgroun
                             "isComplete": True,
                             "fromCache": "suggested_question"
                         }
-                        yield f"data: {json.dumps(payload)}\n\n"
+                        yield sse.event(payload)
                         
                         # Set metadata for cache hit
                         metadata = {
@@ -1271,30 +1301,11 @@ async def chat_stream_endpoint(request: ChatRequest, background_tasks: Backgroun
                 if chunk_data["type"] == "chunk":
                     # Collect full answer for logging
                     full_answer += chunk_data['content']
-                    # Use proper JSON encoding for the chunk content
-                    payload = {
-                        "status": "streaming",
-                        "chunk": chunk_data['content'],
-                        "isComplete": False
-                    }
-                    yield f"data: {json.dumps(payload)}\n\n"
+                    yield sse.chunk(chunk_data['content'])
                 elif chunk_data["type"] == "sources":
-                    # Send sources information
-                    published_sources = [
-                        doc for doc in chunk_data["sources"]
-                        if doc.metadata.get('status') == 'published'
-                    ]
-                    sources_count = len(published_sources)
-                    sources_json = jsonable_encoder([
-                        SourceDocument(page_content=doc.page_content, metadata=doc.metadata)
-                        for doc in published_sources
-                    ])
-                    payload = {
-                        "status": "sources",
-                        "sources": sources_json,
-                        "isComplete": False
-                    }
-                    yield f"data: {json.dumps(payload)}\n\n"
+                    # Send published sources (cache hits carry a pre-encoded payload)
+                    frame, sources_count = sse.sources(chunk_data["sources"])
+                    yield frame
                 elif chunk_data["type"] == "metadata":
                     # Capture metadata for logging
                     metadata = chunk_data.get("metadata", {})
@@ -1311,7 +1322,7 @@ async def chat_stream_endpoint(request: ChatRequest, background_tasks: Backgroun
                         "isComplete": True,
                         "fromCache": from_cache
                     }
-                    yield f"data: {json.dumps(payload)}\n\n"
+                    yield sse.event(payload)
                     break
                 elif chunk_data["type"] == "error":
                     status = "error"
@@ -1321,7 +1332,7 @@ async def chat_stream_endpoint(request: ChatRequest, background_tasks: Backgroun
                         "error": error_message,
                         "isComplete": True
                     }
-                    yield f"data: {json.dumps(payload)}\n\n"
+                    yield sse.event(payload)
                     break
 
         except Exception as e:
@@ -1333,8 +1344,9 @@ async def chat_stream_endpoint(request: ChatRequest, background_tasks: Backgroun
                 "error": "An error occurred while processing your query. Please try again or rephrase your question.",
                 "isComplete": True
             }
-            yield f"data: {json.dumps(payload)}\n\n"
+            yield sse.event(payload)
         finally:
+            sse.observe()
             # Log LLM request in background after stream completes
             duration = time.time() - start_time
             if metadata is None:
@@ -1505,14 +1517,15 @@ async def refresh_faiss_index_endpoint(request: Request):
                 detail={"error": "Service unavailable", "message": "MongoDB connection not available"}
             )
         
-        # Refresh the vector store (rebuilds FAISS from MongoDB)
-        rag_pipeline_instance.refresh_vector_store()
+        # Refresh the vector store in a worker thread; queries keep using the current
+        # retriever bundle until the new one is swapped in
+        await asyncio.to_thread(rag_pipeline_instance.refresh_vector_store)
         
-        # Get FAISS index size after refresh
+        # Get FAISS index size of the bundle now serving queries
         faiss_index_size = 0
-        if hasattr(rag_pipeline_instance.vector_store_manager, 'vector_store'):
-            if hasattr(rag_pipeline_instance.vector_store_manager.vector_store, 'index'):
-                faiss_index_size = rag_pipeline_instance.vector_store_manager.vector_store.index.ntotal
+        bundle = rag_pipeline_instance.retriever_bundle
+        if bundle is not None and hasattr(bundle.vector_store, 'index'):
+            faiss_index_size = bundle.vector_store.index.ntotal
         
         result = {
             "status": "success",
@@ -1520,6 +1533,7 @@ async def refresh_faiss_index_endpoint(request: Request):
             "mongodb_documents": mongo_doc_count,
             "mongodb_published": published_count,
             "faiss_index_size": faiss_index_size,
+            "retriever_bundle": rag_pipeline_instance.retriever_bundle_status(),
             "timestamp": datetime.utcnow().isoformat()
         }
         
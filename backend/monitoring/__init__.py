@@ -24,6 +24,8 @@ from .metrics import (
     suggested_question_cache_size,
     suggested_question_cache_refresh_duration_seconds,
     suggested_question_cache_refresh_errors_total,
+    suggested_question_cache_stale_hits_total,
+    suggested_question_cache_background_refreshes_total,
     llm_tokens_total,
     llm_requests_total,
     llm_cost_usd_total,
@@ -51,6 +53,8 @@ __all__ = [
     "suggested_question_cache_size",
     "suggested_question_cache_refresh_duration_seconds",
     "suggested_question_cache_refresh_errors_total",
+    "suggested_question_cache_stale_hits_total",
+    "suggested_question_cache_background_refreshes_total",
     "llm_tokens_total",
     "llm_requests_total",
     "llm_cost_usd_total",
@@ -137,6 +137,7 @@ class HealthChecker:
                 "cache_size": cache_stats.get("size", 0),
                 "cache_max_size": cache_stats.get("max_size", 1000),
                 "cache_utilization": cache_stats.get("size", 0) / cache_stats.get("max_size", 1000),
+                "cache_hit_rate": cache_stats.get("hit_rate", 0.0),
             }
         except Exception as e:
             logger.error(f"Cache health check failed: {e}", exc_info=True)
@@ -56,6 +56,37 @@ rag_cache_misses_total = Counter(
     ["cache_type"],
 )
 
+query_cache_evictions_total = Counter(
+    "query_cache_evictions_total",
+    "Entries dropped from the in-memory exact-match query cache",
+    ["reason"],  # reason: "capacity" (LRU), "expired" (TTL)
+)
+
+query_cache_invalidations_total = Counter(
+    "query_cache_invalidations_total",
+    "Exact-match query cache invalidations (L1 cleared, L2 generation bumped)",
+    ["source"],  # source: "local" (this worker), "remote" (another worker via pub/sub or version check)
+)
+
+query_cache_l2_lookup_seconds = Histogram(
+    "query_cache_l2_lookup_seconds",
+    "Redis L2 exact-match query cache lookup latency in seconds",
+    buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1],
+)
+
+rag_single_flight_requests_total = Counter(
+    "rag_single_flight_requests_total",
+    "Requests needing answer generation, by single-flight role",
+    ["mode", "role"],  # mode: "query", "stream"; role: "leader" (ran generation), "follower" (attached to a leader)
+)
+
+rag_single_flight_group_size = Histogram(
+    "rag_single_flight_group_size",
+    "Requests served by one generation run (1 = not coalesced)",
+    ["mode"],
+    buckets=[1, 2, 3, 5, 10, 20, 50, 100],
+)
+
 rag_retrieval_duration_seconds = Histogram(
     "rag_retrieval_duration_seconds",
     "Vector store retrieval duration in seconds",
@@ -105,6 +136,50 @@ rag_llm_generation_duration_seconds = Histogram(
     buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0],
 )
 
+# Infinity Embedding Client Metrics
+infinity_embed_requests_total = Counter(
+    "infinity_embed_requests_total",
+    "Total /embeddings requests sent to Infinity",
+    ["status"],  # status: "success", "error"
+)
+
+infinity_embed_batch_size = Histogram(
+    "infinity_embed_batch_size",
+    "Number of texts sent per /embeddings request",
+    buckets=[1, 2, 4, 8, 16, 32, 64, 128],
+)
+
+infinity_embed_coalesced_total = Counter(
+    "infinity_embed_coalesced_total",
+    "embed_query calls served without a request of their own",
+    ["reason"],  # reason: "batched" (joined a micro-batch), "deduplicated" (identical text in flight)
+)
+
+infinity_http_clients_created_total = Counter(
+    "infinity_http_clients_created_total",
+    "Pooled HTTP clients created for Infinity (should stay near 1 per process)",
+)
+
+infinity_http_pool_connections = Gauge(
+    "infinity_http_pool_connections",
+    "Connections held by the pooled Infinity HTTP client",
+    ["state"],  # state: "active", "idle"
+)
+
+# Chat Stream (SSE) Metrics
+chat_stream_cpu_seconds = Histogram(
+    "chat_stream_cpu_seconds",
+    "Per-request CPU time spent building SSE frames in the chat stream endpoint",
+    ["phase"],  # phase: "sources" (filter + encode sources), "frames" (chunk/control frames), "total"
+    buckets=[0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1],
+)
+
+chat_stream_sources_encoded_total = Counter(
+    "chat_stream_sources_encoded_total",
+    "Sources events sent by the chat stream endpoint",
+    ["result"],  # result: "cached" (pre-encoded bytes reused), "encoded" (serialized for this request)
+)
+
 # Suggested Question Cache Metrics
 suggested_question_cache_hits_total = Counter(
     "suggested_question_cache_hits_total",
@@ -140,6 +215,37 @@ suggested_question_cache_refresh_errors_total = Counter(
     "Total number of errors during suggested question cache refresh",
 )
 
+suggested_question_cache_stale_hits_total = Counter(
+    "suggested_question_cache_stale_hits_total",
+    "Suggested question cache entries served past their soft TTL",
+)
+
+suggested_question_cache_background_refreshes_total = Counter(
+    "suggested_question_cache_background_refreshes_total",
+    "Background regenerations of stale suggested question cache entries",
+    ["result"],  # result: "refreshed", "declined" (generic error answer), "deduplicated" (another worker), "error"
+)
+
+# FAQ Question Cache Metrics
+faq_question_cache_lookups_total = Counter(
+    "faq_question_cache_lookups_total",
+    "Chunks looked up in the FAQ question cache during FAQ generation",
+    ["result"],  # result: "hit" (questions reused), "miss" (sent to the LLM)
+)
+
+faq_question_cache_hit_ratio = Histogram(
+    "faq_question_cache_hit_ratio",
+    "Share of chunks whose questions were reused, per FAQ generation run (one per webhook)",
+    buckets=[0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 0.95, 1.0],
+)
+
+# Chunk Store Metrics
+chunk_store_lookups_total = Counter(
+    "chunk_store_lookups_total",
+    "Source chunk lookups for cached answers",
+    ["result"],  # result: "memo" (in-process), "redis", "missing" (expired/undecodable)
+)
+
 # LLM Observability Metrics
 llm_requests_total = Counter(
     "llm_requests_total",
@@ -210,6 +316,65 @@ vector_store_health = Gauge(
     "Vector store health status (1 = healthy, 0 = unhealthy)",
 )
 
+# Parent Chunk Index Metrics (FAQ Parent Document Pattern)
+parent_chunk_index_size = Gauge(
+    "parent_chunk_index_size",
+    "Number of parent chunks held in the in-process chunk_id index",
+)
+
+parent_chunk_index_build_duration_seconds = Histogram(
+    "parent_chunk_index_build_duration_seconds",
+    "Time spent building the parent chunk index from MongoDB",
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+)
+
+parent_chunk_index_updates_total = Counter(
+    "parent_chunk_index_updates_total",
+    "Parent chunk index maintenance operations",
+    ["operation"],  # operation: "build", "upsert", "remove", "invalidate"
+)
+
+# BM25 Index Metrics (in-process inverted index for hybrid retrieval)
+bm25_index_documents = Gauge(
+    "bm25_index_documents",
+    "Number of documents held in the in-process BM25 index",
+)
+
+bm25_index_build_duration_seconds = Histogram(
+    "bm25_index_build_duration_seconds",
+    "Time spent tokenizing and indexing the full BM25 corpus",
+    buckets=[0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0],
+)
+
+bm25_index_updates_total = Counter(
+    "bm25_index_updates_total",
+    "BM25 index maintenance operations",
+    ["operation"],  # operation: "build", "add", "upsert", "remove", "invalidate"
+)
+
+# Retriever Bundle Metrics (double-buffered FAISS + BM25 + parent map snapshot)
+retriever_bundle_generation = Gauge(
+    "retriever_bundle_generation",
+    "Generation number of the retriever bundle currently served to queries",
+)
+
+retriever_bundle_build_duration_seconds = Histogram(
+    "retriever_bundle_build_duration_seconds",
+    "Time to build a retriever bundle in the background (FAISS load, BM25, chains, parent map)",
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0],
+)
+
+retriever_bundle_swap_latency_seconds = Histogram(
+    "retriever_bundle_swap_latency_seconds",
+    "Time from the earliest refresh request included in a bundle until the bundle is swapped in",
+    buckets=[0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0],
+)
+
+retriever_bundle_staleness_seconds = Gauge(
+    "retriever_bundle_staleness_seconds",
+    "Seconds since the oldest content change not yet visible to queries (0 when up to date)",
+)
+
 # Webhook Processing Metrics
 webhook_processing_total = Counter(
     "webhook_processing_total",
@@ -224,6 +389,35 @@ webhook_processing_duration_seconds = Histogram(
     buckets=[0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0],
 )
 
+webhook_chunk_changes_total = Counter(
+    "webhook_chunk_changes_total",
+    "Chunks per diff-based webhook re-ingestion, by outcome",
+    ["source", "change"],  # change: "kept" (unchanged, not re-embedded), "patched" (moved, metadata only), "added", "removed"
+)
+
+ingestion_queue_depth = Gauge(
+    "ingestion_queue_depth",
+    "Payload documents waiting in the ingestion queue (one per payload_id)",
+)
+
+ingestion_queue_active_jobs = Gauge(
+    "ingestion_queue_active_jobs",
+    "Ingestion jobs currently being processed",
+)
+
+ingestion_jobs_total = Counter(
+    "ingestion_jobs_total",
+    "Ingestion queue job outcomes",
+    ["operation", "status"],  # status: "success", "error", "retry", "coalesced"
+)
+
+ingestion_publish_to_searchable_seconds = Histogram(
+    "ingestion_publish_to_searchable_seconds",
+    "Seconds from the CMS change (document updatedAt) until it is searchable",
+    ["operation"],
+    buckets=[1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0],
+)
+
 # Application Health Metrics
 application_health = Gauge(
     "application_health",
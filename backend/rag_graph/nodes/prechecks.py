@@ -13,12 +13,16 @@ def make_prechecks_node(pipeline: Any):
         """
         Prechecks: intent (optional) and exact cache check.
 
+        With state["bypass_cache"] the FAQ (suggested question) and exact cache
+        lookups are skipped, so the caller always gets a freshly generated answer.
+
         We keep this conservative: if integrations aren't configured on the pipeline yet,
         this node becomes a no-op.
         """
         query_text = state.get("sanitized_query") or state.get("raw_query") or ""
         effective_history = state.get("effective_history_pairs") or []
         is_dependent = bool(state.get("is_dependent", False))
+        bypass_cache = bool(state.get("bypass_cache", False))
 
         metadata: Dict[str, Any] = state.get("metadata") or {}
 
@@ -55,7 +59,7 @@ def make_prechecks_node(pipeline: Any):
                         return state
 
                     # FAQ match: try suggested question cache (if available)
-                    if intent == Intent.FAQ_MATCH and matched_faq:
+                    if intent == Intent.FAQ_MATCH and matched_faq and not bypass_cache:
                         suggested_cache = (
                             pipeline.get_suggested_question_cache()
                             if hasattr(pipeline, "get_suggested_question_cache")
@@ -93,9 +97,13 @@ def make_prechecks_node(pipeline: Any):
 
         # 2) Exact cache check (optional)
         query_cache = getattr(pipeline, "query_cache", None)
-        if query_cache and hasattr(query_cache, "get"):
+        if query_cache and hasattr(query_cache, "get") and not bypass_cache:
             try:
-                cached = query_cache.get(query_text, effective_history)
+                if hasattr(query_cache, "aget"):
+                    # In-process L1, then the Redis L2 shared by all workers
+                    cached = await query_cache.aget(query_text, effective_history)
+                else:
+                    cached = query_cache.get(query_text, effective_history)
                 if cached:
                     answer, sources = cached
                     state.update(
@@ -32,7 +32,12 @@ def make_resolve_parents_node(pipeline: Any):
         try:
             from backend.services.faq_generator import resolve_parents as resolve_parents_fn
 
-            parent_chunks_map = pipeline._load_parent_chunks_map() if hasattr(pipeline, "_load_parent_chunks_map") else {}
+            # Prefer the parent map of the bundle this query retrieved from (same generation)
+            bundle = state.get("retriever_bundle")
+            if bundle is not None and bundle.parent_chunks_map:
+                parent_chunks_map = bundle.parent_chunks_map
+            else:
+                parent_chunks_map = pipeline._load_parent_chunks_map() if hasattr(pipeline, "_load_parent_chunks_map") else {}
             if parent_chunks_map:
                 resolved = resolve_parents_fn(context_docs, parent_chunks_map)
                 state["context_docs"] = resolved
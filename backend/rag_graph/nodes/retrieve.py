@@ -3,10 +3,19 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 from langchain_core.documents import Document
 
+from backend.services.hybrid_fusion import (
+    HYBRID_BM25_WEIGHT,
+    HYBRID_VECTOR_WEIGHT,
+    RankedList,
+    fuse_ranked_lists,
+    resolve_fusion_mode,
+    vector_scores_higher_is_better,
+)
+
 from ..state import RAGState
 
 
@@ -16,7 +25,8 @@ def make_retrieve_node(pipeline: Any):
         Retrieval node.
 
         Full behavior: when Infinity embeddings are enabled and a vector exists, run
-        Infinity vector search + BM25 in parallel, then optionally sparse re-rank.
+        Infinity vector search + BM25 in parallel, fuse the two rankings by chunk_id,
+        resolve FAQ parents on the scored list, then optionally sparse re-rank.
         Otherwise, fall back to the pipeline's hybrid retriever.
         """
         metadata: Dict[str, Any] = state.get("metadata") or {}
@@ -47,82 +57,125 @@ def make_retrieve_node(pipeline: Any):
         query_vector = state.get("query_vector")
         query_sparse = state.get("query_sparse")
 
+        # Snapshot the retriever bundle once so every stage of this query reads the same
+        # generation (FAISS, BM25, hybrid retriever, parent map) even if a refresh swaps in
+        # a new one mid-query. Pipelines without bundles expose the retrievers directly.
+        bundle = getattr(pipeline, "retriever_bundle", None)
+        if bundle is not None:
+            vector_store = bundle.vector_store
+            bm25 = bundle.bm25_retriever
+            hybrid_retriever = bundle.hybrid_retriever
+            state["retriever_bundle"] = bundle
+            metadata["retriever_generation"] = bundle.generation
+        else:
+            vector_store_manager = getattr(pipeline, "vector_store_manager", None)
+            vector_store = getattr(vector_store_manager, "vector_store", None)
+            bm25 = getattr(pipeline, "bm25_retriever", None)
+            hybrid_retriever = getattr(pipeline, "hybrid_retriever", None)
+
         # Infinity hybrid retrieval path
-        if use_infinity and query_vector is not None and getattr(pipeline, "vector_store_manager", None):
-            infinity = pipeline.get_infinity_embeddings() if hasattr(pipeline, "get_infinity_embeddings") else None
-            vector_docs: List[Document] = []
-            bm25_docs: List[Document] = []
+        if use_infinity and query_vector is not None and vector_store is not None:
+            vector_results: List[Tuple[Document, float]] = []
+            bm25_results: List[Tuple[Document, float]] = []
 
             try:
                 def run_vector_search():
-                    return pipeline.vector_store_manager.vector_store.similarity_search_with_score_by_vector(  # type: ignore[attr-defined]
+                    return vector_store.similarity_search_with_score_by_vector(  # type: ignore[attr-defined]
                         query_vector, k=retriever_k * 2
                     )
 
                 def run_bm25_search():
-                    bm25 = getattr(pipeline, "bm25_retriever", None)
                     if not bm25:
                         return []
+                    bm25_k = retriever_k * (4 if is_short_query else 2)
+                    if hasattr(bm25, "search_with_scores"):
+                        # Per-call k: the retriever is shared across concurrent queries
+                        return bm25.search_with_scores(retrieval_query, k=bm25_k)
                     original_k = getattr(bm25, "k", retriever_k)
-                    bm25.k = retriever_k * (4 if is_short_query else 2)
+                    bm25.k = bm25_k
                     try:
-                        return bm25.invoke(retrieval_query)
+                        docs = bm25.invoke(retrieval_query)
                     finally:
                         bm25.k = original_k
+                    # Retrievers without scores: rank order only
+                    return [(doc, float(len(docs) - i)) for i, doc in enumerate(docs)]
 
                 vector_task = asyncio.to_thread(run_vector_search)
-                bm25 = getattr(pipeline, "bm25_retriever", None)
                 bm25_task = asyncio.to_thread(run_bm25_search) if bm25 else None
 
                 if bm25_task:
-                    vector_results, bm25_docs = await asyncio.gather(vector_task, bm25_task)
+                    vector_results, bm25_results = await asyncio.gather(vector_task, bm25_task)
                 else:
                     vector_results = await vector_task
-                    bm25_docs = []
+                    bm25_results = []
 
                 # NOTE: FAISS (via LangChain) commonly returns a *distance* score where
                 # lower is better (not a similarity where higher is better).
                 # Thresholding with `score >= MIN_VECTOR_SIMILARITY` can therefore drop
                 # the best matches and keep worse ones. We avoid score-based filtering
                 # and just take the top-K results returned by the vector store.
-                vector_docs = [doc for doc, _score in (vector_results or [])[:retriever_k]]
+                vector_results = list(vector_results or [])[:retriever_k]
 
             except Exception as e:
                 logger.warning("Infinity parallel retrieval failed; falling back: %s", e, exc_info=True)
-                vector_docs = []
-                bm25_docs = []
-
-            # Merge + dedupe (BM25 first)
-            seen = set()
-            candidate_docs: List[Document] = []
-            for doc in bm25_docs:
-                key = doc.page_content[:200]
-                if key not in seen:
-                    seen.add(key)
-                    candidate_docs.append(doc)
-            for doc in vector_docs:
-                key = doc.page_content[:200]
-                if key not in seen:
-                    seen.add(key)
-                    candidate_docs.append(doc)
-
-            # Sparse re-ranking if available
-            if query_sparse and infinity and candidate_docs:
+                vector_results = []
+                bm25_results = []
+
+            # Fuse BM25 and vector rankings by chunk_id (weighted RRF or normalized scores)
+            fused = fuse_ranked_lists(
+                [
+                    RankedList("bm25", bm25_results, weight=HYBRID_BM25_WEIGHT),
+                    RankedList(
+                        "vector",
+                        vector_results,
+                        weight=HYBRID_VECTOR_WEIGHT,
+                        higher_is_better=vector_scores_higher_is_better(vector_store),
+                    ),
+                ]
+            )
+            metadata["fusion_mode"] = resolve_fusion_mode()
+
+            # Swap synthetic FAQ hits for their parents on the scored list, so re-rank and
+            # truncation operate on unique parent chunks
+            if fused and getattr(pipeline, "use_faq_indexing", False) and any(
+                doc.metadata.get("is_synthetic", False) for doc, _score in fused
+            ):
+                try:
+                    from backend.services.faq_generator import resolve_parents_from_tuples
+
+                    if bundle is not None and bundle.parent_chunks_map:
+                        parent_chunks_map = bundle.parent_chunks_map
+                    else:
+                        parent_chunks_map = pipeline._load_parent_chunks_map() if hasattr(pipeline, "_load_parent_chunks_map") else {}
+                    if parent_chunks_map:
+                        fused = resolve_parents_from_tuples(fused, parent_chunks_map)
+                except Exception as e:
+                    logger.warning("FAQ parent resolution on fused results failed: %s", e)
+
+            candidate_docs: List[Document] = [doc for doc, _score in fused]
+
+            # Sparse re-ranking against document sparse vectors precomputed at ingest
+            # (lookup + dot product only; no embedding call on the query path)
+            vector_store_manager = getattr(pipeline, "vector_store_manager", None)
+            if query_sparse and candidate_docs and hasattr(vector_store_manager, "get_sparse_index"):
                 try:
                     candidates_for_rerank = candidate_docs[:sparse_rerank_limit]
-                    doc_texts = [d.page_content[:8000] for d in candidates_for_rerank]
-                    _, doc_sparse_list = await infinity.embed_documents(doc_texts)
-
-                    doc_scores = []
-                    for i, (doc, doc_sparse) in enumerate(zip(candidates_for_rerank, doc_sparse_list)):
-                        if doc_sparse:
-                            score = infinity.sparse_similarity(query_sparse, doc_sparse)
-                        else:
-                            score = 0.0
-                        doc_scores.append((score, i, doc))
-
-                    doc_scores.sort(reverse=True, key=lambda x: x[0])
-                    reranked = [doc for _, _, doc in doc_scores]
+                    sparse_index = await asyncio.to_thread(vector_store_manager.get_sparse_index)
+                    scores = sparse_index.score(query_sparse, candidates_for_rerank)
+
+                    # Candidates without a stored vector (ingested before sparse vectors were
+                    # persisted) keep their slot; scored candidates are re-ordered among themselves.
+                    scored = sorted(
+                        ((score, i, doc) for i, (doc, score) in enumerate(zip(candidates_for_rerank, scores)) if score is not None),
+                        key=lambda x: (-x[0], x[1]),
+                    )
+                    scored_iter = iter(doc for _, _, doc in scored)
+                    reranked = [next(scored_iter) if score is not None else doc for doc, score in zip(candidates_for_rerank, scores)]
+                    if scored and len(scored) < len(candidates_for_rerank):
+                        logger.debug(
+                            "Sparse re-rank: %d/%d candidates have precomputed vectors",
+                            len(scored), len(candidates_for_rerank),
+                        )
                     # Add remaining candidates if needed
                     if len(reranked) < retriever_k and len(candidate_docs) > len(candidates_for_rerank):
                         remaining = [d for d in candidate_docs[sparse_rerank_limit:] if d not in reranked]
@@ -137,7 +190,7 @@ def make_retrieve_node(pipeline: Any):
             # Fallback if nothing retrieved
             if not context_docs:
                 try:
-                    retriever = getattr(pipeline, "hybrid_retriever", None)
+                    retriever = hybrid_retriever
                     if retriever and hasattr(retriever, "ainvoke"):
                         context_docs = await retriever.ainvoke(retrieval_query)
                         retrieval_failed = True
@@ -146,7 +199,7 @@ def make_retrieve_node(pipeline: Any):
                     context_docs = []
         else:
             # Legacy: use hybrid retriever directly.
-            retriever = getattr(pipeline, "hybrid_retriever", None)
+            retriever = hybrid_retriever
             try:
                 if retriever and hasattr(retriever, "ainvoke"):
                     context_docs = await retriever.ainvoke(retrieval_query)
@@ -14,6 +14,7 @@ def make_semantic_cache_node(pipeline: Any):
         Semantic cache check (Redis vector cache or legacy semantic cache).
 
         In the skeleton, this is a no-op unless the pipeline exposes the needed objects.
+        With state["bypass_cache"] only the query embedding is computed (retrieval uses it).
         """
         metadata: Dict[str, Any] = state.get("metadata") or {}
 
@@ -52,6 +53,10 @@ def make_semantic_cache_node(pipeline: Any):
         state["query_vector"] = query_vector
         state["query_sparse"] = query_sparse
 
+        if state.get("bypass_cache"):
+            state["metadata"] = metadata
+            return state
+
         # === 2) Redis vector cache (unified semantic cache) ===
         if getattr(pipeline, "use_redis_cache", False) and query_vector:
             redis_cache = pipeline.get_redis_vector_cache() if hasattr(pipeline, "get_redis_vector_cache") else None
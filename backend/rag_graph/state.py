@@ -17,6 +17,7 @@ class RAGState(TypedDict, total=False):
     # Inputs
     raw_query: str
     chat_history_pairs: List[Tuple[str, str]]
+    bypass_cache: bool  # Skip every answer-cache lookup (regenerating a cached answer)
 
     # Sanitized + normalized
     sanitized_query: str
@@ -45,6 +46,7 @@ class RAGState(TypedDict, total=False):
 
     # Retrieval
     retrieval_query: str
+    retriever_bundle: Any  # RetrieverBundle snapshot used for this query
     context_docs: List[Document]
     published_sources: List[Document]
     retrieval_failed: bool
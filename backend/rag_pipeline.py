@@ -1,5 +1,7 @@
 import os
 import asyncio
+import hashlib
+import json
 import time
 import re
 import logging
@@ -15,12 +17,16 @@ try:
 except ImportError:
     # Fallback for older pydantic versions
     from pydantic.v1 import BaseModel, Field
-from langchain_community.retrievers import BM25Retriever
 from langchain.retrievers import EnsembleRetriever
 from langchain.chains import create_history_aware_retriever, create_retrieval_chain
 from langchain.chains.combine_documents import create_stuff_documents_chain
 from data_ingestion.vector_store_manager import VectorStoreManager
-from cache_utils import query_cache, SemanticCache
+from cache_utils import shared_query_cache, SemanticCache
+from backend.services.parent_chunk_index import ParentChunkIndex
+from backend.services.bm25_index import BM25Index, BM25IndexRetriever
+from backend.services.retriever_bundle import RetrieverBundle, RetrieverBundleHolder
+from backend.utils.stream_replay import replay_text
+from backend.utils.single_flight import SingleFlight
 from backend.utils.input_sanitizer import sanitize_query_input, detect_prompt_injection
 from backend.utils.litecoin_vocabulary import normalize_ltc_keywords, expand_ltc_entities, LTC_ENTITY_EXPANSIONS
 from fastapi import HTTPException
@@ -47,6 +53,9 @@ SHORT_QUERY_WORD_THRESHOLD = int(os.getenv("SHORT_QUERY_WORD_THRESHOLD", "3"))
 SHORT_QUERY_EXPANSION_MAX_WORDS = int(os.getenv("SHORT_QUERY_EXPANSION_MAX_WORDS", "12"))
 SHORT_QUERY_EXPANSION_CACHE_MAX = int(os.getenv("SHORT_QUERY_EXPANSION_CACHE_MAX", "512"))
 
+# Coalesce identical concurrent generations (same rewritten query + effective history)
+RAG_SINGLE_FLIGHT_ENABLED = os.getenv("RAG_SINGLE_FLIGHT_ENABLED", "true").lower() == "true"
+
 # --- User-facing error messages (shared across modules) ---
 GENERIC_USER_ERROR_MESSAGE = (
     "I encountered an error while processing your query. Please try again or rephrase your question."
@@ -147,8 +156,9 @@ def _get_suggested_question_cache():
     global _suggested_question_cache
     if _suggested_question_cache is None:
         try:
-            from backend.cache_utils import SuggestedQuestionCache
-            _suggested_question_cache = SuggestedQuestionCache()
+            # Shared instance: stale FAQ-match hits join the same background refresh queue
+            from backend.cache_utils import suggested_question_cache
+            _suggested_question_cache = suggested_question_cache
             logging.getLogger(__name__).info("SuggestedQuestionCache initialized")
         except Exception as e:
             logging.getLogger(__name__).warning(f"Failed to initialize SuggestedQuestionCache: {e}")
@@ -344,6 +354,10 @@ class RAGPipeline:
 
     # Process-level cache for BM25 doc corpus (MongoDB read is slow; corpus is small ~400 docs)
     _published_docs_cache: Dict[Tuple[str, str], List[Document]] = {}
+    # Process-level chunk_id -> Document index for FAQ parent resolution (built once, updated incrementally)
+    _parent_chunk_indexes: Dict[Tuple[str, str], ParentChunkIndex] = {}
+    # Process-level BM25 inverted index (built once from the corpus, updated incrementally)
+    _bm25_indexes: Dict[Tuple[str, str], BM25Index] = {}
     
     def __init__(self, vector_store_manager=None, db_name=None, collection_name=None):
         """
@@ -399,17 +413,14 @@ class RAGPipeline:
             logger.warning(f"Failed to initialize local tokenizer: {e}. Will use fallback methods.")
             self.tokenizer_model = None
 
-        # Setup hybrid retrievers (BM25 + semantic + history-aware)
-        self._setup_retrievers()
-        
         # Create document combining chain for final answer generation
         self.document_chain = create_stuff_documents_chain(self.llm, RAG_PROMPT)
         
-        # Create full retrieval chain that passes chat_history to final generation
-        self.rag_chain = create_retrieval_chain(
-            self.history_aware_retriever,
-            self.document_chain
-        )
+        # Build the first retriever bundle (FAISS snapshot + BM25 + hybrid/history-aware
+        # retrievers + retrieval chain + parent map). Refreshes build the next generation
+        # in the background and swap it in atomically.
+        self._retriever_bundles = RetrieverBundleHolder(self._build_retriever_bundle)
+        self._retriever_bundles.rebuild()
         
         # Initialize semantic cache with the embedding model from VectorStoreManager
         # Skip legacy semantic cache when using Redis Stack cache (unified semantic cache provider)
@@ -427,7 +438,8 @@ class RAGPipeline:
             logger.info(f"Legacy semantic cache initialized with threshold={self.semantic_cache.threshold}, TTL={self.semantic_cache.ttl_seconds}s")
 
         # --- Expose config + dependencies for LangGraph nodes (no module imports in nodes) ---
-        self.query_cache = query_cache
+        # Two-tier exact cache: in-process L1 + Redis L2 shared by all workers
+        self.query_cache = shared_query_cache
         self.use_local_rewriter = USE_LOCAL_REWRITER
         self.use_infinity_embeddings = USE_INFINITY_EMBEDDINGS
         self.use_redis_cache = USE_REDIS_CACHE
@@ -454,6 +466,10 @@ class RAGPipeline:
         self.check_spend_limit = check_spend_limit
         self.record_spend = record_spend
 
+        # Single-flight groups: concurrent requests needing the same generation share one run
+        self.query_flight = SingleFlight("query", enabled=RAG_SINGLE_FLIGHT_ENABLED)
+        self.stream_flight = SingleFlight("stream", enabled=RAG_SINGLE_FLIGHT_ENABLED)
+
         # LangGraph compiled graph (lazy)
         self._rag_graph = None
 
@@ -512,11 +528,12 @@ class RAGPipeline:
 
     def _load_parent_chunks_map(self) -> Dict[str, Document]:
         """
-        Load parent chunks map from MongoDB for Parent Document Pattern resolution.
+        Get the parent chunks map for Parent Document Pattern resolution.
         
-        Loads all non-synthetic documents (original chunks) and builds a map
-        from chunk_id to Document. This map is used to swap synthetic question
-        hits with their full-text parent chunks at retrieval time.
+        Served from the process-level ParentChunkIndex, which loads all non-synthetic
+        documents (original chunks) from MongoDB once and is then kept current by the
+        ingestion paths. This map is used to swap synthetic question hits with their
+        full-text parent chunks at retrieval time.
         
         Returns:
             Dict mapping chunk_id -> Document for all non-synthetic chunks
@@ -529,81 +546,158 @@ class RAGPipeline:
             return {}
         
         try:
-            # Query for non-synthetic documents with chunk_id
-            cursor = self.vector_store_manager.collection.find(
-                {
-                    "metadata.is_synthetic": {"$ne": True},
-                    "metadata.chunk_id": {"$exists": True}
-                },
-                {"text": 1, "metadata": 1}
-            ).limit(20000)  # Safety limit
-            
-            chunks_map: Dict[str, Document] = {}
-            for doc in cursor:
-                chunk_id = doc.get("metadata", {}).get("chunk_id")
-                if chunk_id:
-                    chunks_map[chunk_id] = Document(
-                        page_content=doc.get("text", ""),
-                        metadata=doc.get("metadata", {})
-                    )
-            
-            logger.debug(f"Loaded {len(chunks_map)} parent chunks for FAQ resolution")
-            return chunks_map
-            
+            return self.parent_chunk_index.get(self.vector_store_manager.collection)
         except Exception as e:
             logger.error(f"Failed to load parent chunks map: {e}", exc_info=True)
             return {}
 
-    def _setup_retrievers(self):
-        """Setup hybrid retriever with proper document loading."""
-        # 1. Load published docs from MongoDB
-        all_published_docs = self._load_published_docs_from_mongo()
+    @property
+    def parent_chunk_index(self) -> ParentChunkIndex:
+        """Shared parent chunk index for this pipeline's (db, collection)."""
+        cache_key = (self.db_name, self.collection_name)
+        index = self.__class__._parent_chunk_indexes.get(cache_key)
+        if index is None:
+            index = self.__class__._parent_chunk_indexes.setdefault(cache_key, ParentChunkIndex())
+        return index
+
+    @property
+    def bm25_index(self) -> BM25Index:
+        """Writer BM25 index for this pipeline's (db, collection); bundles search snapshots of it."""
+        cache_key = (self.db_name, self.collection_name)
+        index = self.__class__._bm25_indexes.get(cache_key)
+        if index is None:
+            index = self.__class__._bm25_indexes.setdefault(cache_key, BM25Index())
+        return index
 
-        # 2. Create BM25 retriever (only if we have docs)
-        if all_published_docs:
-            self.bm25_retriever = BM25Retriever.from_documents(
-                all_published_docs,
-                k=RETRIEVER_K
-            )
-            logger.info(f"BM25 retriever initialized with k={RETRIEVER_K}")
+    def apply_payload_update(self, payload_id: str, documents: List[Document]) -> None:
+        """
+        Incrementally apply a re-ingested Payload document to the in-process indexes.
+
+        Call after the vector store has been updated, then refresh with
+        refresh_vector_store(incremental=True) so the indexes are not rebuilt.
+        """
+        # BM25 corpus holds published documents only (same filter as the MongoDB load)
+        self.bm25_index.upsert_payload(
+            payload_id,
+            [d for d in documents if (d.metadata or {}).get("status") == "published"],
+        )
+        if not USE_FAQ_INDEXING:
+            return
+        index = self.parent_chunk_index
+        index.remove_payload(payload_id)
+        index.upsert(documents)
+
+    def apply_payload_removal(self, payload_id: str) -> None:
+        """Incrementally drop a deleted/unpublished Payload document from the in-process indexes."""
+        self.bm25_index.remove_payload(payload_id)
+        if not USE_FAQ_INDEXING:
+            return
+        self.parent_chunk_index.remove_payload(payload_id)
+
+    def _build_retriever_bundle(self, generation: int) -> RetrieverBundle:
+        """
+        Build a complete retriever bundle without touching the one serving queries.
+
+        Runs on a worker thread during refreshes; everything here (FAISS snapshot,
+        BM25 corpus load, parent map) happens off the query path.
+        """
+        # 1. Read snapshot of the FAISS store (ingestion keeps writing to its own copy)
+        vector_store = self.vector_store_manager.snapshot_vector_store()
+
+        # 2. BM25 retriever over a snapshot of the writer index. The corpus is tokenized
+        # once from MongoDB; webhook updates then patch the writer by payload_id
+        # (apply_payload_update) and only reach queries with the next bundle.
+        writer_index = self.bm25_index
+        if not writer_index.is_built:
+            all_published_docs = self._load_published_docs_from_mongo()
+            if all_published_docs:
+                writer_index.build(all_published_docs)
+        bm25_index = writer_index.snapshot()
+        if bm25_index.size:
+            bm25_retriever = BM25IndexRetriever(index=bm25_index, k=RETRIEVER_K)
+            logger.info(f"BM25 retriever initialized with k={RETRIEVER_K} ({bm25_index.size} docs)")
         else:
-            self.bm25_retriever = None
+            bm25_retriever = None
             logger.warning("BM25 retriever disabled: no published documents loaded")
 
-        # 3. Semantic retriever with filter
-        search_kwargs = {"k": RETRIEVER_K}
-        if self.vector_store_manager.mongodb_available:
-            # Note: FAISS doesn't support metadata filtering directly, but we filter after retrieval
-            pass
-        
-        self.semantic_retriever = self.vector_store_manager.get_retriever(
+        # 3. Semantic retriever over the snapshot
+        # Note: FAISS doesn't support metadata filtering directly, but we filter after retrieval
+        semantic_retriever = vector_store.as_retriever(
             search_type="similarity",
-            search_kwargs=search_kwargs
+            search_kwargs={"k": RETRIEVER_K}
         )
 
         # 4. Hybrid retriever
-        retrievers = [self.semantic_retriever]
+        retrievers = [semantic_retriever]
         weights = [1.0]
 
-        if self.bm25_retriever:
-            retrievers.insert(0, self.bm25_retriever)
+        if bm25_retriever:
+            retrievers.insert(0, bm25_retriever)
             weights = [0.5, 0.5]
 
-        self.hybrid_retriever = EnsembleRetriever(
+        hybrid_retriever = EnsembleRetriever(
             retrievers=retrievers,
             weights=weights,
             search_type="similarity"
         )
 
         # 5. History-aware hybrid retriever (THIS FIXES TOPIC DRIFT)
-        self.history_aware_retriever = create_history_aware_retriever(
+        history_aware_retriever = create_history_aware_retriever(
             llm=self.llm,
-            retriever=self.hybrid_retriever,
+            retriever=hybrid_retriever,
             prompt=QA_WITH_HISTORY_PROMPT
         )
 
-        logger.info(f"Hybrid retriever ready | BM25: {'enabled' if self.bm25_retriever else 'disabled'} "
-                    f"| Weights: {weights}")
+        # 6. Full retrieval chain that passes chat_history to final generation
+        rag_chain = create_retrieval_chain(
+            history_aware_retriever,
+            self.document_chain
+        )
+
+        logger.info(f"Hybrid retriever ready | BM25: {'enabled' if bm25_retriever else 'disabled'} "
+                    f"| Weights: {weights} | generation {generation}")
+
+        return RetrieverBundle(
+            generation=generation,
+            vector_store=vector_store,
+            bm25_retriever=bm25_retriever,
+            semantic_retriever=semantic_retriever,
+            hybrid_retriever=hybrid_retriever,
+            history_aware_retriever=history_aware_retriever,
+            rag_chain=rag_chain,
+            # 7. Parent chunk map snapshot (copy-on-write dict, safe to share)
+            parent_chunks_map=self._load_parent_chunks_map(),
+        )
+
+    @property
+    def retriever_bundle(self) -> RetrieverBundle:
+        """Current retriever bundle; snapshot it once per query."""
+        return self._retriever_bundles.current
+
+    def retriever_bundle_status(self) -> Dict[str, Any]:
+        """Generation, age and staleness of the bundle serving queries."""
+        return self._retriever_bundles.status()
+
+    # Read-only views of the current bundle (kept for callers that predate bundles)
+    @property
+    def bm25_retriever(self):
+        return self.retriever_bundle.bm25_retriever
+
+    @property
+    def semantic_retriever(self):
+        return self.retriever_bundle.semantic_retriever
+
+    @property
+    def hybrid_retriever(self):
+        return self.retriever_bundle.hybrid_retriever
+
+    @property
+    def history_aware_retriever(self):
+        return self.retriever_bundle.history_aware_retriever
+
+    @property
+    def rag_chain(self):
+        return self.retriever_bundle.rag_chain
 
     def _truncate_chat_history(self, chat_history: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
         """
@@ -833,43 +927,52 @@ class RAGPipeline:
         
         return input_tokens, output_tokens
 
-    def refresh_vector_store(self):
+    def refresh_vector_store(self, incremental: bool = False):
         """
-        Refreshes the vector store by reloading from disk and recreating the RAG chain.
+        Builds a new retriever bundle from the current content and swaps it in atomically.
         This should be called after new documents are added to ensure queries use the latest content.
+
+        Blocking: call it from a worker thread (webhook background tasks already run in
+        the threadpool; async callers should use asyncio.to_thread). Queries keep reading
+        the previous bundle until the swap, and concurrent refreshes are coalesced.
         
-        NOTE: This does NOT rebuild from MongoDB - it only reloads the FAISS index from disk.
-        The add_documents() method already saves to disk after adding, so this just picks up
-        those changes. For a full rebuild from MongoDB, use vector_store_manager._create_faiss_from_mongodb().
+        NOTE: This does NOT rebuild FAISS from MongoDB - it snapshots the in-memory index
+        (reloaded from disk first unless incremental). For a full rebuild from MongoDB, use
+        vector_store_manager._create_faiss_from_mongodb().
+
+        Args:
+            incremental: True when the caller already applied its changes to the in-process
+                indexes (see apply_payload_update/apply_payload_removal) and to this pipeline's
+                VectorStoreManager. Otherwise the parent chunk and BM25 writer indexes are
+                invalidated and the FAISS index is reloaded from disk first; the bundle serving
+                queries keeps its own snapshots of both until the swap.
         """
         try:
             logger.info("Refreshing vector store and hybrid retrievers...")
 
-            # Invalidate BM25 corpus cache so changes in MongoDB are reflected
+            if not incremental:
+                self.parent_chunk_index.invalidate()
+                self.bm25_index.invalidate()
+
+                # Reload the writer store from disk (fast - no rebuild!) to pick up
+                # changes written by other VectorStoreManager instances
+                if hasattr(self, 'vector_store_manager') and self.vector_store_manager:
+                    if self.vector_store_manager.reload_from_disk():
+                        logger.info("Vector store reloaded from disk")
+                    else:
+                        logger.warning("Failed to reload from disk, vector store unchanged")
+
+            # Invalidate BM25 corpus cache so the next index build reads current MongoDB content
             try:
                 cache_key = (self.db_name, self.collection_name)
                 self.__class__._published_docs_cache.pop(cache_key, None)
             except Exception:
                 pass
 
-            # Reload the vector store from disk (fast - no rebuild!)
-            if hasattr(self, 'vector_store_manager') and self.vector_store_manager:
-                if self.vector_store_manager.reload_from_disk():
-                    logger.info("Vector store reloaded from disk")
-                else:
-                    logger.warning("Failed to reload from disk, vector store unchanged")
-
-            # RECREATE ALL RETRIEVERS (this is the critical fix!)
-            self._setup_retrievers()
+            # Build the next generation off to the side and swap it in
+            bundle = self._retriever_bundles.rebuild()
             
-            # Rebuild the document chain and retrieval chain (in case LLM changed, though unlikely)
-            document_chain = create_stuff_documents_chain(self.llm, RAG_PROMPT)
-            self.rag_chain = create_retrieval_chain(
-                self.history_aware_retriever,
-                document_chain
-            )
-            
-            logger.info("Vector store and hybrid retrievers refreshed")
+            logger.info(f"Vector store and hybrid retrievers refreshed (generation {bundle.generation})")
 
         except Exception as e:
             logger.error(f"Error refreshing vector store: {e}", exc_info=True)
@@ -983,12 +1086,119 @@ Be conservative: only mark as dependent if the query is clearly referring to pri
             logger.warning(f"Standardizer failed: {e}")
             return query_text, False
 
-    async def aquery(self, query_text: str, chat_history: List[Tuple[str, str]]) -> Tuple[str, List[Document], Dict[str, Any]]:
-        """Async query endpoint (non-stream). LangGraph handles routing/caching/retrieval; this handles generation + cache write-back."""
+    def _single_flight_key(self, state: Dict[str, Any], query_text: str) -> str:
+        """Coalescing key: normalized rewritten query + hash of the effective history."""
+        query = (
+            state.get("rewritten_query_for_cache")
+            or state.get("rewritten_query")
+            or state.get("sanitized_query")
+            or query_text
+        )
+        history = state.get("effective_history_pairs") or []
+        history_hash = hashlib.blake2b(json.dumps(history, default=str).encode("utf-8"), digest_size=8).hexdigest()
+        return f"{' '.join(query.lower().split())}|{history_hash}"
+
+    @staticmethod
+    def _follower_metadata(metadata: Dict[str, Any], start_time: float) -> Dict[str, Any]:
+        """Metadata for a request served by another request's generation (it paid nothing)."""
+        follower = dict(metadata)
+        follower.update(
+            {
+                "input_tokens": 0,
+                "output_tokens": 0,
+                "cost_usd": 0.0,
+                "duration_seconds": time.time() - start_time,
+                "coalesced": True,
+            }
+        )
+        return follower
+
+    async def _generate_answer(
+        self, state: Dict[str, Any], query_text: str, start_time: float
+    ) -> Tuple[str, List[Document], Dict[str, Any]]:
+        """LLM generation + cache write-back for aquery() (run once per single-flight key)."""
+        metadata: Dict[str, Any] = state.get("metadata") or {}
+        context_docs: List[Document] = state.get("context_docs") or []
+        published_sources: List[Document] = state.get("published_sources") or []
+        converted_history: List[BaseMessage] = state.get("converted_history_messages") or []
+        sanitized_query = state.get("sanitized_query") or query_text
+
+        llm_start = time.time()
+        answer_result = await self.document_chain.ainvoke(
+            {"input": sanitized_query, "context": context_docs, "chat_history": converted_history}
+        )
+        answer = answer_result.content if hasattr(answer_result, "content") else str(answer_result)
+        llm_duration = time.time() - llm_start
+
+        # Token usage + cost
+        input_tokens, output_tokens = 0, 0
+        cost_usd = 0.0
+        if self.monitoring_enabled:
+            input_tokens, output_tokens = self._extract_token_usage_from_llm_response(answer_result)
+            if input_tokens == 0 and output_tokens == 0:
+                context_text = "\n\n".join(d.page_content for d in context_docs)
+                prompt_text = self._build_prompt_text_with_history(sanitized_query, context_text, converted_history)
+                input_tokens, output_tokens = self._estimate_token_usage(prompt_text, answer)
+            cost_usd = self.estimate_gemini_cost(input_tokens, output_tokens, self.model_name)
+            self.track_llm_metrics(
+                model=self.model_name,
+                operation="generate",
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                cost_usd=cost_usd,
+                duration_seconds=llm_duration,
+                status="success",
+            )
+            try:
+                await self.record_spend(cost_usd, input_tokens, output_tokens, self.model_name)
+            except Exception as e:
+                logger.warning("Error recording spend: %s", e, exc_info=True)
+
+        # Cache write-back
+        effective_history = state.get("effective_history_pairs") or []
+        await self.query_cache.aset(query_text, effective_history, answer, published_sources)
+
+        query_vector = state.get("query_vector")
+        rewritten_query = state.get("rewritten_query_for_cache") or state.get("rewritten_query") or ""
+        if self.use_redis_cache and query_vector:
+            redis_cache = self.get_redis_vector_cache()
+            if redis_cache:
+                try:
+                    sources_data = [{"page_content": d.page_content, "metadata": d.metadata} for d in published_sources]
+                    await redis_cache.set(query_vector, rewritten_query, answer, sources_data)
+                except Exception as e:
+                    logger.warning("Redis cache storage failed: %s", e)
+        if self.semantic_cache and not self.use_redis_cache:
+            self.semantic_cache.set(rewritten_query, [], answer, published_sources)
+
+        metadata.update(
+            {
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "cost_usd": cost_usd,
+                "duration_seconds": time.time() - start_time,
+                "cache_hit": False,
+                "cache_type": None,
+                "rewritten_query": rewritten_query if rewritten_query and rewritten_query != query_text else None,
+            }
+        )
+        return answer, published_sources, metadata
+
+    async def aquery(
+        self, query_text: str, chat_history: List[Tuple[str, str]], bypass_cache: bool = False
+    ) -> Tuple[str, List[Document], Dict[str, Any]]:
+        """
+        Async query endpoint (non-stream). LangGraph handles routing/caching/retrieval; this handles generation + cache write-back.
+
+        bypass_cache skips the FAQ, exact and semantic cache lookups (the fresh answer is still written
+        back); used to regenerate cached answers such as stale suggested questions.
+        """
         start_time = time.time()
         try:
             graph = self._get_rag_graph()
-            state = await graph.ainvoke({"raw_query": query_text, "chat_history_pairs": chat_history, "metadata": {}})
+            state = await graph.ainvoke(
+                {"raw_query": query_text, "chat_history_pairs": chat_history, "metadata": {}, "bypass_cache": bypass_cache}
+            )
             metadata: Dict[str, Any] = state.get("metadata") or {}
 
             # Early return (intent/static or cache hits)
@@ -1014,69 +1224,13 @@ Be conservative: only mark as dependent if the query is clearly referring to pri
                 response_message = self.generic_user_error_message if retrieval_failed else self.no_kb_match_response
                 return response_message, [], metadata
 
-            converted_history: List[BaseMessage] = state.get("converted_history_messages") or []
-            sanitized_query = state.get("sanitized_query") or query_text
-
-            llm_start = time.time()
-            answer_result = await self.document_chain.ainvoke(
-                {"input": sanitized_query, "context": context_docs, "chat_history": converted_history}
+            key = self._single_flight_key(state, query_text)
+            (answer, sources, metadata), leader = await self.query_flight.run(
+                key, lambda: self._generate_answer(state, query_text, start_time)
             )
-            answer = answer_result.content if hasattr(answer_result, "content") else str(answer_result)
-            llm_duration = time.time() - llm_start
-
-            # Token usage + cost
-            input_tokens, output_tokens = 0, 0
-            cost_usd = 0.0
-            if self.monitoring_enabled:
-                input_tokens, output_tokens = self._extract_token_usage_from_llm_response(answer_result)
-                if input_tokens == 0 and output_tokens == 0:
-                    context_text = "\n\n".join(d.page_content for d in context_docs)
-                    prompt_text = self._build_prompt_text_with_history(sanitized_query, context_text, converted_history)
-                    input_tokens, output_tokens = self._estimate_token_usage(prompt_text, answer)
-                cost_usd = self.estimate_gemini_cost(input_tokens, output_tokens, self.model_name)
-                self.track_llm_metrics(
-                    model=self.model_name,
-                    operation="generate",
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    cost_usd=cost_usd,
-                    duration_seconds=llm_duration,
-                    status="success",
-                )
-                try:
-                    await self.record_spend(cost_usd, input_tokens, output_tokens, self.model_name)
-                except Exception as e:
-                    logger.warning("Error recording spend: %s", e, exc_info=True)
-
-            # Cache write-back
-            effective_history = state.get("effective_history_pairs") or []
-            self.query_cache.set(query_text, effective_history, answer, published_sources)
-
-            query_vector = state.get("query_vector")
-            rewritten_query = state.get("rewritten_query_for_cache") or state.get("rewritten_query") or ""
-            if self.use_redis_cache and query_vector:
-                redis_cache = self.get_redis_vector_cache()
-                if redis_cache:
-                    try:
-                        sources_data = [{"page_content": d.page_content, "metadata": d.metadata} for d in published_sources]
-                        await redis_cache.set(query_vector, rewritten_query, answer, sources_data)
-                    except Exception as e:
-                        logger.warning("Redis cache storage failed: %s", e)
-            if self.semantic_cache and not self.use_redis_cache:
-                self.semantic_cache.set(rewritten_query, [], answer, published_sources)
-
-            metadata.update(
-                {
-                    "input_tokens": input_tokens,
-                    "output_tokens": output_tokens,
-                    "cost_usd": cost_usd,
-                    "duration_seconds": time.time() - start_time,
-                    "cache_hit": False,
-                    "cache_type": None,
-                    "rewritten_query": rewritten_query if rewritten_query and rewritten_query != query_text else None,
-                }
-            )
-            return answer, published_sources, metadata
+            if not leader:
+                metadata = self._follower_metadata(metadata, start_time)
+            return answer, sources, metadata
         except HTTPException:
             raise
         except Exception as e:
@@ -1091,6 +1245,91 @@ Be conservative: only mark as dependent if the query is clearly referring to pri
             }
             return self.generic_user_error_message, [], metadata
 
+    async def _stream_answer(self, state: Dict[str, Any], query_text: str, start_time: float):
+        """Streaming LLM generation + cache write-back for astream_query() (run once per single-flight key)."""
+        metadata: Dict[str, Any] = state.get("metadata") or {}
+        context_docs: List[Document] = state.get("context_docs") or []
+        published_sources: List[Document] = state.get("published_sources") or []
+
+        # Send sources immediately (low-latency UX)
+        yield {"type": "sources", "sources": published_sources}
+
+        converted_history: List[BaseMessage] = state.get("converted_history_messages") or []
+        sanitized_query = state.get("sanitized_query") or query_text
+
+        llm_start = time.time()
+        full_answer = ""
+        answer_obj = None
+        async for chunk in self.document_chain.astream(
+            {"input": sanitized_query, "context": context_docs, "chat_history": converted_history}
+        ):
+            content = ""
+            if hasattr(chunk, "content"):
+                answer_obj = chunk
+                content = chunk.content
+            elif isinstance(chunk, str):
+                content = chunk
+            if content:
+                full_answer += content
+                yield {"type": "chunk", "content": content}
+
+        llm_duration = time.time() - llm_start
+        total_duration = time.time() - start_time
+
+        input_tokens, output_tokens = 0, 0
+        cost_usd = 0.0
+        if self.monitoring_enabled:
+            if answer_obj:
+                input_tokens, output_tokens = self._extract_token_usage_from_llm_response(answer_obj)
+            if input_tokens == 0 and output_tokens == 0:
+                context_text = "\n\n".join(d.page_content for d in context_docs)
+                prompt_text = self._build_prompt_text_with_history(sanitized_query, context_text, converted_history)
+                input_tokens, output_tokens = self._estimate_token_usage(prompt_text, full_answer)
+            cost_usd = self.estimate_gemini_cost(input_tokens, output_tokens, self.model_name)
+            self.track_llm_metrics(
+                model=self.model_name,
+                operation="generate",
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                cost_usd=cost_usd,
+                duration_seconds=llm_duration,
+                status="success",
+            )
+            try:
+                await self.record_spend(cost_usd, input_tokens, output_tokens, self.model_name)
+            except Exception as e:
+                logger.warning("Error recording spend: %s", e, exc_info=True)
+
+        # Cache write-back
+        effective_history = state.get("effective_history_pairs") or []
+        await self.query_cache.aset(query_text, effective_history, full_answer, published_sources)
+
+        query_vector = state.get("query_vector")
+        rewritten_query = state.get("rewritten_query_for_cache") or state.get("rewritten_query") or ""
+        if self.use_redis_cache and query_vector:
+            redis_cache = self.get_redis_vector_cache()
+            if redis_cache:
+                try:
+                    sources_data = [{"page_content": d.page_content, "metadata": d.metadata} for d in published_sources]
+                    await redis_cache.set(query_vector, rewritten_query, full_answer, sources_data)
+                except Exception as e:
+                    logger.warning("Redis cache storage failed in stream: %s", e)
+        if self.semantic_cache and not self.use_redis_cache:
+            self.semantic_cache.set(rewritten_query, [], full_answer, published_sources)
+
+        metadata.update(
+            {
+                "input_tokens": input_tokens if self.monitoring_enabled else 0,
+                "output_tokens": output_tokens if self.monitoring_enabled else 0,
+                "cost_usd": cost_usd if self.monitoring_enabled else 0.0,
+                "duration_seconds": total_duration,
+                "cache_hit": False,
+                "cache_type": None,
+            }
+        )
+        yield {"type": "metadata", "metadata": metadata}
+        yield {"type": "complete", "from_cache": False}
+
     async def astream_query(self, query_text: str, chat_history: List[Tuple[str, str]]):
         """
         Streaming version of aquery that yields response chunks progressively.
@@ -1113,10 +1352,8 @@ Be conservative: only mark as dependent if the query is clearly referring to pri
                 sources = state.get("early_sources") or []
                 yield {"type": "sources", "sources": sources}
                 answer_text = state.get("early_answer") or ""
-                for i, char in enumerate(answer_text):
-                    yield {"type": "chunk", "content": char}
-                    if i % 10 == 0:
-                        await asyncio.sleep(0.001)
+                async for block in replay_text(answer_text):
+                    yield {"type": "chunk", "content": block}
                 metadata.setdefault("duration_seconds", time.time() - start_time)
                 yield {"type": "metadata", "metadata": metadata}
                 yield {"type": "complete", "from_cache": True}
@@ -1144,84 +1381,14 @@ Be conservative: only mark as dependent if the query is clearly referring to pri
                 yield {"type": "complete", "from_cache": False, "no_kb_results": True}
                 return
 
-            # Send sources immediately (low-latency UX)
-            yield {"type": "sources", "sources": published_sources}
-
-            converted_history: List[BaseMessage] = state.get("converted_history_messages") or []
-            sanitized_query = state.get("sanitized_query") or query_text
-
-            llm_start = time.time()
-            full_answer = ""
-            answer_obj = None
-            async for chunk in self.document_chain.astream(
-                {"input": sanitized_query, "context": context_docs, "chat_history": converted_history}
-            ):
-                content = ""
-                if hasattr(chunk, "content"):
-                    answer_obj = chunk
-                    content = chunk.content
-                elif isinstance(chunk, str):
-                    content = chunk
-                if content:
-                    full_answer += content
-                    yield {"type": "chunk", "content": content}
-
-            llm_duration = time.time() - llm_start
-            total_duration = time.time() - start_time
-
-            input_tokens, output_tokens = 0, 0
-            cost_usd = 0.0
-            if self.monitoring_enabled:
-                if answer_obj:
-                    input_tokens, output_tokens = self._extract_token_usage_from_llm_response(answer_obj)
-                if input_tokens == 0 and output_tokens == 0:
-                    context_text = "\n\n".join(d.page_content for d in context_docs)
-                    prompt_text = self._build_prompt_text_with_history(sanitized_query, context_text, converted_history)
-                    input_tokens, output_tokens = self._estimate_token_usage(prompt_text, full_answer)
-                cost_usd = self.estimate_gemini_cost(input_tokens, output_tokens, self.model_name)
-                self.track_llm_metrics(
-                    model=self.model_name,
-                    operation="generate",
-                    input_tokens=input_tokens,
-                    output_tokens=output_tokens,
-                    cost_usd=cost_usd,
-                    duration_seconds=llm_duration,
-                    status="success",
-                )
-                try:
-                    await self.record_spend(cost_usd, input_tokens, output_tokens, self.model_name)
-                except Exception as e:
-                    logger.warning("Error recording spend: %s", e, exc_info=True)
-
-            # Cache write-back
-            effective_history = state.get("effective_history_pairs") or []
-            self.query_cache.set(query_text, effective_history, full_answer, published_sources)
-
-            query_vector = state.get("query_vector")
-            rewritten_query = state.get("rewritten_query_for_cache") or state.get("rewritten_query") or ""
-            if self.use_redis_cache and query_vector:
-                redis_cache = self.get_redis_vector_cache()
-                if redis_cache:
-                    try:
-                        sources_data = [{"page_content": d.page_content, "metadata": d.metadata} for d in published_sources]
-                        await redis_cache.set(query_vector, rewritten_query, full_answer, sources_data)
-                    except Exception as e:
-                        logger.warning("Redis cache storage failed in stream: %s", e)
-            if self.semantic_cache and not self.use_redis_cache:
-                self.semantic_cache.set(rewritten_query, [], full_answer, published_sources)
-
-            metadata.update(
-                {
-                    "input_tokens": input_tokens if self.monitoring_enabled else 0,
-                    "output_tokens": output_tokens if self.monitoring_enabled else 0,
-                    "cost_usd": cost_usd if self.monitoring_enabled else 0.0,
-                    "duration_seconds": total_duration,
-                    "cache_hit": False,
-                    "cache_type": None,
-                }
+            key = self._single_flight_key(state, query_text)
+            events, leader = self.stream_flight.subscribe(
+                key, lambda: self._stream_answer(state, query_text, start_time)
             )
-            yield {"type": "metadata", "metadata": metadata}
-            yield {"type": "complete", "from_cache": False}
+            async for event in events:
+                if not leader and event.get("type") == "metadata":
+                    event = {"type": "metadata", "metadata": self._follower_metadata(event["metadata"], start_time)}
+                yield event
         except HTTPException as he:
             # Preserve previous streaming behavior: emit an error event instead of raising.
             if getattr(he, "status_code", None) == 429:
@@ -11,6 +11,9 @@ logger = logging.getLogger(__name__)
 # Global Redis client singleton shared across all requests
 _global_redis_client: Optional[redis.Redis] = None
 
+# Separate pool for binary values (decode_responses=False), e.g. compressed chunk payloads
+_global_binary_redis_client: Optional[redis.Redis] = None
+
 # Use ContextVar to allow per-context (per-test) Redis client overrides
 # This solves the "different event loop" problem in async tests
 _redis_client: ContextVar[Optional[redis.Redis]] = ContextVar("redis_client", default=None)
@@ -74,6 +77,26 @@ async def get_redis_client() -> redis.Redis:
   return _global_redis_client
 
 
+async def get_binary_redis_client() -> redis.Redis:
+  """
+  Get a shared async Redis client that returns raw bytes (decode_responses=False).
+
+  Same server and pool settings as get_redis_client(); use it for values that
+  are not UTF-8 text, such as compressed payloads.
+  """
+  global _global_binary_redis_client
+
+  if _global_binary_redis_client is None:
+    _global_binary_redis_client = redis.from_url(
+      get_redis_url(),
+      decode_responses=False,
+      max_connections=100,
+      socket_timeout=5
+    )
+    logger.info("Global binary Redis client singleton created")
+  return _global_binary_redis_client
+
+
 def _set_test_redis_client(client: redis.Redis) -> None:
   """
   Internal helper function to set a test Redis client.
@@ -87,7 +110,7 @@ async def close_redis_client() -> None:
   Gracefully close the Redis client on application shutdown.
   Closes both the ContextVar client (if set) and the global client.
   """
-  global _global_redis_client
+  global _global_redis_client, _global_binary_redis_client
   
   # Close ContextVar client if set
   client = _redis_client.get()
@@ -102,4 +125,8 @@ async def close_redis_client() -> None:
     _global_redis_client = None
     logger.info("Global Redis client singleton closed")
 
+  if _global_binary_redis_client is not None:
+    await _global_binary_redis_client.aclose()
+    _global_binary_redis_client = None
+
 
@@ -0,0 +1,417 @@
+"""
+BM25 Index
+
+In-process inverted-index BM25 engine for the lexical half of hybrid
+retrieval, replacing LangChain's BM25Retriever.from_documents.
+
+- Documents are tokenized once with the Litecoin-aware tokenizer
+  (utils.litecoin_vocabulary.tokenize_ltc), so queries and documents agree
+  on canonical terms ("mimblewimble" -> "mweb").
+- Scoring walks only the postings of the query terms and accumulates
+  Okapi BM25 contributions with NumPy, instead of scoring every document
+  in Python. IDF is the Lucene form log(1 + (N - n + 0.5) / (n + 0.5)),
+  which stays positive for terms in most documents; rank_bm25 (behind
+  BM25Retriever) uses log((N - n + 0.5) / (n + 0.5)) floored at
+  0.25 x the corpus-average IDF instead, an average every incremental
+  update would change.
+- `k` is a per-call argument, so concurrent queries never share mutable
+  retriever state.
+- Webhook updates add/remove one Payload document's chunks by payload_id;
+  removed documents are tombstoned and the postings are compacted from the
+  stored term counts (no re-tokenization) once enough of them accumulate.
+
+The pipeline owns one writer index per collection and every retriever
+bundle searches its own snapshot() of it. Snapshots share the posting lists
+with the writer copy-on-write: the writer copies a term's postings the first
+time it changes them after a snapshot, so a bundle keeps serving the corpus
+it was built with while webhook updates or a full rebuild go to the writer.
+
+Usage:
+    index = BM25Index()
+    index.build(published_docs)                  # full (re)build
+    index.upsert_payload(payload_id, docs)       # after a webhook update
+    index.remove_payload(payload_id)             # after delete/unpublish
+    index.search("what is mweb", k=24)           # -> [(Document, score), ...]
+
+    frozen = index.snapshot()                    # read-only copy for one bundle
+    retriever = BM25IndexRetriever(index=frozen, k=12)  # LangChain retriever
+"""
+
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+
+from backend.utils.litecoin_vocabulary import tokenize_ltc
+
+logger = logging.getLogger(__name__)
+
+# Import metrics if available
+try:
+    from backend.monitoring.metrics import (
+        rag_bm25_search_duration_seconds,
+        bm25_index_documents,
+        bm25_index_build_duration_seconds,
+        bm25_index_updates_total,
+    )
+    METRICS_ENABLED = True
+except ImportError:
+    METRICS_ENABLED = False
+
+# Okapi BM25 parameters (same defaults as rank_bm25, which BM25Retriever used)
+DEFAULT_K1 = 1.5
+DEFAULT_B = 0.75
+# Compact postings once tombstoned slots exceed this fraction of all slots
+COMPACT_RATIO = 0.25
+
+
+def bm25_idf(n_docs: int, df: int) -> float:
+    """Lucene-style BM25 IDF of a term found in `df` of `n_docs` documents (always > 0)."""
+    return math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+
+
+class BM25Index:
+    """Thread-safe inverted-index BM25 with incremental add/remove by payload_id."""
+
+    def __init__(
+        self,
+        k1: float = DEFAULT_K1,
+        b: float = DEFAULT_B,
+        tokenizer: Callable[[str], List[str]] = tokenize_ltc,
+        compact_ratio: float = COMPACT_RATIO,
+    ):
+        self.k1 = k1
+        self.b = b
+        self.tokenizer = tokenizer
+        self.compact_ratio = compact_ratio
+        self._lock = threading.Lock()
+        self._built = False
+        self.last_build_seconds: float = 0.0
+        self._reset()
+
+    def _reset(self) -> None:
+        # Slot-addressed document storage; removed slots hold None until compaction
+        self._docs: List[Optional[Document]] = []
+        self._doc_tf: List[Optional[Dict[str, int]]] = []
+        self._doc_len = np.zeros(0, dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._n_alive = 0
+        self._total_len = 0
+        # term -> (slots, term frequencies); NumPy views are built lazily per term
+        self._postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        self._posting_arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._df: Dict[str, int] = {}
+        self._payload_slots: Dict[str, List[int]] = {}
+        # Posting lists are shared with snapshots until this index copies them
+        self._postings_shared = False
+        self._owned_terms: Set[str] = set()
+
+    @property
+    def is_built(self) -> bool:
+        return self._built
+
+    @property
+    def size(self) -> int:
+        return self._n_alive
+
+    def __len__(self) -> int:
+        return self._n_alive
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def build(self, documents: Iterable[Document]) -> int:
+        """
+        Replace the whole index with `documents`.
+
+        Returns:
+            Number of documents indexed
+        """
+        start = time.perf_counter()
+        prepared = self._tokenize(documents)
+        with self._lock:
+            self._reset()
+            self._add_locked(prepared)
+            self._built = True
+            size = self._n_alive
+        self.last_build_seconds = time.perf_counter() - start
+
+        logger.info(
+            f"BM25 index built: {size} docs, {len(self._postings)} terms in {self.last_build_seconds * 1000:.1f}ms"
+        )
+        if METRICS_ENABLED:
+            bm25_index_build_duration_seconds.observe(self.last_build_seconds)
+            bm25_index_documents.set(size)
+            bm25_index_updates_total.labels(operation="build").inc()
+        return size
+
+    def add_documents(self, documents: Iterable[Document]) -> int:
+        """
+        Append documents to a built index (no-op before the first build()).
+
+        Returns:
+            Number of documents added
+        """
+        prepared = self._tokenize(documents)
+        with self._lock:
+            if not self._built or not prepared:
+                return 0
+            self._add_locked(prepared)
+            size = self._n_alive
+        self._record_update("add", size)
+        return len(prepared)
+
+    def remove_payload(self, payload_id: str) -> int:
+        """
+        Drop all documents that belong to a Payload CMS document.
+
+        Returns:
+            Number of documents removed
+        """
+        with self._lock:
+            if not self._built:
+                return 0
+            removed = self._remove_locked(payload_id)
+            size = self._n_alive
+        if removed:
+            self._record_update("remove", size)
+        return removed
+
+    def upsert_payload(self, payload_id: str, documents: Iterable[Document]) -> int:
+        """
+        Atomically replace a Payload CMS document's chunks.
+
+        Returns:
+            Number of documents indexed for the payload
+        """
+        prepared = self._tokenize(documents)
+        with self._lock:
+            if not self._built:
+                return 0
+            self._remove_locked(payload_id)
+            self._add_locked(prepared)
+            size = self._n_alive
+        self._record_update("upsert", size)
+        return len(prepared)
+
+    def invalidate(self) -> None:
+        """Discard the index; the owner rebuilds it on next use."""
+        with self._lock:
+            self._reset()
+            self._built = False
+        self._record_update("invalidate", 0)
+
+    def snapshot(self) -> "BM25Index":
+        """
+        Read-only copy of the current index for one retriever bundle.
+
+        Later updates to this index do not show up in the snapshot: posting
+        lists are shared and copied by the writer before it next appends to
+        them, everything else is copied here (O(documents + terms)).
+        """
+        frozen = BM25Index(k1=self.k1, b=self.b, tokenizer=self.tokenizer, compact_ratio=self.compact_ratio)
+        with self._lock:
+            frozen._docs = list(self._docs)
+            frozen._doc_tf = list(self._doc_tf)
+            frozen._doc_len = self._doc_len.copy()
+            frozen._alive = self._alive.copy()
+            frozen._n_alive = self._n_alive
+            frozen._total_len = self._total_len
+            frozen._postings = dict(self._postings)
+            # Cached NumPy views are replaced, never written in place
+            frozen._posting_arrays = dict(self._posting_arrays)
+            frozen._df = dict(self._df)
+            frozen._payload_slots = {pid: list(slots) for pid, slots in self._payload_slots.items()}
+            frozen._built = self._built
+            frozen.last_build_seconds = self.last_build_seconds
+            self._postings_shared = True
+            self._owned_terms = set()
+        return frozen
+
+    def _record_update(self, operation: str, size: int) -> None:
+        logger.debug(f"BM25 index {operation} (size={size})")
+        if METRICS_ENABLED:
+            bm25_index_documents.set(size)
+            bm25_index_updates_total.labels(operation=operation).inc()
+
+    def _tokenize(self, documents: Iterable[Document]) -> List[Tuple[Document, Dict[str, int], int]]:
+        """(document, term counts, length) triples; runs outside the lock so searches are not blocked."""
+        prepared = []
+        for doc in documents:
+            tokens = self.tokenizer(doc.page_content or "")
+            prepared.append((doc, dict(Counter(tokens)), len(tokens)))
+        return prepared
+
+    def _add_locked(self, prepared: List[Tuple[Document, Dict[str, int], int]]) -> None:
+        """Append tokenized documents. Caller must hold the lock."""
+        if not prepared:
+            return
+        first = len(self._docs)
+        lengths = np.zeros(len(prepared), dtype=np.float32)
+        for offset, (doc, tf, length) in enumerate(prepared):
+            slot = first + offset
+            self._docs.append(doc)
+            self._doc_tf.append(tf)
+            lengths[offset] = length
+            self._total_len += length
+            self._index_terms(slot, tf)
+            payload_id = (doc.metadata or {}).get("payload_id")
+            if payload_id:
+                self._payload_slots.setdefault(payload_id, []).append(slot)
+
+        self._doc_len = np.concatenate([self._doc_len, lengths])
+        self._alive = np.concatenate([self._alive, np.ones(len(prepared), dtype=bool)])
+        self._n_alive += len(prepared)
+
+    def _index_terms(self, slot: int, tf: Dict[str, int]) -> None:
+        postings, df = self._postings, self._df
+        for term, count in tf.items():
+            term_postings = postings.get(term)
+            if term_postings is None:
+                postings[term] = ([slot], [count])
+                df[term] = 1
+            else:
+                if self._postings_shared and term not in self._owned_terms:
+                    # Copy on first write after a snapshot; the snapshot keeps the old lists
+                    term_postings = (list(term_postings[0]), list(term_postings[1]))
+                    postings[term] = term_postings
+                    self._owned_terms.add(term)
+                term_postings[0].append(slot)
+                term_postings[1].append(count)
+                # Postings may outlive df while only tombstoned slots remain
+                df[term] = df.get(term, 0) + 1
+        if self._posting_arrays:
+            # Drop cached NumPy views of the postings that just grew
+            for term in tf:
+                self._posting_arrays.pop(term, None)
+
+    def _remove_locked(self, payload_id: str) -> int:
+        """Tombstone a payload's slots. Caller must hold the lock."""
+        slots = self._payload_slots.pop(payload_id, None)
+        if not slots:
+            return 0
+        for slot in slots:
+            tf = self._doc_tf[slot]
+            if tf is None:
+                continue
+            for term in tf:
+                df = self._df[term] - 1
+                if df:
+                    self._df[term] = df
+                else:
+                    del self._df[term]
+            self._total_len -= int(self._doc_len[slot])
+            self._docs[slot] = None
+            self._doc_tf[slot] = None
+            self._alive[slot] = False
+            self._n_alive -= 1
+
+        dead = len(self._docs) - self._n_alive
+        if dead > self.compact_ratio * max(len(self._docs), 1):
+            self._compact_locked()
+        return len(slots)
+
+    def _compact_locked(self) -> None:
+        """Rebuild postings without tombstones from stored term counts. Caller must hold the lock."""
+        live = [
+            (doc, tf, int(self._doc_len[slot]))
+            for slot, (doc, tf) in enumerate(zip(self._docs, self._doc_tf))
+            if doc is not None
+        ]
+        self._reset()
+        self._add_locked(live)
+        logger.debug(f"BM25 index compacted to {len(live)} docs")
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _term_arrays(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        arrays = self._posting_arrays.get(term)
+        if arrays is None:
+            postings = self._postings.get(term)
+            if postings is None:
+                return None
+            arrays = (
+                np.asarray(postings[0], dtype=np.int64),
+                np.asarray(postings[1], dtype=np.float32),
+            )
+            self._posting_arrays[term] = arrays
+        return arrays
+
+    def search(self, query: str, k: int) -> List[Tuple[Document, float]]:
+        """
+        Top-k documents by BM25 score (documents sharing no term with the query are skipped).
+
+        Args:
+            query: Raw query text (tokenized with the index tokenizer)
+            k: Maximum number of results for this call
+
+        Returns:
+            List of (Document, score), best first
+        """
+        terms = set(self.tokenizer(query or ""))
+        if not terms or k <= 0:
+            return []
+
+        start = time.perf_counter()
+        with self._lock:
+            n_alive = self._n_alive
+            if not n_alive:
+                return []
+            n_slots = len(self._docs)
+            avgdl = max(self._total_len / n_alive, 1e-9)
+            scores = np.zeros(n_slots, dtype=np.float32)
+            length_norm = None
+            for term in terms:
+                arrays = self._term_arrays(term)
+                if arrays is None:
+                    continue
+                if length_norm is None:
+                    length_norm = self.k1 * (1.0 - self.b + self.b * self._doc_len / avgdl)
+                slots, tf = arrays
+                df = self._df.get(term, 0)
+                idf = bm25_idf(n_alive, df)
+                scores[slots] += idf * tf * (self.k1 + 1.0) / (tf + length_norm[slots])
+
+            if length_norm is None:
+                return []
+            scores[~self._alive] = 0.0
+            candidates = np.flatnonzero(scores > 0.0)
+            if len(candidates) > k:
+                candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+            # Best score first; ties keep corpus order
+            order = candidates[np.lexsort((candidates, -scores[candidates]))]
+            results = [(self._docs[i], float(scores[i])) for i in order]
+
+        if METRICS_ENABLED:
+            rag_bm25_search_duration_seconds.observe(time.perf_counter() - start)
+        return results
+
+
+class BM25IndexRetriever(BaseRetriever):
+    """LangChain retriever over a shared BM25Index (drop-in for BM25Retriever)."""
+
+    index: Any
+    k: int = 4
+
+    def search_with_scores(self, query: str, k: Optional[int] = None) -> List[Tuple[Document, float]]:
+        """Thread-safe scored search with a per-call k (does not touch self.k)."""
+        return self.index.search(query, k if k is not None else self.k)
+
+    def search(self, query: str, k: Optional[int] = None) -> List[Document]:
+        """Thread-safe search with a per-call k (does not touch self.k)."""
+        return [doc for doc, _score in self.search_with_scores(query, k)]
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return self.search(query)
@@ -0,0 +1,275 @@
+"""
+Chunk Store
+
+Content-addressed store for source chunks referenced by cached answers.
+
+Cached answers (RedisVectorCache, SuggestedQuestionCache) used to embed the
+full JSON of every source's page_content + metadata, so one popular article
+chunk was duplicated across hundreds of entries and re-parsed into Documents
+on every hit. Instead, each chunk is stored once under a hash of its content
+and the cached answers keep only the chunk ids.
+
+- Ids are content hashes (page_content + canonical metadata JSON), so an
+  edited chunk gets a new id and an id never points at stale content.
+- Payloads are msgpack + zstd when those packages are installed (msgpack or
+  ormsgpack; zstandard), falling back to JSON + zlib. A two-byte header
+  records the format, so any worker can read what another wrote.
+- Decoded Documents are memoised in-process (LRU); content addressing makes
+  the memo safe to share, and a warm hit skips both Redis and decoding.
+- Chunks expire after CHUNK_STORE_TTL_SECONDS, refreshed whenever an answer
+  that cites them is cached; a missing chunk makes the answer a cache miss.
+
+The store needs a Redis client with decode_responses=False.
+
+Usage:
+    store = ChunkStore()
+    ids = await store.put_many(client, documents)        # -> ["3f2a...", ...]
+    docs = await store.get_many(client, ids)             # -> [Document | None, ...]
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import zlib
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+    _MSGPACK = "msgpack"
+except ImportError:
+    try:
+        import ormsgpack as msgpack
+        _MSGPACK = "ormsgpack"
+    except ImportError:
+        msgpack = None
+        _MSGPACK = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Import metrics if available
+try:
+    from backend.monitoring.metrics import chunk_store_lookups_total
+    METRICS_ENABLED = True
+except ImportError:
+    METRICS_ENABLED = False
+
+CHUNK_STORE_TTL_SECONDS = int(os.getenv("CHUNK_STORE_TTL_SECONDS", "259200"))  # 72 hours
+CHUNK_STORE_MEMO_SIZE = int(os.getenv("CHUNK_STORE_MEMO_SIZE", "4096"))
+ZSTD_LEVEL = 3
+
+# Payload header: serializer byte + compressor byte
+_MSGPACK_FORMAT = b"m"
+_JSON_FORMAT = b"j"
+_ZSTD_FORMAT = b"z"
+_ZLIB_FORMAT = b"d"
+
+
+# zstd (de)compressor contexts are costly to create and not thread-safe: reuse one per thread
+_zstd_contexts = threading.local()
+
+
+def _zstd_compressor():
+    compressor = getattr(_zstd_contexts, "compressor", None)
+    if compressor is None:
+        compressor = _zstd_contexts.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL)
+    return compressor
+
+
+def _zstd_decompressor():
+    decompressor = getattr(_zstd_contexts, "decompressor", None)
+    if decompressor is None:
+        decompressor = _zstd_contexts.decompressor = zstandard.ZstdDecompressor()
+    return decompressor
+
+
+def _default(value: Any) -> Any:
+    """Fallback for values neither serializer handles natively (datetime, ObjectId, numpy scalars, ...)."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def pack_payload(value: Any) -> bytes:
+    """Serialize + compress with the best available codecs, prefixed with the format header."""
+    if msgpack is not None:
+        serializer = _MSGPACK_FORMAT
+        if _MSGPACK == "msgpack":
+            raw = msgpack.packb(value, default=_default, use_bin_type=True)
+        else:
+            raw = msgpack.packb(value, default=_default)
+    else:
+        serializer = _JSON_FORMAT
+        raw = json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    if zstandard is not None:
+        return serializer + _ZSTD_FORMAT + _zstd_compressor().compress(raw)
+    return serializer + _ZLIB_FORMAT + zlib.compress(raw)
+
+
+def unpack_payload(data: bytes) -> Any:
+    """Inverse of pack_payload(); raises ValueError for formats this process cannot read."""
+    serializer, compressor, body = data[:1], data[1:2], data[2:]
+
+    if compressor == _ZSTD_FORMAT:
+        if zstandard is None:
+            raise ValueError("zstd payload but zstandard is not installed")
+        raw = _zstd_decompressor().decompress(body)
+    elif compressor == _ZLIB_FORMAT:
+        raw = zlib.decompress(body)
+    else:
+        raise ValueError(f"Unknown payload compressor {compressor!r}")
+
+    if serializer == _MSGPACK_FORMAT:
+        if msgpack is None:
+            raise ValueError("msgpack payload but neither msgpack nor ormsgpack is installed")
+        return msgpack.unpackb(raw, raw=False) if _MSGPACK == "msgpack" else msgpack.unpackb(raw)
+    if serializer == _JSON_FORMAT:
+        return json.loads(raw)
+    raise ValueError(f"Unknown payload serializer {serializer!r}")
+
+
+def payload_format() -> str:
+    """Human-readable codec pair used by pack_payload() in this process."""
+    return f"{_MSGPACK or 'json'}+{'zstd' if zstandard is not None else 'zlib'}"
+
+
+def chunk_id(doc: Any) -> str:
+    """Content hash of a Document (or {page_content, metadata} dict)."""
+    if isinstance(doc, dict):
+        page_content, metadata = doc.get("page_content", ""), doc.get("metadata") or {}
+    else:
+        page_content, metadata = doc.page_content, doc.metadata or {}
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(page_content.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(json.dumps(metadata, sort_keys=True, default=_default).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ChunkStore:
+    """Redis chunk store with an in-process LRU of decoded Documents."""
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[int] = None,
+        memo_size: Optional[int] = None,
+        key_prefix: str = "chunk:",
+    ):
+        self.ttl_seconds = ttl_seconds or CHUNK_STORE_TTL_SECONDS
+        self.memo_size = memo_size if memo_size is not None else CHUNK_STORE_MEMO_SIZE
+        self.key_prefix = key_prefix
+        self._memo: "OrderedDict[str, Document]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, chunk_id_: str) -> str:
+        return f"{self.key_prefix}{chunk_id_}"
+
+    def _remember(self, chunk_id_: str, doc: Document) -> None:
+        if self.memo_size <= 0:
+            return
+        with self._lock:
+            self._memo[chunk_id_] = doc
+            self._memo.move_to_end(chunk_id_)
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+
+    @staticmethod
+    def _as_document(doc: Any) -> Document:
+        if isinstance(doc, Document):
+            return doc
+        if isinstance(doc, dict):
+            return Document(page_content=doc.get("page_content", ""), metadata=doc.get("metadata") or {})
+        return Document(page_content=str(doc), metadata={})
+
+    async def put_many(self, client, documents: Iterable[Any]) -> List[str]:
+        """
+        Store documents (Documents or {page_content, metadata} dicts) and refresh their TTL.
+
+        Returns:
+            Chunk ids in input order (duplicates preserved)
+        """
+        docs = [self._as_document(doc) for doc in documents]
+        ids = [chunk_id(doc) for doc in docs]
+        if not ids:
+            return ids
+
+        pipe = client.pipeline(transaction=False)
+        written = set()
+        for chunk_id_, doc in zip(ids, docs):
+            if chunk_id_ in written:
+                continue
+            written.add(chunk_id_)
+            key = self._key(chunk_id_)
+            # NX keeps an identical existing value; EXPIRE refreshes its lifetime either way
+            pipe.set(key, pack_payload({"page_content": doc.page_content, "metadata": doc.metadata}),
+                     ex=self.ttl_seconds, nx=True)
+            pipe.expire(key, self.ttl_seconds)
+            self._remember(chunk_id_, doc)
+        await pipe.execute()
+        return ids
+
+    async def get_many(self, client, ids: Sequence[str]) -> List[Optional[Document]]:
+        """
+        Resolve chunk ids (memo first, then one MGET for the rest).
+
+        Returns:
+            Documents in input order; None for chunks that expired or cannot be decoded
+        """
+        results: List[Optional[Document]] = [None] * len(ids)
+        missing: Dict[str, List[int]] = {}
+        with self._lock:
+            for position, chunk_id_ in enumerate(ids):
+                doc = self._memo.get(chunk_id_)
+                if doc is not None:
+                    self._memo.move_to_end(chunk_id_)
+                    results[position] = doc
+                else:
+                    missing.setdefault(chunk_id_, []).append(position)
+
+        if missing:
+            missing_ids = list(missing)
+            values = await client.mget([self._key(chunk_id_) for chunk_id_ in missing_ids])
+            for chunk_id_, value in zip(missing_ids, values):
+                if value is None:
+                    continue
+                try:
+                    payload = unpack_payload(value)
+                except Exception as e:
+                    logger.warning(f"Undecodable chunk {chunk_id_}: {e}")
+                    continue
+                doc = Document(page_content=payload.get("page_content", ""), metadata=payload.get("metadata") or {})
+                self._remember(chunk_id_, doc)
+                for position in missing[chunk_id_]:
+                    results[position] = doc
+
+        if METRICS_ENABLED:
+            memo_hits = len(ids) - sum(len(positions) for positions in missing.values())
+            fetched = sum(len(missing[i]) for i in missing if results[missing[i][0]] is not None)
+            if memo_hits:
+                chunk_store_lookups_total.labels(result="memo").inc(memo_hits)
+            if fetched:
+                chunk_store_lookups_total.labels(result="redis").inc(fetched)
+            if len(ids) - memo_hits - fetched:
+                chunk_store_lookups_total.labels(result="missing").inc(len(ids) - memo_hits - fetched)
+        return results
+
+    def clear_memo(self) -> None:
+        with self._lock:
+            self._memo.clear()
+
+
+# Shared instance: the decoded-Document memo is process-wide
+chunk_store = ChunkStore()
@@ -21,6 +21,20 @@ LLM Backend Options:
 - "gemini": Use Google Gemini API (requires GOOGLE_API_KEY)
 - "local": Use local Ollama (requires OLLAMA_URL, default localhost:11434)
 
+Throughput:
+- Chunks are sent FAQ_CHUNKS_PER_PROMPT at a time in one prompt that
+  returns a JSON object of questions per chunk (falling back to one prompt
+  per chunk when the response cannot be parsed).
+- Up to FAQ_LLM_CONCURRENCY prompts are in flight at once.
+- Gemini calls are paced by a token bucket (one request per
+  FAQ_LLM_RATE_LIMIT_DELAY seconds, bursts of FAQ_LLM_RATE_LIMIT_BURST)
+  instead of a fixed sleep after every call. The bucket is shared by every
+  FAQGenerator of the process using the same backend and model, so
+  concurrent ingestion jobs stay within one limit together.
+- With a question_cache (services.faq_question_cache), questions of chunks
+  whose text was seen before are reused and only new or edited chunks
+  reach the LLM.
+
 Usage:
     # Use Gemini (default)
     FAQ_LLM_BACKEND=gemini python scripts/reindex_with_faq.py
@@ -30,27 +44,70 @@ Usage:
 """
 
 import os
+import re
+import json
+import time
 import logging
 import hashlib
 import asyncio
-from typing import List, Dict, Tuple, Optional, Set
+import threading
+from typing import Any, List, Dict, Tuple, Optional, Set
 from langchain_core.documents import Document
 import httpx
 
+from backend.utils.token_bucket import TokenBucket
+
 logger = logging.getLogger(__name__)
 
+# Import metrics if available
+try:
+    from backend.monitoring.metrics import faq_question_cache_lookups_total, faq_question_cache_hit_ratio
+    METRICS_ENABLED = True
+except ImportError:
+    METRICS_ENABLED = False
+
 # Feature flag for FAQ indexing
 USE_FAQ_INDEXING = os.getenv("USE_FAQ_INDEXING", "true").lower() == "true"
 FAQ_QUESTIONS_PER_CHUNK = int(os.getenv("FAQ_QUESTIONS_PER_CHUNK", "3"))
-# Rate limiting for LLM calls (seconds between calls, 0 = no limit)
+# Rate limiting for LLM calls (average seconds between calls, 0 = no limit)
 # Default 2s for Gemini (30 RPM limit), 0 for local (no limit)
 FAQ_LLM_RATE_LIMIT_DELAY = float(os.getenv("FAQ_LLM_RATE_LIMIT_DELAY", "2.0"))
+# Calls that may go out back-to-back before the average rate applies
+FAQ_LLM_RATE_LIMIT_BURST = int(os.getenv("FAQ_LLM_RATE_LIMIT_BURST", "4"))
+# LLM calls in flight at once
+FAQ_LLM_CONCURRENCY = int(os.getenv("FAQ_LLM_CONCURRENCY", "4"))
+# Chunks per prompt (1 = one prompt per chunk)
+FAQ_CHUNKS_PER_PROMPT = int(os.getenv("FAQ_CHUNKS_PER_PROMPT", "4"))
 # LLM backend: "gemini" or "local"
 FAQ_LLM_BACKEND = os.getenv("FAQ_LLM_BACKEND", "gemini").lower()
+FAQ_GEMINI_MODEL = "gemini-2.0-flash-lite"  # Cheap for batch ingestion
 # Local LLM settings (Ollama)
 FAQ_OLLAMA_URL = os.getenv("FAQ_OLLAMA_URL", os.getenv("OLLAMA_URL", "http://host.docker.internal:11434"))
 FAQ_OLLAMA_MODEL = os.getenv("FAQ_OLLAMA_MODEL", os.getenv("LOCAL_REWRITER_MODEL", "llama3.2:3b"))
 
+# Process-level rate limiters keyed by (backend, model); API quotas are per model, not per generator
+_rate_limiters: Dict[Tuple[str, str], TokenBucket] = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(backend: str, model: str) -> TokenBucket:
+    """
+    Shared token bucket for LLM calls to `model` on `backend`.
+
+    Local (Ollama) models are not rate limited.
+    """
+    key = (backend, model)
+    with _rate_limiters_lock:
+        bucket = _rate_limiters.get(key)
+        if bucket is None:
+            delay = FAQ_LLM_RATE_LIMIT_DELAY if backend != "local" else 0.0
+            bucket = TokenBucket(
+                rate=1.0 / delay if delay > 0 else 0.0,
+                capacity=FAQ_LLM_RATE_LIMIT_BURST,
+            )
+            _rate_limiters[key] = bucket
+        return bucket
+
 
 class FAQGenerator:
     """
@@ -85,7 +142,30 @@ Content:
 
 Questions:"""
 
-    def __init__(self, llm=None, num_questions: int = None, backend: str = None):
+    BATCH_GENERATION_PROMPT = """You are a question generator for a Litecoin knowledge base.
+Below are {num_blocks} numbered content blocks. For EACH block, generate {num_questions} natural questions that the block directly answers.
+
+Rules:
+1. Questions should be phrased as a user would naturally ask them
+2. Questions should be answerable ONLY from their own block
+3. Vary question styles (what, how, why, can, does, etc.)
+4. Include vocabulary variations users might use
+5. Output ONLY a JSON object mapping each block number (as a string) to an array of questions, each ending with a question mark
+   Example: {{"1": ["What is ...?", "How does ...?"], "2": ["Why ...?"]}}
+
+{blocks}
+
+JSON:"""
+
+    def __init__(
+        self,
+        llm=None,
+        num_questions: int = None,
+        backend: str = None,
+        concurrency: int = None,
+        chunks_per_prompt: int = None,
+        question_cache=None,
+    ):
         """
         Initialize FAQ Generator.
         
@@ -93,19 +173,35 @@ Questions:"""
             llm: LangChain LLM instance. If None, auto-selects based on backend.
             num_questions: Number of questions to generate per chunk (default: FAQ_QUESTIONS_PER_CHUNK)
             backend: "gemini" or "local" (default: FAQ_LLM_BACKEND env var)
+            concurrency: LLM calls in flight at once (default: FAQ_LLM_CONCURRENCY)
+            chunks_per_prompt: Chunks sent per LLM call (default: FAQ_CHUNKS_PER_PROMPT)
+            question_cache: FAQQuestionCache to reuse questions of unchanged chunks (default: none)
         """
         self.num_questions = num_questions or FAQ_QUESTIONS_PER_CHUNK
         self.backend = backend or FAQ_LLM_BACKEND
+        self.concurrency = max(1, concurrency or FAQ_LLM_CONCURRENCY)
+        self.chunks_per_prompt = max(1, chunks_per_prompt or FAQ_CHUNKS_PER_PROMPT)
+        self.question_cache = question_cache
         self._llm = llm
         self._use_local = self.backend == "local"
+        self._gemini_json_mode = False  # set when we build the Gemini client ourselves
         
-        # Auto-disable rate limiting for local LLM (no API limits)
+        # Auto-disable rate limiting for local LLM (no API limits); the bucket is
+        # shared with every other generator calling the same model in this process
         self._rate_limit = FAQ_LLM_RATE_LIMIT_DELAY if not self._use_local else 0.0
+        self._rate_limiter = get_rate_limiter(
+            self.backend, FAQ_OLLAMA_MODEL if self._use_local else FAQ_GEMINI_MODEL
+        )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self.llm_calls = 0
+        self.last_run_stats: Dict[str, Any] = {}
         
         logger.info(
             f"FAQGenerator initialized: backend={self.backend}, "
             f"questions_per_chunk={self.num_questions}, "
-            f"rate_limit={self._rate_limit}s"
+            f"chunks_per_prompt={self.chunks_per_prompt}, "
+            f"concurrency={self.concurrency}, "
+            f"rate_limit={self._rate_limit}s (burst {self._rate_limiter.capacity})"
         )
     
     @property
@@ -116,6 +212,7 @@ Questions:"""
                 self._llm = "local"  # Special marker for local backend
             else:
                 self._llm = self._get_gemini_llm()
+                self._gemini_json_mode = self._llm is not None
         return self._llm
     
     def _get_gemini_llm(self):
@@ -128,7 +225,7 @@ Questions:"""
                 return None
             
             return ChatGoogleGenerativeAI(
-                model="gemini-2.0-flash-lite",  # Cheap for batch ingestion
+                model=FAQ_GEMINI_MODEL,
                 temperature=0.3,
                 google_api_key=google_api_key
             )
@@ -136,29 +233,34 @@ Questions:"""
             logger.error(f"Failed to initialize Gemini LLM: {e}")
             return None
     
-    async def _call_local_llm(self, prompt: str) -> Optional[str]:
+    async def _call_local_llm(self, prompt: str, json_mode: bool = False, num_chunks: int = 1) -> Optional[str]:
         """
         Call local Ollama LLM for question generation.
         
         Args:
             prompt: The prompt to send to the LLM
+            json_mode: Constrain the output to JSON (multi-chunk prompts)
+            num_chunks: Chunks covered by the prompt (scales the output budget)
             
         Returns:
             Generated text or None on error
         """
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        request = {
+            "model": FAQ_OLLAMA_MODEL,
+            "prompt": prompt,
+            "stream": False,
+            "options": {
+                "temperature": 0.3,
+                "num_predict": 300 * num_chunks,  # ~100 tokens per question × 3
+            },
+        }
+        if json_mode:
+            request["format"] = "json"
+        async with httpx.AsyncClient(timeout=60.0 * num_chunks) as client:
             try:
                 response = await client.post(
                     f"{FAQ_OLLAMA_URL}/api/generate",
-                    json={
-                        "model": FAQ_OLLAMA_MODEL,
-                        "prompt": prompt,
-                        "stream": False,
-                        "options": {
-                            "temperature": 0.3,
-                            "num_predict": 300,  # ~100 tokens per question × 3
-                        },
-                    },
+                    json=request,
                 )
                 response.raise_for_status()
                 
@@ -222,6 +324,21 @@ Questions:"""
         logger.info("✓ Gemini API key configured")
         return True
     
+    @staticmethod
+    def _content_hash(chunk: Document) -> str:
+        """MD5 of the chunk text (chunk ids and question cache keys derive from it)."""
+        return hashlib.md5(chunk.page_content.encode()).hexdigest()
+    
+    @property
+    def cache_version(self) -> str:
+        """
+        Generator version for question cache keys: backend, model, questions per
+        chunk and a hash of the prompts. Cached questions from another version are ignored.
+        """
+        model = FAQ_OLLAMA_MODEL if self._use_local else FAQ_GEMINI_MODEL
+        prompts = hashlib.md5((self.GENERATION_PROMPT + self.BATCH_GENERATION_PROMPT).encode()).hexdigest()[:8]
+        return f"{self.backend}:{model}:q{self.num_questions}:{prompts}"
+    
     def _generate_chunk_id(self, chunk: Document) -> str:
         """
         Generate a stable ID for a chunk based on content hash + metadata.
@@ -236,7 +353,7 @@ Questions:"""
             Stable chunk ID string
         """
         # Use content hash for uniqueness
-        content_hash = hashlib.md5(chunk.page_content.encode()).hexdigest()[:12]
+        content_hash = self._content_hash(chunk)[:12]
         
         # Include payload_id for traceability
         payload_id = chunk.metadata.get("payload_id", "unknown")
@@ -246,6 +363,66 @@ Questions:"""
         
         return f"{payload_id}_{chunk_idx}_{content_hash}"
     
+    async def _invoke(self, prompt: str, json_mode: bool = False, num_chunks: int = 1) -> Optional[str]:
+        """
+        Send one prompt to the configured backend, within the concurrency and rate limits.
+        
+        Returns:
+            Response text, or None if the backend is unavailable or returned nothing
+        """
+        async with self._semaphore:
+            if self._use_local:
+                self.llm_calls += 1
+                response_text = await self._call_local_llm(prompt, json_mode=json_mode, num_chunks=num_chunks)
+                if not response_text:
+                    logger.warning("Local LLM returned empty response")
+                    return None
+                return response_text
+            
+            if not self.llm or self.llm == "local":
+                logger.warning("Gemini LLM not available")
+                return None
+            
+            # Rate limiting (only for Gemini, local has no limits)
+            await self._rate_limiter.acquire()
+            self.llm_calls += 1
+            if json_mode and self._gemini_json_mode:
+                response = await self.llm.ainvoke(
+                    prompt, generation_config={"response_mime_type": "application/json"}
+                )
+            else:
+                response = await self.llm.ainvoke(prompt)
+            return response.content.strip()
+    
+    def _parse_questions(self, raw_questions: List[str]) -> List[str]:
+        """Clean LLM output lines into at most num_questions questions."""
+        questions = []
+        for q in raw_questions:
+            if not isinstance(q, str):
+                continue
+            q = q.strip()
+            # Remove numbering (1., 2., etc.)
+            if q and q[0].isdigit() and '.' in q[:3]:
+                q = q.split('.', 1)[1].strip()
+            # Remove bullet points
+            if q and q.startswith(('-', '*', '•')):
+                q = q[1:].strip()
+            # Keep only valid questions
+            if q and q.endswith('?') and len(q) > 10:
+                questions.append(q)
+        
+        # Limit to requested number
+        return questions[:self.num_questions]
+    
+    @staticmethod
+    def _eligible_content(chunk: Document) -> Optional[str]:
+        """Content sent to the LLM (truncated to avoid token limits), or None for very short chunks."""
+        content = chunk.page_content[:3000]
+        if len(content.strip()) < 50:
+            logger.debug(f"Skipping question generation for short chunk ({len(content)} chars)")
+            return None
+        return content
+    
     async def generate_questions(self, chunk: Document) -> List[str]:
         """
         Generate questions for a document chunk.
@@ -256,12 +433,8 @@ Questions:"""
         Returns:
             List of generated questions (up to num_questions per chunk)
         """
-        # Truncate content for LLM context (avoid token limits)
-        content = chunk.page_content[:3000]
-        
-        # Skip very short content
-        if len(content.strip()) < 50:
-            logger.debug(f"Skipping question generation for short chunk ({len(content)} chars)")
+        content = self._eligible_content(chunk)
+        if content is None:
             return []
         
         # Escape curly braces in content to prevent .format() breaking on code snippets
@@ -274,42 +447,12 @@ Questions:"""
         )
         
         try:
-            # Call appropriate backend
-            if self._use_local:
-                response_text = await self._call_local_llm(prompt)
-                if not response_text:
-                    logger.warning("Local LLM returned empty response")
-                    return []
-            else:
-                if not self.llm or self.llm == "local":
-                    logger.warning("Gemini LLM not available")
-                    return []
-                response = await self.llm.ainvoke(prompt)
-                response_text = response.content.strip()
-            
-            # Rate limiting (only for Gemini, local has no limits)
-            if self._rate_limit > 0:
-                await asyncio.sleep(self._rate_limit)
+            response_text = await self._invoke(prompt)
+            if response_text is None:
+                return []
             
             # Parse response - one question per line
-            raw_questions = response_text.split('\n')
-            
-            # Filter and clean questions
-            questions = []
-            for q in raw_questions:
-                q = q.strip()
-                # Remove numbering (1., 2., etc.)
-                if q and q[0].isdigit() and '.' in q[:3]:
-                    q = q.split('.', 1)[1].strip()
-                # Remove bullet points
-                if q and q.startswith(('-', '*', '•')):
-                    q = q[1:].strip()
-                # Keep only valid questions
-                if q and q.endswith('?') and len(q) > 10:
-                    questions.append(q)
-            
-            # Limit to requested number
-            questions = questions[:self.num_questions]
+            questions = self._parse_questions(response_text.split('\n'))
             
             logger.debug(f"Generated {len(questions)} questions for chunk")
             return questions
@@ -318,6 +461,78 @@ Questions:"""
             logger.warning(f"Failed to generate questions: {e}")
             return []
     
+    @staticmethod
+    def _parse_json_object(response_text: str) -> Optional[Dict[str, Any]]:
+        """Parse a JSON object from an LLM response, tolerating code fences and surrounding text."""
+        text = re.sub(r"^```(?:json)?\s*|\s*```$", "", response_text.strip())
+        start, end = text.find("{"), text.rfind("}")
+        if start == -1 or end <= start:
+            return None
+        try:
+            value = json.loads(text[start:end + 1])
+        except json.JSONDecodeError:
+            return None
+        return value if isinstance(value, dict) else None
+    
+    async def generate_questions_batch(self, chunks: List[Document]) -> List[List[str]]:
+        """
+        Generate questions for several chunks with one multi-chunk prompt.
+        
+        Chunks the response does not cover (or all of them, if it is not valid
+        JSON) are retried with one prompt each.
+        
+        Args:
+            chunks: Document chunks (normally chunks_per_prompt of them)
+            
+        Returns:
+            Questions per chunk, in input order
+        """
+        results: List[List[str]] = [[] for _ in chunks]
+        contents = {i: content for i, chunk in enumerate(chunks)
+                    if (content := self._eligible_content(chunk)) is not None}
+        if len(contents) <= 1:
+            for i in contents:
+                results[i] = await self.generate_questions(chunks[i])
+            return results
+        
+        # Blocks are numbered 1..n in prompt order
+        numbered = list(contents)
+        blocks = "\n\n".join(
+            f"[{block}]\n{contents[i]}" for block, i in enumerate(numbered, start=1)
+        )
+        prompt = self.BATCH_GENERATION_PROMPT.format(
+            num_blocks=len(numbered),
+            num_questions=self.num_questions,
+            blocks=blocks,
+        )
+        
+        response_text = None
+        parsed = None
+        try:
+            response_text = await self._invoke(prompt, json_mode=True, num_chunks=len(numbered))
+            if response_text is None:
+                # Backend unavailable; per-chunk prompts would fail the same way
+                return results
+            parsed = self._parse_json_object(response_text)
+            if parsed is None:
+                logger.warning(f"Multi-chunk FAQ response was not a JSON object; retrying {len(numbered)} chunks one by one")
+        except Exception as e:
+            logger.warning(f"Failed to generate questions for {len(numbered)} chunks: {e}")
+        
+        retry = []
+        for block, i in enumerate(numbered, start=1):
+            value = parsed.get(str(block)) if parsed is not None else None
+            questions = self._parse_questions(value) if isinstance(value, list) else []
+            if questions:
+                results[i] = questions
+            else:
+                retry.append(i)
+        if retry:
+            retried = await asyncio.gather(*(self.generate_questions(chunks[i]) for i in retry))
+            for i, questions in zip(retry, retried):
+                results[i] = questions
+        return results
+    
     async def process_chunks_with_questions(
         self, 
         chunks: List[Document]
@@ -347,8 +562,48 @@ Questions:"""
         parent_chunks_map: Dict[str, Document] = {}
         
         total_questions = 0
+        start_time = time.perf_counter()
+        calls_before = self.llm_calls
         
-        for i, chunk in enumerate(chunks):
+        # Reuse questions of chunks whose text was already processed by this generator version
+        questions_per_chunk: List[List[str]] = [[] for _ in chunks]
+        eligible = [i for i, chunk in enumerate(chunks) if self._eligible_content(chunk) is not None]
+        cache_keys: Dict[int, str] = {}
+        if self.question_cache is not None and eligible:
+            version = self.cache_version
+            cache_keys = {i: self.question_cache.key(self._content_hash(chunks[i]), version) for i in eligible}
+            found = await asyncio.to_thread(self.question_cache.get_many, list(cache_keys.values()))
+            for i, key in cache_keys.items():
+                if key in found:
+                    questions_per_chunk[i] = found[key][:self.num_questions]
+        pending = [i for i in eligible if not questions_per_chunk[i]]
+        cache_hits = len(eligible) - len(pending)
+        
+        # Prompts of chunks_per_prompt chunks, run concurrently (bounded in _invoke)
+        groups = [pending[i:i + self.chunks_per_prompt] for i in range(0, len(pending), self.chunks_per_prompt)]
+        done = 0
+        next_progress_log = 10
+        
+        async def run_group(group: List[int]) -> None:
+            nonlocal done, next_progress_log
+            results = await self.generate_questions_batch([chunks[i] for i in group])
+            for i, questions in zip(group, results):
+                questions_per_chunk[i] = questions
+            done += len(group)
+            # Log progress for long operations
+            if done >= next_progress_log:
+                logger.info(f"Generated questions for {done}/{len(pending)} chunks...")
+                next_progress_log = (done // 10 + 1) * 10
+        
+        await asyncio.gather(*(run_group(group) for group in groups))
+        
+        if cache_keys and pending:
+            await asyncio.to_thread(
+                self.question_cache.put_many,
+                {cache_keys[i]: questions_per_chunk[i] for i in pending},
+            )
+        
+        for chunk, questions in zip(chunks, questions_per_chunk):
             # Generate stable ID for this chunk
             chunk_id = self._generate_chunk_id(chunk)
             
@@ -366,9 +621,6 @@ Questions:"""
             )
             all_docs.append(chunk_with_id)
             
-            # Generate synthetic questions
-            questions = await self.generate_questions(chunk)
-            
             for q_idx, question in enumerate(questions):
                 # CRITICAL: Synthetic questions MUST inherit key metadata
                 # especially payload_id for CRUD lifecycle support
@@ -388,15 +640,35 @@ Questions:"""
                 )
                 all_docs.append(question_doc)
                 total_questions += 1
-            
-            # Log progress for long operations
-            if (i + 1) % 10 == 0:
-                logger.info(f"Processed {i + 1}/{len(chunks)} chunks...")
         
+        elapsed = time.perf_counter() - start_time
+        minutes = max(elapsed, 1e-9) / 60
+        self.last_run_stats = {
+            "chunks": len(chunks),
+            "questions": total_questions,
+            "cache_hits": cache_hits,
+            "cache_misses": len(pending),
+            "cache_hit_ratio": cache_hits / len(eligible) if eligible else 0.0,
+            "llm_calls": self.llm_calls - calls_before,
+            "duration_seconds": elapsed,
+            "chunks_per_minute": len(chunks) / minutes,
+            "questions_per_minute": total_questions / minutes,
+        }
         logger.info(
             f"Processed {len(chunks)} chunks → {len(all_docs)} documents "
-            f"({total_questions} synthetic questions)"
+            f"({total_questions} synthetic questions, {self.last_run_stats['llm_calls']} LLM calls) "
+            f"in {elapsed:.1f}s: {self.last_run_stats['chunks_per_minute']:.1f} chunks/min, "
+            f"{self.last_run_stats['questions_per_minute']:.1f} questions/min"
         )
+        if self.question_cache is not None and eligible:
+            logger.info(
+                f"FAQ question cache: reused {cache_hits}/{len(eligible)} chunks "
+                f"({self.last_run_stats['cache_hit_ratio']:.0%}), generated {len(pending)}"
+            )
+            if METRICS_ENABLED:
+                faq_question_cache_lookups_total.labels(result="hit").inc(cache_hits)
+                faq_question_cache_lookups_total.labels(result="miss").inc(len(pending))
+                faq_question_cache_hit_ratio.observe(self.last_run_stats["cache_hit_ratio"])
         return all_docs, parent_chunks_map
 
 
@@ -0,0 +1,164 @@
+"""
+FAQ Question Cache
+
+Persistent store of the synthetic questions FAQGenerator produced for a
+chunk, so re-ingesting an article only calls the LLM for chunks whose text
+changed.
+
+- Keyed by the MD5 of the chunk's page_content (the hash FAQGenerator's
+  chunk ids are derived from) plus the generator version (model, questions
+  per chunk, prompt text). Changing any of those starts a fresh keyspace
+  instead of serving questions made by a different prompt or model.
+- The key deliberately excludes payload_id and chunk_index: a paragraph
+  inserted above a chunk, or the same text in another article, still hits.
+- Stored in MongoDB (MONGO_URI, collection FAQ_QUESTION_CACHE_COLLECTION)
+  through the VectorStoreManager's shared pymongo client. Calls are
+  synchronous; async callers run them in a thread. Without MongoDB every
+  lookup is a miss and writes are dropped.
+- Entries expire through a TTL index on last_used_at, which every hit
+  refreshes: questions of a retired generator version (or of text that no
+  longer exists) are dropped FAQ_QUESTION_CACHE_TTL_DAYS after their last use.
+
+Usage:
+    cache = FAQQuestionCache()
+    found = cache.get_many(["<md5>:<version>", ...])     # -> {key: [questions]}
+    cache.put_many({"<md5>:<version>": ["What is ...?"]})
+"""
+
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from pymongo import UpdateOne
+
+logger = logging.getLogger(__name__)
+
+FAQ_QUESTION_CACHE_ENABLED = os.getenv("FAQ_QUESTION_CACHE_ENABLED", "true").lower() == "true"
+FAQ_QUESTION_CACHE_COLLECTION = os.getenv("FAQ_QUESTION_CACHE_COLLECTION", "faq_question_cache")
+# Days an entry is kept after its last use (0 disables expiry)
+FAQ_QUESTION_CACHE_TTL_DAYS = float(os.getenv("FAQ_QUESTION_CACHE_TTL_DAYS", "90"))
+
+
+class FAQQuestionCache:
+    """MongoDB-backed map of (content hash, generator version) -> generated questions."""
+
+    def __init__(self, collection=None, ttl_days: float = None):
+        """
+        Args:
+            collection: pymongo collection to use (default: FAQ_QUESTION_CACHE_COLLECTION
+                in MONGO_DB_NAME, opened lazily)
+            ttl_days: Days an entry survives without being used (default: FAQ_QUESTION_CACHE_TTL_DAYS)
+        """
+        self._collection = collection
+        self._unavailable = False
+        self.ttl_days = FAQ_QUESTION_CACHE_TTL_DAYS if ttl_days is None else ttl_days
+        self._indexes_ready = False
+
+    @property
+    def collection(self):
+        if self._collection is None and not self._unavailable:
+            try:
+                from backend.data_ingestion.vector_store_manager import _get_shared_mongo_client
+                client = _get_shared_mongo_client()
+            except Exception as e:
+                logger.warning(f"FAQ question cache unavailable: {e}")
+                client = None
+            if client is None:
+                logger.info("MongoDB unavailable, FAQ question cache disabled")
+                self._unavailable = True
+                return None
+            db_name = os.getenv("MONGO_DB_NAME", "litecoin_rag_db")
+            self._collection = client[db_name][FAQ_QUESTION_CACHE_COLLECTION]
+        if self._collection is not None and not self._indexes_ready:
+            self._ensure_ttl_index(self._collection)
+        return self._collection
+
+    def _ensure_ttl_index(self, collection) -> None:
+        """Create the last_used_at TTL index (once per process) and stamp entries written before it."""
+        self._indexes_ready = True
+        if self.ttl_days <= 0:
+            return
+        try:
+            collection.create_index("last_used_at", expireAfterSeconds=int(self.ttl_days * 86400))
+            # Entries from before the TTL index have no last_used_at and would never expire
+            collection.update_many(
+                {"last_used_at": {"$exists": False}},
+                {"$set": {"last_used_at": datetime.utcnow()}},
+            )
+        except Exception as e:
+            logger.warning(f"Could not create FAQ question cache TTL index: {e}")
+
+    @staticmethod
+    def key(content_hash: str, version: str) -> str:
+        return f"{content_hash}:{version}"
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, List[str]]:
+        """
+        Look up cached questions.
+
+        Returns:
+            {key: questions} for the keys that are cached
+        """
+        keys = list(dict.fromkeys(keys))
+        collection = self.collection
+        if not keys or collection is None:
+            return {}
+        try:
+            found = {
+                doc["_id"]: doc["questions"]
+                for doc in collection.find({"_id": {"$in": keys}}, {"questions": 1})
+                if doc.get("questions")
+            }
+            if found:
+                # Keep entries that are still in use from expiring
+                collection.update_many(
+                    {"_id": {"$in": list(found)}},
+                    {"$set": {"last_used_at": datetime.utcnow()}},
+                )
+            return found
+        except Exception as e:
+            logger.warning(f"FAQ question cache lookup failed: {e}")
+            return {}
+
+    def put_many(self, entries: Dict[str, List[str]]) -> int:
+        """
+        Store questions (entries with no questions are skipped).
+
+        Returns:
+            Number of entries written
+        """
+        collection = self.collection
+        entries = {key: questions for key, questions in entries.items() if questions}
+        if not entries or collection is None:
+            return 0
+        now = datetime.utcnow()
+        try:
+            collection.bulk_write(
+                [
+                    UpdateOne(
+                        {"_id": key},
+                        {"$set": {"questions": questions, "updated_at": now, "last_used_at": now}},
+                        upsert=True,
+                    )
+                    for key, questions in entries.items()
+                ],
+                ordered=False,
+            )
+            return len(entries)
+        except Exception as e:
+            logger.warning(f"FAQ question cache write failed: {e}")
+            return 0
+
+
+_default_cache: Optional[FAQQuestionCache] = None
+
+
+def get_faq_question_cache() -> Optional[FAQQuestionCache]:
+    """Process-wide cache instance, or None when FAQ_QUESTION_CACHE_ENABLED=false."""
+    global _default_cache
+    if not FAQ_QUESTION_CACHE_ENABLED:
+        return None
+    if _default_cache is None:
+        _default_cache = FAQQuestionCache()
+    return _default_cache
@@ -0,0 +1,142 @@
+"""
+Hybrid Fusion
+
+Merges the ranked (Document, score) lists of the lexical (BM25) and vector
+(FAISS) retrievers into one scored list, keyed by chunk_id.
+
+The retrieve node used to put all BM25 hits first and dedupe on
+`page_content[:200]`, discarding the FAISS scores. Fusion instead lets a
+chunk that both retrievers rank highly beat one that only a single
+retriever found, and keeps a score the downstream steps can order by.
+
+Modes (HYBRID_FUSION_MODE):
+    rrf    weighted Reciprocal Rank Fusion: sum(weight / (HYBRID_RRF_K + rank))
+           (default; rank-based, so BM25 and L2 distance scales never mix)
+    score  weighted sum of per-list min-max normalized scores (lists whose
+           scores are distances are inverted first)
+
+Keys: synthetic FAQ questions are keyed by their parent_chunk_id, so a
+question hit and its parent chunk pool their evidence; other documents by
+chunk_id, falling back to the full page_content for legacy documents
+without one. The fused entry keeps the first non-synthetic document seen
+for its key.
+
+Usage:
+    fused = fuse_ranked_lists([
+        RankedList("bm25", bm25_results, weight=HYBRID_BM25_WEIGHT),
+        RankedList("vector", vector_results, weight=HYBRID_VECTOR_WEIGHT, higher_is_better=False),
+    ])
+    resolved = resolve_parents_from_tuples(fused, parent_chunks_map)
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+FUSION_MODES = ("rrf", "score")
+
+HYBRID_FUSION_MODE = os.getenv("HYBRID_FUSION_MODE", "rrf").lower()
+HYBRID_RRF_K = int(os.getenv("HYBRID_RRF_K", "60"))
+HYBRID_BM25_WEIGHT = float(os.getenv("HYBRID_BM25_WEIGHT", "0.5"))
+HYBRID_VECTOR_WEIGHT = float(os.getenv("HYBRID_VECTOR_WEIGHT", "0.5"))
+
+
+@dataclass(frozen=True)
+class RankedList:
+    """One retriever's results, best first."""
+
+    name: str
+    results: Sequence[Tuple[Document, float]]
+    weight: float = 1.0
+    # False for distance scores (FAISS L2), where lower is better
+    higher_is_better: bool = True
+
+
+def resolve_fusion_mode(mode: Optional[str] = None) -> str:
+    """Normalise a fusion mode, falling back to RRF for unknown values."""
+    resolved = (mode or HYBRID_FUSION_MODE or "rrf").lower()
+    if resolved not in FUSION_MODES:
+        logger.warning(f"Unknown hybrid fusion mode '{resolved}', using 'rrf'")
+        return "rrf"
+    return resolved
+
+
+def fusion_key(doc: Document) -> Hashable:
+    """Identity used to merge the same chunk across retrievers."""
+    metadata = doc.metadata or {}
+    if metadata.get("is_synthetic"):
+        parent_id = metadata.get("parent_chunk_id")
+        if parent_id:
+            return parent_id
+    return metadata.get("chunk_id") or doc.page_content
+
+
+def vector_scores_higher_is_better(vector_store: Any) -> bool:
+    """LangChain FAISS returns L2 distances unless built for max inner product."""
+    strategy = getattr(vector_store, "distance_strategy", None)
+    return str(getattr(strategy, "value", strategy) or "").upper() == "MAX_INNER_PRODUCT"
+
+
+def _normalized(results: Sequence[Tuple[Document, float]], higher_is_better: bool) -> List[float]:
+    scores = [float(score) for _doc, score in results]
+    low, high = min(scores), max(scores)
+    if high == low:
+        return [1.0] * len(scores)
+    span = high - low
+    if higher_is_better:
+        return [(s - low) / span for s in scores]
+    return [(high - s) / span for s in scores]
+
+
+def fuse_ranked_lists(
+    ranked_lists: Sequence[RankedList],
+    mode: Optional[str] = None,
+    rrf_k: Optional[int] = None,
+) -> List[Tuple[Document, float]]:
+    """
+    Fuse ranked result lists into (Document, fused score), best first.
+
+    Within one list only the best-ranked occurrence of a key counts. Ties
+    keep first-seen order (list order, then rank).
+
+    Args:
+        ranked_lists: Retriever results, each sorted best first
+        mode: "rrf" or "score" (defaults to HYBRID_FUSION_MODE)
+        rrf_k: RRF rank constant (defaults to HYBRID_RRF_K)
+
+    Returns:
+        Fused (Document, score) list, higher score first
+    """
+    mode = resolve_fusion_mode(mode)
+    rrf_k = HYBRID_RRF_K if rrf_k is None else rrf_k
+
+    scores: Dict[Hashable, float] = {}
+    docs: Dict[Hashable, Document] = {}
+
+    for ranked in ranked_lists:
+        if not ranked.results or ranked.weight == 0:
+            continue
+        if mode == "score":
+            contributions = _normalized(ranked.results, ranked.higher_is_better)
+        else:
+            contributions = [1.0 / (rrf_k + rank) for rank in range(1, len(ranked.results) + 1)]
+
+        seen_in_list = set()
+        for (doc, _score), contribution in zip(ranked.results, contributions):
+            key = fusion_key(doc)
+            if key in seen_in_list:
+                continue
+            seen_in_list.add(key)
+            scores[key] = scores.get(key, 0.0) + ranked.weight * contribution
+            current = docs.get(key)
+            if current is None or (current.metadata.get("is_synthetic") and not doc.metadata.get("is_synthetic")):
+                docs[key] = doc
+
+    # dicts keep insertion order and sorted() is stable, so ties keep first-seen order
+    ordered = sorted(scores.items(), key=lambda item: -item[1])
+    return [(docs[key], score) for key, score in ordered]
@@ -19,16 +19,48 @@ Usage:
     
     # Embed multiple documents
     vectors = await embeddings.embed_documents(["doc1", "doc2"])
+
+Requests share one long-lived pooled client (keep-alive, HTTP/2 when the
+h2 package is installed). Concurrent embed_query calls that arrive within
+INFINITY_BATCH_WINDOW_MS are sent as a single /embeddings request, and
+identical texts already in flight share one result.
 """
 
 import os
+import asyncio
+import importlib.util
 import logging
-from typing import List, Optional, Dict, Tuple
+from typing import Any, List, Optional, Dict, Set, Tuple
 import httpx
 import numpy as np
 
+from backend.services.sparse_index import sparse_cosine, sparse_cosine_batch
+
 logger = logging.getLogger(__name__)
 
+# Import metrics if available
+try:
+    from backend.monitoring.metrics import (
+        infinity_embed_requests_total,
+        infinity_embed_batch_size,
+        infinity_embed_coalesced_total,
+        infinity_http_clients_created_total,
+        infinity_http_pool_connections,
+    )
+    METRICS_ENABLED = True
+except ImportError:
+    METRICS_ENABLED = False
+
+# HTTP/2 needs the optional 'h2' package; fall back to HTTP/1.1 keep-alive without it
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Connection pool sizing for the long-lived client
+INFINITY_MAX_CONNECTIONS = int(os.getenv("INFINITY_MAX_CONNECTIONS", "20"))
+INFINITY_KEEPALIVE_EXPIRY = float(os.getenv("INFINITY_KEEPALIVE_EXPIRY", "30"))
+# Micro-batching window for concurrent embed_query calls (0 disables batching)
+INFINITY_BATCH_WINDOW_MS = float(os.getenv("INFINITY_BATCH_WINDOW_MS", "2"))
+INFINITY_MAX_BATCH_SIZE = int(os.getenv("INFINITY_MAX_BATCH_SIZE", "32"))
+
 
 class InfinityEmbeddings:
     """
@@ -66,8 +98,83 @@ class InfinityEmbeddings:
         self.model_id = model_id or os.getenv("EMBEDDING_MODEL_ID", "BAAI/bge-m3")
         self.timeout = timeout
         self.dimension = int(os.getenv("VECTOR_DIMENSION", "1024"))
+        self.batch_window = max(INFINITY_BATCH_WINDOW_MS, 0.0) / 1000.0
+        self.max_batch_size = max(INFINITY_MAX_BATCH_SIZE, 1)
+        
+        # Long-lived pooled client, bound to the event loop that created it
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
         
-        logger.info(f"InfinityEmbeddings initialized: url={self.infinity_url}, model={self.model_id}")
+        # Micro-batching state for embed_query (text -> shared future)
+        self._batch_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: Set[asyncio.Task] = set()  # strong refs so running batches aren't GC'd
+        
+        logger.info(
+            f"InfinityEmbeddings initialized: url={self.infinity_url}, model={self.model_id}, "
+            f"http2={HTTP2_AVAILABLE}, batch_window={INFINITY_BATCH_WINDOW_MS}ms"
+        )
+    
+    def _create_client(self) -> httpx.AsyncClient:
+        """Create a pooled keep-alive client (HTTP/2 when the h2 package is installed)."""
+        client = httpx.AsyncClient(
+            timeout=self.timeout,
+            limits=httpx.Limits(
+                max_connections=INFINITY_MAX_CONNECTIONS,
+                max_keepalive_connections=INFINITY_MAX_CONNECTIONS,
+                keepalive_expiry=INFINITY_KEEPALIVE_EXPIRY,
+            ),
+            http2=HTTP2_AVAILABLE,
+        )
+        if METRICS_ENABLED:
+            infinity_http_clients_created_total.inc()
+        return client
+    
+    def _get_client(self) -> Tuple[httpx.AsyncClient, bool]:
+        """
+        Return (client, is_pooled) for the current event loop.
+        
+        httpx clients are bound to the loop they were created on. Calls coming
+        from the sync wrappers run on a throwaway loop (asyncio.run), so they get
+        a one-off client that the caller must close.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is not None and (self._client_loop.is_closed() or self._client.is_closed):
+            # Owning loop is gone or the client was closed: start a fresh pool
+            self._client = None
+        if self._client is None:
+            self._client = self._create_client()
+            self._client_loop = loop
+            return self._client, True
+        if self._client_loop is loop:
+            return self._client, True
+        return self._create_client(), False
+    
+    def pool_stats(self) -> Dict[str, int]:
+        """Best-effort connection counts for the pooled client (httpcore internals)."""
+        stats = {"active": 0, "idle": 0}
+        try:
+            pool = getattr(getattr(self._client, "_transport", None), "_pool", None)
+            for conn in list(getattr(pool, "connections", None) or []):
+                if conn.is_idle():
+                    stats["idle"] += 1
+                else:
+                    stats["active"] += 1
+        except Exception:
+            pass
+        return stats
+    
+    async def aclose(self) -> None:
+        """Close the pooled client (call on application shutdown)."""
+        client, self._client = self._client, None
+        self._client_loop = None
+        if client is not None:
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.debug(f"Error closing Infinity HTTP client: {e}")
     
     async def embed_query(self, text: str) -> Tuple[List[float], Optional[Dict[str, float]]]:
         """
@@ -85,8 +192,71 @@ class InfinityEmbeddings:
             httpx.HTTPError: If the request fails
             ValueError: If the response format is invalid
         """
-        dense, sparse = await self.embed_documents([text])
-        return dense[0], sparse[0] if sparse else None
+        if self.batch_window <= 0:
+            dense, sparse = await self.embed_documents([text])
+            return dense[0], sparse[0] if sparse else None
+        
+        loop = asyncio.get_running_loop()
+        if self._batch_loop is not loop:
+            if self._batch_loop is None or self._batch_loop.is_closed():
+                self._batch_loop = loop
+                self._pending = {}
+                self._in_flight = {}
+                self._flush_handle = None
+                self._batch_tasks = set()
+            else:
+                # Called from a secondary loop (sync wrapper) - don't mix futures across loops
+                dense, sparse = await self.embed_documents([text])
+                return dense[0], sparse[0] if sparse else None
+        
+        future = self._pending.get(text) or self._in_flight.get(text)
+        if future is not None:
+            if METRICS_ENABLED:
+                infinity_embed_coalesced_total.labels(reason="deduplicated").inc()
+        else:
+            future = loop.create_future()
+            if self._pending and METRICS_ENABLED:
+                infinity_embed_coalesced_total.labels(reason="batched").inc()
+            self._pending[text] = future
+            if len(self._pending) >= self.max_batch_size:
+                self._flush_pending()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.batch_window, self._flush_pending)
+        
+        # Shield so one caller's cancellation doesn't fail everyone sharing the future
+        return await asyncio.shield(future)
+    
+    def _flush_pending(self) -> None:
+        """Send everything collected in the current batch window as one request."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        self._in_flight.update(batch)
+        task = asyncio.ensure_future(self._run_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+    
+    async def _run_batch(self, batch: Dict[str, asyncio.Future]) -> None:
+        texts = list(batch.keys())
+        try:
+            dense, sparse = await self.embed_documents(texts)
+            for i, text in enumerate(texts):
+                future = batch[text]
+                if not future.done():
+                    future.set_result((dense[i], sparse[i] if sparse else None))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Mark retrieved so abandoned futures don't log "exception never retrieved"
+                    future.exception()
+        finally:
+            for text, future in batch.items():
+                if self._in_flight.get(text) is future:
+                    del self._in_flight[text]
     
     async def embed_query_dense(self, text: str) -> List[float]:
         """
@@ -113,20 +283,20 @@ class InfinityEmbeddings:
         Returns:
             Similarity score (0.0 to 1.0)
         """
-        if not query_sparse or not doc_sparse:
-            return 0.0
-        
-        # Compute dot product and norms
-        dot_product = sum(query_sparse.get(word, 0) * doc_sparse.get(word, 0) 
-                         for word in set(query_sparse.keys()) | set(doc_sparse.keys()))
-        
-        query_norm = sum(w * w for w in query_sparse.values()) ** 0.5
-        doc_norm = sum(w * w for w in doc_sparse.values()) ** 0.5
-        
-        if query_norm == 0 or doc_norm == 0:
-            return 0.0
+        return sparse_cosine(query_sparse, doc_sparse)
+    
+    @staticmethod
+    def sparse_similarity_batch(
+        query_sparse: Dict[str, float], doc_sparse_list: List[Optional[Dict[str, float]]]
+    ) -> List[float]:
+        """
+        Compute cosine similarity between a query and many sparse embeddings
+        with a single sparse mat-vec (see services.sparse_index).
         
-        return dot_product / (query_norm * doc_norm)
+        Returns:
+            One similarity score per document (0.0 where a document has no sparse vector)
+        """
+        return sparse_cosine_batch(query_sparse, doc_sparse_list)
     
     async def embed_documents(self, texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict[str, float]]]]:
         """
@@ -147,57 +317,78 @@ class InfinityEmbeddings:
         if not texts:
             return []
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            try:
-                response = await client.post(
-                    f"{self.infinity_url}/embeddings",
-                    json={
-                        "model": self.model_id,
-                        "input": texts,
-                        "encoding_format": "float",  # Ensure consistent format with document embeddings
-                    },
-                    headers={"Content-Type": "application/json"},
-                )
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                # Extract embeddings from OpenAI-compatible response format
-                # Response format: {"data": [{"embedding": [...], "index": 0}, ...]}
-                if "data" not in data:
-                    raise ValueError(f"Invalid response format: missing 'data' key. Response: {data}")
-                
-                # Sort by index to ensure correct order
-                sorted_data = sorted(data["data"], key=lambda x: x.get("index", 0))
-                dense_embeddings = [item["embedding"] for item in sorted_data]
-                sparse_embeddings = [item.get("sparse_embedding") for item in sorted_data]
-                
-                # Validate embedding dimensions
-                if dense_embeddings:
-                    actual_dim = len(dense_embeddings[0])
-                    expected_dim = self.dimension
-                    if actual_dim != expected_dim:
-                        logger.warning(
-                            f"Embedding dimension mismatch: got {actual_dim}, expected {expected_dim}. "
-                            f"This may cause search issues!"
+        client, pooled = self._get_client()
+        try:
+            dense_embeddings, sparse_embeddings = await self._post_embeddings(client, texts)
+            if METRICS_ENABLED:
+                infinity_embed_requests_total.labels(status="success").inc()
+                infinity_embed_batch_size.observe(len(texts))
+                if pooled:
+                    for state, count in self.pool_stats().items():
+                        infinity_http_pool_connections.labels(state=state).set(count)
+            return dense_embeddings, sparse_embeddings
+        except Exception:
+            if METRICS_ENABLED:
+                infinity_embed_requests_total.labels(status="error").inc()
+            raise
+        finally:
+            if not pooled:
+                await client.aclose()
+    
+    async def _post_embeddings(
+        self, client: Any, texts: List[str]
+    ) -> Tuple[List[List[float]], List[Optional[Dict[str, float]]]]:
+        """POST a batch of texts to /embeddings and parse dense + sparse results."""
+        try:
+            response = await client.post(
+                f"{self.infinity_url}/embeddings",
+                json={
+                    "model": self.model_id,
+                    "input": texts,
+                    "encoding_format": "float",  # Ensure consistent format with document embeddings
+                },
+                headers={"Content-Type": "application/json"},
+            )
+            response.raise_for_status()
+            
+            data = response.json()
+            
+            # Extract embeddings from OpenAI-compatible response format
+            # Response format: {"data": [{"embedding": [...], "index": 0}, ...]}
+            if "data" not in data:
+                raise ValueError(f"Invalid response format: missing 'data' key. Response: {data}")
+            
+            # Sort by index to ensure correct order
+            sorted_data = sorted(data["data"], key=lambda x: x.get("index", 0))
+            dense_embeddings = [item["embedding"] for item in sorted_data]
+            sparse_embeddings = [item.get("sparse_embedding") for item in sorted_data]
+            
+            # Validate embedding dimensions
+            if dense_embeddings:
+                actual_dim = len(dense_embeddings[0])
+                expected_dim = self.dimension
+                if actual_dim != expected_dim:
+                    logger.warning(
+                        f"Embedding dimension mismatch: got {actual_dim}, expected {expected_dim}. "
+                        f"This may cause search issues!"
+                    )
+                # Validate all embeddings have same dimension
+                for i, emb in enumerate(dense_embeddings):
+                    if len(emb) != actual_dim:
+                        raise ValueError(
+                            f"Embedding {i} has inconsistent dimension: {len(emb)} vs {actual_dim}"
                         )
-                    # Validate all embeddings have same dimension
-                    for i, emb in enumerate(dense_embeddings):
-                        if len(emb) != actual_dim:
-                            raise ValueError(
-                                f"Embedding {i} has inconsistent dimension: {len(emb)} vs {actual_dim}"
-                            )
-                
-                logger.debug(f"Generated {len(dense_embeddings)} embeddings (dim={len(dense_embeddings[0]) if dense_embeddings else 0})")
-                logger.debug(f"Sparse embeddings available: {sum(1 for s in sparse_embeddings if s is not None)}/{len(sparse_embeddings)}")
-                return dense_embeddings, sparse_embeddings
-                
-            except httpx.HTTPStatusError as e:
-                logger.error(f"Infinity API error: {e.response.status_code} - {e.response.text}")
-                raise
-            except httpx.RequestError as e:
-                logger.error(f"Infinity connection error: {e}")
-                raise
+            
+            logger.debug(f"Generated {len(dense_embeddings)} embeddings (dim={len(dense_embeddings[0]) if dense_embeddings else 0})")
+            logger.debug(f"Sparse embeddings available: {sum(1 for s in sparse_embeddings if s is not None)}/{len(sparse_embeddings)}")
+            return dense_embeddings, sparse_embeddings
+            
+        except httpx.HTTPStatusError as e:
+            logger.error(f"Infinity API error: {e.response.status_code} - {e.response.text}")
+            raise
+        except httpx.RequestError as e:
+            logger.error(f"Infinity connection error: {e}")
+            raise
     
     def embed_query_sync(self, text: str) -> List[float]:
         """
@@ -262,13 +453,16 @@ class InfinityEmbeddings:
         Returns:
             True if healthy, False otherwise
         """
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            try:
-                response = await client.get(f"{self.infinity_url}/health")
-                return response.status_code == 200
-            except Exception as e:
-                logger.warning(f"Infinity health check failed: {e}")
-                return False
+        client, pooled = self._get_client()
+        try:
+            response = await client.get(f"{self.infinity_url}/health", timeout=5.0)
+            return response.status_code == 200
+        except Exception as e:
+            logger.warning(f"Infinity health check failed: {e}")
+            return False
+        finally:
+            if not pooled:
+                await client.aclose()
 
 
 class InfinityEmbeddingsLangChain:
@@ -0,0 +1,533 @@
+"""
+Ingestion Queue
+
+Async work queue for Payload CMS webhooks. The webhook endpoint only records
+the change and returns; a fixed pool of worker coroutines in the API event
+loop does the chunking, FAQ generation and embedding.
+
+- Coalescing: at most one pending job per payload_id. A newer revision of a
+  queued article replaces the queued one, so a burst of edits to the same
+  article is processed once, with its latest content. An edit that arrives
+  while the article is being processed is queued behind it (never run
+  concurrently with it).
+- Bounded concurrency: INGESTION_WORKER_CONCURRENCY workers, so bursts wait
+  in the queue instead of competing with chat traffic for threads.
+- Job state in Redis (hash ingestion_job:{payload_id}: status, revision,
+  operation, document, timestamps, attempts, last error) plus the set
+  ingestion_jobs:unfinished, from which jobs interrupted by a restart are
+  re-queued on start(). Redis errors only cost persistence; the in-process
+  queue keeps working.
+- Multiple API processes: a worker claims a job before running it with a
+  lease (SET ingestion_job:{payload_id}:lease <worker> NX EX
+  INGESTION_LEASE_SECONDS), renewed while the handler runs. A job whose
+  lease is held elsewhere is retried after a delay, not run; start() only
+  recovers jobs whose lease has expired. The persisted revision decides
+  whether a job is superseded, so an edit received by another process wins.
+- Failed jobs are retried with exponential backoff up to
+  INGESTION_MAX_ATTEMPTS, unless a newer revision supersedes them.
+- Metrics: queue depth, active jobs, outcomes, and publish-to-searchable
+  latency (document updatedAt until the job finished).
+
+Usage:
+    queue = IngestionQueue(handler)          # async handler(job: IngestionJob)
+    await queue.start()                      # app startup: workers + recovery
+    await queue.enqueue(payload_id, "update", doc_dict, published_at)
+    await queue.stop()                       # app shutdown
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from backend.utils.lua_scripts import RELEASE_LEASE_LUA, RENEW_LEASE_LUA
+
+logger = logging.getLogger(__name__)
+
+INGESTION_WORKER_CONCURRENCY = int(os.getenv("INGESTION_WORKER_CONCURRENCY", "2"))
+INGESTION_MAX_ATTEMPTS = int(os.getenv("INGESTION_MAX_ATTEMPTS", "3"))
+INGESTION_RETRY_BACKOFF_SECONDS = float(os.getenv("INGESTION_RETRY_BACKOFF_SECONDS", "5"))
+# How long finished job state is kept in Redis
+INGESTION_JOB_TTL_SECONDS = int(os.getenv("INGESTION_JOB_TTL_SECONDS", "604800"))
+# Lifetime of a worker's claim on a job; renewed every third of it while the job runs
+INGESTION_LEASE_SECONDS = int(os.getenv("INGESTION_LEASE_SECONDS", "60"))
+
+JOB_KEY_PREFIX = "ingestion_job:"
+UNFINISHED_JOBS_KEY = "ingestion_jobs:unfinished"
+LEASE_KEY_SUFFIX = ":lease"
+
+try:
+    from backend.monitoring.metrics import (
+        ingestion_queue_depth,
+        ingestion_queue_active_jobs,
+        ingestion_jobs_total,
+        ingestion_publish_to_searchable_seconds,
+    )
+    METRICS_ENABLED = True
+except ImportError:
+    METRICS_ENABLED = False
+
+
+@dataclass
+class IngestionJob:
+    """Latest requested change to one Payload document."""
+
+    payload_id: str
+    operation: str  # "create", "update", "delete" or "unpublish"
+    doc: Optional[Dict[str, Any]] = None  # JSON-serializable PayloadWebhookDoc data
+    revision: int = 0
+    published_at: float = field(default_factory=time.time)  # CMS change time (epoch seconds)
+    enqueued_at: float = field(default_factory=time.time)
+    attempts: int = 0
+
+    def to_redis(self) -> Dict[str, str]:
+        return {
+            "payload_id": self.payload_id,
+            "operation": self.operation,
+            "doc": json.dumps(self.doc) if self.doc is not None else "",
+            "revision": str(self.revision),
+            "published_at": str(self.published_at),
+            "enqueued_at": str(self.enqueued_at),
+            "attempts": str(self.attempts),
+        }
+
+    @classmethod
+    def from_redis(cls, data: Dict[str, str]) -> "IngestionJob":
+        return cls(
+            payload_id=data["payload_id"],
+            operation=data["operation"],
+            doc=json.loads(data["doc"]) if data.get("doc") else None,
+            revision=int(data.get("revision", 0)),
+            published_at=float(data.get("published_at", time.time())),
+            enqueued_at=float(data.get("enqueued_at", time.time())),
+            attempts=int(data.get("attempts", 0)),
+        )
+
+
+def _lease_key(payload_id: str) -> str:
+    return f"{JOB_KEY_PREFIX}{payload_id}{LEASE_KEY_SUFFIX}"
+
+
+async def _default_redis():
+    from backend.redis_client import get_redis_client
+    return await get_redis_client()
+
+
+class IngestionQueue:
+    """Coalescing per-payload_id job queue drained by a bounded pool of async workers."""
+
+    def __init__(
+        self,
+        handler: Callable[[IngestionJob], Awaitable[None]],
+        concurrency: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        retry_backoff_seconds: Optional[float] = None,
+        redis_getter: Optional[Callable[[], Awaitable[Any]]] = _default_redis,
+        lease_seconds: Optional[float] = None,
+    ):
+        """
+        Args:
+            handler: Processes one job; raising marks the attempt failed
+            concurrency: Number of workers (default: INGESTION_WORKER_CONCURRENCY)
+            max_attempts: Attempts per revision (default: INGESTION_MAX_ATTEMPTS)
+            retry_backoff_seconds: Delay before the first retry, doubled per attempt
+            redis_getter: Returns the async Redis client for job state (None: in-memory only)
+            lease_seconds: Lifetime of a job claim (default: INGESTION_LEASE_SECONDS)
+        """
+        self.handler = handler
+        self.concurrency = max(1, concurrency if concurrency is not None else INGESTION_WORKER_CONCURRENCY)
+        self.max_attempts = max(1, max_attempts if max_attempts is not None else INGESTION_MAX_ATTEMPTS)
+        self.retry_backoff_seconds = (
+            retry_backoff_seconds if retry_backoff_seconds is not None else INGESTION_RETRY_BACKOFF_SECONDS
+        )
+        self._redis_getter = redis_getter
+        self.lease_seconds = lease_seconds if lease_seconds is not None else INGESTION_LEASE_SECONDS
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._ready: Optional[asyncio.Queue] = None  # payload_ids ready to run, each at most once
+        self._pending: Dict[str, IngestionJob] = {}  # latest not-yet-started job per payload_id
+        self._active: Set[str] = set()
+        self._revisions: Dict[str, int] = {}
+        self._workers: List[asyncio.Task] = []
+        self._retry_tasks: Set[asyncio.Task] = set()
+
+    # ------------------------------------------------------------------ state
+
+    @property
+    def depth(self) -> int:
+        """Number of payload_ids waiting to be processed."""
+        return len(self._pending)
+
+    @property
+    def active(self) -> int:
+        return len(self._active)
+
+    def _update_gauges(self) -> None:
+        if METRICS_ENABLED:
+            ingestion_queue_depth.set(self.depth)
+            ingestion_queue_active_jobs.set(self.active)
+
+    async def _redis(self):
+        if self._redis_getter is None:
+            return None
+        try:
+            return await self._redis_getter()
+        except Exception as e:
+            logger.warning(f"Ingestion queue: Redis unavailable, job state not persisted: {e}")
+            return None
+
+    async def _save_state(self, job: IngestionJob, status: str, **extra: Any) -> None:
+        redis = await self._redis()
+        if redis is None:
+            return
+        key = f"{JOB_KEY_PREFIX}{job.payload_id}"
+        fields = {**job.to_redis(), "status": status, "updated_at": str(time.time())}
+        fields.update({k: str(v) for k, v in extra.items()})
+        try:
+            pipe = redis.pipeline(transaction=True)
+            pipe.hset(key, mapping=fields)
+            if status in ("done", "failed"):
+                pipe.expire(key, INGESTION_JOB_TTL_SECONDS)
+                pipe.srem(UNFINISHED_JOBS_KEY, job.payload_id)
+            else:
+                pipe.persist(key)
+                pipe.sadd(UNFINISHED_JOBS_KEY, job.payload_id)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Ingestion queue: failed to save state of job {job.payload_id}: {e}")
+
+    async def _next_revision(self, payload_id: str) -> int:
+        """Revisions increase across restarts (and processes) when Redis is available."""
+        redis = await self._redis()
+        if redis is not None:
+            try:
+                revision = int(await redis.hincrby(f"{JOB_KEY_PREFIX}{payload_id}", "revision", 1))
+                self._revisions[payload_id] = revision
+                return revision
+            except Exception as e:
+                logger.warning(f"Ingestion queue: failed to bump revision of {payload_id}: {e}")
+        revision = self._revisions.get(payload_id, 0) + 1
+        self._revisions[payload_id] = revision
+        return revision
+
+    async def _persisted_revision(self, payload_id: str) -> Optional[int]:
+        redis = await self._redis()
+        if redis is None:
+            return None
+        try:
+            revision = await redis.hget(f"{JOB_KEY_PREFIX}{payload_id}", "revision")
+        except Exception as e:
+            logger.warning(f"Ingestion queue: failed to read revision of {payload_id}: {e}")
+            return None
+        return int(revision) if revision is not None else None
+
+    async def get_job(self, payload_id: str) -> Optional[Dict[str, Any]]:
+        """Persisted state of a payload's latest job (status, revision, timestamps, error)."""
+        redis = await self._redis()
+        if redis is None:
+            return None
+        try:
+            data = await redis.hgetall(f"{JOB_KEY_PREFIX}{payload_id}")
+        except Exception as e:
+            logger.warning(f"Ingestion queue: failed to read job {payload_id}: {e}")
+            return None
+        if not data:
+            return None
+        data = {
+            (k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+            for k, v in data.items()
+        }
+        data.pop("doc", None)
+        return data
+
+    # -------------------------------------------------------------- lifecycle
+
+    def _ensure_workers(self) -> None:
+        if self._ready is None:
+            self._ready = asyncio.Queue()
+        self._workers = [task for task in self._workers if not task.done()]
+        for index in range(len(self._workers), self.concurrency):
+            self._workers.append(asyncio.create_task(self._worker(index)))
+
+    async def start(self) -> int:
+        """
+        Start the workers and re-queue unfinished jobs that no live worker holds a lease on.
+
+        Returns:
+            Number of recovered jobs
+        """
+        self._ensure_workers()
+        recovered = 0
+        redis = await self._redis()
+        if redis is not None:
+            try:
+                payload_ids = await redis.smembers(UNFINISHED_JOBS_KEY)
+                for payload_id in payload_ids:
+                    payload_id = payload_id.decode() if isinstance(payload_id, bytes) else payload_id
+                    data = await redis.hgetall(f"{JOB_KEY_PREFIX}{payload_id}")
+                    if not data or "operation" not in data:
+                        await redis.srem(UNFINISHED_JOBS_KEY, payload_id)
+                        continue
+                    job = IngestionJob.from_redis(data)
+                    if payload_id in self._pending or payload_id in self._active:
+                        continue
+                    if await redis.exists(_lease_key(payload_id)):
+                        continue  # Still being run by a live worker
+                    self._revisions[payload_id] = max(job.revision, self._revisions.get(payload_id, 0))
+                    self._submit(job)
+                    recovered += 1
+            except Exception as e:
+                logger.warning(f"Ingestion queue: failed to recover unfinished jobs: {e}")
+        if recovered:
+            logger.info(f"Ingestion queue: re-queued {recovered} unfinished job(s)")
+        logger.info(f"Ingestion queue started with {self.concurrency} worker(s)")
+        return recovered
+
+    async def stop(self) -> None:
+        """Cancel the workers. Jobs that did not finish stay unfinished in Redis for the next start()."""
+        tasks = self._workers + list(self._retry_tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers = []
+        self._retry_tasks.clear()
+
+    async def join(self) -> None:
+        """Wait until every queued job (including retries) has finished."""
+        while self._pending or self._active or self._retry_tasks:
+            if self._ready is not None and (self._pending or self._active):
+                await self._ready.join()
+            if self._retry_tasks:
+                await asyncio.gather(*list(self._retry_tasks), return_exceptions=True)
+
+    # ---------------------------------------------------------------- enqueue
+
+    def _submit(self, job: IngestionJob) -> bool:
+        """Queue a job in-process. Returns True when it replaced a waiting job of the same payload."""
+        coalesced = job.payload_id in self._pending
+        if coalesced:
+            # Keep the original enqueue time so queue wait is measured from the first request
+            job.enqueued_at = min(job.enqueued_at, self._pending[job.payload_id].enqueued_at)
+        self._pending[job.payload_id] = job
+        if not coalesced and job.payload_id not in self._active:
+            self._ready.put_nowait(job.payload_id)
+        # A payload being processed is re-queued by its worker when it finishes
+        self._update_gauges()
+        return coalesced
+
+    async def enqueue(
+        self,
+        payload_id: str,
+        operation: str,
+        doc: Optional[Dict[str, Any]] = None,
+        published_at: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Request (re-)ingestion of a Payload document.
+
+        Args:
+            payload_id: Payload CMS document ID
+            operation: "create"/"update" (doc required) or "delete"/"unpublish"
+            doc: JSON-serializable document data for create/update
+            published_at: Epoch seconds of the CMS change (default: now)
+
+        Returns:
+            {"payload_id", "revision", "coalesced", "queue_depth"}
+        """
+        self._ensure_workers()
+        payload_id = str(payload_id)
+        job = IngestionJob(
+            payload_id=payload_id,
+            operation=operation,
+            doc=doc,
+            revision=await self._next_revision(payload_id),
+            published_at=published_at if published_at is not None else time.time(),
+        )
+        coalesced = self._submit(job)
+        if coalesced:
+            logger.info(f"Ingestion queue: {payload_id} revision {job.revision} replaced a waiting revision")
+            if METRICS_ENABLED:
+                ingestion_jobs_total.labels(operation=operation, status="coalesced").inc()
+        await self._save_state(job, "queued")
+        return {
+            "payload_id": payload_id,
+            "revision": job.revision,
+            "coalesced": coalesced,
+            "queue_depth": self.depth,
+        }
+
+    # ----------------------------------------------------------------- worker
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            payload_id = await self._ready.get()
+            try:
+                job = self._pending.pop(payload_id, None)
+                if job is not None:
+                    self._active.add(payload_id)
+                    self._update_gauges()
+                    try:
+                        if await self._claim(job):
+                            await self._run_claimed(job)
+                        else:
+                            self._schedule_retry(job, self.lease_seconds / 4)
+                    finally:
+                        self._active.discard(payload_id)
+                        if payload_id in self._pending:
+                            # A newer revision arrived while this one was processed
+                            self._ready.put_nowait(payload_id)
+                        self._update_gauges()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ingestion worker {index} crashed on {payload_id}: {e}", exc_info=True)
+            finally:
+                self._ready.task_done()
+
+    async def _claim(self, job: IngestionJob) -> bool:
+        """Take the job's lease. False when another worker holds it; True without Redis."""
+        redis = await self._redis()
+        if redis is None:
+            return True
+        try:
+            acquired = await redis.set(
+                _lease_key(job.payload_id), self.worker_id, nx=True, ex=int(max(1, self.lease_seconds)),
+            )
+        except Exception as e:
+            logger.warning(f"Ingestion queue: failed to claim {job.payload_id}, running unclaimed: {e}")
+            return True
+        if not acquired:
+            logger.info(
+                f"Ingestion queue: {job.payload_id} revision {job.revision} is claimed by another worker; "
+                f"retrying in {self.lease_seconds / 4:.1f}s"
+            )
+        return bool(acquired)
+
+    async def _renew_lease(self, payload_id: str) -> None:
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            redis = await self._redis()
+            if redis is None:
+                continue
+            try:
+                renewed = await redis.eval(
+                    RENEW_LEASE_LUA, 1, _lease_key(payload_id), self.worker_id, int(max(1, self.lease_seconds)),
+                )
+            except Exception as e:
+                logger.warning(f"Ingestion queue: failed to renew lease of {payload_id}: {e}")
+                continue
+            if not renewed:
+                logger.warning(f"Ingestion queue: lost the lease of {payload_id}; another worker may take it over")
+                return
+
+    async def _release(self, payload_id: str) -> None:
+        redis = await self._redis()
+        if redis is None:
+            return
+        try:
+            await redis.eval(RELEASE_LEASE_LUA, 1, _lease_key(payload_id), self.worker_id)
+        except Exception as e:
+            logger.warning(f"Ingestion queue: failed to release lease of {payload_id}: {e}")
+
+    async def _run_claimed(self, job: IngestionJob) -> None:
+        renewer = asyncio.create_task(self._renew_lease(job.payload_id))
+        try:
+            if await self._superseded(job):
+                logger.info(f"Ingestion queue: {job.payload_id} revision {job.revision} superseded, skipped")
+            elif await self._finished_elsewhere(job):
+                logger.info(f"Ingestion queue: {job.payload_id} revision {job.revision} already finished, skipped")
+            else:
+                await self._run(job)
+        finally:
+            renewer.cancel()
+            await asyncio.gather(renewer, return_exceptions=True)
+            await self._release(job.payload_id)
+
+    async def _superseded(self, job: IngestionJob) -> bool:
+        """A newer revision was requested, in this process or (per Redis) in another one."""
+        latest = self._revisions.get(job.payload_id, job.revision)
+        persisted = await self._persisted_revision(job.payload_id)
+        if persisted is not None:
+            latest = max(latest, persisted)
+        return latest > job.revision
+
+    async def _finished_elsewhere(self, job: IngestionJob) -> bool:
+        """Another worker already completed this revision (e.g. both recovered it on start)."""
+        state = await self.get_job(job.payload_id)
+        if not state or state.get("status") not in ("done", "failed"):
+            return False
+        return int(state.get("revision", 0)) == job.revision
+
+    async def _run(self, job: IngestionJob) -> None:
+        job.attempts += 1
+        started_at = time.time()
+        await self._save_state(job, "processing", started_at=started_at)
+        logger.info(
+            f"Ingestion queue: processing {job.payload_id} ({job.operation}, revision {job.revision}, "
+            f"attempt {job.attempts}, waited {started_at - job.enqueued_at:.1f}s)"
+        )
+        try:
+            await self.handler(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            status = await self._on_failure(job, e)
+            if status != "superseded":  # the newer revision owns the persisted state
+                await self._save_state(job, status, error=str(e)[:500], finished_at=time.time())
+            return
+
+        finished_at = time.time()
+        if METRICS_ENABLED:
+            ingestion_jobs_total.labels(operation=job.operation, status="success").inc()
+            ingestion_publish_to_searchable_seconds.labels(operation=job.operation).observe(
+                max(0.0, finished_at - job.published_at)
+            )
+        if not await self._superseded(job):
+            await self._save_state(job, "done", finished_at=finished_at, error="")
+        logger.info(
+            f"Ingestion queue: {job.payload_id} revision {job.revision} searchable "
+            f"{finished_at - job.published_at:.1f}s after the CMS change"
+        )
+
+    async def _on_failure(self, job: IngestionJob, error: Exception) -> str:
+        """Log a failed attempt and schedule a retry if due. Returns the job's new status."""
+        if await self._superseded(job):
+            logger.warning(
+                f"Ingestion queue: {job.payload_id} revision {job.revision} failed ({error}); "
+                f"a newer revision is queued"
+            )
+            if METRICS_ENABLED:
+                ingestion_jobs_total.labels(operation=job.operation, status="error").inc()
+            return "superseded"
+        if job.attempts >= self.max_attempts:
+            logger.error(
+                f"Ingestion queue: {job.payload_id} revision {job.revision} failed after "
+                f"{job.attempts} attempt(s): {error}"
+            )
+            if METRICS_ENABLED:
+                ingestion_jobs_total.labels(operation=job.operation, status="error").inc()
+            return "failed"
+        delay = self.retry_backoff_seconds * (2 ** (job.attempts - 1))
+        logger.warning(
+            f"Ingestion queue: {job.payload_id} revision {job.revision} attempt {job.attempts} "
+            f"failed ({error}); retrying in {delay:.1f}s"
+        )
+        if METRICS_ENABLED:
+            ingestion_jobs_total.labels(operation=job.operation, status="retry").inc()
+        self._schedule_retry(job, delay)
+        return "queued"
+
+    def _schedule_retry(self, job: IngestionJob, delay: float) -> None:
+        task = asyncio.create_task(self._retry_later(job, delay))
+        self._retry_tasks.add(task)
+        task.add_done_callback(self._retry_tasks.discard)
+
+    async def _retry_later(self, job: IngestionJob, delay: float) -> None:
+        await asyncio.sleep(delay)
+        # Dropped if a newer revision was queued (or already ran) in the meantime
+        if not await self._superseded(job) and job.payload_id not in self._pending:
+            self._submit(job)
@@ -0,0 +1,203 @@
+"""
+Parent Chunk Index
+
+Process-level chunk_id -> Document index used by the Parent Document Pattern
+(FAQ indexing) to swap synthetic question hits with their full-text parents.
+
+The index is built once from MongoDB on first use and then maintained
+incrementally by the ingestion paths (webhook create/update/delete), so
+FAQ-style queries never pay a collection scan.
+
+Readers always receive an immutable snapshot: updates build a new dict and
+swap the reference under a lock (copy-on-write), so a query that is resolving
+parents never observes a half-applied update.
+
+Usage:
+    index = ParentChunkIndex()
+
+    parents = index.get(collection)          # builds on first call
+    index.upsert(processed_chunks)           # after add_documents()
+    index.remove_payload(payload_id)         # after delete by payload_id
+    index.invalidate()                       # force rebuild on next get()
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+# Import metrics if available
+try:
+    from backend.monitoring.metrics import (
+        parent_chunk_index_size,
+        parent_chunk_index_build_duration_seconds,
+        parent_chunk_index_updates_total,
+    )
+    METRICS_ENABLED = True
+except ImportError:
+    METRICS_ENABLED = False
+
+# Safety limit for the initial MongoDB load (matches the previous per-query scan)
+PARENT_CHUNK_INDEX_LIMIT = 20000
+
+
+def _is_parent_chunk(doc: Document) -> bool:
+    """Parent chunks are the original (non-synthetic) chunks that carry a chunk_id."""
+    metadata = doc.metadata or {}
+    return bool(metadata.get("chunk_id")) and not metadata.get("is_synthetic", False)
+
+
+class ParentChunkIndex:
+    """
+    Thread-safe, copy-on-write chunk_id -> Document index.
+
+    Built lazily from MongoDB and updated incrementally by ingestion.
+    """
+
+    def __init__(self, limit: int = PARENT_CHUNK_INDEX_LIMIT):
+        self.limit = limit
+        self._chunks: Optional[Dict[str, Document]] = None
+        # payload_id -> chunk_ids, so removals touch only the affected entries
+        self._payload_chunks: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.last_build_seconds: float = 0.0
+
+    @property
+    def is_built(self) -> bool:
+        return self._chunks is not None
+
+    @property
+    def size(self) -> int:
+        chunks = self._chunks
+        return len(chunks) if chunks is not None else 0
+
+    def get(self, collection: Any) -> Dict[str, Document]:
+        """
+        Return the current index snapshot, building it from MongoDB if needed.
+
+        Args:
+            collection: pymongo collection holding the chunk documents
+
+        Returns:
+            Dict mapping chunk_id -> Document (do not mutate)
+        """
+        chunks = self._chunks
+        if chunks is not None:
+            return chunks
+
+        with self._lock:
+            # Another thread may have finished the build while we waited
+            if self._chunks is not None:
+                return self._chunks
+            self._build_locked(collection)
+            return self._chunks
+
+    def _build_locked(self, collection: Any) -> None:
+        """Load all parent chunks from MongoDB. Caller must hold the lock."""
+        start = time.perf_counter()
+        cursor = collection.find(
+            {
+                "metadata.is_synthetic": {"$ne": True},
+                "metadata.chunk_id": {"$exists": True}
+            },
+            {"text": 1, "metadata": 1}
+        ).limit(self.limit)
+
+        chunks: Dict[str, Document] = {}
+        payload_chunks: Dict[str, Set[str]] = {}
+        for doc in cursor:
+            metadata = doc.get("metadata", {}) or {}
+            chunk_id = metadata.get("chunk_id")
+            if not chunk_id:
+                continue
+            chunks[chunk_id] = Document(page_content=doc.get("text", ""), metadata=metadata)
+            payload_id = metadata.get("payload_id")
+            if payload_id:
+                payload_chunks.setdefault(payload_id, set()).add(chunk_id)
+
+        self._chunks = chunks
+        self._payload_chunks = payload_chunks
+        self.last_build_seconds = time.perf_counter() - start
+
+        logger.info(
+            f"Parent chunk index built: {len(chunks)} chunks in {self.last_build_seconds * 1000:.1f}ms"
+        )
+        if METRICS_ENABLED:
+            parent_chunk_index_build_duration_seconds.observe(self.last_build_seconds)
+            parent_chunk_index_size.set(len(chunks))
+            parent_chunk_index_updates_total.labels(operation="build").inc()
+
+    def upsert(self, documents: Iterable[Document]) -> int:
+        """
+        Add or replace parent chunks after ingestion.
+
+        Synthetic questions and documents without a chunk_id are ignored.
+        If the index has not been built yet this is a no-op; the first get()
+        will load the documents from MongoDB anyway.
+
+        Returns:
+            Number of chunks written to the index
+        """
+        parents: List[Document] = [d for d in documents if _is_parent_chunk(d)]
+        if not parents:
+            return 0
+
+        with self._lock:
+            if self._chunks is None:
+                return 0
+            chunks = dict(self._chunks)
+            payload_chunks = {k: set(v) for k, v in self._payload_chunks.items()}
+            for doc in parents:
+                chunk_id = doc.metadata["chunk_id"]
+                chunks[chunk_id] = doc
+                payload_id = doc.metadata.get("payload_id")
+                if payload_id:
+                    payload_chunks.setdefault(payload_id, set()).add(chunk_id)
+            self._chunks = chunks
+            self._payload_chunks = payload_chunks
+            size = len(chunks)
+
+        logger.debug(f"Parent chunk index upserted {len(parents)} chunks (size={size})")
+        if METRICS_ENABLED:
+            parent_chunk_index_size.set(size)
+            parent_chunk_index_updates_total.labels(operation="upsert").inc()
+        return len(parents)
+
+    def remove_payload(self, payload_id: str) -> int:
+        """
+        Drop all parent chunks that belong to a Payload CMS document.
+
+        Returns:
+            Number of chunks removed from the index
+        """
+        with self._lock:
+            if self._chunks is None:
+                return 0
+            chunk_ids = self._payload_chunks.get(payload_id)
+            if not chunk_ids:
+                return 0
+            chunks = {k: v for k, v in self._chunks.items() if k not in chunk_ids}
+            payload_chunks = {k: v for k, v in self._payload_chunks.items() if k != payload_id}
+            removed = len(self._chunks) - len(chunks)
+            self._chunks = chunks
+            self._payload_chunks = payload_chunks
+            size = len(chunks)
+
+        logger.debug(f"Parent chunk index removed {removed} chunks for payload {payload_id} (size={size})")
+        if METRICS_ENABLED:
+            parent_chunk_index_size.set(size)
+            parent_chunk_index_updates_total.labels(operation="remove").inc()
+        return removed
+
+    def invalidate(self) -> None:
+        """Discard the index; the next get() rebuilds it from MongoDB."""
+        with self._lock:
+            self._chunks = None
+            self._payload_chunks = {}
+        if METRICS_ENABLED:
+            parent_chunk_index_size.set(0)
+            parent_chunk_index_updates_total.labels(operation="invalidate").inc()
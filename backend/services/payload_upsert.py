@@ -0,0 +1,150 @@
+"""
+Payload Upsert Plans
+
+Diff a re-ingested Payload CMS document against its stored chunks, so a
+webhook update only embeds chunks that are new, deletes chunks that
+disappeared, and leaves everything else in place.
+
+Chunks are compared by fingerprint: a hash of page_content plus the
+metadata they are indexed with. Metadata matters because it is returned with
+search results (title, status, categories), so a chunk whose text is
+unchanged but whose metadata changed is replaced. Fields stamped at storage
+time (embedding_model, embedding_dim) are ignored, and datetimes are compared
+at MongoDB precision (UTC, milliseconds) so a value read back from MongoDB
+matches the freshly parsed one.
+
+Position metadata (chunk_index and the chunk_id/parent_chunk_id links derived
+from it) is matched separately: inserting a paragraph shifts the position of
+every later chunk, but their text and vectors are unchanged, so such chunks
+are kept and only their metadata is patched (plan.patches).
+
+Usage:
+    plan = plan_payload_upsert(
+        [(stored_id, text, metadata), ...],   # what is stored
+        new_documents,                        # what should be
+    )
+    plan.keep_ids / plan.patches / plan.remove_ids / plan.add_indexes
+"""
+
+import hashlib
+import json
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Any, Dict, FrozenSet, Iterable, List, Sequence, Tuple
+
+from langchain_core.documents import Document
+
+# Metadata written by the storage layer, not part of the chunk itself
+STORAGE_METADATA_FIELDS = frozenset({"embedding_model", "embedding_dim"})
+# Metadata derived from a chunk's position in the article (changes when chunks are inserted above it)
+POSITIONAL_METADATA_FIELDS = frozenset({"chunk_index", "chunk_id", "parent_chunk_id", "is_title_chunk"})
+
+
+def _canonical(value: Any) -> Any:
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value.replace(microsecond=value.microsecond // 1000 * 1000).isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    return value
+
+
+def chunk_fingerprint(
+    page_content: str,
+    metadata: Dict[str, Any],
+    ignore: FrozenSet[str] = STORAGE_METADATA_FIELDS,
+) -> str:
+    """Stable hash of a chunk's text and indexed metadata (minus the `ignore` fields)."""
+    indexed = {k: v for k, v in (metadata or {}).items() if k not in ignore}
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(page_content.encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(json.dumps(_canonical(indexed), sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def content_fingerprint(page_content: str, metadata: Dict[str, Any]) -> str:
+    """Fingerprint without position metadata: equal for the same chunk at another position."""
+    return chunk_fingerprint(page_content, metadata, STORAGE_METADATA_FIELDS | POSITIONAL_METADATA_FIELDS)
+
+
+def patched_metadata(stored: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """New metadata for a kept chunk, preserving the stored embedding identity."""
+    metadata = dict(new or {})
+    for key in STORAGE_METADATA_FIELDS:
+        if key in (stored or {}):
+            metadata[key] = stored[key]
+    return metadata
+
+
+@dataclass
+class PayloadUpsertPlan:
+    """What to do with one store's chunks of a Payload document."""
+
+    keep_ids: List[Any] = field(default_factory=list)
+    # (stored id, position in the new document list) of kept chunks whose position metadata changed
+    patches: List[Tuple[Any, int]] = field(default_factory=list)
+    remove_ids: List[Any] = field(default_factory=list)
+    # Positions in the new document list that must be embedded and added
+    add_indexes: List[int] = field(default_factory=list)
+
+    def counts(self) -> Dict[str, int]:
+        return {
+            "kept": len(self.keep_ids),
+            "patched": len(self.patches),
+            "added": len(self.add_indexes),
+            "removed": len(self.remove_ids),
+        }
+
+
+def plan_payload_upsert(
+    existing: Iterable[Tuple[Any, str, Dict[str, Any]]],
+    documents: Sequence[Document],
+) -> PayloadUpsertPlan:
+    """
+    Match new chunks to stored ones (as multisets: duplicates pair up one to one).
+
+    Exact fingerprint matches are kept as they are; the remaining chunks are
+    then matched ignoring position metadata and kept with patched metadata.
+
+    Args:
+        existing: (stored id, text, metadata) of every stored chunk of the payload
+        documents: The payload's chunks after re-ingestion
+
+    Returns:
+        Plan whose kept + patched + added chunks are exactly `documents`
+    """
+    by_fingerprint: Dict[str, List[Any]] = defaultdict(list)
+    content_keys: Dict[Any, str] = {}
+    for stored_id, text, metadata in existing:
+        by_fingerprint[chunk_fingerprint(text, metadata)].append(stored_id)
+        content_keys[stored_id] = content_fingerprint(text, metadata)
+
+    plan = PayloadUpsertPlan()
+    unmatched: List[int] = []
+    for index, doc in enumerate(documents):
+        matches = by_fingerprint.get(chunk_fingerprint(doc.page_content, doc.metadata))
+        if matches:
+            plan.keep_ids.append(matches.pop())
+        else:
+            unmatched.append(index)
+
+    by_content: Dict[str, List[Any]] = defaultdict(list)
+    for ids in by_fingerprint.values():
+        for stored_id in ids:
+            by_content[content_keys[stored_id]].append(stored_id)
+    for index in unmatched:
+        doc = documents[index]
+        matches = by_content.get(content_fingerprint(doc.page_content, doc.metadata))
+        if matches:
+            plan.patches.append((matches.pop(0), index))
+        else:
+            plan.add_indexes.append(index)
+    plan.remove_ids = [stored_id for ids in by_content.values() for stored_id in ids]
+    return plan
@@ -0,0 +1,178 @@
+"""
+Payload Vector IDs
+
+payload_id -> FAISS docstore ids table, so a Payload CMS document's chunks
+can be removed from the FAISS index directly (FAISS.delete by id) instead of
+rebuilding the whole index from MongoDB.
+
+LangChain's FAISS store already gives every vector a stable docstore id
+(uuid) and keeps the id -> position mapping itself, which serves the same
+purpose as a faiss.IndexIDMap while staying compatible with the saved
+index format. This table adds the missing payload_id lookup.
+
+The table is persisted as `payload_ids.json` next to `index.faiss`. On load
+it is validated against the index (vector count + every id present in the
+docstore); if the file is missing or stale it is reconstructed from the
+docstore metadata, which is always the source of truth.
+
+Usage:
+    table = PayloadVectorIds()
+    table.bind(vector_store, faiss_index_path)   # load or reconstruct (no-op if bound)
+    ids = vector_store.add_embeddings(pairs, metadatas=metadatas)
+    table.record(ids, metadatas)
+    table.remove(vector_store, payload_id)       # -> number of vectors removed
+    table.remove_ids(vector_store, payload_id, ids)  # only some of its vectors
+    table.save(faiss_index_path, vector_store)
+"""
+
+import json
+import logging
+import os
+import threading
+import weakref
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+PAYLOAD_IDS_FILENAME = "payload_ids.json"
+
+
+def _docstore_dict(store: Any) -> Dict[str, Any]:
+    return getattr(getattr(store, "docstore", None), "_dict", None) or {}
+
+
+class PayloadVectorIds:
+    """Thread-safe payload_id -> [docstore id] table bound to one FAISS store."""
+
+    def __init__(self):
+        self._ids: Dict[str, List[str]] = {}
+        self._store_ref: Optional[weakref.ref] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def get(self, payload_id: str) -> List[str]:
+        return list(self._ids.get(payload_id, []))
+
+    def is_bound_to(self, store: Any) -> bool:
+        return self._store_ref is not None and self._store_ref() is store
+
+    def bind(self, store: Any, path: Optional[str] = None) -> "PayloadVectorIds":
+        """
+        Attach the table to `store`, loading it from `path` or reconstructing it.
+
+        A no-op while already bound to the same store object; any code path that
+        replaces the store (rebuild, reload, clear) is picked up on next use.
+        """
+        if self.is_bound_to(store):
+            return self
+        with self._lock:
+            if self.is_bound_to(store):
+                return self
+            ids = self._load(path, store) if path else None
+            source = "persisted table"
+            if ids is None:
+                ids = self._reconstruct(store)
+                source = "docstore metadata"
+            self._ids = ids
+            try:
+                self._store_ref = weakref.ref(store)
+            except TypeError:
+                self._store_ref = None
+            logger.info(f"Payload vector id table ready from {source}: {len(ids)} payloads")
+        return self
+
+    @staticmethod
+    def _reconstruct(store: Any) -> Dict[str, List[str]]:
+        ids: Dict[str, List[str]] = {}
+        for docstore_id, doc in _docstore_dict(store).items():
+            payload_id = (getattr(doc, "metadata", None) or {}).get("payload_id")
+            if payload_id:
+                ids.setdefault(payload_id, []).append(docstore_id)
+        return ids
+
+    @staticmethod
+    def _load(path: str, store: Any) -> Optional[Dict[str, List[str]]]:
+        file_path = os.path.join(path, PAYLOAD_IDS_FILENAME)
+        if not os.path.exists(file_path):
+            return None
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            ntotal = getattr(getattr(store, "index", None), "ntotal", None)
+            if data.get("ntotal") != ntotal:
+                logger.info(f"Persisted payload id table is stale (ntotal {data.get('ntotal')} != {ntotal}); reconstructing")
+                return None
+            docstore = _docstore_dict(store)
+            ids = {str(k): [str(i) for i in v] for k, v in (data.get("payload_ids") or {}).items()}
+            if any(i not in docstore for v in ids.values() for i in v):
+                logger.info("Persisted payload id table references missing vectors; reconstructing")
+                return None
+            return ids
+        except Exception as e:
+            logger.warning(f"Failed to load persisted payload id table: {e}")
+            return None
+
+    def save(self, path: str, store: Any) -> None:
+        """Persist the table next to the saved index (only when bound to `store`)."""
+        if not self.is_bound_to(store):
+            return
+        with self._lock:
+            data = {
+                "ntotal": getattr(getattr(store, "index", None), "ntotal", None),
+                "payload_ids": self._ids,
+            }
+        file_path = os.path.join(path, PAYLOAD_IDS_FILENAME)
+        tmp_path = file_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, file_path)
+        except Exception as e:
+            logger.warning(f"Failed to persist payload id table: {e}")
+
+    def record(self, ids: Sequence[str], metadatas: Iterable[Optional[Dict[str, Any]]]) -> None:
+        """Register freshly added vectors."""
+        with self._lock:
+            for docstore_id, metadata in zip(ids, metadatas):
+                payload_id = (metadata or {}).get("payload_id")
+                if payload_id:
+                    self._ids.setdefault(payload_id, []).append(docstore_id)
+
+    def remove(self, store: Any, payload_id: str) -> int:
+        """
+        Delete a payload's vectors from `store` in place.
+
+        Returns:
+            Number of vectors removed
+        """
+        with self._lock:
+            ids = self._ids.pop(payload_id, [])
+        docstore = _docstore_dict(store)
+        present = [i for i in ids if i in docstore]
+        if not present:
+            return 0
+        store.delete(present)
+        return len(present)
+
+    def remove_ids(self, store: Any, payload_id: str, ids: Iterable[str]) -> int:
+        """
+        Delete some of a payload's vectors from `store` in place.
+
+        Returns:
+            Number of vectors removed
+        """
+        doomed = set(ids)
+        with self._lock:
+            remaining = [i for i in self._ids.get(payload_id, []) if i not in doomed]
+            if remaining:
+                self._ids[payload_id] = remaining
+            else:
+                self._ids.pop(payload_id, None)
+        docstore = _docstore_dict(store)
+        present = [i for i in doomed if i in docstore]
+        if not present:
+            return 0
+        store.delete(present)
+        return len(present)
@@ -11,7 +11,21 @@ enabling semantic matching for similar queries (not just exact matches).
 Features:
 - HNSW vector index (1024-dim for stella_en_1.5B_v5)
 - Cosine similarity with configurable threshold (default: 0.92)
-- LFU eviction via Redis maxmemory-policy
+- Per-entry TTL (REDIS_CACHE_TTL_SECONDS) and an entry cap
+  (REDIS_CACHE_MAX_ENTRIES) trimmed least-frequently-hit first
+- Entries tagged with their sources' payload_ids, so a Payload webhook
+  deletes exactly the answers that cited a changed article
+- Sources stored once in the content-addressed chunk store
+  (services.chunk_store); entries keep only their chunk ids
+- Index existence tracked in memory (re-created only when a search reports
+  it missing); get_many() serves several vectors in one pipelined round trip
+- Optional INT8 index (REDIS_CACHE_VECTOR_TYPE=int8): the HNSW index holds
+  1 byte/dim quantized vectors, and the top REDIS_CACHE_RESCORE_CANDIDATES
+  candidates are re-scored against a float16 copy of the normalized vector
+  kept in the entry hash (not indexed). Needs Redis 8 / RediSearch 2.10+.
+  Each vector type has its own index and key prefix, so after a switch
+  neither index tries to ingest the other's vector blobs; the old type's
+  entries age out through the shared TTL/LFU bookkeeping.
 - Persistent storage with optional AOF
 
 Usage:
@@ -22,18 +36,41 @@ Usage:
     if result:
         answer, sources = result
     
+    # Batched lookup (one round trip)
+    results = await cache.get_many([vector_a, vector_b])   # [(answer, sources) | None, ...]
+    
     # Store in cache
-    await cache.set(query_vector, answer, sources)
+    await cache.set(query_vector, query_text, answer, sources)
+
+    # Drop answers that cited an updated/deleted article
+    await cache.invalidate_payload(payload_id)
+
+Entry keys (one prefix per vector type, neither a prefix of the other):
+    cache:entry:<md5>          float32 entries (index cache:semantic_index)
+    cache:int8:entry:<md5>     int8 entries (index cache:semantic_index:int8)
+
+Bookkeeping keys (outside the index prefixes):
+    cache:lfu                  ZSET entry key -> hit count (+ insertion-time tie-break)
+    cache:expiry               ZSET entry key -> expiry timestamp
+    cache:tag:payload:<id>     SET of entry keys whose sources include payload <id>
+
+Vector bytes per entry at 1024 dims (hash field + HNSW copy, graph excluded):
+    float32: 4 KB + 4 KB
+    int8:    1 KB + 1 KB, plus a 2 KB float16 re-scoring vector
+See scripts/benchmark-vector-quantization.py for the recall/latency trade-off.
 """
 
 import os
 import json
+import time
 import hashlib
 import logging
 from typing import List, Optional, Tuple, Any, Dict
 from dataclasses import dataclass
 import numpy as np
 
+from backend.services.chunk_store import chunk_store
+
 logger = logging.getLogger(__name__)
 
 # Import metrics if available
@@ -61,11 +98,40 @@ try:
         "Redis vector cache lookup latency",
         buckets=[0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25]
     )
+    redis_cache_evictions_total = Counter(
+        "redis_vector_cache_evictions_total",
+        "Redis vector cache entries removed before or at expiry",
+        ["reason"],  # reason: "capacity" (LFU trim), "expired" (TTL), "invalidated" (payload webhook)
+    )
     METRICS_ENABLED = True
 except ImportError:
     METRICS_ENABLED = False
     logger.debug("Prometheus metrics not available for Redis cache")
 
+# Index vector types: "float32" (exact cosine) or "int8" (quantized, re-scored)
+VECTOR_TYPES = ("float32", "int8")
+
+
+def quantize_int8(vector: Any) -> np.ndarray:
+    """
+    Symmetric per-vector int8 quantization (scale = 127 / max|x|).
+    
+    Cosine distance is scale-invariant, so each vector gets its own scale and
+    no calibration set is needed.
+    """
+    arr = np.asarray(vector, dtype=np.float32)
+    peak = float(np.max(np.abs(arr))) if arr.size else 0.0
+    if peak == 0.0:
+        return np.zeros(arr.shape, dtype=np.int8)
+    return np.clip(np.rint(arr * (127.0 / peak)), -127, 127).astype(np.int8)
+
+
+def unit_float16(vector: Any) -> np.ndarray:
+    """L2-normalized float16 copy of a vector (the compact re-scoring vector)."""
+    arr = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(arr))
+    return (arr / norm if norm else arr).astype(np.float16)
+
 
 @dataclass
 class CacheEntry:
@@ -92,6 +158,14 @@ class RedisVectorCache:
     
     INDEX_NAME = "cache:semantic_index"
     KEY_PREFIX = "cache:entry:"
+    # Entry prefix per vector type; each index covers only its own type's hashes
+    KEY_PREFIXES = {"float32": KEY_PREFIX, "int8": "cache:int8:entry:"}
+    LFU_KEY = "cache:lfu"
+    EXPIRY_KEY = "cache:expiry"
+    TAG_PREFIX = "cache:tag:payload:"
+    # Insertion time is folded into the LFU score as a fraction (< 1), so among
+    # entries with equal hit counts the oldest is trimmed first
+    _RECENCY_SCALE = 1e10
     
     def __init__(
         self,
@@ -99,6 +173,10 @@ class RedisVectorCache:
         index_name: Optional[str] = None,
         dimension: Optional[int] = None,
         threshold: Optional[float] = None,
+        ttl_seconds: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        vector_type: Optional[str] = None,
+        rescore_candidates: Optional[int] = None,
     ):
         """
         Initialize Redis vector cache.
@@ -108,18 +186,34 @@ class RedisVectorCache:
             index_name: Index name (default: REDIS_CACHE_INDEX_NAME env var)
             dimension: Vector dimension (default: VECTOR_DIMENSION env var or 1024)
             threshold: Similarity threshold (default: REDIS_CACHE_SIMILARITY_THRESHOLD env var or 0.92)
+            ttl_seconds: Entry TTL (default: REDIS_CACHE_TTL_SECONDS env var or 259200 = 72 hours)
+            max_entries: Entry cap (default: REDIS_CACHE_MAX_ENTRIES env var or 10000)
+            vector_type: "float32" or "int8" (default: REDIS_CACHE_VECTOR_TYPE env var or float32)
+            rescore_candidates: KNN candidates re-scored in int8 mode
+                (default: REDIS_CACHE_RESCORE_CANDIDATES env var or 8)
         """
+        self.vector_type = (vector_type or os.getenv("REDIS_CACHE_VECTOR_TYPE", "float32")).lower()
+        if self.vector_type not in VECTOR_TYPES:
+            raise ValueError(f"Unsupported vector type {self.vector_type!r} (expected one of {VECTOR_TYPES})")
+        self.rescore_candidates = rescore_candidates or int(os.getenv("REDIS_CACHE_RESCORE_CANDIDATES", "8"))
+        self.key_prefix = self.KEY_PREFIXES[self.vector_type]
+        
         self.redis_url = redis_url or os.getenv("REDIS_STACK_URL", "redis://localhost:6379")
-        self.index_name = index_name or os.getenv("REDIS_CACHE_INDEX_NAME", self.INDEX_NAME)
+        # An index's vector type is fixed at creation, so the int8 index gets its own name
+        default_index = self.INDEX_NAME if self.vector_type == "float32" else f"{self.INDEX_NAME}:{self.vector_type}"
+        self.index_name = index_name or os.getenv("REDIS_CACHE_INDEX_NAME", default_index)
         self.dimension = dimension or int(os.getenv("VECTOR_DIMENSION", "1024"))
         self.threshold = threshold or float(os.getenv("REDIS_CACHE_SIMILARITY_THRESHOLD", "0.92"))
+        self.ttl_seconds = ttl_seconds or int(os.getenv("REDIS_CACHE_TTL_SECONDS", "259200"))
+        self.max_entries = max_entries or int(os.getenv("REDIS_CACHE_MAX_ENTRIES", "10000"))
         
         self._client = None
         self._index_created = False
         
         logger.info(
             f"RedisVectorCache initialized: url={self._mask_url(self.redis_url)}, "
-            f"index={self.index_name}, dim={self.dimension}, threshold={self.threshold}"
+            f"index={self.index_name}, dim={self.dimension}, threshold={self.threshold}, "
+            f"ttl={self.ttl_seconds}s, max_entries={self.max_entries}, vector_type={self.vector_type}"
         )
     
     def _mask_url(self, url: str) -> str:
@@ -158,6 +252,8 @@ class RedisVectorCache:
     
     async def _ensure_index(self):
         """Create vector search index if it doesn't exist."""
+        if self._index_created:
+            return
         client = self._client
         
         try:
@@ -180,7 +276,7 @@ class RedisVectorCache:
                     "embedding",
                     "HNSW",
                     {
-                        "TYPE": "FLOAT32",
+                        "TYPE": self.vector_type.upper(),
                         "DIM": self.dimension,
                         "DISTANCE_METRIC": "COSINE",
                         "INITIAL_CAP": 1000,
@@ -193,7 +289,7 @@ class RedisVectorCache:
             ]
             
             definition = IndexDefinition(
-                prefix=[self.KEY_PREFIX],
+                prefix=[self.key_prefix],
                 index_type=IndexType.HASH,
             )
             
@@ -202,7 +298,7 @@ class RedisVectorCache:
                 definition=definition,
             )
             
-            logger.info(f"Created vector index '{self.index_name}' (dim={self.dimension})")
+            logger.info(f"Created vector index '{self.index_name}' (dim={self.dimension}, type={self.vector_type})")
             self._index_created = True
             
         except Exception as e:
@@ -219,17 +315,168 @@ class RedisVectorCache:
         """Convert bytes back to vector."""
         return np.frombuffer(data, dtype=np.float32).tolist()
     
+    def _index_vector_bytes(self, vector: List[float]) -> bytes:
+        """Vector in the index's element type (query blobs must match it)."""
+        if self.vector_type == "int8":
+            return quantize_int8(vector).tobytes()
+        return self._vector_to_bytes(vector)
+    
     def _generate_key(self, vector: List[float]) -> str:
         """Generate cache key from vector hash."""
         vector_bytes = self._vector_to_bytes(vector)
         hash_value = hashlib.md5(vector_bytes).hexdigest()
-        return f"{self.KEY_PREFIX}{hash_value}"
+        return f"{self.key_prefix}{hash_value}"
+    
+    def _tag_key(self, payload_id: str) -> str:
+        """Secondary-index key listing the entries that cite a Payload document."""
+        return f"{self.TAG_PREFIX}{payload_id}"
+    
+    @staticmethod
+    def _source_payload_ids(sources: List[Dict[str, Any]]) -> List[str]:
+        """Distinct payload_ids of the cached answer's sources, in source order."""
+        payload_ids = []
+        for source in sources:
+            metadata = source.get("metadata") if isinstance(source, dict) else None
+            payload_id = (metadata or {}).get("payload_id")
+            if payload_id and str(payload_id) not in payload_ids:
+                payload_ids.append(str(payload_id))
+        return payload_ids
+    
+    @staticmethod
+    def _as_str(value: Any) -> str:
+        return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+    
+    @staticmethod
+    def _is_missing_index_error(error: Exception) -> bool:
+        """RediSearch reports a dropped index as 'no such index' (older: 'Unknown Index name')."""
+        message = str(error).lower()
+        return "no such index" in message or "unknown index name" in message
+    
+    async def _recreate_index(self) -> None:
+        """Re-create the index after a search found it missing (e.g. FLUSHALL, restart without persistence)."""
+        logger.warning(f"Vector index '{self.index_name}' is missing, re-creating it")
+        self._index_created = False
+        await self._ensure_index()
+    
+    def _knn_query(self, k: int):
+        from redis.commands.search.query import Query
+        
+        if self.vector_type != "float32":
+            # Over-fetch quantized candidates; _best_match() re-scores them
+            k = max(k, self.rescore_candidates)
+        query = (
+            Query(f"*=>[KNN {k} @embedding $vec AS score]")
+            .return_fields("query", "response", "sources", "source_ids", "score")
+            .sort_by("score")
+            .dialect(2)
+        )
+        if self.vector_type != "float32":
+            query.return_field("rescore_vec", decode_field=False)
+        return query
+    
+    @staticmethod
+    def _field(match: Any, name: str) -> Any:
+        """Field of a search match (redis-py Document or parsed reply dict)."""
+        return match.get(name) if isinstance(match, dict) else getattr(match, name, None)
+    
+    def _best_match(self, matches: List[Any], query_vector: List[float]) -> Tuple[Any, float]:
+        """
+        (match, cosine similarity) of the closest search match.
+        
+        float32: the first match, similarity from its KNN distance. int8: every
+        candidate is re-scored against its float16 re-scoring vector, since the
+        quantized distances can misorder near-ties.
+        """
+        # Redis returns cosine distance where: distance = 1 - cosine_similarity
+        # For normalized vectors: distance 0 = identical (similarity 1), distance 2 = opposite (similarity -1)
+        # Correct conversion: similarity = 1 - distance
+        if self.vector_type == "float32":
+            return matches[0], 1 - float(self._as_str(self._field(matches[0], "score")))
+        
+        query = np.asarray(query_vector, dtype=np.float32)
+        query_norm = float(np.linalg.norm(query)) or 1.0
+        best, best_similarity = None, -2.0
+        for match in matches:
+            rescore_vec = self._field(match, "rescore_vec")
+            if isinstance(rescore_vec, (bytes, bytearray)) and len(rescore_vec) == 2 * query.size:
+                candidate = np.frombuffer(rescore_vec, dtype=np.float16).astype(np.float32)
+                similarity = float(candidate @ query) / ((float(np.linalg.norm(candidate)) or 1.0) * query_norm)
+            else:
+                similarity = 1 - float(self._as_str(self._field(match, "score")))
+            if similarity > best_similarity:
+                best, best_similarity = match, similarity
+        return best, best_similarity
+    
+    def _parse_search_reply(self, reply: Any) -> List[Dict[str, Any]]:
+        """
+        Parse a raw FT.SEARCH reply into field dicts (plus "id"), in result order.
+        
+        Handles both wire protocols: RESP2 [total, id, [field, value, ...], ...]
+        and the RESP3 map with "results" / "extra_attributes".
+        """
+        docs = []
+        if isinstance(reply, dict):
+            results = reply.get(b"results", reply.get("results")) or []
+            for item in results:
+                attributes = item.get(b"extra_attributes", item.get("extra_attributes")) or {}
+                doc = {self._as_str(field): value for field, value in attributes.items()}
+                doc["id"] = self._as_str(item.get(b"id", item.get("id")))
+                docs.append(doc)
+            return docs
+        
+        for i in range(1, len(reply) - 1, 2):
+            fields = reply[i + 1] or []
+            doc = {self._as_str(fields[j]): fields[j + 1] for j in range(0, len(fields) - 1, 2)}
+            doc["id"] = self._as_str(reply[i])
+            docs.append(doc)
+        return docs
+    
+    def _match_to_hit(
+        self,
+        match: Any,
+        similarity: float,
+    ) -> Optional[Tuple[str, Optional[List[Dict[str, Any]]], Optional[List[str]], float]]:
+        """
+        (response, inline sources, source chunk ids, similarity) for a match above the threshold, else None.
+        
+        Entries reference their sources by chunk store id; entries written before
+        the chunk store carry inline JSON sources instead (ids are then None).
+        """
+        field = lambda name: self._field(match, name)
+        
+        if similarity < self.threshold:
+            return None
+        
+        response = field("response")
+        if isinstance(response, bytes):
+            response = response.decode("utf-8")
+        
+        source_ids = field("source_ids")
+        if source_ids is not None:
+            source_ids = self._as_str(source_ids)
+            return response, None, source_ids.split(",") if source_ids else [], similarity
+        
+        sources_raw = field("sources")
+        if isinstance(sources_raw, bytes):
+            sources_raw = sources_raw.decode("utf-8")
+        sources = json.loads(sources_raw) if sources_raw else []
+        return response, sources, None, similarity
+    
+    async def _resolve_sources(self, client, id_lists: List[List[str]]) -> List[Optional[List[Any]]]:
+        """Chunk ids -> Documents for several entries with one chunk store lookup; None if a chunk expired."""
+        unique_ids = list(dict.fromkeys(chunk_id for ids in id_lists for chunk_id in ids))
+        docs = dict(zip(unique_ids, await chunk_store.get_many(client, unique_ids))) if unique_ids else {}
+        resolved = []
+        for ids in id_lists:
+            sources = [docs[chunk_id] for chunk_id in ids]
+            resolved.append(None if any(doc is None for doc in sources) else sources)
+        return resolved
     
     async def get(
         self,
         query_vector: List[float],
         k: int = 1,
-    ) -> Optional[Tuple[str, List[Dict[str, Any]]]]:
+    ) -> Optional[Tuple[str, List[Any]]]:
         """
         Search cache for similar query.
         
@@ -238,33 +485,26 @@ class RedisVectorCache:
             k: Number of results to return (default: 1)
             
         Returns:
-            Tuple of (response, sources) if cache hit, None if miss
+            Tuple of (response, sources) if cache hit, None if miss. Sources are
+            Documents (from the chunk store), or dicts for entries cached before it
         """
-        import time
         start_time = time.time()
         
         try:
             client = await self._get_client()
             
-            # Ensure index exists (in case it was lost after restart)
-            await self._ensure_index()
-            
-            from redis.commands.search.query import Query
-            
             # Build KNN query
-            query_bytes = self._vector_to_bytes(query_vector)
-            
-            q = (
-                Query(f"*=>[KNN {k} @embedding $vec AS score]")
-                .return_fields("query", "response", "sources", "score")
-                .sort_by("score")
-                .dialect(2)
-            )
+            q = self._knn_query(k)
+            query_params = {"vec": self._index_vector_bytes(query_vector)}
             
-            results = await client.ft(self.index_name).search(
-                q,
-                query_params={"vec": query_bytes},
-            )
+            # Index existence is tracked in memory; only a failed search re-checks it
+            try:
+                results = await client.ft(self.index_name).search(q, query_params=query_params)
+            except Exception as e:
+                if not self._is_missing_index_error(e):
+                    raise
+                await self._recreate_index()
+                results = await client.ft(self.index_name).search(q, query_params=query_params)
             
             latency = time.time() - start_time
             if METRICS_ENABLED:
@@ -276,15 +516,19 @@ class RedisVectorCache:
                 logger.debug(f"Cache miss (no results) in {latency:.3f}s")
                 return None
             
-            # Check similarity threshold
-            # Redis returns cosine distance where: distance = 1 - cosine_similarity
-            # For normalized vectors: distance 0 = identical (similarity 1), distance 2 = opposite (similarity -1)
-            # Correct conversion: similarity = 1 - distance
-            best_match = results.docs[0]
-            distance = float(best_match.score)
-            similarity = 1 - distance
+            best_match, similarity = self._best_match(results.docs, query_vector)
+            hit = self._match_to_hit(best_match, similarity)
+            
+            if hit is not None and hit[2] is not None:
+                [sources] = await self._resolve_sources(client, [hit[2]])
+                if sources is None:
+                    if METRICS_ENABLED:
+                        redis_cache_misses_total.inc()
+                    logger.debug("Cache miss (source chunks expired)")
+                    return None
+                hit = (hit[0], sources, hit[2], hit[3])
             
-            if similarity < self.threshold:
+            if hit is None:
                 if METRICS_ENABLED:
                     redis_cache_misses_total.inc()
                 logger.debug(
@@ -297,15 +541,13 @@ class RedisVectorCache:
             if METRICS_ENABLED:
                 redis_cache_hits_total.inc()
             
-            response = best_match.response
-            if isinstance(response, bytes):
-                response = response.decode("utf-8")
-            
-            sources_raw = best_match.sources
-            if isinstance(sources_raw, bytes):
-                sources_raw = sources_raw.decode("utf-8")
-            sources = json.loads(sources_raw) if sources_raw else []
+            # Count the hit for LFU trimming (XX: never resurrect a trimmed entry)
+            try:
+                await client.zadd(self.LFU_KEY, {self._as_str(best_match.id): 1}, xx=True, incr=True)
+            except Exception as e:
+                logger.debug(f"Failed to record cache hit frequency: {e}")
             
+            response, sources, _source_ids, similarity = hit
             logger.debug(
                 f"Cache hit (similarity {similarity:.3f}) in {latency:.3f}s"
             )
@@ -317,6 +559,101 @@ class RedisVectorCache:
                 redis_cache_misses_total.inc()
             return None
     
+    async def _pipelined_search(self, client, vectors: List[List[float]], k: int) -> List[Any]:
+        """One round trip: an FT.SEARCH per vector, replies in input order."""
+        args = self._knn_query(k).get_args()
+        pipe = client.pipeline(transaction=False)
+        for vector in vectors:
+            pipe.execute_command(
+                "FT.SEARCH", self.index_name, *args, "PARAMS", 2, "vec", self._index_vector_bytes(vector)
+            )
+        return await pipe.execute()
+    
+    async def get_many(
+        self,
+        query_vectors: List[List[float]],
+        k: int = 1,
+    ) -> List[Optional[Tuple[str, List[Any]]]]:
+        """
+        Batched get(): look up several query vectors in one pipelined round trip.
+        
+        Args:
+            query_vectors: Query embedding vectors
+            k: Number of results per vector (default: 1)
+            
+        Returns:
+            One (response, sources) or None per input vector, in input order
+        """
+        if not query_vectors:
+            return []
+        start_time = time.time()
+        
+        try:
+            client = await self._get_client()
+            try:
+                replies = await self._pipelined_search(client, query_vectors, k)
+            except Exception as e:
+                if not self._is_missing_index_error(e):
+                    raise
+                await self._recreate_index()
+                replies = await self._pipelined_search(client, query_vectors, k)
+        except Exception as e:
+            logger.error(f"Redis cache get_many error: {e}")
+            if METRICS_ENABLED:
+                redis_cache_misses_total.inc(len(query_vectors))
+            return [None] * len(query_vectors)
+        
+        if METRICS_ENABLED:
+            redis_cache_lookup_seconds.observe(time.time() - start_time)
+        
+        matches = []
+        for vector, reply in zip(query_vectors, replies):
+            docs = self._parse_search_reply(reply)
+            hit = None
+            if docs:
+                best, similarity = self._best_match(docs, vector)
+                hit = self._match_to_hit(best, similarity)
+            matches.append((best["id"], hit) if hit is not None else None)
+        
+        # Resolve every hit's chunk ids with one chunk store lookup (same order as matches)
+        pending = [match[1][2] for match in matches if match is not None and match[1][2] is not None]
+        resolved = iter(await self._resolve_sources(client, pending) if pending else [])
+        
+        results: List[Optional[Tuple[str, List[Any]]]] = []
+        hit_keys = []
+        for match in matches:
+            if match is None:
+                results.append(None)
+                continue
+            key, (response, sources, source_ids, _similarity) = match
+            if source_ids is not None:
+                sources = next(resolved)
+                if sources is None:
+                    results.append(None)
+                    continue
+            results.append((response, sources))
+            hit_keys.append(key)
+        
+        if METRICS_ENABLED:
+            if hit_keys:
+                redis_cache_hits_total.inc(len(hit_keys))
+            if len(results) > len(hit_keys):
+                redis_cache_misses_total.inc(len(results) - len(hit_keys))
+        
+        if hit_keys:
+            try:
+                pipe = client.pipeline(transaction=False)
+                for key in hit_keys:
+                    pipe.zadd(self.LFU_KEY, {key: 1}, xx=True, incr=True)
+                await pipe.execute()
+            except Exception as e:
+                logger.debug(f"Failed to record cache hit frequency: {e}")
+        
+        logger.debug(
+            f"Batched cache lookup: {len(hit_keys)}/{len(results)} hits in {time.time() - start_time:.3f}s"
+        )
+        return results
+    
     async def set(
         self,
         query_vector: List[float],
@@ -340,20 +677,37 @@ class RedisVectorCache:
             client = await self._get_client()
             
             key = self._generate_key(query_vector)
-            
-            # Serialize sources
-            sources_json = json.dumps(sources, default=str)
-            
-            # Store as hash with vector
-            await client.hset(
-                key,
-                mapping={
-                    "embedding": self._vector_to_bytes(query_vector),
-                    "query": query_text.encode("utf-8"),
-                    "response": response.encode("utf-8"),
-                    "sources": sources_json.encode("utf-8"),
-                },
-            )
+            now = time.time()
+            
+            # Sources are stored once in the chunk store; the entry only references them
+            source_ids = await chunk_store.put_many(client, sources)
+            payload_ids = self._source_payload_ids(sources)
+            
+            mapping = {
+                "embedding": self._index_vector_bytes(query_vector),
+                "query": query_text.encode("utf-8"),
+                "response": response.encode("utf-8"),
+                "source_ids": ",".join(source_ids).encode("utf-8"),
+                "payload_ids": ",".join(payload_ids).encode("utf-8"),
+            }
+            if self.vector_type != "float32":
+                # Not indexed: only read back to re-score quantized candidates
+                mapping["rescore_vec"] = unit_float16(query_vector).tobytes()
+            
+            # Store as hash with vector, plus its TTL, LFU/expiry bookkeeping and payload tags
+            pipe = client.pipeline(transaction=True)
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, self.ttl_seconds)
+            # NX: re-caching the same vector keeps its hit count
+            pipe.zadd(self.LFU_KEY, {key: now / self._RECENCY_SCALE}, nx=True)
+            pipe.zadd(self.EXPIRY_KEY, {key: now + self.ttl_seconds})
+            for payload_id in payload_ids:
+                tag_key = self._tag_key(payload_id)
+                pipe.sadd(tag_key, key)
+                pipe.expire(tag_key, self.ttl_seconds)
+            await pipe.execute()
+            
+            await self._trim(client, now)
             
             logger.debug(f"Cached response for query: {query_text[:50]}...")
             return True
@@ -362,26 +716,95 @@ class RedisVectorCache:
             logger.error(f"Redis cache set error: {e}")
             return False
     
+    async def _delete_entries(self, client, keys: List[Any]) -> int:
+        """Delete entries and their LFU/expiry/tag bookkeeping. Returns entries that still existed."""
+        keys = [self._as_str(key) for key in keys]
+        if not keys:
+            return 0
+        
+        pipe = client.pipeline(transaction=False)
+        for key in keys:
+            pipe.hget(key, "payload_ids")
+        tags = await pipe.execute()
+        
+        pipe = client.pipeline(transaction=True)
+        pipe.delete(*keys)
+        pipe.zrem(self.LFU_KEY, *keys)
+        pipe.zrem(self.EXPIRY_KEY, *keys)
+        for key, payload_ids in zip(keys, tags):
+            for payload_id in self._as_str(payload_ids).split(",") if payload_ids else []:
+                pipe.srem(self._tag_key(payload_id), key)
+        results = await pipe.execute()
+        return int(results[0] or 0)
+    
+    async def _trim(self, client, now: float) -> None:
+        """Drop bookkeeping for expired entries, then trim the least-frequently-hit entries over the cap."""
+        expired = await client.zrangebyscore(self.EXPIRY_KEY, "-inf", now)
+        if expired:
+            # The hashes are already gone (Redis TTL); this only clears their bookkeeping
+            await self._delete_entries(client, expired)
+            if METRICS_ENABLED:
+                redis_cache_evictions_total.labels(reason="expired").inc(len(expired))
+        
+        excess = int(await client.zcard(self.LFU_KEY)) - self.max_entries
+        if excess > 0:
+            victims = await client.zpopmin(self.LFU_KEY, excess)
+            removed = await self._delete_entries(client, [member for member, _score in victims])
+            logger.debug(f"Trimmed {len(victims)} least-frequently-hit cache entries")
+            if METRICS_ENABLED:
+                redis_cache_evictions_total.labels(reason="capacity").inc(removed)
+    
     async def delete(self, query_vector: List[float]) -> bool:
         """Delete entry from cache."""
         try:
             client = await self._get_client()
             key = self._generate_key(query_vector)
-            await client.delete(key)
+            await self._delete_entries(client, [key])
             return True
         except Exception as e:
             logger.error(f"Redis cache delete error: {e}")
             return False
     
+    async def invalidate_payload(self, payload_id: str) -> int:
+        """
+        Delete the cached answers whose sources include a Payload CMS document.
+        
+        Uses the payload's tag set, so no keyspace scan is needed.
+        
+        Args:
+            payload_id: The Payload CMS document ID
+            
+        Returns:
+            Number of cached answers deleted
+        """
+        try:
+            client = await self._get_client()
+            tag_key = self._tag_key(payload_id)
+            keys = await client.smembers(tag_key)
+            await client.delete(tag_key)
+            removed = await self._delete_entries(client, list(keys))
+            if removed:
+                logger.info(f"Invalidated {removed} cached answer(s) citing payload {payload_id}")
+                if METRICS_ENABLED:
+                    redis_cache_evictions_total.labels(reason="invalidated").inc(removed)
+            return removed
+        except Exception as e:
+            logger.error(f"Redis cache invalidate error: {e}")
+            return 0
+    
     async def clear(self) -> bool:
         """Clear all cache entries."""
         try:
             client = await self._get_client()
             
-            # Get all keys with prefix
+            # Entries of every vector type (bookkeeping is shared), plus the bookkeeping keys
             keys = []
-            async for key in client.scan_iter(match=f"{self.KEY_PREFIX}*"):
+            for prefix in self.KEY_PREFIXES.values():
+                async for key in client.scan_iter(match=f"{prefix}*"):
+                    keys.append(key)
+            async for key in client.scan_iter(match=f"{self.TAG_PREFIX}*"):
                 keys.append(key)
+            keys.extend([self.LFU_KEY, self.EXPIRY_KEY])
             
             if keys:
                 await client.delete(*keys)
@@ -398,22 +821,22 @@ class RedisVectorCache:
         try:
             client = await self._get_client()
             
-            # Count entries
-            count = 0
-            async for _ in client.scan_iter(match=f"{self.KEY_PREFIX}*"):
-                count += 1
+            # Count entries from the index (FT.INFO), not a keyspace walk
+            try:
+                index_info = await client.ft(self.index_name).info()
+                num_docs = index_info.get("num_docs", index_info.get(b"num_docs", 0))
+                count = num_docs = int(self._as_str(num_docs))
+            except Exception as e:
+                if self._is_missing_index_error(e):
+                    self._index_created = False
+                # Fall back to the LFU bookkeeping set (one entry per cached answer)
+                count = int(await client.zcard(self.LFU_KEY))
+                num_docs = 0
             
             # Get memory info
             info = await client.info("memory")
             used_memory = info.get("used_memory", 0)
             
-            # Get index info
-            try:
-                index_info = await client.ft(self.index_name).info()
-                num_docs = int(index_info.get("num_docs", 0))
-            except Exception:
-                num_docs = count
-            
             if METRICS_ENABLED:
                 redis_cache_size.set(count)
                 redis_cache_memory_bytes.set(used_memory)
@@ -423,8 +846,11 @@ class RedisVectorCache:
                 "indexed_docs": num_docs,
                 "memory_bytes": used_memory,
                 "dimension": self.dimension,
+                "vector_type": self.vector_type,
                 "threshold": self.threshold,
                 "index_name": self.index_name,
+                "ttl_seconds": self.ttl_seconds,
+                "max_entries": self.max_entries,
             }
             
         except Exception as e:
@@ -0,0 +1,170 @@
+"""
+Retriever Bundle
+
+Immutable snapshot of everything the retrieval stage reads (FAISS store,
+BM25 retriever, hybrid/history-aware retrievers, RAG chain and the FAQ parent
+chunk map), tagged with a generation number.
+
+Content updates build a complete new bundle off the event loop while queries
+keep reading the current one, then publish it with a single reference swap.
+A query snapshots the bundle once and uses it for its whole retrieval, so it
+never sees a FAISS index from one generation next to a BM25 corpus from
+another, or a half-rebuilt chain.
+
+Refresh requests that arrive while a build is running are coalesced: the
+next build picks up all of them, and requests already covered by a finished
+build return immediately.
+
+Usage:
+    holder = RetrieverBundleHolder(builder)      # builder(generation) -> RetrieverBundle
+    holder.rebuild()                             # blocking; call from a worker thread
+    bundle = holder.current                      # lock-free read for queries
+"""
+
+import logging
+import threading
+import time
+import weakref
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Optional
+
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+# Import metrics if available
+try:
+    from backend.monitoring.metrics import (
+        retriever_bundle_generation,
+        retriever_bundle_build_duration_seconds,
+        retriever_bundle_swap_latency_seconds,
+        retriever_bundle_staleness_seconds,
+    )
+    METRICS_ENABLED = True
+except ImportError:
+    METRICS_ENABLED = False
+
+
+@dataclass(frozen=True)
+class RetrieverBundle:
+    """One consistent generation of retrieval state."""
+
+    generation: int
+    vector_store: Any
+    bm25_retriever: Any
+    semantic_retriever: Any
+    hybrid_retriever: Any
+    history_aware_retriever: Any
+    rag_chain: Any
+    parent_chunks_map: Dict[str, Document] = field(default_factory=dict)
+    built_at: float = field(default_factory=time.time)
+    build_seconds: float = 0.0
+
+
+class RetrieverBundleHolder:
+    """
+    Owns the current RetrieverBundle and serializes background rebuilds.
+
+    Readers access `current` without locking; the build lock only orders
+    writers, so queries are never blocked by a rebuild.
+    """
+
+    def __init__(self, builder: Callable[[int], RetrieverBundle]):
+        self._builder = builder
+        self._current: Optional[RetrieverBundle] = None
+        self._build_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        # Refresh requests issued / covered by the current bundle (for coalescing)
+        self._requested = 0
+        self._served = 0
+        # Time of the oldest refresh request not yet served (None when up to date)
+        self._pending_since: Optional[float] = None
+
+        if METRICS_ENABLED:
+            # Weak reference so a discarded pipeline's holder can be collected
+            staleness = weakref.WeakMethod(self.staleness_seconds)
+
+            def _read_staleness() -> float:
+                method = staleness()
+                return method() if method is not None else 0.0
+
+            retriever_bundle_staleness_seconds.set_function(_read_staleness)
+
+    @property
+    def current(self) -> Optional[RetrieverBundle]:
+        return self._current
+
+    @property
+    def generation(self) -> int:
+        bundle = self._current
+        return bundle.generation if bundle is not None else 0
+
+    def staleness_seconds(self) -> float:
+        """Seconds since the oldest content change that queries cannot see yet."""
+        pending_since = self._pending_since
+        return max(time.time() - pending_since, 0.0) if pending_since is not None else 0.0
+
+    def rebuild(self) -> Optional[RetrieverBundle]:
+        """
+        Build a new bundle and swap it in (blocking).
+
+        Returns:
+            The bundle serving queries afterwards (the previous one if the build failed)
+
+        Raises:
+            Whatever the builder raises; the previous bundle stays in place
+        """
+        with self._state_lock:
+            self._requested += 1
+            ticket = self._requested
+            if self._pending_since is None:
+                self._pending_since = time.time()
+
+        with self._build_lock:
+            if self._served >= ticket:
+                # A build that started after this request already swapped in
+                return self._current
+
+            with self._state_lock:
+                previously_served = self._served
+                covered = self._requested
+                pending_since = self._pending_since
+                self._pending_since = None
+
+            start = time.perf_counter()
+            try:
+                bundle = self._builder(self.generation + 1)
+            except Exception:
+                with self._state_lock:
+                    # Changes are still unserved; keep reporting their age
+                    if pending_since is not None and (self._pending_since is None or pending_since < self._pending_since):
+                        self._pending_since = pending_since
+                raise
+            build_seconds = time.perf_counter() - start
+            bundle = replace(bundle, build_seconds=build_seconds)
+
+            self._current = bundle
+            self._served = covered
+
+        latency = time.time() - pending_since if pending_since is not None else 0.0
+        if METRICS_ENABLED:
+            retriever_bundle_generation.set(bundle.generation)
+            retriever_bundle_build_duration_seconds.observe(build_seconds)
+            retriever_bundle_swap_latency_seconds.observe(latency)
+        logger.info(
+            f"Retriever bundle generation {bundle.generation} swapped in "
+            f"(build {build_seconds:.2f}s, {covered - previously_served} refresh request(s) covered, "
+            f"content visible {latency:.2f}s after first request)"
+        )
+        return bundle
+
+    def status(self) -> Dict[str, Any]:
+        """Summary for admin endpoints and logs."""
+        bundle = self._current
+        return {
+            "generation": bundle.generation if bundle else 0,
+            "built_at": bundle.built_at if bundle else None,
+            "age_seconds": (time.time() - bundle.built_at) if bundle else None,
+            "build_seconds": bundle.build_seconds if bundle else None,
+            "staleness_seconds": self.staleness_seconds(),
+        }
@@ -0,0 +1,321 @@
+"""
+Sparse Vector Index
+
+In-memory store of precomputed document sparse embeddings (BGE-M3 lexical
+weights) used by the sparse re-rank stage of retrieval.
+
+Sparse vectors are computed once at ingest time (VectorStoreManager) and
+persisted in MongoDB next to the dense `embedding` as
+`sparse_embedding: {"indices": [...terms], "values": [...weights]}`
+(term lists rather than a sub-document, because sparse terms may contain
+characters MongoDB does not allow in field names).
+
+Entries are keyed by a content hash of the chunk text, so the key can be
+derived from any retrieved Document (FAISS docstore, BM25 corpus, synthetic
+FAQ question) without relying on metadata that legacy documents lack.
+Identical texts share one vector, which is correct by construction.
+
+Vectors are held in a vocabulary-indexed CSR matrix (term -> int id, one
+row per chunk, L2 norms precomputed per row), so scoring a query against N
+candidates is a single sparse mat-vec instead of N Python dict loops. The
+matrix is rebuilt lazily after ingestion changes (O(nnz), off the hot path).
+
+Usage:
+    index = SparseVectorIndex()
+    index.load(collection)                       # once, lazily
+    index.add(texts, sparse_vectors, payload_ids)
+    scores = index.score(query_sparse, docs)     # None for docs without a vector
+"""
+
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+SparseVector = Dict[str, float]
+
+
+def sparse_key(text: str) -> str:
+    """Content-hash key for a chunk's text."""
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest()
+
+
+def encode_sparse_for_mongo(sparse: Optional[SparseVector]) -> Optional[Dict[str, list]]:
+    """Convert {term: weight} into the MongoDB storage layout."""
+    if not sparse:
+        return None
+    terms = list(sparse.keys())
+    return {"indices": terms, "values": [float(sparse[t]) for t in terms]}
+
+
+def decode_sparse_from_mongo(stored: Any) -> Optional[SparseVector]:
+    """Convert the MongoDB storage layout back into {term: weight}."""
+    if not isinstance(stored, dict):
+        return None
+    indices = stored.get("indices") or []
+    values = stored.get("values") or []
+    if not indices or len(indices) != len(values):
+        return None
+    return {str(t): float(w) for t, w in zip(indices, values)}
+
+
+def sparse_cosine(query_sparse: SparseVector, doc_sparse: SparseVector) -> float:
+    """Cosine similarity of two {term: weight} vectors (iterates the smaller one)."""
+    if not query_sparse or not doc_sparse:
+        return 0.0
+    small, large = (query_sparse, doc_sparse) if len(query_sparse) <= len(doc_sparse) else (doc_sparse, query_sparse)
+    dot = sum(w * large.get(t, 0.0) for t, w in small.items())
+    query_norm = sum(w * w for w in query_sparse.values()) ** 0.5
+    doc_norm = sum(w * w for w in doc_sparse.values()) ** 0.5
+    if query_norm == 0 or doc_norm == 0:
+        return 0.0
+    return dot / (query_norm * doc_norm)
+
+
+def sparse_cosine_batch(query_sparse: SparseVector, doc_sparse_list: Sequence[Optional[SparseVector]]) -> List[float]:
+    """
+    Cosine similarity of one query against many ad-hoc sparse vectors.
+
+    Builds a throwaway vocabulary + CSR matrix; for repeated scoring against a
+    stable corpus use SparseVectorIndex, which keeps the matrix between calls.
+    """
+    vocab: Dict[str, int] = {}
+    rows = []
+    for doc_sparse in doc_sparse_list:
+        rows.append(_encode_row(doc_sparse or {}, vocab))
+    matrix, norms = _build_matrix(rows, len(vocab))
+    return _score_rows(matrix, norms, np.arange(len(rows)), query_sparse, vocab).tolist()
+
+
+def _encode_row(sparse: SparseVector, vocab: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Map terms to vocabulary ids (growing the vocabulary) -> (ids, weights)."""
+    ids = np.fromiter((vocab.setdefault(t, len(vocab)) for t in sparse.keys()), dtype=np.int32, count=len(sparse))
+    weights = np.fromiter(sparse.values(), dtype=np.float32, count=len(sparse))
+    return ids, weights
+
+
+def _build_matrix(rows: Sequence[Tuple[np.ndarray, np.ndarray]], vocab_size: int) -> Tuple[csr_matrix, np.ndarray]:
+    """Stack encoded rows into a CSR matrix and compute per-row L2 norms."""
+    lengths = np.fromiter((len(ids) for ids, _ in rows), dtype=np.int64, count=len(rows))
+    indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=indptr[1:])
+    if rows:
+        indices = np.concatenate([ids for ids, _ in rows]) if indptr[-1] else np.zeros(0, dtype=np.int32)
+        data = np.concatenate([w for _, w in rows]) if indptr[-1] else np.zeros(0, dtype=np.float32)
+    else:
+        indices = np.zeros(0, dtype=np.int32)
+        data = np.zeros(0, dtype=np.float32)
+    matrix = csr_matrix((data, indices, indptr), shape=(len(rows), max(vocab_size, 1)))
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel()).astype(np.float32)
+    return matrix, norms
+
+
+def _score_rows(
+    matrix: csr_matrix,
+    norms: np.ndarray,
+    row_ids: np.ndarray,
+    query_sparse: SparseVector,
+    vocab: Dict[str, int],
+) -> np.ndarray:
+    """Cosine scores of the query against the selected matrix rows (one mat-vec)."""
+    if len(row_ids) == 0 or not query_sparse:
+        return np.zeros(len(row_ids), dtype=np.float32)
+    query_norm = float(np.sqrt(sum(w * w for w in query_sparse.values())))
+    if query_norm == 0:
+        return np.zeros(len(row_ids), dtype=np.float32)
+    # Terms outside the corpus vocabulary contribute to the norm but never to the dot product
+    q = np.zeros(matrix.shape[1], dtype=np.float32)
+    for term, weight in query_sparse.items():
+        term_id = vocab.get(term)
+        if term_id is not None:
+            q[term_id] = weight
+    dots = matrix[row_ids] @ q
+    denom = norms[row_ids] * query_norm
+    return np.divide(dots, denom, out=np.zeros_like(dots), where=denom > 0)
+
+
+class SparseVectorIndex:
+    """
+    Thread-safe store of chunk content hash -> sparse vector, scored via CSR.
+
+    Loaded lazily from MongoDB once, then maintained incrementally by the
+    VectorStoreManager add/delete paths.
+    """
+
+    def __init__(self):
+        self._vocab: Dict[str, int] = {}
+        # key -> (term ids, weights); the CSR matrix is derived from these rows
+        self._rows: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        # Reference counts so a key shared by several payloads survives partial deletes
+        self._refs: Dict[str, int] = {}
+        self._payload_keys: Dict[str, List[str]] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+        # Immutable scoring snapshot: (matrix, norms, key -> row id, vocabulary); None when stale
+        self._snapshot: Optional[Tuple[csr_matrix, np.ndarray, Dict[str, int], Dict[str, int]]] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._vocab)
+
+    def load(self, collection: Any) -> int:
+        """
+        Load all stored sparse embeddings from MongoDB (no-op once loaded).
+
+        Returns:
+            Number of vectors in the index
+        """
+        if self._loaded:
+            return len(self._rows)
+        with self._lock:
+            if self._loaded:
+                return len(self._rows)
+            cursor = collection.find(
+                {"sparse_embedding": {"$exists": True}},
+                {"text": 1, "sparse_embedding": 1, "metadata.payload_id": 1}
+            )
+            count = 0
+            for row in cursor:
+                sparse = decode_sparse_from_mongo(row.get("sparse_embedding"))
+                if sparse is None:
+                    continue
+                payload_id = (row.get("metadata") or {}).get("payload_id")
+                self._add_locked(sparse_key(row.get("text", "")), sparse, payload_id)
+                count += 1
+            self._loaded = True
+            logger.info(
+                f"Sparse vector index loaded {count} vectors "
+                f"({len(self._rows)} unique, vocabulary={len(self._vocab)})"
+            )
+            return len(self._rows)
+
+    def _add_locked(self, key: str, sparse: SparseVector, payload_id: Optional[str]) -> None:
+        self._rows[key] = _encode_row(sparse, self._vocab)
+        self._refs[key] = self._refs.get(key, 0) + 1
+        if payload_id:
+            self._payload_keys.setdefault(payload_id, []).append(key)
+        self._snapshot = None
+
+    def add(
+        self,
+        texts: Sequence[str],
+        sparse_vectors: Sequence[Optional[SparseVector]],
+        payload_ids: Optional[Sequence[Optional[str]]] = None,
+    ) -> int:
+        """
+        Register freshly ingested chunks.
+
+        Returns:
+            Number of vectors added (texts without a sparse vector are skipped)
+        """
+        added = 0
+        with self._lock:
+            for i, (text, sparse) in enumerate(zip(texts, sparse_vectors)):
+                if not sparse:
+                    continue
+                payload_id = payload_ids[i] if payload_ids else None
+                self._add_locked(sparse_key(text), sparse, payload_id)
+                added += 1
+        return added
+
+    def remove_payload(self, payload_id: str) -> int:
+        """Drop the vectors registered for a Payload CMS document."""
+        removed = 0
+        with self._lock:
+            for key in self._payload_keys.pop(payload_id, []):
+                refs = self._refs.get(key, 0) - 1
+                if refs <= 0:
+                    self._refs.pop(key, None)
+                    if self._rows.pop(key, None) is not None:
+                        removed += 1
+                else:
+                    self._refs[key] = refs
+            if removed:
+                self._snapshot = None
+        return removed
+
+    def remove_texts(self, payload_id: str, texts: Iterable[str]) -> int:
+        """Drop the vectors of some of a Payload CMS document's chunks."""
+        removed = 0
+        with self._lock:
+            keys = self._payload_keys.get(payload_id, [])
+            for key in (sparse_key(text) for text in texts):
+                if key not in keys:
+                    continue
+                keys.remove(key)
+                refs = self._refs.get(key, 0) - 1
+                if refs <= 0:
+                    self._refs.pop(key, None)
+                    if self._rows.pop(key, None) is not None:
+                        removed += 1
+                else:
+                    self._refs[key] = refs
+            if not keys:
+                self._payload_keys.pop(payload_id, None)
+            if removed:
+                self._snapshot = None
+        return removed
+
+    def clear(self, loaded: bool = False) -> None:
+        """
+        Empty the index.
+
+        Args:
+            loaded: True when MongoDB is known to be empty too (no reload needed);
+                    False forces a reload from MongoDB on next load().
+        """
+        with self._lock:
+            self._vocab = {}
+            self._rows = {}
+            self._refs = {}
+            self._payload_keys = {}
+            self._snapshot = None
+            self._loaded = loaded
+
+    def get(self, text: str) -> Optional[SparseVector]:
+        row = self._rows.get(sparse_key(text))
+        if row is None:
+            return None
+        terms = {term_id: term for term, term_id in self._vocab.items()}
+        ids, weights = row
+        return {terms[int(i)]: float(w) for i, w in zip(ids, weights)}
+
+    def _get_snapshot(self) -> Tuple[csr_matrix, np.ndarray, Dict[str, int], Dict[str, int]]:
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        with self._lock:
+            if self._snapshot is None:
+                keys = list(self._rows.keys())
+                matrix, norms = _build_matrix([self._rows[k] for k in keys], len(self._vocab))
+                self._snapshot = (matrix, norms, {k: i for i, k in enumerate(keys)}, dict(self._vocab))
+            return self._snapshot
+
+    def score(self, query_sparse: SparseVector, docs: Iterable[Document]) -> List[Optional[float]]:
+        """
+        Cosine similarity between the query and each document's stored vector.
+
+        Returns:
+            One score per document, or None where no precomputed vector exists
+        """
+        docs = list(docs)
+        if not query_sparse:
+            return [None] * len(docs)
+        matrix, norms, row_of, vocab = self._get_snapshot()
+        rows = [row_of.get(sparse_key(doc.page_content)) for doc in docs]
+        present = np.fromiter((r for r in rows if r is not None), dtype=np.int64)
+        values = iter(_score_rows(matrix, norms, present, query_sparse, vocab).tolist())
+        return [None if r is None else next(values) for r in rows]
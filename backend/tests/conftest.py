@@ -170,6 +170,211 @@ def mock_redis():
     redis_mock._storage.clear()
     redis_mock._sets.clear()
 
+# In-memory Redis for services that keep real state in Redis (caches, queues, locks)
+class FakeRedisPipeline:
+    """Queues commands and runs them against the fake client on execute()."""
+
+    def __init__(self, client):
+        self._client = client
+        self._calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((getattr(self._client, name), args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        results = [await method(*args, **kwargs) for method, args, kwargs in self._calls]
+        self._calls = []
+        return results
+
+
+class FakePubSub:
+    """Channel subscription fed by FakeRedis.publish()."""
+
+    def __init__(self, client):
+        self._client = client
+        self._messages = asyncio.Queue()
+        self.channels = set()
+
+    async def subscribe(self, *channels):
+        self.channels.update(channels)
+        self._client._subscribers.add(self)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        try:
+            return await asyncio.wait_for(self._messages.get(), timeout=timeout or 0.001)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self):
+        self._client._subscribers.discard(self)
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for the redis.asyncio commands the services use
+    (strings, hashes, sets, sorted sets, pipelines, pub/sub, lease scripts).
+
+    State is exposed for assertions: strings, hashes, sets, zsets, ttls
+    (key -> seconds, dropped by persist) and published (channel, message) pairs.
+    FT.SEARCH replies are queued by tests in search_replies, one per call.
+    """
+
+    def __init__(self):
+        self.strings, self.hashes, self.sets, self.zsets, self.ttls = {}, {}, {}, {}, {}
+        self.published = []
+        self.search_replies = []
+        self.mget_calls = 0
+        self._subscribers = set()
+
+    def pipeline(self, transaction=True):
+        return FakeRedisPipeline(self)
+
+    def pubsub(self):
+        return FakePubSub(self)
+
+    # Strings
+    async def get(self, key):
+        return self.strings.get(key)
+
+    async def mget(self, keys):
+        self.mget_calls += 1
+        return [self.strings.get(key) for key in keys]
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = value
+        if ex is not None:
+            self.ttls[key] = ex
+        return True
+
+    async def setex(self, key, ttl, value):
+        self.strings[key] = value
+        self.ttls[key] = ttl
+        return True
+
+    async def incr(self, key):
+        self.strings[key] = str(int(self.strings.get(key, 0)) + 1)
+        return int(self.strings[key])
+
+    # Keys
+    async def delete(self, *keys):
+        removed = 0
+        for key in keys:
+            self.ttls.pop(key, None)
+            for store in (self.hashes, self.sets, self.zsets, self.strings):
+                if store.pop(key, None) is not None:
+                    removed += 1
+        return removed
+
+    async def exists(self, *keys):
+        return sum(
+            1 for key in keys
+            if any(key in store for store in (self.strings, self.hashes, self.sets, self.zsets))
+        )
+
+    async def expire(self, key, seconds):
+        self.ttls[key] = seconds
+        return True
+
+    async def persist(self, key):
+        return self.ttls.pop(key, None) is not None
+
+    # Hashes
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hincrby(self, key, field, amount=1):
+        data = self.hashes.setdefault(key, {})
+        data[field] = str(int(data.get(field, 0)) + amount)
+        return int(data[field])
+
+    # Sets
+    async def sadd(self, key, *members):
+        members_set = self.sets.setdefault(key, set())
+        added = len(set(members) - members_set)
+        members_set.update(members)
+        return added
+
+    async def srem(self, key, *members):
+        members_set = self.sets.get(key, set())
+        removed = len(members_set & set(members))
+        members_set.difference_update(members)
+        return removed
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    # Sorted sets
+    async def zadd(self, key, mapping, nx=False, xx=False, incr=False):
+        zset = self.zsets.setdefault(key, {})
+        for member, score in mapping.items():
+            if (nx and member in zset) or (xx and member not in zset):
+                continue
+            zset[member] = zset.get(member, 0) + score if incr else score
+
+    async def zrem(self, key, *members):
+        for member in members:
+            self.zsets.get(key, {}).pop(member, None)
+
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    async def zrangebyscore(self, key, low, high):
+        return [m for m, score in sorted(self.zsets.get(key, {}).items(), key=lambda i: i[1]) if score <= high]
+
+    async def zpopmin(self, key, count):
+        zset = self.zsets.get(key, {})
+        popped = sorted(zset.items(), key=lambda i: i[1])[:count]
+        for member, _score in popped:
+            del zset[member]
+        return popped
+
+    # Pub/sub
+    async def publish(self, channel, message):
+        self.published.append((channel, message))
+        receivers = [sub for sub in self._subscribers if channel in sub.channels]
+        for sub in receivers:
+            sub._messages.put_nowait({"type": "message", "channel": channel, "data": message})
+        return len(receivers)
+
+    # Scripts: the Lua scripts the services use, run in Python
+    async def eval(self, script, numkeys, *keys_and_args):
+        from backend.utils.lua_scripts import RELEASE_LEASE_LUA, RENEW_LEASE_LUA
+
+        keys, args = keys_and_args[:numkeys], keys_and_args[numkeys:]
+        if script == RENEW_LEASE_LUA:
+            if self.strings.get(keys[0]) != args[0]:
+                return 0
+            return int(await self.expire(keys[0], int(args[1])))
+        if script == RELEASE_LEASE_LUA:
+            if self.strings.get(keys[0]) != args[0]:
+                return 0
+            return await self.delete(keys[0])
+        raise NotImplementedError("FakeRedis.eval: unknown script")
+
+    async def execute_command(self, *args):
+        reply = self.search_replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+@pytest.fixture
+def fake_redis():
+    """Stateful in-memory Redis client (see FakeRedis); share one instance between 'workers'."""
+    return FakeRedis()
+
 # Mock MongoDB client (using mongomock for realism)
 @pytest.fixture
 def mock_mongo():
@@ -0,0 +1,125 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from langchain_core.documents import Document
+
+from backend.services.bm25_index import DEFAULT_B, DEFAULT_K1, BM25Index, BM25IndexRetriever, bm25_idf
+from backend.utils.litecoin_vocabulary import tokenize_ltc
+
+
+def _doc(text, payload_id=None):
+    metadata = {"status": "published"}
+    if payload_id:
+        metadata["payload_id"] = payload_id
+    return Document(page_content=text, metadata=metadata)
+
+
+CORPUS = [
+    _doc("MWEB adds optional confidential transactions to Litecoin", "mweb"),
+    _doc("Mimblewimble extension blocks activated in 2022", "mweb"),
+    _doc("The Litecoin halving cuts the block reward in half", "halving"),
+    _doc("Scrypt is the proof of work hashing algorithm", "scrypt"),
+    _doc("Litecoin was created by Charlie Lee in 2011"),
+]
+
+
+def _contents(results):
+    return [doc.page_content for doc, _score in results]
+
+
+def test_tokenizer_applies_litecoin_synonyms():
+    assert tokenize_ltc("Mimblewimble & LTC-20") == ["mweb", "ltc-20"]
+    assert tokenize_ltc("") == []
+
+
+def test_search_ranks_matching_documents_with_shared_vocabulary():
+    index = BM25Index()
+    index.build(CORPUS)
+
+    results = index.search("Mimblewimble", k=5)
+    # "mimblewimble" normalizes to "mweb" on both sides
+    assert set(_contents(results)) == {CORPUS[0].page_content, CORPUS[1].page_content}
+    assert [score for _doc, score in results] == sorted((score for _doc, score in results), reverse=True)
+
+    assert _contents(index.search("halvening", k=1)) == [CORPUS[2].page_content]
+    assert index.search("unrelated gibberish", k=5) == []
+
+
+def test_idf_is_lucene_style_and_stays_positive():
+    # log(1 + (N - n + 0.5) / (n + 0.5)), not rank_bm25's epsilon-floored log((N - n + 0.5) / (n + 0.5))
+    assert bm25_idf(5, 1) == pytest.approx(1.3862944)  # log(4)
+    assert bm25_idf(5, 3) == pytest.approx(0.5389965)  # log(1 + 2.5/3.5)
+    assert bm25_idf(5, 5) == pytest.approx(0.0870114)  # log(1 + 0.5/5.5): common terms keep a small weight
+    assert bm25_idf(1, 1) == pytest.approx(0.2876821)  # log(1 + 0.5/1.5)
+
+
+def test_score_matches_the_okapi_formula():
+    index = BM25Index()
+    index.build(CORPUS)
+    (doc, score), = index.search("scrypt", k=5)
+
+    tokens = [tokenize_ltc(d.page_content) for d in CORPUS]
+    df = sum("scrypt" in t for t in tokens)
+    doc_tokens = tokenize_ltc(doc.page_content)
+    tf = doc_tokens.count("scrypt")  # "hashing algorithm" also maps to scrypt
+    avgdl = sum(len(t) for t in tokens) / len(CORPUS)
+    norm = DEFAULT_K1 * (1 - DEFAULT_B + DEFAULT_B * len(doc_tokens) / avgdl)
+    expected = bm25_idf(len(CORPUS), df) * tf * (DEFAULT_K1 + 1) / (tf + norm)
+    assert score == pytest.approx(expected, rel=1e-5)
+
+
+def test_upsert_and_remove_by_payload_id():
+    index = BM25Index()
+    index.build(CORPUS)
+
+    assert index.upsert_payload("halving", [_doc("Halving every 840,000 blocks", "halving")]) == 1
+    assert _contents(index.search("halving", k=5)) == ["Halving every 840,000 blocks"]
+    assert len(index) == 5
+
+    assert index.remove_payload("mweb") == 2
+    assert index.search("mweb", k=5) == []
+    assert len(index) == 3
+    # Removals compacted the postings without losing the remaining documents
+    assert _contents(index.search("scrypt", k=5)) == [CORPUS[3].page_content]
+    assert index.remove_payload("mweb") == 0
+
+
+def test_updates_before_build_are_ignored():
+    index = BM25Index()
+    assert index.upsert_payload("mweb", [CORPUS[0]]) == 0
+    assert not index.is_built and len(index) == 0
+
+
+def test_snapshot_is_isolated_from_writer_updates():
+    index = BM25Index()
+    index.build(CORPUS)
+    snapshot = index.snapshot()
+
+    index.upsert_payload("halving", [_doc("Halving every 840,000 blocks", "halving")])
+    index.add_documents([_doc("Litecoin halving schedule", "schedule")])
+    index.remove_payload("mweb")
+
+    # The snapshot keeps serving the corpus it was taken from
+    assert _contents(snapshot.search("halving", k=5)) == [CORPUS[2].page_content]
+    assert len(snapshot.search("mweb", k=5)) == 2
+    assert len(snapshot) == 5
+    assert set(_contents(index.search("halving", k=5))) == {
+        "Halving every 840,000 blocks",
+        "Litecoin halving schedule",
+    }
+
+    # A full refresh invalidates the writer only
+    index.invalidate()
+    assert snapshot.is_built and len(snapshot.search("scrypt", k=5)) == 1
+
+
+def test_retriever_uses_per_call_k_without_mutating_shared_state():
+    index = BM25Index()
+    index.build(CORPUS)
+    retriever = BM25IndexRetriever(index=index, k=1)
+
+    assert len(retriever.invoke("litecoin")) == 1
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        sizes = list(pool.map(lambda k: len(retriever.search("litecoin", k=k)), [1, 2, 3] * 10))
+    assert sizes == [1, 2, 3] * 10
+    assert retriever.k == 1
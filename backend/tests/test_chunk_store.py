@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import pytest
+from langchain_core.documents import Document
+
+from backend.services import chunk_store as chunk_store_module
+from backend.services.chunk_store import ChunkStore, chunk_id, pack_payload, unpack_payload
+
+
+def test_payload_round_trip_with_every_codec(monkeypatch):
+    value = {"page_content": "MWEB ünïcode", "metadata": {"published": datetime(2024, 5, 1), "n": 3}}
+    expected = {"page_content": "MWEB ünïcode", "metadata": {"published": "2024-05-01T00:00:00", "n": 3}}
+
+    packed = pack_payload(value)
+    assert unpack_payload(packed) == expected
+
+    # Fallback codecs (no msgpack, no zstd) produce payloads any worker can still read
+    monkeypatch.setattr(chunk_store_module, "msgpack", None)
+    monkeypatch.setattr(chunk_store_module, "zstandard", None)
+    fallback = pack_payload(value)
+    assert fallback[:2] == b"jd"
+    assert unpack_payload(fallback) == expected
+
+
+def test_chunk_id_is_content_addressed():
+    doc = Document(page_content="text", metadata={"chunk_id": "c1", "payload_id": "p1"})
+    same = {"page_content": "text", "metadata": {"payload_id": "p1", "chunk_id": "c1"}}
+    edited = Document(page_content="text v2", metadata={"chunk_id": "c1", "payload_id": "p1"})
+
+    assert chunk_id(doc) == chunk_id(same)
+    assert chunk_id(doc) != chunk_id(edited)
+
+
+@pytest.mark.asyncio
+async def test_put_dedupes_and_get_uses_memo_then_redis(fake_redis):
+    client = fake_redis
+    store = ChunkStore(memo_size=8)
+    docs = [Document(page_content=f"chunk {i}", metadata={"chunk_id": f"c{i}"}) for i in range(2)]
+
+    ids = await store.put_many(client, [docs[0], docs[1], docs[0]])
+    assert ids[0] == ids[2] and len(client.strings) == 2
+
+    # Warm: served from the in-process memo without touching Redis
+    assert [d.page_content for d in await store.get_many(client, ids)] == ["chunk 0", "chunk 1", "chunk 0"]
+    assert client.mget_calls == 0
+
+    # Cold (another worker): one MGET, and unknown ids come back as None
+    other = ChunkStore(memo_size=8)
+    resolved = await other.get_many(client, [ids[1], "missing", ids[1]])
+    assert client.mget_calls == 1
+    assert resolved[0].page_content == "chunk 1" and resolved[0] is resolved[2]
+    assert resolved[1] is None
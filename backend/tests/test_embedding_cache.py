@@ -0,0 +1,75 @@
+import numpy as np
+
+from backend.cache_utils import EmbeddingCache
+
+
+def test_lru_evicts_least_recently_used_and_reuses_its_row():
+    cache = EmbeddingCache(max_size=2)
+    cache.set("a", [1.0, 0.0])
+    cache.set("b", [0.0, 1.0])
+    assert cache.get("a") is not None  # "a" is now most recent
+
+    cache.set("c", [1.0, 1.0])
+
+    assert cache.get("b") is None
+    np.testing.assert_array_equal(cache.get("a"), [1.0, 0.0])
+    np.testing.assert_array_equal(cache.get("c"), [1.0, 1.0])
+    assert len(cache) == 2
+
+
+def test_get_many_returns_hit_mask_and_namespaces_keys():
+    cache = EmbeddingCache(max_size=8)
+    cache.set_many(["x", "y"], [[1.0, 2.0], [3.0, 4.0]], namespace="model-a")
+
+    vectors, hits = cache.get_many(["x", "new", "y"], namespace="model-a")
+    assert hits.tolist() == [True, False, True]
+    assert vectors[1] is None
+    np.testing.assert_array_equal(vectors[2], [3.0, 4.0])
+
+    # Another embedding model never sees these vectors
+    _vectors, hits = cache.get_many(["x", "y"], namespace="model-b")
+    assert not hits.any()
+
+
+def test_get_similar_uses_word_overlap_fallback():
+    cache = EmbeddingCache(max_size=8)
+    cache.set("what is the litecoin block time", [1.0, 0.0])
+    cache.set("who created litecoin", [0.0, 1.0])
+
+    np.testing.assert_array_equal(cache.get_similar("What is the Litecoin block time"), [1.0, 0.0])
+    assert cache.get_similar("how does mweb work") is None
+
+
+def test_persisted_segments_are_memory_mapped_by_a_new_instance(tmp_path):
+    first = EmbeddingCache(max_size=4, persist_dir=str(tmp_path), max_segments=2)
+    for i in range(3):
+        first.set(f"chunk {i}", [float(i), 1.0])
+        assert first.flush() == 1
+    assert first.flush() == 0
+    # Three flushes exceed max_segments=2, so they were compacted into one
+    assert first.stats()["disk_segments"] == 1
+
+    second = EmbeddingCache(max_size=4, persist_dir=str(tmp_path))
+    vectors, hits = second.get_many(["chunk 0", "chunk 2", "chunk 9"])
+    assert hits.tolist() == [True, True, False]
+    np.testing.assert_array_equal(vectors[1], [2.0, 1.0])
+    assert second.stats()["disk_hits"] == 2
+
+
+def test_extras_are_stored_alongside_vectors_and_persisted(tmp_path):
+    first = EmbeddingCache(max_size=4, persist_dir=str(tmp_path))
+    first.set_many(["mweb", "halving"], [[1.0, 0.0], [0.0, 1.0]], namespace="bge-m3",
+                   extras=[{"mweb": 0.9}, None])
+    first.set("plain", [1.0, 1.0], namespace="bge-m3")
+
+    vectors, extras, hits = first.get_many_with_extras(["mweb", "halving", "plain"], namespace="bge-m3")
+    # An entry stored without an extra does not count as a hit here
+    assert hits.tolist() == [True, True, False]
+    assert extras == [{"mweb": 0.9}, None, None]
+    first.flush()
+
+    second = EmbeddingCache(max_size=4, persist_dir=str(tmp_path))
+    vectors, extras, hits = second.get_many_with_extras(["mweb", "halving"], namespace="bge-m3")
+    assert hits.tolist() == [True, True]
+    assert extras == [{"mweb": 0.9}, None]
+    np.testing.assert_array_equal(vectors[0], [1.0, 0.0])
@@ -0,0 +1,125 @@
+import threading
+import time
+
+from bson import ObjectId
+from langchain_core.embeddings import FakeEmbeddings
+
+from backend.data_ingestion.vector_store_manager import VectorStoreManager
+
+
+class _Cursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def sort(self, field, direction):
+        self.rows = sorted(self.rows, key=lambda row: row[field], reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        self.rows = self.rows[:n]
+        return self
+
+    def __iter__(self):
+        return iter(self.rows)
+
+
+class _FakeCollection:
+    """find(query, projection).sort().limit() and bulk_write(UpdateOne) over a list of rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.finds = []
+
+    def find(self, query, projection=None):
+        self.finds.append((query, projection))
+        after = query.get("_id", {}).get("$gt")
+        rows = [row for row in self.rows if after is None or row["_id"] > after]
+        if projection:
+            rows = [{k: v for k, v in row.items() if k == "_id" or k in projection} for row in rows]
+        return _Cursor(rows)
+
+    def bulk_write(self, operations, ordered=True):
+        by_id = {row["_id"]: row for row in self.rows}
+        for op in operations:
+            by_id[op._filter["_id"]].update(op._doc["$set"])
+
+
+def _rows(n_stored, n_missing):
+    embed = FakeEmbeddings(size=8)
+    rows = []
+    for i in range(n_stored + n_missing):
+        row = {
+            "_id": ObjectId(),
+            "text": f"doc {i}",
+            "metadata": {"payload_id": f"p{i}"},
+            "sparse_embedding": {"indices": [1], "values": [0.5]},
+        }
+        if i % 2 == 0 and n_stored:  # interleave stored and missing embeddings
+            row["embedding"] = embed.embed_query(row["text"])
+            n_stored -= 1
+        rows.append(row)
+    return rows
+
+
+def _manager(tmp_path, collection):
+    manager = VectorStoreManager.__new__(VectorStoreManager)
+    manager._write_lock = threading.RLock()
+    manager.collection = collection
+    manager.mongodb_available = True
+    manager.use_infinity = False
+    manager.embeddings = FakeEmbeddings(size=8)
+    manager.faiss_index_path = str(tmp_path)
+    return manager
+
+
+def test_rebuild_streams_pages_and_embeds_missing_batches_concurrently(tmp_path, monkeypatch):
+    monkeypatch.setenv("FAISS_REBUILD_PAGE_SIZE", "4")
+    monkeypatch.setenv("EMBEDDING_BACKFILL_BATCH_SIZE", "2")
+    monkeypatch.setenv("EMBEDDING_BACKFILL_CONCURRENCY", "3")
+    monkeypatch.setenv("ALLOW_EMBEDDING_BACKFILL_ON_REBUILD", "true")
+    collection = _FakeCollection(_rows(n_stored=5, n_missing=8))
+    missing_ids = {row["_id"] for row in collection.rows if "embedding" not in row}
+    manager = _manager(tmp_path, collection)
+
+    lock = threading.Lock()
+    running = peak = 0
+    embedded = []
+
+    def get_cached_embeddings(texts):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+            embedded.extend(texts)
+        time.sleep(0.02)
+        with lock:
+            running -= 1
+        return manager.embeddings.embed_documents(texts)
+
+    manager.get_cached_embeddings = get_cached_embeddings
+
+    store = manager._create_faiss_from_mongodb()
+
+    assert store.index.ntotal == 13
+    assert len(embedded) == 8 and 1 < peak <= 3
+    # Paged by _id with a projection that leaves out the sparse vectors
+    assert len(collection.finds) == 4
+    assert all(projection == {"text": 1, "metadata": 1, "embedding": 1} for _, projection in collection.finds)
+    # Backfilled embeddings were persisted with the embedding identity
+    backfilled = [row for row in collection.rows if row["_id"] in missing_ids]
+    assert all(len(row["embedding"]) == 8 and row["metadata"]["embedding_dim"] == 8 for row in backfilled)
+
+    stats = manager.last_rebuild_stats
+    assert stats["documents"] == 13 and stats["stored"] == 5 and stats["embedded"] == 8
+    assert stats["persisted"] == 8 and stats["pages"] == 4
+    assert stats["docs_per_second"] > 0 and stats["peak_rss_mb"] > 0
+    assert (tmp_path / "index.faiss").exists()
+
+
+def test_rebuild_of_empty_collection_creates_empty_index(tmp_path, monkeypatch):
+    manager = _manager(tmp_path, _FakeCollection([]))
+    created = []
+    monkeypatch.setattr(manager, "_create_empty_faiss_index", lambda: created.append(True) or "empty")
+
+    assert manager._create_faiss_from_mongodb() == "empty"
+    assert created and manager.last_rebuild_stats["documents"] == 0
@@ -10,6 +10,7 @@ Tests cover:
 
 import pytest
 import asyncio
+import json
 from unittest.mock import patch, MagicMock, AsyncMock
 from typing import List, Dict
 
@@ -22,6 +23,14 @@ from backend.services.faq_generator import (
     resolve_parents_from_tuples,
     USE_FAQ_INDEXING,
 )
+from backend.services import faq_generator as faq_generator_module
+from backend.utils.token_bucket import TokenBucket
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_limiters(monkeypatch):
+    """Each test starts with full process-level LLM rate limit buckets."""
+    monkeypatch.setattr(faq_generator_module, "_rate_limiters", {})
 
 
 class TestFAQGenerator:
@@ -156,6 +165,73 @@ class TestFAQGenerator:
             assert doc.metadata["payload_id"] is not None
             assert doc.metadata["is_synthetic"] == True
             assert "parent_chunk_id" in doc.metadata
+    
+    @pytest.mark.asyncio
+    async def test_multi_chunk_prompt_generates_all_chunks_in_one_call(self, sample_chunks):
+        """Chunks batched into one prompt get their questions from the JSON response."""
+        mock = AsyncMock()
+        mock.ainvoke.return_value = MagicMock(content=json.dumps({
+            "1": ["What is the maximum supply of Litecoin?"],
+            "2": ["How does MWEB make transactions private?"],
+            "3": ["Which hashing algorithm does Litecoin use?"],
+        }))
+        generator = FAQGenerator(llm=mock, num_questions=3, chunks_per_prompt=4)
+        
+        all_docs, _ = await generator.process_chunks_with_questions(sample_chunks)
+        
+        mock.ainvoke.assert_called_once()
+        assert "[3]" in mock.ainvoke.call_args[0][0]
+        questions = {
+            d.metadata["parent_chunk_id"]: d.page_content
+            for d in all_docs if d.metadata.get("is_synthetic")
+        }
+        assert questions[generator._generate_chunk_id(sample_chunks[1])] == "How does MWEB make transactions private?"
+        assert generator.last_run_stats["llm_calls"] == 1
+        assert generator.last_run_stats["questions"] == 3
+    
+    @pytest.mark.asyncio
+    async def test_multi_chunk_prompt_falls_back_to_one_prompt_per_chunk(self, sample_chunks, mock_llm):
+        """A response that is not JSON is retried chunk by chunk."""
+        generator = FAQGenerator(llm=mock_llm, num_questions=3, chunks_per_prompt=3)
+        
+        results = await generator.generate_questions_batch(sample_chunks)
+        
+        # 1 multi-chunk call + 3 single-chunk retries
+        assert mock_llm.ainvoke.call_count == 4
+        assert all(len(questions) == 3 for questions in results)
+    
+    @pytest.mark.asyncio
+    async def test_llm_calls_are_bounded_by_concurrency(self, sample_chunks):
+        """No more than `concurrency` prompts are in flight at once."""
+        running = peak = 0
+        
+        async def slow_invoke(prompt, **kwargs):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return MagicMock(content="What does this chunk explain about Litecoin?")
+        
+        mock = MagicMock()
+        mock.ainvoke = slow_invoke
+        generator = FAQGenerator(llm=mock, concurrency=2, chunks_per_prompt=1)
+        generator._rate_limiter = TokenBucket(rate=0.0)  # isolate the concurrency bound
+        
+        await generator.process_chunks_with_questions(sample_chunks * 3)
+        
+        assert peak == 2
+        assert generator.last_run_stats["chunks"] == 9
+
+    def test_rate_limiter_is_shared_per_backend_and_model(self):
+        """Concurrent ingestion jobs draw from one bucket, so the API limit holds process-wide."""
+        first, second = FAQGenerator(backend="gemini"), FAQGenerator(backend="gemini")
+        local = FAQGenerator(backend="local")
+        
+        assert first._rate_limiter is second._rate_limiter
+        assert first._rate_limiter.enabled
+        assert local._rate_limiter is not first._rate_limiter
+        assert not local._rate_limiter.enabled
 
 
 class TestResolveParents:
@@ -485,6 +561,181 @@ class TestCRUDLifecycle:
         assert len(remaining_docs) == 0
 
 
+class TestParentChunkIndex:
+    """Test the process-level chunk_id -> Document index used for parent resolution."""
+    
+    @pytest.fixture
+    def collection(self):
+        """Mock MongoDB collection returning two parent chunks from one article."""
+        rows = [
+            {"text": "Parent A", "metadata": {"chunk_id": "p1_0_a", "payload_id": "p1"}},
+            {"text": "Parent B", "metadata": {"chunk_id": "p1_1_b", "payload_id": "p1"}},
+        ]
+        collection = MagicMock()
+        collection.find.return_value.limit.return_value = rows
+        return collection
+    
+    def test_builds_once(self, collection):
+        """Test the index is loaded from MongoDB once and then served from memory."""
+        from backend.services.parent_chunk_index import ParentChunkIndex
+        
+        index = ParentChunkIndex()
+        first = index.get(collection)
+        second = index.get(collection)
+        
+        assert set(first) == {"p1_0_a", "p1_1_b"}
+        assert first is second
+        assert collection.find.call_count == 1
+    
+    def test_incremental_update_and_remove(self, collection):
+        """Test webhook-style updates touch only the affected payload."""
+        from backend.services.parent_chunk_index import ParentChunkIndex
+        
+        index = ParentChunkIndex()
+        snapshot = index.get(collection)
+        
+        index.upsert([
+            Document(page_content="Parent C", metadata={"chunk_id": "p2_0_c", "payload_id": "p2"}),
+            Document(page_content="Q?", metadata={"chunk_id": "q", "payload_id": "p2", "is_synthetic": True}),
+        ])
+        assert set(index.get(collection)) == {"p1_0_a", "p1_1_b", "p2_0_c"}
+        # Snapshots handed out earlier are never mutated
+        assert "p2_0_c" not in snapshot
+        
+        assert index.remove_payload("p1") == 2
+        assert set(index.get(collection)) == {"p2_0_c"}
+        assert collection.find.call_count == 1
+    
+    def test_invalidate_forces_rebuild(self, collection):
+        """Test invalidate() makes the next lookup reload from MongoDB."""
+        from backend.services.parent_chunk_index import ParentChunkIndex
+        
+        index = ParentChunkIndex()
+        index.get(collection)
+        index.invalidate()
+        
+        assert not index.is_built
+        index.get(collection)
+        assert collection.find.call_count == 2
+
+
+class _FakeQuestionCollection:
+    """find($in) / bulk_write(UpdateOne upserts) / update_many over a dict, like the faq_question_cache collection."""
+    
+    def __init__(self):
+        self.docs = {}
+        self.indexes = {}
+    
+    def _matches(self, doc, query):
+        ids = query.get("_id", {}).get("$in")
+        if ids is not None and doc["_id"] not in ids:
+            return False
+        missing = query.get("last_used_at", {}).get("$exists") is False
+        return not (missing and "last_used_at" in doc)
+    
+    def find(self, query, projection=None):
+        return [dict(self.docs[key]) for key in query["_id"]["$in"] if key in self.docs]
+    
+    def find_one(self, query):
+        return self.docs.get(query["_id"])
+    
+    def insert_one(self, doc):
+        self.docs[doc["_id"]] = dict(doc)
+    
+    def update_many(self, query, update):
+        for doc in self.docs.values():
+            if self._matches(doc, query):
+                doc.update(update["$set"])
+    
+    def bulk_write(self, operations, ordered=True):
+        for op in operations:
+            key = op._filter["_id"]
+            self.docs.setdefault(key, {"_id": key}).update(op._doc["$set"])
+    
+    def create_index(self, field, expireAfterSeconds=None):
+        self.indexes[field] = expireAfterSeconds
+
+
+class TestFAQQuestionCache:
+    """Re-ingestion reuses questions of unchanged chunks (keyed by content hash + generator version)."""
+    
+    @pytest.fixture
+    def question_collection(self):
+        return _FakeQuestionCollection()
+    
+    @pytest.mark.asyncio
+    async def test_only_new_or_edited_chunks_reach_the_llm(self, question_collection):
+        from backend.services.faq_question_cache import FAQQuestionCache
+        
+        chunks = [
+            Document(
+                page_content=f"Paragraph {i} explains a different part of how Litecoin block rewards work.",
+                metadata={"payload_id": "article-1", "chunk_index": i},
+            )
+            for i in range(3)
+        ]
+        mock_llm = AsyncMock()
+        mock_llm.ainvoke.return_value = MagicMock(content="How do Litecoin block rewards work?")
+        cache = FAQQuestionCache(collection=question_collection)
+        generator = FAQGenerator(llm=mock_llm, chunks_per_prompt=1, question_cache=cache)
+        
+        await generator.process_chunks_with_questions(chunks)
+        assert mock_llm.ainvoke.call_count == 3
+        assert generator.last_run_stats["cache_hit_ratio"] == 0.0
+        
+        # Update: one paragraph edited, and a new one inserted above the others (indexes shift)
+        edited = [
+            Document(page_content="A new introduction paragraph about Litecoin halvings and supply.",
+                     metadata={"payload_id": "article-1", "chunk_index": 0}),
+            Document(page_content=chunks[0].page_content, metadata={"payload_id": "article-1", "chunk_index": 1}),
+            Document(page_content=chunks[1].page_content + " Edited.", metadata={"payload_id": "article-1", "chunk_index": 2}),
+            Document(page_content=chunks[2].page_content, metadata={"payload_id": "article-1", "chunk_index": 3}),
+        ]
+        mock_llm.ainvoke.reset_mock()
+        all_docs, _ = await generator.process_chunks_with_questions(edited)
+        
+        assert mock_llm.ainvoke.call_count == 2
+        assert generator.last_run_stats["cache_hits"] == 2
+        assert generator.last_run_stats["cache_hit_ratio"] == 0.5
+        # Reused questions still point at the new chunk ids
+        synthetic = [d for d in all_docs if d.metadata.get("is_synthetic")]
+        assert {d.metadata["parent_chunk_id"] for d in synthetic} == {
+            generator._generate_chunk_id(chunk) for chunk in edited
+        }
+    
+    @pytest.mark.asyncio
+    async def test_other_generator_version_is_a_miss(self, question_collection):
+        from backend.services.faq_question_cache import FAQQuestionCache
+        
+        chunk = Document(page_content="Litecoin uses Scrypt proof of work for mining new blocks.", metadata={})
+        mock_llm = AsyncMock()
+        mock_llm.ainvoke.return_value = MagicMock(content="What mining algorithm does Litecoin use?")
+        cache = FAQQuestionCache(collection=question_collection)
+        
+        await FAQGenerator(llm=mock_llm, num_questions=3, question_cache=cache).process_chunks_with_questions([chunk])
+        await FAQGenerator(llm=mock_llm, num_questions=5, question_cache=cache).process_chunks_with_questions([chunk])
+        
+        assert mock_llm.ainvoke.call_count == 2
+    
+    def test_entries_expire_after_last_use(self, question_collection):
+        from datetime import datetime, timedelta
+        from backend.services.faq_question_cache import FAQQuestionCache
+        
+        long_ago = datetime.utcnow() - timedelta(days=365)
+        question_collection.insert_one({"_id": "legacy:v0", "questions": ["Old?"], "updated_at": long_ago})
+        cache = FAQQuestionCache(collection=question_collection, ttl_days=30)
+        cache.put_many({"abc:v1": ["What is MWEB?"]})
+        question_collection.docs["abc:v1"]["last_used_at"] = long_ago
+        
+        assert question_collection.indexes == {"last_used_at": 30 * 86400}
+        # Entries written before the TTL index get a last_used_at, so they can expire too
+        assert question_collection.find_one({"_id": "legacy:v0"})["last_used_at"] > long_ago
+        
+        # A hit pushes the entry's expiry back
+        assert cache.get_many(["abc:v1"]) == {"abc:v1": ["What is MWEB?"]}
+        assert question_collection.find_one({"_id": "abc:v1"})["last_used_at"] > long_ago
+
+
 class TestFeatureFlag:
     """Test that FAQ indexing respects feature flag."""
     
@@ -0,0 +1,122 @@
+import pytest
+from langchain_core.documents import Document
+
+from backend.rag_graph.nodes.retrieve import make_retrieve_node
+from backend.services.hybrid_fusion import RankedList, fuse_ranked_lists
+
+
+def _chunk(chunk_id, text=None, **metadata):
+    return Document(
+        page_content=text or f"text of {chunk_id}",
+        metadata={"chunk_id": chunk_id, "status": "published", **metadata},
+    )
+
+
+def _ids(results):
+    return [doc.metadata.get("chunk_id") or doc.metadata.get("parent_chunk_id") for doc, _score in results]
+
+
+def test_rrf_rewards_chunks_ranked_by_both_retrievers():
+    a, b, c, d = (_chunk(x) for x in "abcd")
+    bm25 = [(a, 12.0), (b, 9.0), (c, 1.0)]
+    # Different objects for the same chunk (FAISS docstore vs MongoDB corpus) merge by chunk_id
+    vector = [(_chunk("c"), 0.1), (d, 0.2), (_chunk("b"), 0.3)]
+
+    fused = fuse_ranked_lists([RankedList("bm25", bm25), RankedList("vector", vector, higher_is_better=False)], mode="rrf")
+
+    assert _ids(fused) == ["c", "b", "a", "d"]
+    assert fused[0][1] == pytest.approx(1 / 63 + 1 / 61)
+
+
+def test_score_fusion_normalizes_and_inverts_distances():
+    a, b, c = (_chunk(x) for x in "abc")
+    bm25 = [(a, 10.0), (b, 5.0)]
+    vector = [(c, 0.1), (b, 0.5), (a, 2.1)]
+
+    fused = fuse_ranked_lists(
+        [RankedList("bm25", bm25, weight=0.5), RankedList("vector", vector, weight=0.5, higher_is_better=False)],
+        mode="score",
+    )
+
+    scores = {doc.metadata["chunk_id"]: score for doc, score in fused}
+    assert scores == pytest.approx({"a": 0.5, "b": 0.5 * 0.8, "c": 0.5})
+    assert _ids(fused)[0] == "a"  # tie with c keeps first-seen order
+
+
+def test_synthetic_question_pools_with_parent_and_prefers_parent_document():
+    parent = _chunk("p1")
+    question = Document(
+        page_content="What is MWEB?",
+        metadata={"is_synthetic": True, "parent_chunk_id": "p1", "status": "published"},
+    )
+    legacy = Document(page_content="no chunk id", metadata={"status": "published"})
+
+    fused = fuse_ranked_lists(
+        [RankedList("vector", [(question, 0.1), (legacy, 0.2)]), RankedList("bm25", [(legacy, 3.0), (parent, 2.0)])],
+        mode="rrf",
+    )
+
+    # Equal RRF totals; the parent's key was seen first (via its question) and keeps the parent doc
+    assert [doc for doc, _score in fused] == [parent, legacy]
+    assert fused[0][0] is parent
+
+
+class _VectorStore:
+    def __init__(self, results):
+        self._results = results
+
+    def similarity_search_with_score_by_vector(self, query_vector, k):
+        return self._results[:k]
+
+
+class _BM25:
+    def __init__(self, results):
+        self._results = results
+
+    def search_with_scores(self, query, k=None):
+        return self._results[:k]
+
+
+class _Bundle:
+    generation = 1
+
+    def __init__(self, vector_store, bm25, parent_chunks_map):
+        self.vector_store = vector_store
+        self.bm25_retriever = bm25
+        self.hybrid_retriever = None
+        self.parent_chunks_map = parent_chunks_map
+
+
+class _Pipeline:
+    use_infinity_embeddings = True
+    use_faq_indexing = True
+    vector_store_manager = None
+    retriever_k = 3
+    sparse_rerank_limit = 3
+
+    def __init__(self, bundle):
+        self.retriever_bundle = bundle
+
+
+@pytest.mark.asyncio
+async def test_retrieve_fuses_rankings_and_resolves_parents_on_scored_list():
+    parent = _chunk("p1", "MWEB parent chunk")
+    question = Document(
+        page_content="What is MWEB?",
+        metadata={"is_synthetic": True, "parent_chunk_id": "p1", "status": "published"},
+    )
+    other = _chunk("c2")
+    vector_only = _chunk("c3")
+    bundle = _Bundle(
+        _VectorStore([(question, 0.1), (vector_only, 0.4)]),
+        _BM25([(other, 8.0), (parent, 6.0)]),
+        {"p1": parent},
+    )
+
+    node = make_retrieve_node(_Pipeline(bundle))
+    state = await node({"retrieval_query": "mweb", "metadata": {}, "query_vector": [0.0] * 4, "query_sparse": None})
+
+    # p1 (BM25 rank 2 + vector rank 1 via its synthetic question) beats single-retriever hits
+    assert [d.metadata["chunk_id"] for d in state["context_docs"]] == ["p1", "c2", "c3"]
+    assert state["context_docs"][0] is parent
+    assert state["metadata"]["fusion_mode"] == "rrf"
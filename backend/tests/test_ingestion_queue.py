@@ -0,0 +1,214 @@
+import asyncio
+
+import pytest
+
+from backend.services.ingestion_queue import (
+    JOB_KEY_PREFIX,
+    UNFINISHED_JOBS_KEY,
+    IngestionJob,
+    IngestionQueue,
+    LEASE_KEY_SUFFIX,
+)
+
+
+def _queue(handler, redis=None, **kwargs):
+    async def get_redis():
+        return redis
+
+    return IngestionQueue(handler, redis_getter=get_redis if redis is not None else None, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_burst_of_edits_is_coalesced_and_never_runs_concurrently_per_payload():
+    processed = []
+    running = set()
+    release = asyncio.Event()
+
+    async def handler(job):
+        assert job.payload_id not in running
+        running.add(job.payload_id)
+        processed.append((job.payload_id, job.doc["title"]))
+        if job.doc["title"] == "a1":
+            await release.wait()
+        running.discard(job.payload_id)
+
+    queue = _queue(handler, concurrency=2)
+    await queue.enqueue("a", "update", {"title": "a1"})
+    await asyncio.sleep(0)  # a1 starts and blocks
+
+    # Edits while a1 is processing: only the latest is run, after a1
+    for title in ("a2", "a3", "a4"):
+        await queue.enqueue("a", "update", {"title": title})
+    await queue.enqueue("b", "update", {"title": "b1"})
+    assert queue.depth == 2 and queue.active == 1
+
+    await asyncio.sleep(0.01)
+    assert ("b", "b1") in processed  # other documents are not blocked behind "a"
+
+    release.set()
+    await queue.join()
+    await queue.stop()
+    assert [p for p in processed if p[0] == "a"] == [("a", "a1"), ("a", "a4")]
+
+
+@pytest.mark.asyncio
+async def test_failed_job_is_retried_and_state_is_persisted(fake_redis):
+    redis = fake_redis
+    attempts = []
+
+    async def handler(job):
+        attempts.append(job.attempts)
+        if job.attempts == 1:
+            raise RuntimeError("embedding server down")
+
+    queue = _queue(handler, redis, retry_backoff_seconds=0.01)
+    result = await queue.enqueue("a", "update", {"title": "a"}, published_at=100.0)
+    assert result["revision"] == 1
+    await queue.join()
+    await queue.stop()
+
+    assert attempts == [1, 2]
+    state = await queue.get_job("a")
+    assert state["status"] == "done" and state["revision"] == "1" and state["attempts"] == "2"
+    assert float(state["published_at"]) == 100.0
+    assert redis.sets[UNFINISHED_JOBS_KEY] == set()
+    assert f"{JOB_KEY_PREFIX}a" in redis.ttls
+
+
+@pytest.mark.asyncio
+async def test_job_gives_up_after_max_attempts(fake_redis):
+    async def handler(job):
+        raise RuntimeError("bad document")
+
+    redis = fake_redis
+    queue = _queue(handler, redis, max_attempts=2, retry_backoff_seconds=0.01)
+    await queue.enqueue("a", "delete")
+    await queue.join()
+    await queue.stop()
+
+    state = await queue.get_job("a")
+    assert state["status"] == "failed" and state["attempts"] == "2"
+    assert state["error"] == "bad document"
+
+
+@pytest.mark.asyncio
+async def test_start_requeues_jobs_left_unfinished_by_a_previous_process(fake_redis):
+    redis = fake_redis
+    job = IngestionJob(payload_id="a", operation="update", doc={"title": "a"}, revision=4)
+    redis.hashes[f"{JOB_KEY_PREFIX}a"] = {**job.to_redis(), "status": "processing"}
+    redis.sets[UNFINISHED_JOBS_KEY] = {"a"}
+    processed = []
+
+    async def handler(job):
+        processed.append((job.payload_id, job.revision, job.doc))
+
+    queue = _queue(handler, redis)
+    assert await queue.start() == 1
+    await queue.join()
+
+    # Revisions continue from the persisted one
+    assert (await queue.enqueue("a", "update", {"title": "a, edited"}))["revision"] == 5
+    await queue.join()
+    await queue.stop()
+    assert processed == [("a", 4, {"title": "a"}), ("a", 5, {"title": "a, edited"})]
+
+
+def _leave_unfinished(redis, payload_id, revision):
+    job = IngestionJob(payload_id=payload_id, operation="update", doc={"title": payload_id}, revision=revision)
+    redis.hashes[f"{JOB_KEY_PREFIX}{payload_id}"] = {**job.to_redis(), "status": "processing"}
+    redis.sets.setdefault(UNFINISHED_JOBS_KEY, set()).add(payload_id)
+
+
+@pytest.mark.asyncio
+async def test_job_recovered_by_several_workers_runs_once(fake_redis):
+    _leave_unfinished(fake_redis, "a", 4)
+    processed = []
+
+    async def handler(job):
+        processed.append((job.payload_id, job.revision))
+        await asyncio.sleep(0.01)
+
+    # Both processes start before either has claimed the job
+    workers = [_queue(handler, fake_redis, lease_seconds=0.02) for _ in range(2)]
+    assert [await queue.start() for queue in workers] == [1, 1]
+    await asyncio.gather(*(queue.join() for queue in workers))
+    for queue in workers:
+        await queue.stop()
+
+    assert processed == [("a", 4)]
+    assert (await workers[0].get_job("a"))["status"] == "done"
+    assert f"{JOB_KEY_PREFIX}a{LEASE_KEY_SUFFIX}" not in fake_redis.strings
+
+
+@pytest.mark.asyncio
+async def test_start_only_recovers_jobs_whose_lease_expired(fake_redis):
+    _leave_unfinished(fake_redis, "running", 1)
+    _leave_unfinished(fake_redis, "orphaned", 1)
+    await fake_redis.set(f"{JOB_KEY_PREFIX}running{LEASE_KEY_SUFFIX}", "live-worker", nx=True, ex=60)
+    processed = []
+
+    async def handler(job):
+        processed.append(job.payload_id)
+
+    queue = _queue(handler, fake_redis)
+    assert await queue.start() == 1
+    await queue.join()
+    await queue.stop()
+    assert processed == ["orphaned"]
+
+
+@pytest.mark.asyncio
+async def test_newer_revision_received_by_another_worker_supersedes_the_running_one(fake_redis):
+    release = asyncio.Event()
+    processed = []
+
+    async def handler(job):
+        processed.append(job.revision)
+        if job.revision == 1:
+            await release.wait()
+
+    worker_a = _queue(handler, fake_redis, lease_seconds=0.02)
+    worker_b = _queue(handler, fake_redis, lease_seconds=0.02)
+    await worker_a.enqueue("a", "update", {"title": "a1"})
+    await asyncio.sleep(0)  # revision 1 runs on worker A
+    await worker_b.enqueue("a", "update", {"title": "a2"})
+    await asyncio.sleep(0.03)
+    assert processed == [1]  # worker B waits for A's lease instead of running concurrently
+
+    release.set()
+    await asyncio.gather(worker_a.join(), worker_b.join())
+    await worker_a.stop()
+    await worker_b.stop()
+    assert processed == [1, 2]
+    state = await worker_b.get_job("a")
+    assert state["status"] == "done" and state["revision"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_failed_chunking_fails_the_job_so_it_is_retried(fake_redis, monkeypatch):
+    from types import SimpleNamespace
+
+    from backend.api.v1.sync import payload
+
+    calls = []
+
+    def failing_chunking(docs):
+        calls.append(docs[0].id)
+        return None
+
+    monkeypatch.setenv("USE_FAQ_INDEXING", "false")
+    monkeypatch.setattr(payload, "process_payload_documents", failing_chunking)
+    monkeypatch.setattr(payload, "_global_rag_pipeline", SimpleNamespace(vector_store_manager=object()))
+    doc = {
+        "id": "a", "createdAt": "2026-01-01T00:00:00Z", "updatedAt": "2026-01-01T00:00:00Z",
+        "title": "A", "content": {}, "markdown": "# A", "status": "published",
+    }
+
+    queue = _queue(payload.run_ingestion_job, fake_redis, max_attempts=2, retry_backoff_seconds=0.01)
+    await queue.enqueue("a", "update", doc)
+    await queue.join()
+    await queue.stop()
+
+    assert calls == ["a", "a"]
+    state = await queue.get_job("a")
+    assert state["status"] == "failed" and "returned no chunks" in state["error"]
@@ -196,6 +196,16 @@ class TestGeminiRewriter:
 # InfinityEmbeddings Tests
 # ============================================================================
 
+def _mock_http_client(post):
+    """httpx.AsyncClient double: an open client (is_closed False) whose post() is `post`."""
+    client = AsyncMock()
+    client.is_closed = False
+    client.post = post
+    client.__aenter__ = AsyncMock(return_value=client)
+    client.__aexit__ = AsyncMock(return_value=None)
+    return client
+
+
 class TestInfinityEmbeddings:
     """Tests for the InfinityEmbeddings service."""
     
@@ -237,10 +247,7 @@ class TestInfinityEmbeddings:
             }
             mock_response.raise_for_status = MagicMock()
             
-            mock_client_instance = AsyncMock()
-            mock_client_instance.post = AsyncMock(return_value=mock_response)
-            mock_client_instance.__aenter__ = AsyncMock(return_value=mock_client_instance)
-            mock_client_instance.__aexit__ = AsyncMock(return_value=None)
+            mock_client_instance = _mock_http_client(AsyncMock(return_value=mock_response))
             mock_client.return_value = mock_client_instance
             
             dense, sparse = await embeddings.embed_query("test query")
@@ -265,10 +272,7 @@ class TestInfinityEmbeddings:
             }
             mock_response.raise_for_status = MagicMock()
             
-            mock_client_instance = AsyncMock()
-            mock_client_instance.post = AsyncMock(return_value=mock_response)
-            mock_client_instance.__aenter__ = AsyncMock(return_value=mock_client_instance)
-            mock_client_instance.__aexit__ = AsyncMock(return_value=None)
+            mock_client_instance = _mock_http_client(AsyncMock(return_value=mock_response))
             mock_client.return_value = mock_client_instance
             
             dense, sparse = await embeddings.embed_documents(["doc1", "doc2"])
@@ -277,6 +281,55 @@ class TestInfinityEmbeddings:
             assert len(dense[0]) == 1024
             assert len(sparse) == 2  # Sparse list same length as dense
     
+    @pytest.mark.asyncio
+    async def test_concurrent_queries_are_batched_and_deduplicated(self, embeddings):
+        """Test concurrent embed_query calls share one request and identical texts one slot."""
+        def fake_post(url, json=None, headers=None):
+            response = MagicMock()
+            response.raise_for_status = MagicMock()
+            response.json.return_value = {
+                "data": [
+                    {"embedding": [float(i)] * 1024, "index": i}
+                    for i in range(len(json["input"]))
+                ]
+            }
+            return response
+
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_client_instance = _mock_http_client(AsyncMock(side_effect=fake_post))
+            mock_client.return_value = mock_client_instance
+
+            results = await asyncio.gather(
+                embeddings.embed_query("what is ltc"),
+                embeddings.embed_query("what is mweb"),
+                embeddings.embed_query("what is ltc"),
+            )
+
+            mock_client_instance.post.assert_called_once()
+            sent = mock_client_instance.post.call_args.kwargs["json"]["input"]
+            assert sent == ["what is ltc", "what is mweb"]
+            assert results[0][0] == results[2][0]
+            assert results[0][0] != results[1][0]
+            assert embeddings._batch_tasks == set()  # finished batches drop their reference
+
+    @pytest.mark.asyncio
+    async def test_client_is_reused_across_calls(self, embeddings):
+        """Test the pooled HTTP client is created once and kept alive."""
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_response = MagicMock()
+            mock_response.raise_for_status = MagicMock()
+            mock_response.json.return_value = {"data": [{"embedding": [0.1] * 1024, "index": 0}]}
+
+            mock_client_instance = _mock_http_client(AsyncMock(return_value=mock_response))
+            mock_client.return_value = mock_client_instance
+
+            await embeddings.embed_documents(["doc1"])
+            await embeddings.embed_documents(["doc2"])
+
+            assert mock_client.call_count == 1
+            assert mock_client_instance.post.call_count == 2
+            mock_client_instance.aclose.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_embed_empty_list(self, embeddings):
         """Test embed_documents handles empty list."""
@@ -284,6 +337,84 @@ class TestInfinityEmbeddings:
         assert result == []
 
 
+# ============================================================================
+# SparseVectorIndex Tests
+# ============================================================================
+
+class TestSparseVectorIndex:
+    """Tests for precomputed document sparse vectors used by sparse re-ranking."""
+
+    def test_mongo_round_trip(self):
+        """Test sparse vectors survive the MongoDB storage layout (terms may contain dots)."""
+        from backend.services.sparse_index import encode_sparse_for_mongo, decode_sparse_from_mongo
+
+        sparse = {"ltc": 0.5, "v0.21": 0.25}
+        stored = encode_sparse_for_mongo(sparse)
+
+        assert stored == {"indices": ["ltc", "v0.21"], "values": [0.5, 0.25]}
+        assert decode_sparse_from_mongo(stored) == sparse
+        assert encode_sparse_for_mongo(None) is None
+
+    def test_score_is_lookup_only(self):
+        """Test scoring uses stored vectors and reports None for unknown documents."""
+        from langchain_core.documents import Document
+        from backend.services.sparse_index import SparseVectorIndex
+
+        index = SparseVectorIndex()
+        index.add(["mweb privacy", "scrypt mining"], [{"mweb": 1.0}, {"scrypt": 1.0}], ["p1", "p2"])
+
+        docs = [
+            Document(page_content="scrypt mining"),
+            Document(page_content="mweb privacy"),
+            Document(page_content="not ingested"),
+        ]
+        scores = index.score({"mweb": 1.0}, docs)
+
+        assert scores[0] == 0.0
+        assert scores[1] == pytest.approx(1.0)
+        assert scores[2] is None
+
+    def test_csr_scores_match_pairwise_cosine(self):
+        """Test the vectorized CSR scoring agrees with the pairwise definition."""
+        from backend.services.infinity_adapter import InfinityEmbeddings
+
+        query = {"ltc": 0.4, "mweb": 0.3, "unseen": 0.2}
+        docs = [{"ltc": 0.1, "halving": 0.5}, {"mweb": 0.7, "ltc": 0.2}, {}, None]
+
+        batch = InfinityEmbeddings.sparse_similarity_batch(query, docs)
+        pairwise = [InfinityEmbeddings.sparse_similarity(query, d or {}) for d in docs]
+
+        assert batch == pytest.approx(pairwise, abs=1e-6)
+        assert batch[2] == 0.0 and batch[3] == 0.0
+
+    def test_remove_payload_keeps_shared_text(self):
+        """Test removing one payload keeps vectors still referenced by another."""
+        from backend.services.sparse_index import SparseVectorIndex
+
+        index = SparseVectorIndex()
+        index.add(["shared", "only p1"], [{"a": 1.0}, {"b": 1.0}], ["p1", "p1"])
+        index.add(["shared"], [{"a": 1.0}], ["p2"])
+
+        assert index.remove_payload("p1") == 1
+        assert index.get("shared") == {"a": 1.0}
+        assert index.get("only p1") is None
+
+    def test_load_from_mongo(self):
+        """Test the index loads stored vectors from MongoDB once."""
+        from backend.services.sparse_index import SparseVectorIndex
+
+        collection = MagicMock()
+        collection.find.return_value = [
+            {"text": "halving", "sparse_embedding": {"indices": ["halving"], "values": [1.0]}, "metadata": {"payload_id": "p1"}},
+        ]
+        index = SparseVectorIndex()
+
+        assert index.load(collection) == 1
+        assert index.load(collection) == 1
+        assert collection.find.call_count == 1
+        assert index.get("halving") == {"halving": 1.0}
+
+
 # ============================================================================
 # RedisVectorCache Tests
 # ============================================================================
@@ -328,8 +459,8 @@ class TestRedisVectorCache:
         vector = [0.1] * 1024
         key = cache._generate_key(vector)
         
-        assert key.startswith(cache.KEY_PREFIX)
-        assert len(key) > len(cache.KEY_PREFIX)
+        assert key.startswith(cache.key_prefix)
+        assert len(key) > len(cache.key_prefix)
     
     def test_url_masking(self, cache):
         """Test password masking in URL for logging."""
@@ -341,6 +472,166 @@ class TestRedisVectorCache:
         clean = cache._mask_url("redis://localhost:6379")
         assert clean == "redis://localhost:6379"
 
+    @pytest.fixture
+    def fake_cache(self, fake_redis):
+        """RedisVectorCache wired to an in-memory fake client."""
+        from backend.services.redis_vector_cache import RedisVectorCache
+        cache = RedisVectorCache(redis_url="redis://localhost:6379", dimension=4, ttl_seconds=60, max_entries=2)
+        cache._client = fake_redis
+        return cache
+
+    @staticmethod
+    def _sources(*payload_ids):
+        return [{"page_content": "x", "metadata": {"payload_id": pid}} for pid in payload_ids]
+
+    @pytest.mark.asyncio
+    async def test_set_applies_ttl_and_payload_tags(self, fake_cache):
+        client = fake_cache._client
+        assert await fake_cache.set([1.0, 0, 0, 0], "q", "answer", self._sources("a1", "a2", "a1"))
+
+        key = fake_cache._generate_key([1.0, 0, 0, 0])
+        assert client.ttls[key] == 60
+        assert client.hashes[key]["payload_ids"] == b"a1,a2"
+        assert client.sets[fake_cache._tag_key("a1")] == {key}
+        assert client.sets[fake_cache._tag_key("a2")] == {key}
+
+    @pytest.mark.asyncio
+    async def test_trim_evicts_least_frequently_hit_entry(self, fake_cache):
+        client = fake_cache._client
+        first, second, third = ([float(i), 1.0, 0, 0] for i in range(3))
+        await fake_cache.set(first, "q1", "a", self._sources("p1"))
+        await fake_cache.set(second, "q2", "a", self._sources("p2"))
+        # A hit on the first entry (what get() records)
+        await client.zadd(fake_cache.LFU_KEY, {fake_cache._generate_key(first): 1}, xx=True, incr=True)
+
+        await fake_cache.set(third, "q3", "a", [])
+
+        assert fake_cache._generate_key(second) not in client.hashes
+        assert fake_cache._generate_key(second) not in client.sets[fake_cache._tag_key("p2")]
+        assert {fake_cache._generate_key(first), fake_cache._generate_key(third)} <= set(client.hashes)
+        assert await client.zcard(fake_cache.LFU_KEY) == 2
+
+    @pytest.mark.asyncio
+    async def test_invalidate_payload_removes_only_citing_entries(self, fake_cache):
+        client = fake_cache._client
+        fake_cache.max_entries = 10
+        await fake_cache.set([1.0, 0, 0, 0], "q1", "a", self._sources("x", "y"))
+        await fake_cache.set([0, 1.0, 0, 0], "q2", "a", self._sources("y"))
+        await fake_cache.set([0, 0, 1.0, 0], "q3", "a", self._sources("z"))
+
+        assert await fake_cache.invalidate_payload("y") == 2
+
+        assert set(client.hashes) == {fake_cache._generate_key([0, 0, 1.0, 0])}
+        assert client.sets[fake_cache._tag_key("x")] == set()
+        assert fake_cache._tag_key("y") not in client.sets
+        assert await client.zcard(fake_cache.LFU_KEY) == 1
+
+    @pytest.mark.asyncio
+    async def test_get_many_pipelines_searches_and_parses_both_protocols(self, fake_cache):
+        client = fake_cache._client
+        await client.zadd(fake_cache.LFU_KEY, {"cache:entry:a": 0.1, "cache:entry:c": 0.1})
+        sources = b'[{"page_content": "x", "metadata": {}}]'
+        client.search_replies = [
+            # RESP2: [total, id, [field, value, ...]]
+            [1, b"cache:entry:a", [b"response", b"answer a", b"sources", sources, b"score", b"0.02"]],
+            # Below the similarity threshold
+            [1, b"cache:entry:b", [b"response", b"answer b", b"sources", b"[]", b"score", b"0.5"]],
+            # RESP3 map
+            {b"total_results": 1, b"results": [
+                {b"id": b"cache:entry:c", b"extra_attributes": {b"response": b"answer c", b"sources": b"[]", b"score": b"0.01"}}
+            ]},
+            [0],
+        ]
+
+        results = await fake_cache.get_many([[1.0, 0, 0, 0]] * 4)
+
+        assert results == [("answer a", [{"page_content": "x", "metadata": {}}]), None, ("answer c", []), None]
+        assert client.zsets[fake_cache.LFU_KEY] == pytest.approx({"cache:entry:a": 1.1, "cache:entry:c": 1.1})
+
+    @pytest.mark.asyncio
+    async def test_sources_are_stored_once_in_chunk_store(self, fake_cache):
+        from backend.services.chunk_store import chunk_store
+
+        client = fake_cache._client
+        fake_cache.max_entries = 10
+        shared = {"page_content": "MWEB " * 100, "metadata": {"payload_id": "p1", "chunk_id": "c1"}}
+        await fake_cache.set([1.0, 0, 0, 0], "q1", "answer 1", [shared])
+        await fake_cache.set([0, 1.0, 0, 0], "q2", "answer 2", [shared])
+
+        chunk_keys = [k for k in client.strings if k.startswith(chunk_store.key_prefix)]
+        assert len(chunk_keys) == 1  # one copy for both answers
+        entry = client.hashes[fake_cache._generate_key([1.0, 0, 0, 0])]
+        assert "sources" not in entry
+        assert entry["source_ids"].decode() == chunk_keys[0][len(chunk_store.key_prefix):]
+
+        chunk_store.clear_memo()
+        client.search_replies = [
+            [1, b"cache:entry:x", [b"response", b"answer 1", b"source_ids", entry["source_ids"], b"score", b"0.01"]],
+            [1, b"cache:entry:y", [b"response", b"answer 3", b"source_ids", b"expired-id", b"score", b"0.01"]],
+        ]
+        [(answer, sources), expired] = await fake_cache.get_many([[1.0, 0, 0, 0]] * 2)
+        assert answer == "answer 1"
+        assert sources[0].page_content == shared["page_content"]
+        assert sources[0].metadata == shared["metadata"]
+        assert expired is None  # a missing chunk turns the hit into a miss
+
+    @pytest.mark.asyncio
+    async def test_int8_mode_stores_quantized_vectors_and_rescores_candidates(self, fake_redis):
+        from backend.services.redis_vector_cache import RedisVectorCache, unit_float16
+
+        cache = RedisVectorCache(redis_url="redis://localhost:6379", dimension=4, threshold=0.9,
+                                 ttl_seconds=60, max_entries=10, vector_type="int8", rescore_candidates=5)
+        client = cache._client = fake_redis
+        query = [0.6, 0.8, 0.0, 0.0]
+        await cache.set(query, "q", "answer", [])
+
+        entry = client.hashes[cache._generate_key(query)]
+        assert len(entry["embedding"]) == 4  # 1 byte per dim
+        assert len(entry["rescore_vec"]) == 8  # float16 side copy
+        assert cache.index_name.endswith(":int8")
+        # Disjoint from the float32 index's prefix, so neither index ingests the other's vectors
+        assert not cache._generate_key(query).startswith(RedisVectorCache.KEY_PREFIX)
+        assert not RedisVectorCache.KEY_PREFIX.startswith(cache.key_prefix)
+        assert "KNN 5" in cache._knn_query(1).query_string()
+
+        # Quantized distances rank the far entry first; re-scoring picks the near one
+        client.search_replies = [[
+            2,
+            b"cache:entry:far", [b"response", b"far", b"source_ids", b"", b"score", b"0.001",
+                                 b"rescore_vec", unit_float16([0.0, 0.0, 1.0, 0.0]).tobytes()],
+            b"cache:entry:near", [b"response", b"near", b"source_ids", b"", b"score", b"0.002",
+                                  b"rescore_vec", unit_float16([0.6, 0.8, 0.01, 0.0]).tobytes()],
+        ]]
+        assert await cache.get_many([query]) == [("near", [])]
+
+        with pytest.raises(ValueError):
+            RedisVectorCache(vector_type="binary")
+
+    @pytest.mark.asyncio
+    async def test_missing_index_is_recreated_once_and_search_retried(self, fake_cache):
+        from redis.exceptions import ResponseError
+
+        client = fake_cache._client
+        fake_cache._index_created = True
+        fake_cache._ensure_index = AsyncMock()
+        client.search_replies = [ResponseError("test:index: no such index"), [0]]
+
+        assert await fake_cache.get_many([[1.0, 0, 0, 0]]) == [None]
+        fake_cache._ensure_index.assert_awaited_once()
+        assert fake_cache._index_created is False  # cleared so _ensure_index really re-creates
+
+    @pytest.mark.asyncio
+    async def test_stats_count_entries_from_ft_info(self, fake_cache):
+        client = fake_cache._client
+        client.ft = MagicMock(return_value=MagicMock(info=AsyncMock(return_value={"num_docs": "42"})))
+        client.info = AsyncMock(return_value={"used_memory": 1024})
+        client.scan_iter = MagicMock(side_effect=AssertionError("stats() must not walk the keyspace"))
+
+        stats = await fake_cache.stats()
+
+        assert stats["entries"] == 42 and stats["indexed_docs"] == 42
+        assert stats["memory_bytes"] == 1024
+
 
 # ============================================================================
 # Integration Tests (with mocked external services)
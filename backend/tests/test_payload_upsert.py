@@ -0,0 +1,201 @@
+import threading
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import FakeEmbeddings
+
+from backend.data_ingestion.vector_store_manager import VectorStoreManager
+from backend.services.payload_upsert import chunk_fingerprint, content_fingerprint, plan_payload_upsert
+from backend.services.payload_vector_ids import PayloadVectorIds
+from backend.services.sparse_index import SparseVectorIndex
+
+
+def _chunk(text, index, **metadata):
+    return Document(page_content=text, metadata={"payload_id": "a", "chunk_index": index, **metadata})
+
+
+class _FakeCollection:
+    """find / bulk_write(InsertOne, UpdateOne $set, DeleteMany) over a list of rows."""
+
+    def __init__(self):
+        self.rows = []
+        self.bulk_writes = 0
+
+    def find(self, query, projection=None):
+        payload_id = query["metadata.payload_id"]
+        return [dict(row) for row in self.rows if row["metadata"].get("payload_id") == payload_id]
+
+    def bulk_write(self, operations, ordered=True):
+        self.bulk_writes += 1
+        for op in operations:
+            if hasattr(op, "_doc") and "$set" in op._doc:
+                for row in self.rows:
+                    if row["_id"] == op._filter["_id"]:
+                        row.update(op._doc["$set"])
+            elif hasattr(op, "_doc"):
+                self.rows.append({"_id": ObjectId(), **op._doc})
+            else:
+                doomed = set(op._filter["_id"]["$in"])
+                self.rows = [row for row in self.rows if row["_id"] not in doomed]
+
+
+def _manager(tmp_path, collection=None):
+    manager = VectorStoreManager.__new__(VectorStoreManager)
+    manager._write_lock = threading.RLock()
+    manager.vector_store = FAISS.from_texts(["other"], FakeEmbeddings(size=8), metadatas=[{"payload_id": "b"}])
+    manager.faiss_index_path = str(tmp_path)
+    manager.payload_vector_ids = PayloadVectorIds()
+    manager.sparse_vectors = SparseVectorIndex()
+    manager.embeddings = FakeEmbeddings(size=8)
+    manager.use_infinity = False
+    manager.mongodb_available = collection is not None
+    manager.collection = collection
+    embedded = []
+
+    def get_cached_embeddings(texts):
+        embedded.extend(texts)
+        return manager.embeddings.embed_documents(texts)
+
+    manager.get_cached_embeddings = get_cached_embeddings
+    return manager, embedded
+
+
+def _contents(store):
+    return sorted(doc.page_content for doc in store.docstore._dict.values())
+
+
+def test_fingerprint_ignores_storage_fields_and_mongo_datetime_precision():
+    published = datetime(2024, 5, 1, 12, 0, 0, 123456, tzinfo=timezone.utc)
+    fresh = chunk_fingerprint("text", {"published_date": published, "chunk_index": 0})
+    # As read back from MongoDB: naive UTC, millisecond precision, stamped embedding identity
+    stored = chunk_fingerprint("text", {
+        "published_date": datetime(2024, 5, 1, 12, 0, 0, 123000),
+        "chunk_index": 0,
+        "embedding_model": "model",
+        "embedding_dim": 8,
+    })
+    assert fresh == stored
+    assert chunk_fingerprint("text", {"chunk_index": 1}) != chunk_fingerprint("text", {"chunk_index": 0})
+    # Position metadata aside, a moved chunk is the same chunk
+    assert content_fingerprint("text", {"chunk_index": 1, "chunk_id": "a_1_x"}) == content_fingerprint(
+        "text", {"chunk_index": 0, "chunk_id": "a_0_x"}
+    )
+    assert content_fingerprint("text", {"title": "A"}) != content_fingerprint("text", {"title": "B"})
+
+
+def test_plan_pairs_duplicates_one_to_one():
+    old = [_chunk("same", 0), _chunk("same", 0), _chunk("gone", 1)]
+    existing = [(i, d.page_content, d.metadata) for i, d in enumerate(old)]
+
+    plan = plan_payload_upsert(existing, [_chunk("same", 0), _chunk("new", 1)])
+
+    assert len(plan.keep_ids) == 1 and plan.add_indexes == [1]
+    assert sorted(plan.remove_ids) in ([0, 2], [1, 2])
+    assert plan.counts() == {"kept": 1, "patched": 0, "added": 1, "removed": 2}
+
+
+def test_upsert_only_embeds_changed_chunks_in_faiss_and_mongo(tmp_path):
+    collection = _FakeCollection()
+    manager, embedded = _manager(tmp_path, collection)
+    v1 = [_chunk("intro", 0), _chunk("body", 1), _chunk("outro", 2)]
+
+    assert manager.upsert_payload_documents("a", v1) == {"kept": 0, "patched": 0, "added": 3, "removed": 0}
+    embedded.clear()
+
+    v2 = [_chunk("intro", 0), _chunk("body, edited", 1), _chunk("outro", 2)]
+    assert manager.upsert_payload_documents("a", v2) == {"kept": 2, "patched": 0, "added": 1, "removed": 1}
+
+    assert embedded == ["body, edited"]
+    assert _contents(manager.vector_store) == ["body, edited", "intro", "other", "outro"]
+    assert sorted(row["text"] for row in collection.rows) == ["body, edited", "intro", "outro"]
+    assert all(row["metadata"]["embedding_dim"] == 8 for row in collection.rows)
+
+    # No change -> nothing embedded or written
+    writes = collection.bulk_writes
+    assert manager.upsert_payload_documents("a", v2) == {"kept": 3, "patched": 0, "added": 0, "removed": 0}
+    assert collection.bulk_writes == writes and embedded == ["body, edited"]
+
+    # Empty article removes every chunk of the payload and nothing else
+    assert manager.upsert_payload_documents("a", [])["removed"] == 3
+    assert _contents(manager.vector_store) == ["other"]
+    assert collection.rows == []
+
+
+def test_paragraph_inserted_mid_article_only_embeds_the_new_chunk(tmp_path):
+    collection = _FakeCollection()
+    manager, embedded = _manager(tmp_path, collection)
+
+    def article(texts):
+        # Chunk ids and question links derive from the position, like FAQGenerator's
+        docs = []
+        for i, text in enumerate(texts):
+            chunk_id = f"a_{i}_{text}"
+            docs.append(_chunk(text, i, chunk_id=chunk_id, is_synthetic=False))
+            docs.append(Document(
+                page_content=f"What about {text}?",
+                metadata={"payload_id": "a", "is_synthetic": True, "parent_chunk_id": chunk_id, "question_index": 0},
+            ))
+        return docs
+
+    manager.upsert_payload_documents("a", article(["intro", "body", "outro"]))
+    embedded.clear()
+
+    v2 = article(["intro", "inserted", "body", "outro"])
+    assert manager.upsert_payload_documents("a", v2) == {"kept": 2, "patched": 4, "added": 2, "removed": 0}
+
+    assert embedded == ["inserted", "What about inserted?"]
+    # Moved chunks and their questions carry the new position metadata in both stores
+    by_text = {row["text"]: row["metadata"] for row in collection.rows}
+    assert by_text["outro"]["chunk_index"] == 3 and by_text["outro"]["chunk_id"] == "a_3_outro"
+    assert by_text["What about body?"]["parent_chunk_id"] == "a_2_body"
+    assert by_text["body"]["embedding_dim"] == 8
+    faiss_by_text = {d.page_content: d.metadata for d in manager.vector_store.docstore._dict.values()}
+    assert faiss_by_text["What about outro?"]["parent_chunk_id"] == "a_3_outro"
+    assert faiss_by_text["body"]["chunk_index"] == 2
+
+    # Re-running the same version is a no-op
+    writes = collection.bulk_writes
+    assert manager.upsert_payload_documents("a", v2)["kept"] == 8
+    assert collection.bulk_writes == writes
+
+
+def test_upsert_repairs_faiss_that_drifted_from_mongo(tmp_path):
+    collection = _FakeCollection()
+    manager, embedded = _manager(tmp_path, collection)
+    docs = [_chunk("intro", 0), _chunk("body", 1)]
+    manager.upsert_payload_documents("a", docs)
+    # FAISS lost a vector (e.g. a failed save) while MongoDB kept the row
+    body_id = next(i for i, d in manager.vector_store.docstore._dict.items() if d.page_content == "body")
+    manager.payload_vector_ids.remove_ids(manager.vector_store, "a", [body_id])
+    embedded.clear()
+
+    assert manager.upsert_payload_documents("a", docs) == {"kept": 2, "patched": 0, "added": 0, "removed": 0}
+    assert embedded == ["body"]
+    assert _contents(manager.vector_store) == ["body", "intro", "other"]
+
+
+def test_infinity_embeddings_of_unchanged_texts_come_from_the_embedding_cache(monkeypatch):
+    from backend.cache_utils import EmbeddingCache
+    from backend.data_ingestion import vector_store_manager as vsm_module
+
+    monkeypatch.setattr(vsm_module, "embedding_cache", EmbeddingCache(max_size=8))
+    manager = VectorStoreManager.__new__(VectorStoreManager)
+    manager.use_infinity = True
+    requested = []
+
+    def embed_with_infinity(client, texts):
+        requested.append(list(texts))
+        return [[float(len(t)), 1.0] for t in texts], [{t: 1.0} for t in texts]
+
+    manager._embed_with_infinity = embed_with_infinity
+
+    dense, sparse, _model = manager._embed_texts(["What is MWEB?", "What is the halving?"])
+    assert requested == [["What is MWEB?", "What is the halving?"]]
+
+    # Re-ingestion: only the new question reaches Infinity; cached hits keep their sparse vectors
+    dense, sparse, model = manager._embed_texts(["What is MWEB?", "Who created Litecoin?"])
+    assert requested[1:] == [["Who created Litecoin?"]]
+    assert dense[0] == [13.0, 1.0]
+    assert sparse == [{"What is MWEB?": 1.0}, {"Who created Litecoin?": 1.0}]
@@ -0,0 +1,75 @@
+import json
+import os
+import threading
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import FakeEmbeddings
+
+from backend.data_ingestion.vector_store_manager import VectorStoreManager
+from backend.services.payload_vector_ids import PAYLOAD_IDS_FILENAME, PayloadVectorIds
+
+
+def _store():
+    texts = ["a1", "a2", "b1", "untracked"]
+    metadatas = [{"payload_id": "a"}, {"payload_id": "a"}, {"payload_id": "b"}, {}]
+    return FAISS.from_texts(texts, FakeEmbeddings(size=8), metadatas=metadatas)
+
+
+def _contents(store):
+    return sorted(doc.page_content for doc in store.docstore._dict.values())
+
+
+def test_reconstructs_from_docstore_and_removes_payload_vectors():
+    store = _store()
+    table = PayloadVectorIds().bind(store)
+    assert len(table.get("a")) == 2 and len(table.get("b")) == 1
+
+    assert table.remove(store, "a") == 2
+    assert store.index.ntotal == 2
+    assert _contents(store) == ["b1", "untracked"]
+    # Unknown / already removed payloads are a no-op
+    assert table.remove(store, "a") == 0
+
+
+def test_record_tracks_added_vectors():
+    store = _store()
+    table = PayloadVectorIds().bind(store)
+    metadatas = [{"payload_id": "c"}, {"payload_id": "c"}]
+    ids = store.add_texts(["c1", "c2"], metadatas=metadatas)
+    table.record(ids, metadatas)
+
+    assert table.remove(store, "c") == 2
+    assert "c1" not in _contents(store)
+
+
+def test_persisted_table_is_used_only_when_consistent(tmp_path):
+    store = _store()
+    table = PayloadVectorIds().bind(store)
+    table.save(str(tmp_path), store)
+    saved = json.loads((tmp_path / PAYLOAD_IDS_FILENAME).read_text())
+    assert saved["ntotal"] == 4 and set(saved["payload_ids"]) == {"a", "b"}
+
+    assert PayloadVectorIds()._load(str(tmp_path), store) == saved["payload_ids"]
+
+    # Index changed behind the table's back -> stale file is ignored
+    store.add_texts(["x"], metadatas=[{"payload_id": "x"}])
+    assert PayloadVectorIds()._load(str(tmp_path), store) is None
+    rebound = PayloadVectorIds().bind(store, str(tmp_path))
+    assert rebound.get("x")
+
+
+def test_manager_removes_payload_vectors_incrementally(tmp_path):
+    manager = VectorStoreManager.__new__(VectorStoreManager)
+    manager._write_lock = threading.RLock()
+    manager.vector_store = _store()
+    manager.faiss_index_path = str(tmp_path)
+    manager.payload_vector_ids = PayloadVectorIds()
+
+    assert manager.remove_payload_vectors("a") == 2
+    assert manager.vector_store.index.ntotal == 2
+    assert os.path.exists(tmp_path / "index.faiss")
+    assert os.path.exists(tmp_path / PAYLOAD_IDS_FILENAME)
+
+    # A replaced store (rebuild / reload) rebinds the table on next use
+    manager.vector_store = _store()
+    assert manager.remove_payload_vectors("b") == 1
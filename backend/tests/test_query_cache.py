@@ -0,0 +1,67 @@
+import threading
+
+from backend.cache_utils import QueryCache
+
+
+def test_lru_evicts_least_recently_used_entry():
+    cache = QueryCache(max_size=3, shards=1)
+    for q in ("a", "b", "c"):
+        cache.set(q, [], f"answer {q}", [])
+
+    assert cache.get("a", [])[0] == "answer a"  # refreshes "a"
+    cache.set("d", [], "answer d", [])
+
+    assert cache.get("b", []) is None
+    assert [cache.get(q, [])[0] for q in ("a", "c", "d")] == ["answer a", "answer c", "answer d"]
+    stats = cache.stats()
+    assert stats["size"] == 3 and stats["evictions"] == 1
+
+
+def test_expired_entries_are_dropped_and_counted():
+    cache = QueryCache(max_size=10, ttl_seconds=60, shards=1)
+    cache.set("old", [], "answer", [])
+    cache.set("fresh", [], "answer", [])
+    shard = cache._shards[0]
+    key = cache._generate_key("old", [])
+    shard.entries[key]["expires_at"] = 0.0
+    shard.expiry_heap = [(0.0 if k == key else e["expires_at"], k) for k, e in shard.entries.items()]
+
+    # Purged by the next set() via the expiry heap, without a lookup
+    cache.set("another", [], "answer", [])
+    assert len(cache) == 2
+    assert cache.get("old", []) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_stats_track_real_hit_rate():
+    cache = QueryCache()
+    cache.set("What is MWEB?", [], "answer", [])
+    cache.get("what is mweb?", [])
+    cache.get("What is MWEB?", [])
+    cache.get("unknown", [])
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+    assert stats["hit_rate"] == 2 / 3
+
+
+def test_shards_share_capacity_and_tolerate_concurrent_access():
+    cache = QueryCache(max_size=100, shards=8)
+    assert sum(cache._shard_capacity) == 100
+
+    def worker(offset):
+        for i in range(200):
+            cache.set(f"q{offset}-{i}", [], "answer", [])
+            cache.get(f"q{offset}-{i}", [])
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = cache.stats()
+    assert stats["size"] <= 100
+    # Another thread may evict an entry between a worker's set and get
+    assert stats["hits"] + stats["misses"] == 800
+    assert stats["size"] + stats["evictions"] == 800
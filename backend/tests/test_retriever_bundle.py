@@ -0,0 +1,121 @@
+import threading
+import time
+
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import FakeEmbeddings
+
+from backend.data_ingestion.vector_store_manager import VectorStoreManager
+from backend.services.retriever_bundle import RetrieverBundle, RetrieverBundleHolder
+
+
+def _bundle(generation: int, marker: str = "") -> RetrieverBundle:
+    return RetrieverBundle(
+        generation=generation,
+        vector_store=marker,
+        bm25_retriever=None,
+        semantic_retriever=None,
+        hybrid_retriever=None,
+        history_aware_retriever=None,
+        rag_chain=None,
+    )
+
+
+def test_rebuild_swaps_in_next_generation():
+    holder = RetrieverBundleHolder(_bundle)
+    assert holder.current is None and holder.generation == 0
+
+    first = holder.rebuild()
+    second = holder.rebuild()
+
+    assert (first.generation, second.generation) == (1, 2)
+    assert holder.current is second
+    assert holder.staleness_seconds() == 0.0
+    assert holder.status()["generation"] == 2
+
+
+def test_failed_build_keeps_serving_previous_bundle():
+    calls = {"n": 0}
+
+    def builder(generation):
+        calls["n"] += 1
+        if calls["n"] > 1:
+            raise RuntimeError("mongo down")
+        return _bundle(generation)
+
+    holder = RetrieverBundleHolder(builder)
+    served = holder.rebuild()
+    with pytest.raises(RuntimeError):
+        holder.rebuild()
+
+    assert holder.current is served
+    # The change that failed to build is still pending
+    assert holder.staleness_seconds() > 0.0
+
+
+def test_concurrent_refreshes_are_coalesced_into_one_build():
+    release = threading.Event()
+    started = threading.Event()
+    builds = []
+
+    def builder(generation):
+        builds.append(generation)
+        if generation == 1:
+            started.set()
+            release.wait(timeout=5)
+        return _bundle(generation)
+
+    holder = RetrieverBundleHolder(builder)
+    first = threading.Thread(target=holder.rebuild)
+    first.start()
+    assert started.wait(timeout=5)
+
+    # Two refreshes arrive while generation 1 is building; readers still see no swap yet
+    waiters = [threading.Thread(target=holder.rebuild) for _ in range(2)]
+    for t in waiters:
+        t.start()
+    time.sleep(0.05)
+    assert holder.current is None
+
+    release.set()
+    first.join(timeout=5)
+    for t in waiters:
+        t.join(timeout=5)
+
+    assert builds == [1, 2]
+    assert holder.current.generation == 2
+
+
+def test_snapshot_vector_store_is_isolated_from_writer():
+    store = FAISS.from_texts(["litecoin", "mweb"], FakeEmbeddings(size=8))
+    manager = VectorStoreManager.__new__(VectorStoreManager)
+    manager._write_lock = threading.RLock()
+    manager.vector_store = store
+
+    snapshot = manager.snapshot_vector_store()
+    store.add_texts(["halving"])
+
+    assert store.index.ntotal == 3
+    assert snapshot.index.ntotal == 2
+    assert {d.page_content for d in snapshot.similarity_search("litecoin", k=5)} == {"litecoin", "mweb"}
+
+
+def test_snapshot_waits_for_an_in_progress_write():
+    store = FAISS.from_texts(["litecoin", "mweb"], FakeEmbeddings(size=8))
+    manager = VectorStoreManager.__new__(VectorStoreManager)
+    manager._write_lock = threading.RLock()
+    manager.vector_store = store
+    snapshots = []
+
+    # A writer (upsert, delete, reload) holds the lock across its whole change
+    with manager._write_lock:
+        reader = threading.Thread(target=lambda: snapshots.append(manager.snapshot_vector_store()))
+        reader.start()
+        store.add_texts(["halving"])
+        time.sleep(0.05)
+        assert snapshots == []
+        store.add_texts(["scrypt"])
+    reader.join()
+
+    assert snapshots[0].index.ntotal == 4
+    assert len(snapshots[0].index_to_docstore_id) == 4
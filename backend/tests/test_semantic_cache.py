@@ -0,0 +1,64 @@
+import numpy as np
+
+from langchain_core.documents import Document
+
+from backend.cache_utils import SemanticCache
+
+
+class _Embeddings:
+    """Deterministic vectors: 'q<i>' -> basis vector i (scaled, to exercise normalization)."""
+
+    dim = 8
+
+    def embed_query(self, text):
+        vec = np.zeros(self.dim, dtype=np.float32)
+        index = int(text.strip().lower().lstrip("q").split()[0]) % self.dim
+        vec[index] = 3.0
+        if "near" in text:
+            vec[(index + 1) % self.dim] = 0.3
+        return vec
+
+
+def _cache(**kwargs):
+    defaults = {"threshold": 0.9, "max_size": 4, "ttl_seconds": 60}
+    defaults.update(kwargs)
+    return SemanticCache(_Embeddings(), **defaults)
+
+
+def test_hit_on_similar_query_and_miss_below_threshold():
+    cache = _cache()
+    source = Document(page_content="MWEB", metadata={"status": "published"})
+    cache.set("q1", [], "answer 1", [source])
+    cache.set("q2", [], "answer 2", [])
+
+    answer, sources = cache.get("q1 near")
+    assert answer == "answer 1"
+    assert sources[0].page_content == "MWEB"
+    assert cache.get("q3") is None
+    # Follow-ups with history never use the cache
+    assert cache.get("q1", [("earlier", "reply")]) is None
+
+
+def test_ring_buffer_overwrites_oldest_entry():
+    cache = _cache(max_size=3)
+    for i in range(4):
+        cache.set(f"q{i}", [], f"answer {i}", [])
+
+    assert cache.get("q0") is None
+    assert [cache.get(f"q{i}")[0] for i in (1, 2, 3)] == ["answer 1", "answer 2", "answer 3"]
+    assert cache.stats()["size"] == 3
+
+
+def test_expired_entries_are_masked_and_clear_resets():
+    cache = _cache()
+    cache.set("q1", [], "answer 1", [])
+    cache.set("q2", [], "answer 2", [])
+    cache._timestamps[0] -= 120  # age q1 past the TTL
+
+    assert cache.get("q1") is None
+    assert cache.get("q2")[0] == "answer 2"
+    assert cache.stats()["size"] == 1 and cache.stats()["total"] == 2
+
+    cache.clear()
+    assert cache.get("q2") is None
+    assert cache.stats()["total"] == 0
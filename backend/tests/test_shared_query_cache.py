@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+from langchain_core.documents import Document
+
+from backend.cache_utils import QueryCache, SharedQueryCache
+
+
+def _worker(redis):
+    cache = SharedQueryCache(QueryCache(max_size=10), ttl_seconds=60, enabled=True)
+    cache._redis_client = redis
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_answer_cached_by_one_worker_is_served_by_another(fake_redis):
+    redis = fake_redis
+    worker_a, worker_b = _worker(redis), _worker(redis)
+    source = Document(page_content="MWEB " * 200, metadata={"status": "published", "payload_id": "p1"})
+
+    await worker_a.aset("What is MWEB?", [], "answer", [source])
+
+    [value] = [v for k, v in redis.strings.items() if k.startswith(SharedQueryCache.KEY_PREFIX)]
+    assert len(value) < len(source.page_content)  # stored compressed
+
+    answer, sources = await worker_b.aget("what is mweb?", [])
+    assert answer == "answer"
+    assert sources[0].page_content == source.page_content
+    assert sources[0].metadata["payload_id"] == "p1"
+    # Copied into worker B's L1
+    assert worker_b.get("What is MWEB?", [])[0] == "answer"
+    assert worker_b.stats()["l2_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidation_orphans_l2_and_clears_other_workers_l1(fake_redis):
+    redis = fake_redis
+    worker_a, worker_b = _worker(redis), _worker(redis)
+    await worker_a.aset("q", [], "stale answer", [])
+    assert (await worker_b.aget("q", []))[0] == "stale answer"
+    listener = asyncio.create_task(worker_b.listen_for_invalidations(poll_seconds=0.01))
+    while not redis._subscribers:
+        await asyncio.sleep(0.01)
+
+    generation = await worker_a.invalidate_all()
+
+    assert generation == 1
+    assert redis.published == [(worker_a.channel, "1")]
+    assert worker_a.get("q", []) is None
+    # Worker B receives the pub/sub message
+    for _ in range(100):
+        if worker_b.get("q", []) is None:
+            break
+        await asyncio.sleep(0.01)
+    listener.cancel()
+    assert worker_b.get("q", []) is None
+    assert await worker_b.aget("q", []) is None
+    assert worker_b.stats()["invalidations"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_errors_fall_back_to_l1(fake_redis):
+    async def broken_get(key):
+        raise ConnectionError("redis down")
+
+    fake_redis.get = broken_get
+    cache = _worker(fake_redis)
+    await cache.aset("q", [], "answer", [])
+
+    assert (await cache.aget("q", []))[0] == "answer"
+    assert await cache.aget("other", []) is None
+    assert cache.stats()["l2_errors"] >= 1
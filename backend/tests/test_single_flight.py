@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from backend.utils.single_flight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_run_and_its_errors():
+    flight = SingleFlight("query")
+    calls = 0
+    release = asyncio.Event()
+
+    async def generate():
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return "answer"
+
+    waiters = [asyncio.ensure_future(flight.run("k", generate)) for _ in range(3)]
+    await asyncio.sleep(0)
+    release.set()
+    results = await asyncio.gather(*waiters)
+
+    assert calls == 1
+    assert [leader for _answer, leader in results] == [True, False, False]
+    assert {answer for answer, _leader in results} == {"answer"}
+    assert flight.stats()["coalescing_rate"] == pytest.approx(2 / 3)
+
+    # The key is released once the run finishes; failures reach every caller
+    async def fail():
+        await asyncio.sleep(0)
+        raise RuntimeError("llm down")
+
+    outcomes = await asyncio.gather(flight.run("k", fail), flight.run("k", fail), return_exceptions=True)
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert flight.stats()["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_does_not_cancel_followers():
+    flight = SingleFlight("query")
+    release = asyncio.Event()
+
+    async def generate():
+        await release.wait()
+        return "answer"
+
+    leader = asyncio.ensure_future(flight.run("k", generate))
+    follower = asyncio.ensure_future(flight.run("k", generate))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+
+    assert await follower == ("answer", False)
+
+
+@pytest.mark.asyncio
+async def test_stream_followers_replay_earlier_items_then_tee_live_ones():
+    flight = SingleFlight("stream")
+    step = asyncio.Event()
+    runs = 0
+
+    async def tokens():
+        nonlocal runs
+        runs += 1
+        yield "sources"
+        yield "Lite"
+        await step.wait()
+        yield "coin"
+
+    leader_items, leader = flight.subscribe("k", tokens)
+    received = [await leader_items.__anext__(), await leader_items.__anext__()]
+
+    # Joins mid-stream: gets the backlog, then the live remainder
+    follower_items, follower_leads = flight.subscribe("k", tokens)
+    step.set()
+    received += [item async for item in leader_items]
+
+    assert leader and not follower_leads
+    assert received == ["sources", "Lite", "coin"]
+    assert [item async for item in follower_items] == ["sources", "Lite", "coin"]
+    assert runs == 1
+
+
+@pytest.mark.asyncio
+async def test_disabled_group_runs_every_call():
+    flight = SingleFlight("query", enabled=False)
+
+    async def generate():
+        return "answer"
+
+    assert await flight.run("k", generate) == ("answer", True)
+    assert await flight.run("k", generate) == ("answer", True)
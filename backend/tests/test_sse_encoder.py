@@ -0,0 +1,66 @@
+import json
+from datetime import datetime
+
+from langchain_core.documents import Document
+
+from backend.cache_utils import QueryCache
+from backend.utils.sse_encoder import (
+    EncodedSources,
+    StreamFrameEncoder,
+    chunk_frame,
+    event_frame,
+    published_sources_payload,
+)
+
+
+def _parse(frame: bytes):
+    text = frame.decode("utf-8")
+    assert text.startswith("data: ") and text.endswith("\n\n")
+    return json.loads(text[len("data: "):-2])
+
+
+SOURCES = [
+    Document(page_content="MWEB overview", metadata={"status": "published", "published_at": datetime(2024, 5, 1, 12, 0)}),
+    Document(page_content="Draft notes", metadata={"status": "draft"}),
+]
+
+
+def test_chunk_frame_matches_legacy_payload():
+    text = 'Quotes " and unicode Ł\n'
+    assert _parse(chunk_frame(text)) == {"status": "streaming", "chunk": text, "isComplete": False}
+
+
+def test_event_frame_round_trips_payload():
+    payload = {"status": "complete", "chunk": "", "isComplete": True, "fromCache": "suggested_question"}
+    assert _parse(event_frame(payload)) == payload
+
+
+def test_sources_frame_contains_only_published_sources():
+    sse = StreamFrameEncoder()
+    frame, count = sse.sources(SOURCES)
+    payload = _parse(frame)
+    assert count == 1
+    assert payload["status"] == "sources" and payload["isComplete"] is False
+    assert payload["sources"] == [
+        {"page_content": "MWEB overview", "metadata": {"status": "published", "published_at": "2024-05-01T12:00:00"}}
+    ]
+    assert sse.phases["sources"] >= 0.0
+
+
+def test_encoded_sources_memoise_encoding():
+    sources = EncodedSources(SOURCES)
+    assert sources.encoded is None
+    first = published_sources_payload(sources)
+    assert sources.encoded is first
+    assert published_sources_payload(sources) is first
+    assert list(sources) == SOURCES
+
+
+def test_query_cache_hits_return_encoded_sources():
+    cache = QueryCache()
+    cache.set("What is MWEB?", [], "answer", SOURCES)
+    _, sources = cache.get("What is MWEB?", [])
+    assert isinstance(sources, EncodedSources)
+    published_sources_payload(sources)
+    _, again = cache.get("What is MWEB?", [])
+    assert again.encoded is not None
@@ -0,0 +1,37 @@
+import pytest
+
+from backend.utils.stream_replay import REPLAY_MODES, replay_text, resolve_replay_mode, split_for_replay
+
+
+ANSWER = (
+    "Litecoin v0.21 activated MWEB. It uses Scrypt!\n\n"
+    "- Supply: 84M LTC\n"
+    "- Block time: 2.5 minutes?  Yes."
+)
+
+
+@pytest.mark.parametrize("mode", REPLAY_MODES)
+def test_frames_reassemble_to_original_answer(mode):
+    frames = split_for_replay(ANSWER, mode)
+    assert "".join(frames) == ANSWER
+    assert all(frames)
+
+
+def test_block_modes_emit_far_fewer_frames_than_characters():
+    words = split_for_replay(ANSWER, "word")
+    sentences = split_for_replay(ANSWER, "sentence")
+    assert split_for_replay(ANSWER, "full") == [ANSWER]
+    assert len(sentences) < len(words) < len(ANSWER)
+    # Decimal points are not sentence boundaries
+    assert sentences[0] == "Litecoin v0.21 activated MWEB. "
+
+
+def test_unknown_mode_falls_back_to_word():
+    assert resolve_replay_mode("paragraph") == "word"
+    assert split_for_replay("", "word") == []
+
+
+@pytest.mark.asyncio
+async def test_replay_text_yields_blocks_without_pacing():
+    frames = [block async for block in replay_text(ANSWER, mode="word", tokens_per_second=0)]
+    assert frames == split_for_replay(ANSWER, "word")
@@ -0,0 +1,205 @@
+import asyncio
+import json
+
+import pytest
+from langchain_core.documents import Document
+
+from backend.cache_utils import SuggestedQuestionCache
+from backend.rag_graph.graph import build_rag_graph
+from backend.rag_graph.nodes.factory import build_nodes
+from backend.rag_pipeline import RAGPipeline
+from backend.services.intent_classifier import Intent
+from backend.utils.single_flight import SingleFlight
+
+
+def _cache(redis, **kwargs):
+    cache = SuggestedQuestionCache(**kwargs)
+    cache._redis_client = redis
+
+    async def _no_chunk_client():
+        return None
+
+    cache._get_chunk_client = _no_chunk_client
+    return cache
+
+
+def _age_entry(redis, seconds):
+    for key, value in redis.strings.items():
+        if key.startswith("suggested_question:"):
+            entry = json.loads(value)
+            entry["cached_at"] -= seconds
+            redis.strings[key] = json.dumps(entry)
+
+
+@pytest.mark.asyncio
+async def test_soft_expired_entry_is_served_and_refreshed_once_in_background(fake_redis):
+    redis = fake_redis
+    cache = _cache(redis, ttl_seconds=60, hard_ttl_seconds=600)
+    source = Document(page_content="MWEB", metadata={"status": "published"})
+    await cache.set("What is MWEB?", "old answer", [source])
+    assert list(redis.ttls.values()) == [600]  # Redis expiry is the hard TTL
+    assert await cache.is_fresh("What is MWEB?")
+
+    release = asyncio.Event()
+    calls = []
+
+    async def refresher(question):
+        calls.append(question)
+        await release.wait()
+        return "new answer", [source]
+
+    cache.set_refresher(refresher)
+    _age_entry(redis, 120)
+    assert not await cache.is_fresh("What is MWEB?")
+
+    # Stale hits return immediately; only one refresh is started for them
+    for _ in range(3):
+        answer, _sources = await cache.get("what is  mweb?")
+        assert answer == "old answer"
+    await asyncio.sleep(0)
+    assert calls == ["what is  mweb?"]
+
+    release.set()
+    await asyncio.gather(*cache._refresh_tasks)
+    answer, _sources = await cache.get("What is MWEB?")
+    assert answer == "new answer"
+    assert await cache.is_fresh("What is MWEB?")
+
+
+@pytest.mark.asyncio
+async def test_refresh_lock_dedupes_across_workers_and_declined_answers_are_not_cached(fake_redis):
+    redis = fake_redis
+    worker_a, worker_b = _cache(redis, ttl_seconds=60), _cache(redis, ttl_seconds=60)
+    await worker_a.set("q", "old", [])
+    _age_entry(redis, 120)
+
+    calls = []
+
+    async def declining_refresher(question):
+        calls.append(question)
+        return None  # e.g. the generic error message
+
+    worker_a.set_refresher(declining_refresher)
+    worker_b.set_refresher(declining_refresher)
+    await worker_a.get("q")
+    await worker_b.get("q")
+    await asyncio.gather(*worker_a._refresh_tasks, *worker_b._refresh_tasks)
+
+    assert calls == ["q"]
+    assert (await worker_a.get("q"))[0] == "old"
+
+
+@pytest.mark.asyncio
+async def test_refresh_concurrency_is_bounded(fake_redis):
+    cache = _cache(fake_redis, refresh_concurrency=2)
+    running = peak = 0
+
+    async def refresher(question):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return f"answer to {question}", []
+
+    cache.set_refresher(refresher)
+    results = await asyncio.gather(*(cache.refresh(f"q{i}") for i in range(6)))
+
+    assert all(results)
+    assert peak == 2
+    assert (await cache.get("q5"))[0] == "answer to q5"
+
+
+class _StaleCachesPipeline:
+    """RAGPipeline.aquery over caches that all still hold the old answer, with a counting LLM."""
+
+    aquery = RAGPipeline.aquery
+    _generate_answer = RAGPipeline._generate_answer
+    _single_flight_key = RAGPipeline._single_flight_key
+    _follower_metadata = RAGPipeline._follower_metadata
+
+    def __init__(self, suggested_cache, source):
+        self.strong_ambiguous_tokens = {"it", "this", "that"}
+        self.strong_prefixes = ("and ", "also ")
+        self.use_intent_classification = True
+        self.use_redis_cache = False
+        self.use_infinity_embeddings = False
+        self.use_faq_indexing = False
+        self.retriever_k = 3
+        self.sparse_rerank_limit = 3
+        self.monitoring_enabled = False
+        self.model_name = "dummy"
+        self.generic_user_error_message = "ERR"
+        self.no_kb_match_response = "NO_MATCH"
+        self.semantic_cache = None
+        self.query_flight = SingleFlight("query")
+        self.llm_calls = []
+        pipeline = self
+
+        class _Classifier:
+            def classify(self, query):
+                return Intent.FAQ_MATCH, "What is MWEB?", None
+
+        class _ExactCache:
+            def get(self, query, history):
+                return "old answer", [source]
+
+            async def aset(self, *args):
+                pass
+
+        class _Retriever:
+            async def ainvoke(self, query):
+                return [source]
+
+        class _Chain:
+            async def ainvoke(self, inputs):
+                pipeline.llm_calls.append(inputs["input"])
+                return "new answer"
+
+        self._classifier = _Classifier()
+        self._suggested_cache = suggested_cache
+        self.query_cache = _ExactCache()
+        self.hybrid_retriever = _Retriever()
+        self.document_chain = _Chain()
+        self._graph = build_rag_graph(build_nodes(self))
+
+    def _get_rag_graph(self):
+        return self._graph
+
+    def _truncate_chat_history(self, history_pairs):
+        return history_pairs
+
+    def get_intent_classifier(self):
+        return self._classifier
+
+    def get_suggested_question_cache(self):
+        return self._suggested_cache
+
+    def get_infinity_embeddings(self):
+        return None
+
+    def get_redis_vector_cache(self):
+        return None
+
+
+@pytest.mark.asyncio
+async def test_refresh_regenerates_through_the_llm_instead_of_reading_the_stale_caches(fake_redis):
+    cache = _cache(fake_redis, ttl_seconds=60)
+    source = Document(page_content="MWEB", metadata={"status": "published"})
+    await cache.set("What is MWEB?", "old answer", [source])
+    _age_entry(fake_redis, 120)
+    pipeline = _StaleCachesPipeline(cache, source)
+
+    # Without bypassing, the FAQ precheck serves the stale suggested-question entry
+    answer, _sources, metadata = await pipeline.aquery("What is MWEB?", [])
+    assert answer == "old answer" and metadata["cache_type"] == "intent_faq_match"
+
+    async def refresher(question):
+        answer, sources, _metadata = await pipeline.aquery(question, [], bypass_cache=True)
+        return answer, sources
+
+    cache.set_refresher(refresher)
+    assert await cache.refresh("What is MWEB?")
+    assert pipeline.llm_calls == ["What is MWEB?"]
+    assert (await cache.get("What is MWEB?"))[0] == "new answer"
+    assert await cache.is_fresh("What is MWEB?")
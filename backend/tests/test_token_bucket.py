@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+import pytest
+
+from backend.utils.token_bucket import TokenBucket
+
+
+@pytest.mark.asyncio
+async def test_burst_is_immediate_then_rate_limited():
+    bucket = TokenBucket(rate=20.0, capacity=3)
+
+    start = time.monotonic()
+    for _ in range(3):
+        await bucket.acquire()
+    assert time.monotonic() - start < 0.04
+
+    # Two more tokens refill at 20/s: ~0.1s
+    await asyncio.gather(bucket.acquire(), bucket.acquire())
+    assert time.monotonic() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_zero_rate_disables_limiting():
+    bucket = TokenBucket(rate=0.0)
+    assert not bucket.enabled
+
+    start = time.monotonic()
+    for _ in range(100):
+        await bucket.acquire()
+    assert time.monotonic() - start < 0.05
+
+
+def test_bucket_can_be_reused_across_event_loops():
+    bucket = TokenBucket(rate=1000.0, capacity=1)
+
+    async def drain():
+        await asyncio.gather(*(bucket.acquire() for _ in range(3)))
+
+    # A module-level bucket outlives asyncio.run() in scripts
+    asyncio.run(drain())
+    asyncio.run(drain())
@@ -15,6 +15,9 @@ Usage (examples):
 
   - Limit work (useful for testing):
       python backend/utils/backfill_embeddings.py --force --limit 100
+
+  - Backfill precomputed sparse vectors (Infinity only) used by the sparse re-rank stage:
+      USE_INFINITY_EMBEDDINGS=true python backend/utils/backfill_embeddings.py --force --sparse
 """
 
 import argparse
@@ -39,7 +42,7 @@ def _get_mongo_collection(client: MongoClient):
     return client[db_name][collection_name]
 
 
-def _embed_with_infinity(texts: List[str]) -> List[List[float]]:
+def _embed_with_infinity(texts: List[str]) -> Tuple[List[List[float]], List[Optional[Dict[str, float]]]]:
     import httpx
 
     infinity_url = os.getenv("INFINITY_URL", "http://localhost:7997")
@@ -56,10 +59,12 @@ def _embed_with_infinity(texts: List[str]) -> List[List[float]]:
         )
         resp.raise_for_status()
         data = resp.json()
-        embeddings = [item["embedding"] for item in data.get("data", [])]
+        items = data.get("data", [])
+        embeddings = [item["embedding"] for item in items]
+        sparse_embeddings = [item.get("sparse_embedding") for item in items]
         if len(embeddings) != len(texts):
             raise ValueError(f"Infinity embedding count mismatch: got {len(embeddings)}, expected {len(texts)}")
-        return embeddings
+        return embeddings, sparse_embeddings
 
 
 def _embed_with_legacy_model(texts: List[str]) -> Tuple[List[List[float]], str]:
@@ -83,6 +88,11 @@ def main() -> int:
         default="",
         help="Only backfill docs for a specific payload_id (matches metadata.payload_id)",
     )
+    parser.add_argument(
+        "--sparse",
+        action="store_true",
+        help="Backfill missing sparse_embedding fields instead of dense embeddings (Infinity only)",
+    )
     args = parser.parse_args()
 
     if not args.dry_run and not args.force:
@@ -104,12 +114,19 @@ def main() -> int:
     client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000)
     collection = _get_mongo_collection(client)
 
-    base_filter: Dict[str, Any] = {"$or": [{"embedding": {"$exists": False}}, {"embedding": []}, {"embedding": None}]}
+    if args.sparse and not use_infinity:
+        print("ERROR: --sparse requires USE_INFINITY_EMBEDDINGS=true")
+        return 2
+
+    if args.sparse:
+        base_filter: Dict[str, Any] = {"sparse_embedding": {"$exists": False}}
+    else:
+        base_filter = {"$or": [{"embedding": {"$exists": False}}, {"embedding": []}, {"embedding": None}]}
     if args.filter_payload_id:
         base_filter["metadata.payload_id"] = args.filter_payload_id
 
     total_missing = collection.count_documents(base_filter)
-    print(f"MongoDB docs missing embeddings: {total_missing}")
+    print(f"MongoDB docs missing {'sparse embeddings' if args.sparse else 'embeddings'}: {total_missing}")
     if args.dry_run:
         print("Dry-run mode: no updates will be written.")
         return 0
@@ -153,8 +170,9 @@ def main() -> int:
         idxs = list(idxs)
         embed_texts = list(embed_texts)
 
+        sparse_vectors: List[Optional[Dict[str, float]]] = [None] * len(embed_texts)
         if use_infinity:
-            vectors = _embed_with_infinity(embed_texts)
+            vectors, sparse_vectors = _embed_with_infinity(embed_texts)
             embedding_model = model_id
         else:
             vectors, embedding_model = _embed_with_legacy_model(embed_texts)
@@ -162,6 +180,20 @@ def main() -> int:
         embedding_dim = len(vectors[0]) if vectors else 0
 
         updates: List[UpdateOne] = []
+        if args.sparse:
+            from backend.services.sparse_index import encode_sparse_for_mongo
+
+            for local_i, sparse in zip(idxs, sparse_vectors):
+                stored_sparse = encode_sparse_for_mongo(sparse)
+                if stored_sparse:
+                    updates.append(
+                        UpdateOne(
+                            {"_id": batch_docs[local_i]["_id"]},
+                            {"$set": {"sparse_embedding": stored_sparse}},
+                        )
+                    )
+            vectors = []
+
         for local_i, vec in zip(idxs, vectors):
             md = metadatas[local_i]
             md.setdefault("embedding_model", embedding_model)
@@ -1,5 +1,5 @@
 import re
-from typing import Dict
+from typing import Dict, List, Tuple
 
 # 1. Expanded and categorized synonym map
 LTC_SYNONYM_MAP: Dict[str, str] = {
@@ -192,4 +192,56 @@ def expand_ltc_entities(query: str) -> str:
         # Append unique expansion terms to the query
         return f"{query} {' '.join(expansions_to_add)}".strip()
     
-    return query.strip()
\ No newline at end of file
+    return query.strip()
+
+
+# Lexical tokens: lowercase alphanumerics, keeping hyphenated/apostrophe terms
+# intact so identifiers like "ltc-20", "lip-0002" and "peer-to-peer" match as one token
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+
+# LTC_SYNONYM_MAP re-keyed by token tuples, so tokenize_ltc() can apply the same
+# mapping with dict lookups instead of running the alternation regex over whole documents
+_TOKEN_SYNONYMS: Dict[Tuple[str, ...], List[str]] = {
+    tuple(_TOKEN_PATTERN.findall(phrase)): _TOKEN_PATTERN.findall(canonical)
+    for phrase, canonical in LTC_SYNONYM_MAP.items()
+}
+_MAX_SYNONYM_TOKENS = max(len(key) for key in _TOKEN_SYNONYMS)
+_SYNONYM_FIRST_TOKENS = frozenset(key[0] for key in _TOKEN_SYNONYMS)
+
+
+def tokenize_ltc(text: str) -> List[str]:
+    """
+    Tokenizes text for lexical (BM25) retrieval.
+
+    Applies the LTC_SYNONYM_MAP canonical mapping (longest phrase first, as in
+    normalize_ltc_keywords()) at token level, so documents and queries agree on
+    terms like "mimblewimble" -> "mweb" or "halvening" -> "halving".
+
+    Example:
+        "Mimblewimble & LTC-20 tokens" -> ["mweb", "ltc-20", "ordinals"]
+
+    Args:
+        text: Document or query text.
+    Returns:
+        List of lowercase tokens (empty for empty input).
+    """
+    if not text:
+        return []
+    tokens = _TOKEN_PATTERN.findall(text.lower())
+    out: List[str] = []
+    i, n = 0, len(tokens)
+    while i < n:
+        if tokens[i] not in _SYNONYM_FIRST_TOKENS:
+            out.append(tokens[i])
+            i += 1
+            continue
+        for size in range(min(_MAX_SYNONYM_TOKENS, n - i), 0, -1):
+            canonical = _TOKEN_SYNONYMS.get(tuple(tokens[i:i + size]))
+            if canonical is not None:
+                out.extend(canonical)
+                i += size
+                break
+        else:
+            out.append(tokens[i])
+            i += 1
+    return out
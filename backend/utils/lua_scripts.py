@@ -461,3 +461,25 @@ redis.call('SETEX', ban_key, ban_duration, ban_expiry)
 return {violation_count, ban_expiry, ban_duration}
 """
 
+
+RENEW_LEASE_LUA = """
+-- Extend a lease only while the caller still owns it
+-- Keys: [1] lease_key
+-- Args: [1] owner, [2] ttl_seconds
+-- Returns: 1 if renewed, 0 if the lease expired or belongs to someone else
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]))
+end
+return 0
+"""
+
+RELEASE_LEASE_LUA = """
+-- Delete a lease only if the caller still owns it
+-- Keys: [1] lease_key
+-- Args: [1] owner
+-- Returns: 1 if released, 0 otherwise
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
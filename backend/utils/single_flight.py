@@ -0,0 +1,181 @@
+"""
+Single-flight coalescing of identical concurrent work.
+
+When a question trends, many users send it at once and all of them miss the
+caches together, so each would pay for its own Gemini generation. A
+SingleFlight group lets the first caller for a key (the leader) run the work
+while later callers with the same key (followers) attach to it:
+
+    run(key, fn)          fn() runs once; every caller gets its result (or exception)
+    subscribe(key, fn)    fn() is an async generator run once; every caller
+                          iterates all of its items, followers replaying the
+                          items emitted before they joined
+
+The work runs in its own task, so a caller that disconnects (cancelled
+request, closed SSE stream) does not cancel it for the others, and the
+leader's cache write-back still happens. A key is released as soon as its
+work finishes; the next caller starts a new flight (by then the answer is
+normally in the query cache).
+
+Roles are exported as rag_single_flight_requests_total{mode, role}; the
+coalescing rate is followers / (leaders + followers).
+"""
+
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Import metrics if available
+try:
+    from backend.monitoring.metrics import rag_single_flight_requests_total, rag_single_flight_group_size
+    METRICS_ENABLED = True
+except ImportError:
+    METRICS_ENABLED = False
+
+
+class _Broadcast:
+    """Items of one streaming flight, replayable by any number of subscribers."""
+
+    def __init__(self):
+        self.items: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.task: Optional["asyncio.Task[None]"] = None
+        self._changed = asyncio.Event()
+
+    def _notify(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def publish(self, item: Any) -> None:
+        self.items.append(item)
+        self._notify()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        self.done = True
+        self.error = error
+        self._notify()
+
+    async def iterate(self) -> AsyncIterator[Any]:
+        position = 0
+        while True:
+            while position < len(self.items):
+                yield self.items[position]
+                position += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await self._changed.wait()
+
+
+class SingleFlight:
+    """Per-key coalescing of concurrent calls (one asyncio event loop)."""
+
+    def __init__(self, mode: str, enabled: bool = True):
+        self.mode = mode  # metrics label, e.g. "query" / "stream"
+        self.enabled = enabled
+        self._calls: Dict[str, Tuple["asyncio.Task[Any]", List[int]]] = {}
+        self._streams: Dict[str, _Broadcast] = {}
+        self.leaders = 0
+        self.followers = 0
+
+    def _record(self, leader: bool) -> None:
+        if leader:
+            self.leaders += 1
+        else:
+            self.followers += 1
+        if METRICS_ENABLED:
+            rag_single_flight_requests_total.labels(mode=self.mode, role="leader" if leader else "follower").inc()
+
+    def _finished(self, group_size: int) -> None:
+        if METRICS_ENABLED:
+            rag_single_flight_group_size.labels(mode=self.mode).observe(group_size)
+        if group_size > 1:
+            logger.info(f"Single-flight ({self.mode}) served {group_size} identical requests with one run")
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run fn() once per key among concurrent callers.
+
+        Returns:
+            (result, leader): leader is False for callers that attached to another's run
+        """
+        if not self.enabled:
+            return await fn(), True
+
+        call = self._calls.get(key)
+        leader = call is None
+        if leader:
+            group = [1]
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = (task, group)
+
+            def _release(done: "asyncio.Task[Any]") -> None:
+                if self._calls.get(key, (None,))[0] is done:
+                    del self._calls[key]
+                if not done.cancelled():
+                    done.exception()  # mark retrieved; callers re-raise it themselves
+                self._finished(group[0])
+
+            task.add_done_callback(_release)
+        else:
+            task, group = call
+            group[0] += 1
+        self._record(leader)
+
+        # shield(): a cancelled caller must not cancel the shared run
+        return await asyncio.shield(task), leader
+
+    def subscribe(self, key: str, factory: Callable[[], AsyncIterator[Any]]) -> Tuple[AsyncIterator[Any], bool]:
+        """
+        Iterate factory()'s items, running the generator once per key among concurrent callers.
+
+        Returns:
+            (items, leader): every caller receives every item from the start
+        """
+        if not self.enabled:
+            return factory(), True
+
+        broadcast = self._streams.get(key)
+        leader = broadcast is None
+        if leader:
+            broadcast = _Broadcast()
+            self._streams[key] = broadcast
+
+            async def _produce() -> None:
+                error: Optional[BaseException] = None
+                try:
+                    async for item in factory():
+                        broadcast.publish(item)
+                except asyncio.CancelledError:
+                    # Subscribers must not hang on a cancelled run
+                    error = RuntimeError("Single-flight stream was cancelled")
+                    raise
+                except Exception as e:
+                    error = e
+                finally:
+                    if self._streams.get(key) is broadcast:
+                        del self._streams[key]
+                    broadcast.finish(error)
+                    self._finished(broadcast.subscribers)
+
+            # Referenced from the broadcast so the task is not garbage-collected mid-run
+            broadcast.task = asyncio.ensure_future(_produce())
+        broadcast.subscribers += 1
+        self._record(leader)
+        return broadcast.iterate(), leader
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.leaders + self.followers
+        return {
+            "mode": self.mode,
+            "enabled": self.enabled,
+            "in_flight": len(self._calls) + len(self._streams),
+            "leaders": self.leaders,
+            "followers": self.followers,
+            "coalescing_rate": self.followers / total if total else 0.0,
+        }
@@ -0,0 +1,180 @@
+"""
+Server-Sent Events frame encoder for the chat stream endpoint.
+
+Frames are built from constant byte templates (`data: ` prefix, `\\n\\n`
+suffix and the fixed JSON fields of each event type), so a streamed chunk
+costs one JSON string encode instead of a dict build + json.dumps + f-string.
+orjson is used when installed, falling back to the stdlib json module.
+
+Source lists are encoded once: `EncodedSources` is a list of Documents that
+memoises its published-only JSON encoding, and the query caches store their
+sources as EncodedSources so cache hits send pre-encoded bytes.
+
+Usage:
+    sse = StreamFrameEncoder()                  # one per request
+    frame, count = sse.sources(sources)
+    yield frame
+    yield sse.chunk(text)
+    yield sse.event({"status": "error", "error": msg, "isComplete": True})
+    sse.observe()                               # CPU breakdown histogram
+"""
+
+import json
+import time
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+try:
+    from backend.monitoring.metrics import chat_stream_cpu_seconds, chat_stream_sources_encoded_total
+    METRICS_ENABLED = True
+except ImportError:
+    METRICS_ENABLED = False
+
+SSE_PREFIX = b"data: "
+SSE_SUFFIX = b"\n\n"
+
+_CHUNK_HEAD = SSE_PREFIX + b'{"status":"streaming","chunk":'
+_CHUNK_TAIL = b',"isComplete":false}' + SSE_SUFFIX
+_SOURCES_HEAD = SSE_PREFIX + b'{"status":"sources","sources":'
+_SOURCES_TAIL = b',"isComplete":false}' + SSE_SUFFIX
+
+_ORJSON_OPTIONS = (orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY) if ORJSON_AVAILABLE else 0
+
+
+def _default(value: Any) -> Any:
+    """Fallback for values neither JSON backend handles natively (ObjectId, numpy scalars, ...)."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def dumps(value: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def event_frame(payload: Dict[str, Any]) -> bytes:
+    """Encode an arbitrary event payload as one SSE frame."""
+    return SSE_PREFIX + dumps(payload) + SSE_SUFFIX
+
+
+def chunk_frame(chunk: str) -> bytes:
+    """`{"status": "streaming", "chunk": ..., "isComplete": false}` frame."""
+    return _CHUNK_HEAD + dumps(chunk) + _CHUNK_TAIL
+
+
+def sources_frame(encoded_sources: bytes) -> bytes:
+    """`{"status": "sources", "sources": [...], "isComplete": false}` frame from pre-encoded sources."""
+    return _SOURCES_HEAD + encoded_sources + _SOURCES_TAIL
+
+
+def _is_published(doc: Any) -> bool:
+    return (getattr(doc, "metadata", None) or {}).get("status") == "published"
+
+
+def encode_published_sources(sources: Iterable[Any]) -> Tuple[bytes, int]:
+    """
+    Encode the published sources as a JSON array of {page_content, metadata}.
+
+    Returns:
+        (JSON bytes, number of published sources)
+    """
+    published = [
+        {"page_content": doc.page_content, "metadata": doc.metadata or {}}
+        for doc in sources
+        if _is_published(doc)
+    ]
+    return dumps(published), len(published)
+
+
+class EncodedSources(list):
+    """
+    List of source Documents that memoises its published-only SSE encoding.
+
+    Behaves exactly like the plain list the caches used to store; callers
+    that only need the Documents never notice the difference.
+    """
+
+    __slots__ = ("_encoded",)
+
+    def __init__(self, sources: Iterable[Any] = (), encoded: Optional[Tuple[bytes, int]] = None):
+        super().__init__(sources)
+        self._encoded = encoded
+
+    @property
+    def encoded(self) -> Optional[Tuple[bytes, int]]:
+        return self._encoded
+
+    def published_payload(self) -> Tuple[bytes, int]:
+        if self._encoded is None:
+            self._encoded = encode_published_sources(self)
+        return self._encoded
+
+
+def published_sources_payload(sources: Iterable[Any]) -> Tuple[bytes, int]:
+    """Published-source JSON for a sources event, reusing a cached encoding when present."""
+    if isinstance(sources, EncodedSources):
+        cached = sources.encoded is not None
+        payload = sources.published_payload()
+    else:
+        cached = False
+        payload = encode_published_sources(sources)
+    if METRICS_ENABLED:
+        chat_stream_sources_encoded_total.labels(result="cached" if cached else "encoded").inc()
+    return payload
+
+
+class StreamFrameEncoder:
+    """
+    Per-request SSE frame builder with CPU accounting.
+
+    Only the synchronous encode calls are timed (thread CPU time), so time the
+    event loop spends on other requests while this stream awaits is not counted.
+    """
+
+    def __init__(self):
+        self.phases: Dict[str, float] = {"frames": 0.0, "sources": 0.0}
+
+    def chunk(self, text: str) -> bytes:
+        start = time.thread_time()
+        frame = chunk_frame(text)
+        self.phases["frames"] += time.thread_time() - start
+        return frame
+
+    def event(self, payload: Dict[str, Any]) -> bytes:
+        start = time.thread_time()
+        frame = event_frame(payload)
+        self.phases["frames"] += time.thread_time() - start
+        return frame
+
+    def sources(self, sources: Iterable[Any]) -> Tuple[bytes, int]:
+        """
+        Sources event for the published subset of `sources`.
+
+        Returns:
+            (SSE frame, number of published sources)
+        """
+        start = time.thread_time()
+        body, count = published_sources_payload(sources)
+        frame = sources_frame(body)
+        self.phases["sources"] += time.thread_time() - start
+        return frame, count
+
+    def observe(self) -> None:
+        """Record the accumulated phases (and their total) once per request."""
+        if not METRICS_ENABLED:
+            return
+        for name, seconds in self.phases.items():
+            chat_stream_cpu_seconds.labels(phase=name).observe(seconds)
+        chat_stream_cpu_seconds.labels(phase="total").observe(sum(self.phases.values()))
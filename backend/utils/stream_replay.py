@@ -0,0 +1,102 @@
+"""
+Replay of already-complete answers (cache hits, static/intent answers) over SSE.
+
+Cached answers used to be replayed one character per SSE frame with an
+`asyncio.sleep` every 10 characters, so a 3 KB answer cost ~3,000 JSON-encoded
+frames and ~300 event-loop sleeps. This module splits the answer into larger
+blocks and paces them at a target token rate instead.
+
+Modes (CACHED_REPLAY_MODE):
+    word      one frame per word, trailing whitespace attached (default)
+    sentence  one frame per sentence or line
+    full      the whole answer in a single frame, never paced
+    char      legacy one-frame-per-character replay (rollback only)
+
+Pacing (CACHED_REPLAY_TOKENS_PER_SECOND): tokens are estimated as
+characters / 4. The default of 2000 tokens/s roughly matches the perceived
+speed of the legacy character replay. Sleeps are coalesced into ticks of at
+least CACHED_REPLAY_MIN_SLEEP_MS so the event loop is not woken per frame.
+Set the rate to 0 to emit frames without any delay.
+
+The frame content is plain text; concatenating all frames always yields the
+original answer, so the frontend contract ("streaming" chunks appended in
+order) is unchanged.
+"""
+
+import asyncio
+import logging
+import os
+import re
+from typing import AsyncIterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+REPLAY_MODES = ("word", "sentence", "full", "char")
+
+CACHED_REPLAY_MODE = os.getenv("CACHED_REPLAY_MODE", "word").lower()
+CACHED_REPLAY_TOKENS_PER_SECOND = float(os.getenv("CACHED_REPLAY_TOKENS_PER_SECOND", "2000"))
+CACHED_REPLAY_MIN_SLEEP_MS = float(os.getenv("CACHED_REPLAY_MIN_SLEEP_MS", "20"))
+
+CHARS_PER_TOKEN = 4
+
+# Split points: between whitespace and the next word (word mode); after
+# sentence-ending punctuation followed by whitespace, or after newlines (sentence mode)
+_WORD_BOUNDARY = re.compile(r"(?<=\s)(?=\S)")
+_SENTENCE = re.compile(r".+?(?:[.!?]+(?=\s|$)\s*|\n+|$)", re.S)
+
+
+def resolve_replay_mode(mode: Optional[str] = None) -> str:
+    """Normalise a replay mode, falling back to word mode for unknown values."""
+    resolved = (mode or CACHED_REPLAY_MODE or "word").lower()
+    if resolved not in REPLAY_MODES:
+        logger.warning(f"Unknown cached replay mode '{resolved}', using 'word'")
+        return "word"
+    return resolved
+
+
+def split_for_replay(text: str, mode: Optional[str] = None) -> List[str]:
+    """
+    Split an answer into replay frames.
+
+    Returns:
+        Non-empty text blocks whose concatenation equals `text`
+    """
+    if not text:
+        return []
+    mode = resolve_replay_mode(mode)
+    if mode == "full":
+        return [text]
+    if mode == "char":
+        return list(text)
+    if mode == "sentence":
+        return [m.group(0) for m in _SENTENCE.finditer(text) if m.group(0)]
+    return [piece for piece in _WORD_BOUNDARY.split(text) if piece]
+
+
+async def replay_text(
+    text: str,
+    mode: Optional[str] = None,
+    tokens_per_second: Optional[float] = None,
+) -> AsyncIterator[str]:
+    """
+    Yield `text` in replay frames, paced at the target token rate.
+
+    Args:
+        text: Complete answer to replay
+        mode: Replay mode (defaults to CACHED_REPLAY_MODE)
+        tokens_per_second: Target rate (defaults to CACHED_REPLAY_TOKENS_PER_SECOND; 0 disables pacing)
+    """
+    mode = resolve_replay_mode(mode)
+    rate = CACHED_REPLAY_TOKENS_PER_SECOND if tokens_per_second is None else tokens_per_second
+    pace = rate > 0 and mode != "full"
+    min_sleep = CACHED_REPLAY_MIN_SLEEP_MS / 1000.0
+
+    owed = 0.0
+    for piece in split_for_replay(text, mode):
+        yield piece
+        if not pace:
+            continue
+        owed += (len(piece) / CHARS_PER_TOKEN) / rate
+        if owed >= min_sleep:
+            await asyncio.sleep(owed)
+            owed = 0.0
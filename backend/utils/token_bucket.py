@@ -0,0 +1,63 @@
+"""
+Async token bucket for pacing calls to rate-limited APIs.
+
+Tokens refill continuously at `rate` per second and up to `capacity` can be
+banked, so short bursts go out immediately while the long-run call rate
+never exceeds `rate`. Unlike a fixed sleep after every call, time spent
+waiting on the API itself counts towards the refill.
+
+Usage:
+    bucket = TokenBucket(rate=0.5, capacity=4)   # 30 RPM, bursts of 4
+    await bucket.acquire()                       # before each call
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """
+    Token bucket shared by coroutines; waiters on the same event loop are served in order.
+
+    A bucket may be kept at module level and outlive an event loop (scripts that
+    call asyncio.run() more than once): its lock is re-created per loop.
+    """
+
+    def __init__(self, rate: float, capacity: int = 1):
+        """
+        Args:
+            rate: Tokens added per second (<= 0 disables limiting)
+            capacity: Maximum banked tokens, i.e. the burst size
+        """
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and take it."""
+        if not self.enabled:
+            return
+        loop = asyncio.get_running_loop()
+        if self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        # The lock is held while sleeping so waiters take tokens in arrival order
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark SSE replay of cached answers.
+
+Compares the legacy one-frame-per-character replay (json.dumps per char plus
+asyncio.sleep(0.001) every 10 chars) against the block replay modes in
+backend.utils.stream_replay, reporting per cached response:
+
+  - frames   SSE events emitted
+  - bytes    total SSE payload bytes ("data: {...}\\n\\n")
+  - cpu ms   process CPU time spent producing the frames (pacing disabled)
+  - wall ms  wall-clock time to replay with pacing as configured
+
+Usage:
+    python scripts/benchmark-cached-replay.py
+    python scripts/benchmark-cached-replay.py --size 8000 --rate 1000 --repeats 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.utils.stream_replay import REPLAY_MODES, replay_text
+
+SAMPLE_PARAGRAPH = (
+    "Litecoin is a peer-to-peer cryptocurrency created by Charlie Lee in 2011. "
+    "It uses the Scrypt proof-of-work algorithm and targets a 2.5 minute block time, "
+    "four times faster than Bitcoin. MWEB (MimbleWimble Extension Blocks) adds optional "
+    "confidential transactions!\n\n"
+    "- Maximum supply: 84 million LTC\n"
+    "- Halving interval: every 840,000 blocks\n\n"
+)
+
+
+def build_answer(size: int) -> str:
+    repeats = size // len(SAMPLE_PARAGRAPH) + 1
+    return (SAMPLE_PARAGRAPH * repeats)[:size]
+
+
+def sse_frame(chunk: str) -> str:
+    payload = {"status": "streaming", "chunk": chunk, "isComplete": False}
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+async def legacy_replay(answer: str, pace: bool):
+    """Pre-change replay, kept verbatim as the baseline."""
+    for i, char in enumerate(answer):
+        yield sse_frame(char)
+        if pace and i % 10 == 0:
+            await asyncio.sleep(0.001)
+
+
+async def block_replay(answer: str, mode: str, rate: float):
+    async for block in replay_text(answer, mode=mode, tokens_per_second=rate):
+        yield sse_frame(block)
+
+
+async def consume(stream) -> tuple:
+    frames = 0
+    size = 0
+    async for frame in stream:
+        frames += 1
+        size += len(frame.encode("utf-8"))
+    return frames, size
+
+
+async def measure(make_stream, repeats: int) -> tuple:
+    """Returns (frames, bytes, cpu seconds per response) with pacing disabled."""
+    frames, size = await consume(make_stream())
+    cpu_start = time.process_time()
+    for _ in range(repeats):
+        await consume(make_stream())
+    return frames, size, (time.process_time() - cpu_start) / repeats
+
+
+async def wall_time(make_stream) -> float:
+    start = time.perf_counter()
+    await consume(make_stream())
+    return time.perf_counter() - start
+
+
+async def run(args) -> None:
+    answer = build_answer(args.size)
+    print(f"Cached answer: {len(answer)} chars, replay rate {args.rate:g} tokens/s\n")
+    print(f"{'mode':>10} | {'frames':>7} | {'bytes':>8} | {'cpu ms':>8} | {'wall ms':>8}")
+    print("-" * 54)
+
+    rows = [("legacy", lambda pace: legacy_replay(answer, pace))]
+    for mode in REPLAY_MODES:
+        rows.append((mode, lambda pace, m=mode: block_replay(answer, m, args.rate if pace else 0)))
+
+    for name, factory in rows:
+        frames, size, cpu = await measure(lambda: factory(False), args.repeats)
+        wall = await wall_time(lambda: factory(True))
+        print(f"{name:>10} | {frames:>7} | {size:>8} | {cpu * 1000:>8.2f} | {wall * 1000:>8.1f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark cached-answer SSE replay")
+    parser.add_argument("--size", type=int, default=3000, help="Cached answer length in characters")
+    parser.add_argument("--rate", type=float, default=2000, help="Target replay rate in tokens/s for block modes")
+    parser.add_argument("--repeats", type=int, default=20, help="Timed repetitions for CPU measurement")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
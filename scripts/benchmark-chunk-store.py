@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Benchmark cached-answer source storage: inline JSON vs the chunk store.
+
+Simulates N cached answers that each cite k source chunks drawn (with a
+skewed popularity) from M distinct article chunks, then compares:
+
+  - bytes/entry   value bytes stored in Redis per cached answer. Inline: the
+                  RedisVectorCache "sources" JSON field (SuggestedQuestionCache
+                  stored it twice: sources + sources_json). Chunk store: the
+                  source_ids field plus the chunk payloads amortized over all
+                  entries. Redis per-key overhead is not included.
+  - decode        per-hit time to turn the stored value into Documents.
+                  Inline: json.loads + Document(). Chunk store cold: MGET +
+                  unpack + Document() (empty memo, i.e. another worker);
+                  warm: served from the in-process memo.
+
+Redis is replaced by an in-memory dict, so only encoding and decoding are
+measured (no network round trips).
+
+Usage:
+    python scripts/benchmark-chunk-store.py
+    python scripts/benchmark-chunk-store.py --answers 2000 --chunks 500 --sources-per-answer 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from langchain_core.documents import Document
+
+from backend.services.chunk_store import ChunkStore, payload_format
+
+WORDS = (
+    "litecoin mweb mimblewimble extension block confidential transactions halving scrypt "
+    "miners wallet address fee block reward supply peer network node upgrade privacy"
+).split()
+
+
+class DictRedis:
+    """MGET/SET/EXPIRE over a dict, with a pipeline that applies commands on execute()."""
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def set(self, key, value, ex=None, nx=False):
+        if not (nx and key in self.data):
+            self.data[key] = value
+
+    def expire(self, key, seconds):
+        pass
+
+    async def execute(self):
+        return []
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+
+def make_chunks(count: int, words_per_chunk: int, rng: random.Random):
+    chunks = []
+    for i in range(count):
+        text = " ".join(rng.choice(WORDS) for _ in range(words_per_chunk))
+        chunks.append({
+            "page_content": text,
+            "metadata": {
+                "chunk_id": f"chunk-{i}",
+                "payload_id": f"article-{i // 8}",
+                "doc_title": f"Article {i // 8}",
+                "section_title": f"Section {i % 8}",
+                "chunk_type": "section",
+                "status": "published",
+                "source": "payload",
+                "author": "editor",
+                "published_date": "2024-05-01T00:00:00",
+                "categories": ["basics", "mweb"],
+            },
+        })
+    return chunks
+
+
+def timed(fn, repeats: int) -> float:
+    samples = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+async def main_async(args) -> int:
+    rng = random.Random(args.seed)
+    chunks = make_chunks(args.chunks, args.words_per_chunk, rng)
+    # Skewed popularity: low-numbered chunks are cited far more often
+    weights = [1.0 / (i + 1) for i in range(args.chunks)]
+    answers = [rng.choices(chunks, weights=weights, k=args.sources_per_answer) for _ in range(args.answers)]
+
+    # Before: inline JSON per entry
+    inline_values = [json.dumps(sources, default=str).encode("utf-8") for sources in answers]
+    inline_bytes = sum(len(v) for v in inline_values) / args.answers
+
+    # After: chunk ids per entry + each chunk once
+    redis = DictRedis()
+    store = ChunkStore(memo_size=args.chunks * 2)
+    id_fields = []
+    for sources in answers:
+        ids = await store.put_many(redis, sources)
+        id_fields.append(",".join(ids).encode("utf-8"))
+    chunk_bytes = sum(len(v) for v in redis.data.values())
+    store_bytes = (sum(len(v) for v in id_fields) + chunk_bytes) / args.answers
+
+    def decode_inline(i):
+        raw = inline_values[i % args.answers]
+        [Document(page_content=d["page_content"], metadata=d["metadata"]) for d in json.loads(raw)]
+
+    async def run_decode(store_factory):
+        samples = []
+        for i in range(args.repeats):
+            target = store_factory()
+            ids = id_fields[i % args.answers].decode("utf-8").split(",")
+            start = time.perf_counter()
+            await target.get_many(redis, ids)
+            samples.append(time.perf_counter() - start)
+        return statistics.median(samples) * 1e6
+
+    inline_us = timed(decode_inline, args.repeats)
+    cold_us = await run_decode(lambda: ChunkStore(memo_size=0))
+    warm_us = await run_decode(lambda: store)
+
+    print(
+        f"{args.answers} answers x {args.sources_per_answer} sources, {args.chunks} distinct chunks "
+        f"(~{args.words_per_chunk} words), codec={payload_format()}, median of {args.repeats}\n"
+    )
+    print(f"{'layout':<28} | {'bytes/entry':>11} | {'decode (us)':>11}")
+    print("-" * 57)
+    print(f"{'inline JSON (vector cache)':<28} | {inline_bytes:>11.0f} | {inline_us:>11.1f}")
+    print(f"{'inline JSON x2 (suggested)':<28} | {inline_bytes * 2:>11.0f} | {inline_us:>11.1f}")
+    print(f"{'chunk store, cold':<28} | {store_bytes:>11.0f} | {cold_us:>11.1f}")
+    print(f"{'chunk store, warm memo':<28} | {store_bytes:>11.0f} | {warm_us:>11.1f}")
+    print(f"\nchunk payloads: {len(redis.data)} keys, {chunk_bytes / 1024:.1f} KiB total")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark inline JSON sources vs the content-addressed chunk store")
+    parser.add_argument("--answers", type=int, default=1000, help="Cached answers")
+    parser.add_argument("--chunks", type=int, default=300, help="Distinct source chunks")
+    parser.add_argument("--sources-per-answer", type=int, default=6)
+    parser.add_argument("--words-per-chunk", type=int, default=250)
+    parser.add_argument("--repeats", type=int, default=200, help="Decodes timed (median reported)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
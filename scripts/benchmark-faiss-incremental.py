@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark FAISS full rebuild vs incremental payload_id update.
+
+Simulates a Payload CMS update webhook (one article = --chunks-per-payload
+chunks is replaced) against indexes of 1k, 10k and 100k chunks:
+
+  - rebuild      FAISS.from_embeddings over every stored vector, which is what
+                 _create_faiss_from_mongodb() does after loading MongoDB
+                 (the MongoDB read itself is NOT included, so real rebuilds are slower)
+  - incremental  PayloadVectorIds.remove() + add_embeddings() for the changed
+                 article only (the webhook path after this change)
+  - save         FAISS save_local + payload id table, paid by both paths
+
+Vectors are random float32; only index maintenance cost is measured, no
+embedding calls.
+
+Usage:
+    python scripts/benchmark-faiss-incremental.py
+    python scripts/benchmark-faiss-incremental.py --dim 768 --sizes 1000 10000
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import FakeEmbeddings
+from backend.services.payload_vector_ids import PayloadVectorIds
+
+
+def build_corpus(n: int, dim: int, chunks_per_payload: int, rng: np.random.Generator):
+    vectors = rng.random((n, dim), dtype=np.float32)
+    texts = [f"chunk {i}" for i in range(n)]
+    metadatas = [{"payload_id": f"payload-{i // chunks_per_payload}", "status": "published"} for i in range(n)]
+    return texts, vectors, metadatas
+
+
+def run_size(n: int, args, rng: np.random.Generator) -> None:
+    embeddings = FakeEmbeddings(size=args.dim)
+    texts, vectors, metadatas = build_corpus(n, args.dim, args.chunks_per_payload, rng)
+    payload_count = n // args.chunks_per_payload
+
+    # Full rebuild (what every delete/unpublish webhook used to trigger)
+    start = time.perf_counter()
+    store = FAISS.from_embeddings(list(zip(texts, list(vectors))), embeddings, metadatas=metadatas)
+    rebuild_s = time.perf_counter() - start
+
+    table = PayloadVectorIds().bind(store)
+
+    # Incremental: replace one article's chunks, repeated over different articles
+    timings = []
+    for r in range(args.repeats):
+        payload_id = f"payload-{int(rng.integers(payload_count))}"
+        new_vectors = rng.random((args.chunks_per_payload, args.dim), dtype=np.float32)
+        new_meta = [{"payload_id": payload_id, "status": "published"} for _ in range(args.chunks_per_payload)]
+        new_texts = [f"{payload_id} v{r} chunk {i}" for i in range(args.chunks_per_payload)]
+
+        start = time.perf_counter()
+        table.remove(store, payload_id)
+        ids = store.add_embeddings(list(zip(new_texts, list(new_vectors))), metadatas=new_meta)
+        table.record(ids, new_meta)
+        timings.append(time.perf_counter() - start)
+    incremental_s = statistics.median(timings)
+    assert store.index.ntotal == n
+
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        store.save_local(tmp)
+        table.save(tmp, store)
+        save_s = time.perf_counter() - start
+
+    print(f"{n:>8} | {rebuild_s * 1000:>12.1f} | {incremental_s * 1000:>15.2f} | "
+          f"{rebuild_s / incremental_s:>7.0f}x | {save_s * 1000:>9.1f}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark FAISS rebuild vs incremental payload update")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000], help="Index sizes (chunks)")
+    parser.add_argument("--dim", type=int, default=1024, help="Vector dimension (1024 = BGE-M3 / Infinity)")
+    parser.add_argument("--chunks-per-payload", type=int, default=10, help="Chunks replaced per webhook")
+    parser.add_argument("--repeats", type=int, default=5, help="Incremental updates per size (median reported)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"dim={args.dim}, {args.chunks_per_payload} chunks replaced per update\n")
+    print(f"{'chunks':>8} | {'rebuild (ms)':>12} | {'incremental (ms)':>15} | {'speedup':>8} | {'save (ms)':>9}")
+    print("-" * 66)
+    for n in args.sizes:
+        run_size(n, args, rng)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Benchmark the legacy in-memory SemanticCache lookup.
+
+Compares the previous implementation (list of dicts, expired-entry list
+rebuild + per-entry cosine similarity with two np.linalg.norm calls on every
+get/set) against backend.cache_utils.SemanticCache (normalized float32 matrix
+ring buffer, one mat-vec per lookup) at 2k, 20k and 200k entries:
+
+  - get miss   lookup that scans every entry and finds nothing above threshold
+  - get hit    lookup of a stored query
+  - set        insert into a full cache (eviction path)
+  - fill       time to load the cache (legacy is bulk-loaded directly, since
+               filling it through set() is quadratic)
+
+Embeddings are random unit vectors served from a lookup table, so only the
+cache itself is measured (no model calls).
+
+Usage:
+    python scripts/benchmark-semantic-cache.py
+    python scripts/benchmark-semantic-cache.py --sizes 2000 20000 --dim 384
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+
+import numpy as np
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.cache_utils import SemanticCache
+
+
+class TableEmbeddings:
+    """embed_query() backed by a dict of precomputed vectors (random for unknown text)."""
+
+    def __init__(self, dim: int, rng: np.random.Generator):
+        self.dim = dim
+        self.rng = rng
+        self.table = {}
+
+    def embed_query(self, text: str) -> np.ndarray:
+        vec = self.table.get(text)
+        if vec is None:
+            vec = self.rng.standard_normal(self.dim).astype(np.float32)
+            vec /= np.linalg.norm(vec)
+            self.table[text] = vec
+        return vec
+
+
+class LegacySemanticCache(SemanticCache):
+    """The list-of-dicts get/set this repo used before the matrix ring buffer."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.entries = []
+        self._legacy_lock = threading.Lock()
+
+    def _cosine_similarity(self, a, b):
+        return np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b) + 1e-10)
+
+    def get(self, query, chat_history=None):
+        search_text = self._build_search_text(self._normalize(query), chat_history or [])
+        query_vec = self._embed(search_text)
+        with self._legacy_lock:
+            now = time.time()
+            best_match, best_score = None, 0.0
+            self.entries = [e for e in self.entries if now - e["timestamp"] < self.ttl_seconds]
+            for entry in self.entries:
+                sim = self._cosine_similarity(query_vec, entry["query_vec"])
+                if sim > best_score and sim >= self.threshold:
+                    best_score, best_match = sim, entry
+            return (best_match["answer"], best_match["sources"]) if best_match else None
+
+    def prefill(self, queries):
+        # Bulk load: set() rebuilds the list per call, which is O(n^2) to fill
+        now = time.time()
+        self.entries = [{"query": q, "query_vec": self._embed(q), "answer": "answer", "sources": [],
+                         "timestamp": now, "search_text": q} for q in queries]
+
+    def set(self, query, chat_history, answer, sources):
+        normalized = self._normalize(query)
+        search_text = self._build_search_text(normalized, chat_history or [])
+        query_vec = self._embed(search_text)
+        with self._legacy_lock:
+            now = time.time()
+            self.entries = [e for e in self.entries if now - e["timestamp"] < self.ttl_seconds]
+            if len(self.entries) >= self.max_size:
+                self.entries.sort(key=lambda x: x["timestamp"])
+                self.entries = self.entries[-self.max_size // 2:]
+            self.entries.append({"query": normalized, "query_vec": query_vec, "answer": answer,
+                                 "sources": sources, "timestamp": time.time(), "search_text": search_text})
+
+
+def timed(fn, repeats: int) -> float:
+    samples = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def run(cache_cls, size: int, dim: int, repeats: int, seed: int):
+    embeddings = TableEmbeddings(dim, np.random.default_rng(seed))
+    cache = cache_cls(embeddings, threshold=0.92, max_size=size, ttl_seconds=3600)
+    # The embedding memo is not what is measured; keep it from evicting
+    cache._embedding_cache_max_size = size * 2 + repeats * 4
+
+    queries = [f"cached question {i}" for i in range(size)]
+    start = time.perf_counter()
+    if hasattr(cache, "prefill"):
+        cache.prefill(queries)
+    else:
+        for query in queries:
+            cache.set(query, [], "answer", [])
+    fill_s = time.perf_counter() - start
+
+    miss_ms = timed(lambda i: cache.get(f"unseen question {i}"), repeats)
+    hit_ms = timed(lambda i: cache.get(f"cached question {size - 1 - i}"), repeats)
+    set_ms = timed(lambda i: cache.set(f"new question {i}", [], "answer", []), repeats)
+    return fill_s, miss_ms, hit_ms, set_ms
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark legacy vs matrix SemanticCache")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 20000, 200000], help="Cache sizes (entries)")
+    parser.add_argument("--dim", type=int, default=768, help="Embedding dimension (768 = all-mpnet-base-v2)")
+    parser.add_argument("--repeats", type=int, default=20, help="Operations timed per size (median reported)")
+    parser.add_argument("--legacy-max", type=int, default=200000, help="Skip the legacy cache above this size")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    print(f"dim={args.dim}, median of {args.repeats} operations\n")
+    print(f"{'entries':>8} | {'impl':>6} | {'fill (s)':>8} | {'get miss (ms)':>13} | {'get hit (ms)':>12} | {'set (ms)':>8}")
+    print("-" * 72)
+    for size in args.sizes:
+        impls = [("matrix", SemanticCache)]
+        if size <= args.legacy_max:
+            impls.insert(0, ("legacy", LegacySemanticCache))
+        for name, cls in impls:
+            fill_s, miss_ms, hit_ms, set_ms = run(cls, size, args.dim, args.repeats, args.seed)
+            print(f"{size:>8} | {name:>6} | {fill_s:>8.2f} | {miss_ms:>13.3f} | {hit_ms:>12.3f} | {set_ms:>8.3f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Recall / latency / memory report for quantized Redis semantic-cache vectors.
+
+Replays a query set against the cached vectors with each candidate-search
+encoding and compares the result to exact float32 cosine search (what the
+FLOAT32 HNSW index approximates):
+
+  - float32            exact cosine (baseline)
+  - int8               per-vector int8 quantization, top-1 by quantized cosine
+                       (REDIS_CACHE_VECTOR_TYPE=int8 without re-scoring)
+  - int8+rescore       int8 top-C candidates re-scored with the float16 copy
+                       (what RedisVectorCache does in int8 mode)
+  - binary(+rescore)   sign bits + Hamming distance. Reported for comparison
+                       only: RediSearch has no bit-vector type, so the cache
+                       does not offer it.
+
+Columns:
+  - recall@1     top-1 entry equals the exact top-1
+  - decisions    same hit/miss outcome (and same entry on hits) at --threshold
+  - max |dsim|   worst similarity error on agreed hits (what the threshold sees)
+  - us/query     brute-force numpy scan + re-score, one query at a time. A proxy
+                 for relative cost only; Redis HNSW latency is not measured
+  - bytes/entry  vector bytes per entry: hash field + HNSW copy (+ re-scoring
+                 vector); HNSW graph links are the same for every type
+
+Query sets:
+  --record FILE     export the cached vectors of a live cache (REDIS_STACK_URL)
+  --query-set FILE  replay a recorded .npz ("vectors", optional "probes"); without
+                    probes, --probes vectors are held out and used as queries
+  (neither)         synthetic paraphrase clusters, for a dry run
+
+Usage:
+    python scripts/benchmark-vector-quantization.py --record cache-vectors.npz
+    python scripts/benchmark-vector-quantization.py --query-set cache-vectors.npz --output report.md
+    python scripts/benchmark-vector-quantization.py --entries 20000 --dim 1024
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+# Add project root to path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.services.redis_vector_cache import RedisVectorCache, quantize_int8, unit_float16
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint16)
+
+
+def record(path: str, redis_url: str) -> int:
+    """Dump the float vectors of every cached entry to an .npz query set."""
+    import redis
+
+    client = redis.from_url(redis_url, decode_responses=False)
+    vectors = []
+    for key in client.scan_iter(match=f"{RedisVectorCache.KEY_PREFIX}*", count=1000):
+        embedding, rescore_vec = client.hmget(key, "embedding", "rescore_vec")
+        if rescore_vec:
+            vectors.append(np.frombuffer(rescore_vec, dtype=np.float16).astype(np.float32))
+        elif embedding:
+            vectors.append(np.frombuffer(embedding, dtype=np.float32))
+    if not vectors:
+        print("No cached vectors found")
+        return 1
+    np.savez_compressed(path, vectors=np.stack(vectors))
+    print(f"Recorded {len(vectors)} vectors (dim={len(vectors[0])}) to {path}")
+    return 0
+
+
+def synthetic_set(entries: int, probes: int, dim: int, rng: np.random.Generator):
+    """Paraphrase clusters: cached queries and probes scattered around shared topics."""
+    topics = rng.standard_normal((max(entries // 8, 1), dim)).astype(np.float32)
+
+    def around(count):
+        centers = topics[rng.integers(0, len(topics), count)]
+        # Noise levels spread best-match similarities across the band around the threshold
+        noise = rng.uniform(0.1, 0.6, (count, 1)).astype(np.float32)
+        return centers + noise * rng.standard_normal((count, dim)).astype(np.float32)
+
+    return around(entries), around(probes)
+
+
+def normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def evaluate(name, scan, probes_unit, exact_top, exact_sim, threshold, bytes_per_entry):
+    recall = agree = 0
+    errors, timings = [], []
+    for i, probe in enumerate(probes_unit):
+        start = time.perf_counter()
+        top, similarity = scan(i, probe)
+        timings.append(time.perf_counter() - start)
+
+        recall += top == exact_top[i]
+        exact_hit = exact_sim[i] >= threshold
+        hit = similarity >= threshold
+        if hit == exact_hit and (not hit or top == exact_top[i]):
+            agree += 1
+            if hit:
+                errors.append(abs(similarity - exact_sim[i]))
+    count = len(probes_unit)
+    return {
+        "name": name,
+        "recall": recall / count,
+        "agree": agree / count,
+        "max_err": max(errors) if errors else 0.0,
+        "us": statistics.median(timings) * 1e6,
+        "bytes": bytes_per_entry,
+    }
+
+
+def run(corpus: np.ndarray, probes: np.ndarray, threshold: float, candidates: int):
+    dim = corpus.shape[1]
+    corpus_unit = normalize(corpus.astype(np.float32))
+    probes_unit = normalize(probes.astype(np.float32))
+
+    # Exact float32 ground truth
+    exact_scores = probes_unit @ corpus_unit.T
+    exact_top = exact_scores.argmax(axis=1)
+    exact_sim = exact_scores[np.arange(len(probes_unit)), exact_top]
+
+    # Encodings exactly as RedisVectorCache stores them
+    corpus_q8 = np.stack([quantize_int8(v) for v in corpus]).astype(np.float32)
+    corpus_q8_unit = normalize(corpus_q8)
+    corpus_f16 = normalize(np.stack([unit_float16(v) for v in corpus]).astype(np.float32))
+    corpus_bits = np.packbits(corpus > 0, axis=1)
+
+    def rescore(order, probe):
+        candidate_sims = corpus_f16[order] @ probe
+        best = int(candidate_sims.argmax())
+        return int(order[best]), float(candidate_sims[best])
+
+    def scan_float32(i, probe):
+        scores = corpus_unit @ probe
+        top = int(scores.argmax())
+        return top, float(scores[top])
+
+    def int8_candidates(probe, k):
+        query = normalize(quantize_int8(probe).astype(np.float32)[None, :])[0]
+        scores = corpus_q8_unit @ query
+        order = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+        return order, scores
+
+    def scan_int8(i, probe):
+        order, scores = int8_candidates(probe, 1)
+        top = int(order[scores[order].argmax()])
+        return top, float(scores[top])
+
+    def scan_int8_rescore(i, probe):
+        order, _scores = int8_candidates(probe, candidates)
+        return rescore(order, probe)
+
+    def binary_candidates(probe, k):
+        distances = _POPCOUNT[np.bitwise_xor(corpus_bits, np.packbits(probe > 0))].sum(axis=1)
+        order = np.argpartition(distances, k - 1)[:k] if k < len(distances) else np.arange(len(distances))
+        return order, distances
+
+    def scan_binary(i, probe):
+        order, distances = binary_candidates(probe, 1)
+        top = int(order[distances[order].argmin()])
+        # Hamming -> angle estimate: cos(pi * h / d)
+        return top, float(np.cos(np.pi * distances[top] / dim))
+
+    def scan_binary_rescore(i, probe):
+        order, _distances = binary_candidates(probe, candidates)
+        return rescore(order, probe)
+
+    f32, i8, f16, bits = 4 * dim, dim, 2 * dim, (dim + 7) // 8
+    rows = [
+        ("float32", scan_float32, 2 * f32),
+        ("int8", scan_int8, 2 * i8),
+        (f"int8+rescore@{candidates}", scan_int8_rescore, 2 * i8 + f16),
+        ("binary", scan_binary, 2 * bits),
+        (f"binary+rescore@{candidates}", scan_binary_rescore, 2 * bits + f16),
+    ]
+    return [
+        evaluate(name, scan, probes_unit, exact_top, exact_sim, threshold, size)
+        for name, scan, size in rows
+    ], exact_sim
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Recall/latency/memory report for quantized cache vectors")
+    parser.add_argument("--record", metavar="FILE", help="Export the live cache's vectors to FILE (.npz) and exit")
+    parser.add_argument("--redis-url", default=os.getenv("REDIS_STACK_URL", "redis://localhost:6379"))
+    parser.add_argument("--query-set", metavar="FILE", help="Recorded .npz query set")
+    parser.add_argument("--entries", type=int, default=10000, help="Synthetic cached entries")
+    parser.add_argument("--probes", type=int, default=500, help="Queries replayed (held out of a recorded set)")
+    parser.add_argument("--dim", type=int, default=1024, help="Synthetic vector dimension")
+    parser.add_argument("--threshold", type=float,
+                        default=float(os.getenv("REDIS_CACHE_SIMILARITY_THRESHOLD", "0.92")))
+    parser.add_argument("--candidates", type=int, default=int(os.getenv("REDIS_CACHE_RESCORE_CANDIDATES", "8")),
+                        help="Candidates re-scored")
+    parser.add_argument("--output", metavar="FILE", help="Also write the report to FILE (markdown)")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    if args.record:
+        return record(args.record, args.redis_url)
+
+    rng = np.random.default_rng(args.seed)
+    if args.query_set:
+        data = np.load(args.query_set)
+        vectors = data["vectors"].astype(np.float32)
+        if "probes" in data:
+            corpus, probes = vectors, data["probes"].astype(np.float32)
+        else:
+            held_out = rng.permutation(len(vectors))
+            count = min(args.probes, len(vectors) // 2)
+            probes, corpus = vectors[held_out[:count]], vectors[held_out[count:]]
+        source = f"recorded set {os.path.basename(args.query_set)}"
+    else:
+        corpus, probes = synthetic_set(args.entries, args.probes, args.dim, rng)
+        source = "synthetic paraphrase clusters"
+
+    results, exact_sim = run(corpus, probes, args.threshold, args.candidates)
+    hit_rate = float((exact_sim >= args.threshold).mean())
+
+    lines = [
+        f"Query set: {source}: {len(corpus)} cached vectors, {len(probes)} queries, dim={corpus.shape[1]}",
+        f"Threshold {args.threshold} (exact hit rate {hit_rate:.1%}), median of {len(probes)} queries",
+        "",
+        f"| {'encoding':<20} | {'recall@1':>8} | {'decisions':>9} | {'max |dsim|':>10} | {'us/query':>8} | {'bytes/entry':>11} |",
+        f"|{'-' * 22}|{'-' * 10}|{'-' * 11}|{'-' * 12}|{'-' * 10}|{'-' * 13}|",
+    ]
+    for row in results:
+        lines.append(
+            f"| {row['name']:<20} | {row['recall']:>8.1%} | {row['agree']:>9.1%} | {row['max_err']:>10.4f} "
+            f"| {row['us']:>8.0f} | {row['bytes']:>11} |"
+        )
+    report = "\n".join(lines)
+    print(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
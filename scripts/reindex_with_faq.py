@@ -32,12 +32,17 @@ Usage:
     
     # Process specific batch size
     python scripts/reindex_with_faq.py --batch-size 50
+    
+    # Tune LLM throughput (prompts in flight, chunks per prompt)
+    python scripts/reindex_with_faq.py --concurrency 8 --chunks-per-prompt 4
 
 Environment Variables:
     FAQ_LLM_BACKEND: "gemini" or "local" (default: gemini)
     FAQ_OLLAMA_URL: Ollama URL (default: http://localhost:11434)
     FAQ_OLLAMA_MODEL: Ollama model (default: llama3.2:3b)
     GOOGLE_API_KEY: Required for Gemini backend
+    FAQ_LLM_CONCURRENCY, FAQ_CHUNKS_PER_PROMPT: Defaults for --concurrency / --chunks-per-prompt
+    FAQ_LLM_RATE_LIMIT_DELAY, FAQ_LLM_RATE_LIMIT_BURST: Gemini token bucket (default 30 RPM, bursts of 4)
 
 Output:
     - Updates MongoDB with chunk_id and is_synthetic metadata
@@ -51,6 +56,7 @@ import asyncio
 import argparse
 import logging
 import signal
+import time
 from pathlib import Path
 from typing import List, Set, Optional
 
@@ -89,7 +95,15 @@ signal.signal(signal.SIGINT, signal_handler)
 signal.signal(signal.SIGTERM, signal_handler)
 
 
-async def main(dry_run: bool = False, force: bool = False, batch_size: int = 100, use_local: bool = False):
+async def main(
+    dry_run: bool = False,
+    force: bool = False,
+    batch_size: int = 100,
+    use_local: bool = False,
+    concurrency: Optional[int] = None,
+    chunks_per_prompt: Optional[int] = None,
+    no_question_cache: bool = False,
+):
     """
     Main FAQ re-indexing function.
     
@@ -98,6 +112,9 @@ async def main(dry_run: bool = False, force: bool = False, batch_size: int = 100
         force: If True, reprocess all documents (ignore existing chunk_ids)
         batch_size: Number of chunks to process in each batch
         use_local: If True, use local Ollama instead of Gemini
+        concurrency: LLM calls in flight at once (default: FAQ_LLM_CONCURRENCY)
+        chunks_per_prompt: Chunks per LLM call (default: FAQ_CHUNKS_PER_PROMPT)
+        no_question_cache: If True, regenerate questions even for chunks in the FAQ question cache
     """
     global _shutdown_requested
     
@@ -144,6 +161,7 @@ async def main(dry_run: bool = False, force: bool = False, batch_size: int = 100
     # Import FAQ generator
     try:
         from backend.services.faq_generator import FAQGenerator
+        from backend.services.faq_question_cache import get_faq_question_cache
     except ImportError as e:
         logger.error(f"Could not import FAQGenerator: {e}")
         logger.info("Make sure you're running from the project root")
@@ -221,7 +239,12 @@ async def main(dry_run: bool = False, force: bool = False, batch_size: int = 100
     
     # Initialize FAQ Generator with selected backend
     logger.info("Initializing FAQ Generator...")
-    faq_generator = FAQGenerator(backend=backend)
+    faq_generator = FAQGenerator(
+        backend=backend,
+        concurrency=concurrency,
+        chunks_per_prompt=chunks_per_prompt,
+        question_cache=None if no_question_cache else get_faq_question_cache(),
+    )
     
     # Health check
     logger.info("Running health check...")
@@ -240,6 +263,11 @@ async def main(dry_run: bool = False, force: bool = False, batch_size: int = 100
     total_chunks_processed = 0
     total_questions_generated = 0
     total_docs_updated = 0
+    total_llm_calls = 0
+    total_cache_hits = 0
+    total_cache_misses = 0
+    generation_seconds = 0.0
+    run_start = time.perf_counter()
     errors = []
     
     for i in range(0, total_docs, batch_size):
@@ -263,7 +291,17 @@ async def main(dry_run: bool = False, force: bool = False, batch_size: int = 100
             synthetic_docs = [d for d in all_docs if d.metadata.get("is_synthetic", False)]
             original_docs = [d for d in all_docs if not d.metadata.get("is_synthetic", False)]
             
+            stats = faq_generator.last_run_stats
             logger.info(f"  Generated: {len(original_docs)} original chunks + {len(synthetic_docs)} synthetic questions")
+            if stats:
+                logger.info(
+                    f"  Throughput: {stats['chunks_per_minute']:.1f} chunks/min, "
+                    f"{stats['questions_per_minute']:.1f} questions/min ({stats['llm_calls']} LLM calls)"
+                )
+                total_llm_calls += stats["llm_calls"]
+                total_cache_hits += stats["cache_hits"]
+                total_cache_misses += stats["cache_misses"]
+                generation_seconds += stats["duration_seconds"]
             total_chunks_processed += len(original_docs)
             total_questions_generated += len(synthetic_docs)
             
@@ -319,6 +357,18 @@ async def main(dry_run: bool = False, force: bool = False, batch_size: int = 100
     logger.info(f"Documents processed: {total_docs}")
     logger.info(f"Original chunks with chunk_id: {total_chunks_processed}")
     logger.info(f"Synthetic questions generated: {total_questions_generated}")
+    logger.info(f"LLM calls: {total_llm_calls}")
+    if total_cache_hits + total_cache_misses:
+        logger.info(
+            f"FAQ question cache: reused {total_cache_hits}/{total_cache_hits + total_cache_misses} chunks "
+            f"({total_cache_hits / (total_cache_hits + total_cache_misses):.0%})"
+        )
+    if generation_seconds > 0:
+        logger.info(
+            f"Generation throughput: {total_chunks_processed / generation_seconds * 60:.1f} chunks/min, "
+            f"{total_questions_generated / generation_seconds * 60:.1f} questions/min"
+        )
+    logger.info(f"Total time: {time.perf_counter() - run_start:.1f}s")
     if not dry_run:
         logger.info(f"MongoDB documents updated: {total_docs_updated}")
     if errors:
@@ -385,6 +435,23 @@ Examples:
         action="store_true",
         help="Use Gemini API (default, requires GOOGLE_API_KEY)"
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="LLM calls in flight at once (default: FAQ_LLM_CONCURRENCY or 4)"
+    )
+    parser.add_argument(
+        "--chunks-per-prompt",
+        type=int,
+        default=None,
+        help="Chunks sent per LLM call; 1 = one prompt per chunk (default: FAQ_CHUNKS_PER_PROMPT or 4)"
+    )
+    parser.add_argument(
+        "--no-question-cache",
+        action="store_true",
+        help="Regenerate questions even for chunks already in the FAQ question cache"
+    )
     
     args = parser.parse_args()
     
@@ -395,6 +462,9 @@ Examples:
         dry_run=args.dry_run,
         force=args.force,
         batch_size=args.batch_size,
-        use_local=use_local
+        use_local=use_local,
+        concurrency=args.concurrency,
+        chunks_per_prompt=args.chunks_per_prompt,
+        no_question_cache=args.no_question_cache,
     ))
 